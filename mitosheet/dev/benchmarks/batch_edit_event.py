@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks pasting a block of cells, comparing sending an edit_event for each
+cell to sending all of them in a single batch_edit_event.
+
+Run with:
+    python dev/benchmarks/batch_edit_event.py --num-cells 100 500
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def get_df(num_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        f'column_{column_index}': list(range(num_rows)) for column_index in range(10)
+    })
+
+
+def benchmark(num_cells: int, num_rows: int) -> None:
+    cell_values = [
+        (f'column_{cell_index % 10}', cell_index // 10, cell_index)
+        for cell_index in range(num_cells)
+    ]
+
+    mito = create_mito_wrapper(get_df(num_rows))
+    start = time.perf_counter()
+    for column_header, row_index, new_value in cell_values:
+        mito.mito_backend.receive_message({
+            'event': 'edit_event',
+            'id': f'edit_{row_index}_{column_header}',
+            'type': 'set_cell_value_edit',
+            'step_id': f'step_{row_index}_{column_header}',
+            'params': {
+                'sheet_index': 0,
+                'column_id': mito.mito_backend.steps_manager.curr_step.column_ids.get_column_id_by_header(0, column_header),
+                'row_index': row_index,
+                'new_value': str(new_value)
+            }
+        })
+    edit_events_time = time.perf_counter() - start
+    edit_events_dfs = mito.dfs
+
+    mito = create_mito_wrapper(get_df(num_rows))
+    start = time.perf_counter()
+    # NOTE: we call the backend directly so we do not time the transpiled code checks of the test wrapper
+    mito.set_cell_values.__wrapped__(mito, 0, cell_values) # type: ignore
+    batch_edit_event_time = time.perf_counter() - start
+
+    assert edit_events_dfs[0].equals(mito.dfs[0])
+
+    print(
+        f'{num_cells:>5} cells: edit events {edit_events_time * 1000:>9.1f} ms, '
+        f'batch edit event {batch_edit_event_time * 1000:>8.1f} ms ({edit_events_time / batch_edit_event_time:.1f}x faster)'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark pasting a block of cells')
+    parser.add_argument('--num-cells', type=int, nargs='+', default=[100, 500])
+    parser.add_argument('--num-rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    for num_cells in args.num_cells:
+        benchmark(num_cells, args.num_rows)
+
+
+if __name__ == '__main__':
+    main()
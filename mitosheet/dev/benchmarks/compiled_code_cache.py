@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks replaying a saved analysis, comparing replaying it with an empty
+compiled code cache (so every step's code is compiled, like before the cache)
+to replaying it again once the cache is warm.
+
+Run with:
+    python dev/benchmarks/compiled_code_cache.py --num-steps 50 200
+"""
+import argparse
+import time
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from mitosheet.enterprise.mito_config import MitoConfig
+from mitosheet.saved_analyses.save_utils import get_steps_obj_for_saved_analysis
+from mitosheet.steps_manager import StepsManager
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.transpiler.compiled_code_cache import EXEC_FILENAME, compiled_code_cache
+
+
+def get_df() -> pd.DataFrame:
+    return pd.DataFrame({'A': list(range(100)), 'B': [str(i) for i in range(100)]})
+
+
+def get_steps_data(num_steps: int) -> List[Dict[str, Any]]:
+    mito = create_mito_wrapper(get_df())
+    column_index = 0
+    while len(mito.mito_backend.steps_manager.steps_including_skipped) - 1 < num_steps:
+        column_header = f'C{column_index}'
+        mito.add_column(0, column_header)
+        mito.set_formula(f'=A + {column_index}', 0, column_header)
+        mito.rename_column(0, column_header, f'D{column_index}')
+        column_index += 1
+
+    steps_manager = mito.mito_backend.steps_manager
+    return get_steps_obj_for_saved_analysis(steps_manager.steps_including_skipped[1:])
+
+
+def time_replay(steps_data: List[Dict[str, Any]]) -> float:
+    steps_manager = StepsManager([get_df()], MitoConfig())
+    start = time.perf_counter()
+    steps_manager.execute_steps_data(new_steps_data=steps_data)
+    return time.perf_counter() - start
+
+
+def time_compiling_cached_code() -> Tuple[float, float]:
+    """
+    Returns the time to compile all of the code in the cache from scratch, 
+    and the time to look it all up in the cache instead.
+    """
+    cached_code = [code for code in compiled_code_cache._cache.keys() if isinstance(code, str)]
+
+    start = time.perf_counter()
+    for code in cached_code:
+        compile(code, EXEC_FILENAME, 'exec')
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for code in cached_code:
+        compiled_code_cache.compile(code)
+    lookup_time = time.perf_counter() - start
+
+    return compile_time, lookup_time
+
+
+def benchmark(num_steps: int) -> None:
+    steps_data = get_steps_data(num_steps)
+
+    compiled_code_cache.clear()
+    cold_time = time_replay(steps_data)
+    cold_misses = compiled_code_cache.misses
+
+    warm_time = time_replay(steps_data)
+    warm_hits = compiled_code_cache.hits
+
+    compile_time, lookup_time = time_compiling_cached_code()
+
+    print(
+        f'{len(steps_data):>5} steps: cold cache {cold_time * 1000:>8.1f} ms ({cold_misses} compiles), '
+        f'warm cache {warm_time * 1000:>8.1f} ms ({warm_hits} hits); '
+        f'compiling {compile_time * 1000:.2f} ms vs cache lookups {lookup_time * 1000:.2f} ms'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark replaying a saved analysis with the compiled code cache')
+    parser.add_argument('--num-steps', type=int, nargs='+', default=[50, 200])
+    args = parser.parse_args()
+
+    for num_steps in args.num_steps:
+        benchmark(num_steps)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks the memory that the step history of an analysis holds onto, and the
+peak memory of replaying it, comparing the default deep copies of dataframes to
+pandas Copy-on-Write, where Mito makes no deep copies.
+
+Requires pandas 2.0 or later, as Mito does not use Copy-on-Write before it.
+
+Run with:
+    python dev/benchmarks/pandas_copy_on_write.py --num-rows 100000 1000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.enterprise.mito_config import MitoConfig
+from mitosheet.saved_analyses.save_utils import get_steps_obj_for_saved_analysis
+from mitosheet.steps_manager import StepsManager
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import is_pandas_copy_on_write_enabled, is_prev_version
+
+MB = 1024 * 1024
+
+
+def get_df(num_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'A': np.arange(num_rows),
+        'B': rng.random(num_rows),
+        'C': rng.random(num_rows),
+        'D': [str(i % 100) for i in range(num_rows)],
+    })
+
+
+def get_steps_data(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    # Steps that edit a single column or cell, which deep copy the entire dataframe without Copy-on-Write
+    mito = create_mito_wrapper(df)
+    mito.set_formula('=A * B', 0, 'E', add_column=True)
+    mito.set_cell_value(0, 'B', 0, 10)
+    mito.rename_column(0, 'C', 'F')
+    mito.change_column_dtype(0, ['A'], 'float')
+    mito.set_formula('=E + 1', 0, 'E')
+    mito.pivot_sheet(0, ['D'], [], {'B': ['sum']})
+    return get_steps_obj_for_saved_analysis(mito.mito_backend.steps_manager.steps_including_skipped[1:])
+
+
+def measure_replay(df: pd.DataFrame, steps_data: List[Dict[str, Any]], copy_on_write: bool) -> Tuple[int, int, float]:
+    pd.set_option('mode.copy_on_write', copy_on_write)
+    assert is_pandas_copy_on_write_enabled() == copy_on_write
+    gc.collect()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    steps_manager = StepsManager([df], MitoConfig())
+    steps_manager.execute_steps_data(new_steps_data=steps_data)
+    replay_time = time.perf_counter() - start
+    retained_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del steps_manager
+    pd.set_option('mode.copy_on_write', False)
+    return retained_memory, peak_memory, replay_time
+
+
+def benchmark(num_rows: int) -> None:
+    df = get_df(num_rows)
+    steps_data = get_steps_data(df)
+    df_memory = df.memory_usage(deep=True).sum()
+
+    for copy_on_write in [False, True]:
+        retained_memory, peak_memory, replay_time = measure_replay(df, steps_data, copy_on_write)
+        print(
+            f'{num_rows:>8} rows ({df_memory / MB:>6.1f} MB), copy on write {str(copy_on_write):>5}: '
+            f'step history {retained_memory / MB:>7.1f} MB, peak {peak_memory / MB:>7.1f} MB, '
+            f'replay {replay_time * 1000:>8.1f} ms'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the memory Mito uses with and without pandas Copy-on-Write')
+    parser.add_argument('--num-rows', type=int, nargs='+', default=[100000, 1000000])
+    args = parser.parse_args()
+
+    if is_prev_version(pd.__version__, '2.0.0'):
+        print(f'Mito only uses pandas Copy-on-Write with pandas 2.0 or later, but pandas {pd.__version__} is installed')
+        return
+
+    for num_rows in args.num_rows:
+        benchmark(num_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks reconing a wide dataframe after a single column formula step,
+comparing every shared column to the fast path, which skips columns
+that share their data with the previous dataframe, and only compares the
+columns the step says it modified.
+
+Run with:
+    python dev/benchmarks/recon.py --num-columns 30 300 --num-rows 100000
+"""
+import argparse
+import time
+from typing import Any, Callable, List
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.ai.recon import get_modified_dataframe_recon_data
+
+
+def get_wide_df(num_columns: int, num_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({f'C{index}': rng.random(num_rows) for index in range(num_columns)})
+
+
+def get_modified_columns_by_comparing_every_column(old_df: pd.DataFrame, new_df: pd.DataFrame) -> List[Any]:
+    return [column_header for column_header in old_df.columns if not old_df[column_header].equals(new_df[column_header])]
+
+
+def time_recon(recon: Callable[[], object], num_repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        recon()
+    return (time.perf_counter() - start) / num_repeats
+
+
+def benchmark(num_columns: int, num_rows: int, num_repeats: int) -> None:
+    old_df = get_wide_df(num_columns, num_rows)
+
+    # Like a set column formula step, which shares all other columns with the previous dataframe
+    new_df = old_df.copy(deep=False)
+    new_df['C0'] = new_df['C1'] + 1
+
+    full_compare_time = time_recon(lambda: get_modified_columns_by_comparing_every_column(old_df, new_df), num_repeats)
+    shared_data_time = time_recon(lambda: get_modified_dataframe_recon_data(old_df, new_df), num_repeats)
+    hint_time = time_recon(lambda: get_modified_dataframe_recon_data(old_df, new_df, modified_column_headers=['C0']), num_repeats)
+
+    print(
+        f'{num_columns:>5} columns x {num_rows} rows: compare every column {full_compare_time * 1000:>8.2f} ms, '
+        f'skip shared data {shared_data_time * 1000:>7.2f} ms, with modified columns {hint_time * 1000:>6.2f} ms '
+        f'({full_compare_time / hint_time:.0f}x faster)'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark reconing a wide dataframe after a single column step')
+    parser.add_argument('--num-columns', type=int, nargs='+', default=[30, 300])
+    parser.add_argument('--num-rows', type=int, default=100000)
+    parser.add_argument('--num-repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    for num_columns in args.num_columns:
+        benchmark(num_columns, args.num_rows, args.num_repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks sending the data of a sheet to the frontend as Arrow, rather than as JSON. 
+Compares the size of the payload and the time it takes to write it, for a dataframe 
+with a mix of float, int, string and datetime columns. Requires pyarrow.
+
+Run with:
+    python dev/benchmarks/sheet_data_arrow.py --num-columns 10 100 1000
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.sheet_data_arrow import get_arrow_stream_and_column_indexes
+from mitosheet.utils import MAX_COLUMNS, MAX_ROWS, get_columnar_json_data, get_json_string
+
+
+def get_mixed_df(num_columns: int, num_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    columns: Dict[str, Any] = {}
+    for column_index in range(num_columns):
+        if column_index % 4 == 0:
+            columns[f'C{column_index}'] = rng.random(num_rows) * 1000
+        elif column_index % 4 == 1:
+            columns[f'C{column_index}'] = rng.integers(0, 1000, num_rows)
+        elif column_index % 4 == 2:
+            columns[f'C{column_index}'] = np.array([f'value {i % 100}' for i in range(num_rows)], dtype=object)
+        else:
+            columns[f'C{column_index}'] = pd.date_range('2020-01-01', periods=num_rows, freq='min')
+    return pd.DataFrame(columns)
+
+
+def get_sheet_data_json(df: pd.DataFrame) -> bytes:
+    columns_data, index = get_columnar_json_data(df)
+    return get_json_string({'data': columns_data, 'index': index}).encode('utf-8')
+
+
+def get_sheet_data_arrow(df: pd.DataFrame) -> bytes:
+    _, index = get_columnar_json_data(df, max_columns=0)
+    arrow_stream, _ = get_arrow_stream_and_column_indexes(df.head(MAX_ROWS).iloc[:, :MAX_COLUMNS])
+    return get_json_string({'index': index}).encode('utf-8') + arrow_stream
+
+
+def time_serialization(serialize: Callable[[], Any], num_repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        serialize()
+    return (time.perf_counter() - start) / num_repeats
+
+
+def benchmark(num_columns: int, num_rows: int, num_repeats: int) -> None:
+    df = get_mixed_df(num_columns, num_rows)
+
+    json_size = len(get_sheet_data_json(df))
+    arrow_size = len(get_sheet_data_arrow(df))
+    json_time = time_serialization(lambda: get_sheet_data_json(df), num_repeats)
+    arrow_time = time_serialization(lambda: get_sheet_data_arrow(df), num_repeats)
+
+    print(
+        f'{num_columns:>5} columns x {num_rows} rows: JSON {json_size / 1024:>8.0f} KB in {json_time * 1000:>7.1f} ms, '
+        f'Arrow {arrow_size / 1024:>8.0f} KB in {arrow_time * 1000:>7.1f} ms ({json_size / arrow_size:.1f}x smaller)'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark sending the data of a sheet as Arrow rather than JSON')
+    parser.add_argument('--num-columns', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--num-rows', type=int, default=100000)
+    parser.add_argument('--num-repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    for num_columns in args.num_columns:
+        benchmark(num_columns, args.num_rows, args.num_repeats)
+
+
+if __name__ == '__main__':
+    main()
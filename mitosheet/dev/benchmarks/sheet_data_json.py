@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks writing the data of a sheet to JSON for the frontend, which happens after
+every edit. Compares writing the dataframe with to_json, reading it back in, and then
+turning its rows into columns, to building the values of each column directly from
+its array, and then writing it with orjson if it is installed.
+
+Run with:
+    python dev/benchmarks/sheet_data_json.py --num-columns 10 100 1000
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.utils import (MAX_COLUMNS, NpEncoder, convert_df_to_parsed_json,
+                             get_columnar_json_data, get_json_string,
+                             is_orjson_installed)
+
+
+def get_mixed_df(num_columns: int, num_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    columns: Dict[str, Any] = {}
+    for column_index in range(num_columns):
+        if column_index % 4 == 0:
+            columns[f'C{column_index}'] = rng.random(num_rows) * 1000
+        elif column_index % 4 == 1:
+            columns[f'C{column_index}'] = rng.integers(0, 1000, num_rows)
+        elif column_index % 4 == 2:
+            columns[f'C{column_index}'] = np.array([f'value {i % 100}' for i in range(num_rows)], dtype=object)
+        else:
+            columns[f'C{column_index}'] = pd.date_range('2020-01-01', periods=num_rows, freq='min')
+    return pd.DataFrame(columns)
+
+
+def get_sheet_data_json_through_to_json(df: pd.DataFrame) -> str:
+    json_obj = convert_df_to_parsed_json(df)
+    columns_data = [
+        [row[column_index] if column_index < MAX_COLUMNS else None for row in json_obj['data']]
+        for column_index in range(df.shape[1])
+    ]
+    return json.dumps({'data': columns_data, 'index': json_obj['index']}, cls=NpEncoder)
+
+
+def get_sheet_data_json_columnar(df: pd.DataFrame) -> str:
+    columns_data, index = get_columnar_json_data(df)
+    return get_json_string({'data': columns_data, 'index': index})
+
+
+def time_serialization(serialize: Callable[[], Any], num_repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        serialize()
+    return (time.perf_counter() - start) / num_repeats
+
+
+def benchmark(num_columns: int, num_rows: int, num_repeats: int) -> None:
+    df = get_mixed_df(num_columns, num_rows)
+    assert json.loads(get_sheet_data_json_through_to_json(df)) == json.loads(get_sheet_data_json_columnar(df))
+
+    to_json_time = time_serialization(lambda: get_sheet_data_json_through_to_json(df), num_repeats)
+    columnar_time = time_serialization(lambda: get_sheet_data_json_columnar(df), num_repeats)
+
+    print(
+        f'{num_columns:>5} columns x {num_rows} rows: through to_json {to_json_time * 1000:>8.1f} ms, '
+        f'columnar {columnar_time * 1000:>7.1f} ms ({to_json_time / columnar_time:.1f}x faster)'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark writing the data of a sheet to JSON')
+    parser.add_argument('--num-columns', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--num-rows', type=int, default=100000)
+    parser.add_argument('--num-repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'orjson installed: {is_orjson_installed()}')
+    for num_columns in args.num_columns:
+        benchmark(num_columns, args.num_rows, args.num_repeats)
+
+
+if __name__ == '__main__':
+    main()
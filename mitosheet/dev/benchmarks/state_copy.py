@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks copying the State for a simple step that changes a single sheet, on
+wide sheets with column formats, conditional formats and graphs, comparing
+deep copying all of the metadata to the copy-on-write copy the State now makes.
+
+Run with:
+    python dev/benchmarks/state_copy.py --num-sheets 5 --num-columns 100 1000 5000
+"""
+import argparse
+import time
+from copy import deepcopy
+from typing import Any, Callable
+
+import pandas as pd
+
+from mitosheet.state import State
+
+
+def get_wide_state(num_sheets: int, num_columns: int, num_graphs: int) -> State:
+    dfs = [
+        pd.DataFrame({f'column_{column_index}': [1, 2, 3] for column_index in range(num_columns)})
+        for _ in range(num_sheets)
+    ]
+    state = State(dfs, 3)
+    for sheet_index in range(num_sheets):
+        column_ids = state.column_ids.get_column_ids(sheet_index)
+        state.df_formats[sheet_index]['columns'] = {
+            column_id: {'type': 'decimal', 'precision': 2} for column_id in column_ids
+        }
+        state.df_formats[sheet_index]['conditional_formats'] = [
+            {
+                'format_uuid': f'format_{column_id}',
+                'columnIDs': [column_id],
+                'filters': [{'condition': 'greater', 'value': 1}],
+                'invalidFilterColumnIDs': [],
+                'color': '#000000',
+                'backgroundColor': '#FFFFFF'
+            }
+            for column_id in column_ids
+        ]
+        for column_id in column_ids:
+            state.column_formulas[sheet_index][column_id] = [{
+                'frontend_formula': [{'type': 'string part', 'string': '=1'}],
+                'location': {'type': 'entire_column'},
+                'index': list(range(3))
+            }]
+    state.graph_data_array = [
+        {
+            'graph_id': f'graph_{graph_index}',
+            'graph_params': {'graphCreation': {'x_axis_column_ids': column_ids[:10]}},
+            'graph_output': {'graphHTML': '<div></div>' * 100}
+        }
+        for graph_index in range(num_graphs)
+    ]
+    return state
+
+
+def deep_copy_state(state: State) -> State:
+    """
+    How the State was copied before it used copy-on-write metadata.
+    """
+    return State(
+        [df.copy(deep=False) for df in state.dfs],
+        state.public_interface_version,
+        df_names=deepcopy(state.df_names),
+        df_sources=deepcopy(state.df_sources),
+        column_ids=deepcopy(state.column_ids),
+        column_formulas=deepcopy(state.column_formulas),
+        column_filters=deepcopy(state.column_filters),
+        df_formats=deepcopy(state.df_formats),
+        graph_data_array=deepcopy(state.graph_data_array),
+        user_defined_functions=deepcopy(state.user_defined_functions),
+        user_defined_importers=deepcopy(state.user_defined_importers),
+        user_defined_editors=deepcopy(state.user_defined_editors),
+    )
+
+
+def time_simple_step(state: State, copy_state: Callable[[State], Any], num_repeats: int) -> float:
+    """
+    Times a step that copies the state and then changes the metadata of
+    the first sheet, like a set column formula step does.
+    """
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        new_state = copy_state(state)
+        column_id = new_state.column_ids.get_column_ids(0)[0]
+        new_state.column_formulas[0][column_id] = []
+    return (time.perf_counter() - start) / num_repeats
+
+
+def benchmark(num_sheets: int, num_columns: int, num_graphs: int, num_repeats: int) -> None:
+    state = get_wide_state(num_sheets, num_columns, num_graphs)
+    deep_copy_time = time_simple_step(state, deep_copy_state, num_repeats)
+    copy_on_write_time = time_simple_step(state, lambda state: state.copy(), num_repeats)
+
+    print(
+        f'{num_sheets} sheets x {num_columns:>5} columns: deep copy {deep_copy_time * 1000:>9.3f} ms/step, '
+        f'copy-on-write {copy_on_write_time * 1000:>8.3f} ms/step ({deep_copy_time / copy_on_write_time:.0f}x faster)'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark copying the State for a simple step')
+    parser.add_argument('--num-sheets', type=int, default=5)
+    parser.add_argument('--num-columns', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--num-graphs', type=int, default=10)
+    parser.add_argument('--num-repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    for num_columns in args.num_columns:
+        benchmark(args.num_sheets, num_columns, args.num_graphs, args.num_repeats)
+
+
+if __name__ == '__main__':
+    main()
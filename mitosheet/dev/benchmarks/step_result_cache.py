@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks replaying a saved analysis, like every rerun of an app does, comparing
+replaying it without the step result cache to replaying it once the cache is warm.
+
+Run with:
+    python dev/benchmarks/step_result_cache.py --num-rows 10000 1000000
+"""
+import argparse
+import os
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.enterprise.mito_config import (MITO_CONFIG_STEP_RESULT_CACHE_SIZE,
+                                              MITO_CONFIG_VERSION, MitoConfig)
+from mitosheet.saved_analyses.save_utils import get_steps_obj_for_saved_analysis
+from mitosheet.step_result_cache import get_step_result_cache
+from mitosheet.steps_manager import StepsManager
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def get_df(num_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'A': np.arange(num_rows),
+        'B': np.random.default_rng(0).random(num_rows),
+        'C': [str(i % 100) for i in range(num_rows)],
+    })
+
+
+def get_steps_data(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    mito = create_mito_wrapper(df)
+    for index in range(5):
+        mito.set_formula(f'=A * B + {index}', 0, f'D{index}', add_column=True)
+    mito.sort(0, 'B', 'descending')
+    mito.pivot_sheet(0, ['C'], [], {'B': ['sum', 'mean']})
+    return get_steps_obj_for_saved_analysis(mito.mito_backend.steps_manager.steps_including_skipped[1:])
+
+
+def time_replay(df: pd.DataFrame, steps_data: List[Dict[str, Any]], mito_config: MitoConfig) -> float:
+    steps_manager = StepsManager([df], mito_config)
+    start = time.perf_counter()
+    steps_manager.execute_steps_data(new_steps_data=steps_data)
+    return time.perf_counter() - start
+
+
+def benchmark(num_rows: int, cache_size: str) -> None:
+    df = get_df(num_rows)
+    steps_data = get_steps_data(df)
+
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE] = cache_size
+    cache_mito_config = MitoConfig()
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE]
+
+    step_result_cache = get_step_result_cache(cache_mito_config)
+    assert step_result_cache is not None
+    step_result_cache.clear()
+
+    no_cache_time = time_replay(df, steps_data, MitoConfig())
+    cold_cache_time = time_replay(df, steps_data, cache_mito_config)
+    warm_cache_time = time_replay(df, steps_data, cache_mito_config)
+
+    print(
+        f'{num_rows:>8} rows: no cache {no_cache_time * 1000:>9.1f} ms, cold cache {cold_cache_time * 1000:>9.1f} ms, '
+        f'warm cache {warm_cache_time * 1000:>8.1f} ms ({no_cache_time / warm_cache_time:.1f}x faster, '
+        f'hit rate {step_result_cache.hit_rate:.2f})'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark replaying a saved analysis with the step result cache')
+    parser.add_argument('--num-rows', type=int, nargs='+', default=[10000, 1000000])
+    parser.add_argument('--cache-size', type=str, default='2000', help='The size of the cache in MB')
+    args = parser.parse_args()
+
+    for num_rows in args.num_rows:
+        benchmark(num_rows, args.cache_size)
+
+
+if __name__ == '__main__':
+    main()
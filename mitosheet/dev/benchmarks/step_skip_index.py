@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks finding the skipped steps in long analyses, comparing recomputing
+them from all the steps on every edit to the StepSkipIndex the steps manager 
+keeps up to date as steps are added and removed.
+
+Run with:
+    python dev/benchmarks/step_skip_index.py --num-steps 1000 2000 4000
+"""
+import argparse
+import random
+import time
+from typing import List, Set
+
+from mitosheet.step import Step
+from mitosheet.step_skip_index import StepSkipIndex
+from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE
+
+
+def get_step_indexes_to_skip_by_scanning(step_list: List[Step]) -> Set[int]:
+    """
+    How the skipped steps were found before the StepSkipIndex, by comparing
+    every step to all the steps before it.
+    """
+    step_indexes_to_skip: Set[int] = set()
+    for step_index, step in enumerate(step_list):
+        step_indexes_to_skip = step_indexes_to_skip.union(
+            step.step_indexes_to_skip(step_list[:step_index])
+        )
+    return step_indexes_to_skip
+
+
+def get_random_steps(num_steps: int, seed: int) -> List[Step]:
+    """
+    Returns a mix of the steps that users most often create, including filters,
+    formulas and pivot tables that overwrite the steps before them.
+    """
+    rng = random.Random(seed)
+    steps = [Step('initialize', 'initialize', {})]
+    pivot_step_ids = [f'pivot_{index}' for index in range(5)]
+    while len(steps) < num_steps:
+        choice = rng.random()
+        if choice < 0.3:
+            steps.append(Step('filter_column', f'step_{len(steps)}', {
+                'sheet_index': rng.randrange(3), 'column_id': f'column_{rng.randrange(10)}', 'operator': 'And', 'filters': []
+            }))
+        elif choice < 0.7:
+            steps.append(Step('set_column_formula', f'step_{len(steps)}', {
+                'sheet_index': rng.randrange(3), 'column_id': f'column_{rng.randrange(10)}', 'formula_label': 0, 'new_formula': '=1', 
+                'index_labels_formula_is_applied_to': {'type': FORMULA_ENTIRE_COLUMN_TYPE}, 'public_interface_version': 3
+            }))
+        elif choice < 0.8:
+            steps.append(Step('pivot', rng.choice(pivot_step_ids), {'sheet_index': 0}))
+        else:
+            steps.append(Step('add_column', f'step_{len(steps)}', {'sheet_index': rng.randrange(3), 'column_header': f'new_{len(steps)}', 'column_header_index': -1}))
+    return steps
+
+
+def benchmark(num_steps: int, num_edits: int, seed: int) -> None:
+    steps = get_random_steps(num_steps + num_edits, seed)
+    starting_steps, edits = steps[:num_steps], steps[num_steps:]
+
+    # Recompute the skipped steps from scratch after every edit
+    start = time.perf_counter()
+    for edit_index in range(len(edits)):
+        scanned_skipped_step_indexes = get_step_indexes_to_skip_by_scanning(starting_steps + edits[:edit_index + 1])
+    scanning_time = (time.perf_counter() - start) / num_edits
+
+    # Keep the index up to date as the edits are made, like the steps manager does 
+    skip_index = StepSkipIndex(starting_steps)
+    start = time.perf_counter()
+    for edit_index in range(len(edits)):
+        skip_index.sync(starting_steps + edits[:edit_index + 1])
+        indexed_skipped_step_indexes = skip_index.get_step_indexes_to_skip()
+    index_time = (time.perf_counter() - start) / num_edits
+
+    assert scanned_skipped_step_indexes == indexed_skipped_step_indexes
+
+    print(
+        f'{num_steps:>6} steps: scanning {scanning_time * 1000:>9.3f} ms/edit, '
+        f'skip index {index_time * 1000:>7.3f} ms/edit ({scanning_time / index_time:.0f}x faster)'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark finding the skipped steps in long analyses')
+    parser.add_argument('--num-steps', type=int, nargs='+', default=[250, 1000, 2000])
+    parser.add_argument('--num-edits', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for num_steps in args.num_steps:
+        benchmark(num_steps, args.num_edits, args.seed)
+
+
+if __name__ == '__main__':
+    main()
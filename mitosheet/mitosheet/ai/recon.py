@@ -1,7 +1,7 @@
 import ast
 from collections import Counter
 from copy import copy
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
@@ -16,6 +16,7 @@ from mitosheet.step_performers.dataframe_steps.dataframe_delete import \
     delete_dataframe_from_state
 from mitosheet.types import (AITransformFrontendResult, ColumnHeader, ColumnID,
                              DataframeReconData, ModifiedDataframeReconData)
+from mitosheet.utils import is_pandas_copy_on_write_enabled
 
 def is_df_changed(old: pd.DataFrame, new: pd.DataFrame) -> bool:
     try:
@@ -53,7 +54,8 @@ def exec_for_recon(code: str, original_df_map: Dict[str, pd.DataFrame]) -> Dataf
             'prints': ''
         }
 
-    df_map = {df_name: df.copy(deep=True) for df_name, df in original_df_map.items()}
+    deep_copy = not is_pandas_copy_on_write_enabled()
+    df_map = {df_name: df.copy(deep=deep_copy) for df_name, df in original_df_map.items()}
     locals_before = copy(locals())
     try:
         ast_before = ast.parse(code)
@@ -165,9 +167,20 @@ def is_possibly_null_column_header_in_column_headers_with_no_nans(column_header:
     return is_null_column_header_in_column_headers(column_header, column_headers_with_no_nans)
 
 
+def _get_column_headers_for_lookup(column_headers: List[ColumnHeader]) -> Collection[ColumnHeader]:
+    """
+    Returns a set of the column headers if they are hashable, so that checking if 
+    a column header is in them is fast on wide dataframes. 
+    """
+    try:
+        return set(column_headers)
+    except TypeError:
+        return column_headers
+
+
 def get_added_column_headers(old_column_headers: List[ColumnHeader], new_column_headers: Iterable[ColumnHeader]) -> List[ColumnHeader]:
 
-    old_non_null = list(filter(lambda ch: not pd.isna(ch), old_column_headers))
+    old_non_null = _get_column_headers_for_lookup(list(filter(lambda ch: not pd.isna(ch), old_column_headers)))
     new_non_null = list(filter(lambda ch: not pd.isna(ch), new_column_headers))
     added_non_null = list(filter(lambda ch: ch not in old_non_null, new_non_null))
 
@@ -179,7 +192,7 @@ def get_added_column_headers(old_column_headers: List[ColumnHeader], new_column_
 
 def get_shared_column_headers(old_column_headers: List[ColumnHeader], new_column_headers: Iterable[ColumnHeader]) -> List[ColumnHeader]:
 
-    old_non_null = list(filter(lambda ch: not pd.isna(ch), old_column_headers))
+    old_non_null = _get_column_headers_for_lookup(list(filter(lambda ch: not pd.isna(ch), old_column_headers)))
     new_non_null = list(filter(lambda ch: not pd.isna(ch), new_column_headers))
     shared_non_null = list(filter(lambda ch: ch in old_non_null, new_non_null))
 
@@ -190,11 +203,39 @@ def get_shared_column_headers(old_column_headers: List[ColumnHeader], new_column
     return shared_non_null + shared_null
 
 
-def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame) -> ModifiedDataframeReconData:
+def is_column_data_shared(old_column: pd.Series, new_column: pd.Series) -> bool:
+    """
+    Returns True if the two columns are backed by the same data in memory, in which case 
+    they must be equal. This is much faster than comparing them, and is true of most columns
+    after a step executes, as steps share the columns they do not modify with the previous state.
+    """
+    # NOTE: we use _values, as unlike to_numpy, it never copies the data of the column
+    old_values = old_column._values
+    new_values = new_column._values
+    if old_values is new_values:
+        return True
+
+    if isinstance(old_values, np.ndarray) and isinstance(new_values, np.ndarray):
+        return old_values.dtype == new_values.dtype \
+            and old_values.shape == new_values.shape \
+            and old_values.strides == new_values.strides \
+            and old_values.__array_interface__['data'][0] == new_values.__array_interface__['data'][0]
+
+    return False
+
+
+def get_modified_dataframe_recon_data(
+        old_df: pd.DataFrame, 
+        new_df: pd.DataFrame,
+        modified_column_headers: Optional[Collection[ColumnHeader]]=None
+    ) -> ModifiedDataframeReconData:
     """
     Given a dataframe and a modified dataframe, this function tries to figure out what has happened
     to column headers dataframe. Specifically, because our state maps column headers to do others based on column
     id, we need to track which columns are added, which are removed, and which are renamed.
+
+    If the caller knows which of the columns it may have changed the values of, it can pass these as the
+    modified_column_headers, and the values of no other shared columns are compared. 
     """
 
     old_columns = old_df.columns.to_list()
@@ -210,9 +251,6 @@ def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame
             error_modal=False
         )
 
-    old_df_head = old_df.head(5)
-    new_df_head = new_df.head(5)
-
     rows_added_or_removed = len(old_df) != len(new_df)
 
     # First, preserving the order, we remove any columns that are in both the old
@@ -224,32 +262,45 @@ def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame
     # by comparing to see of column are identical between the two values. We do this 
     # just by checking the first 5 values of the dataframe, before doing a direct comparison
     renamed_columns: Dict[ColumnHeader, ColumnHeader] = {}
-    for old_ch in old_columns_without_shared:
-        old_column = old_df_head[old_ch]
-        for new_ch in new_columns_without_shared:
-            new_column = new_df_head[new_ch]
-            if old_column.equals(new_column) and new_ch not in renamed_columns.values():
-                renamed_columns[old_ch] = new_ch
+    if len(old_columns_without_shared) > 0 and len(new_columns_without_shared) > 0:
+        old_df_head = old_df.head(5)
+        new_df_head = new_df.head(5)
+        for old_ch in old_columns_without_shared:
+            old_column = old_df_head[old_ch]
+            for new_ch in new_columns_without_shared:
+                new_column = new_df_head[new_ch]
+                if old_column.equals(new_column) and new_ch not in renamed_columns.values():
+                    renamed_columns[old_ch] = new_ch
 
     added_columns = [ch for ch in new_columns_without_shared if not is_possibly_null_column_header_in_column_headers_with_no_nans(ch, renamed_columns.values())]
     removed_columns = [ch for ch in old_columns_without_shared if not is_possibly_null_column_header_in_column_headers_with_no_nans(ch, renamed_columns)]
 
     shared_columns = get_shared_column_headers(old_columns, new_columns)
 
+    if modified_column_headers is not None:
+        modified_column_headers_lookup = _get_column_headers_for_lookup(list(modified_column_headers))
+        shared_columns = [ch for ch in shared_columns if ch in modified_column_headers_lookup]
+
     if not rows_added_or_removed:
-        modified_columns = [ch for ch in shared_columns if not old_df[ch].equals(new_df[ch])]
+        # If the index did not change, then any column that is still backed by the same data is not modified
+        index_unchanged = old_df.index is new_df.index or old_df.index.equals(new_df.index)
+        modified_columns = [
+            ch for ch in shared_columns 
+            if not (index_unchanged and is_column_data_shared(old_df[ch], new_df[ch])) and not old_df[ch].equals(new_df[ch])
+        ]
     else:
         # If rows were added or removed, then we don't want to detect every column as having changed
         # and instead we'd just like to report the row changes. As such, we only compare the rows not added or removed
         # NOTE: this is not perfect, as you may have modified columns and removed rows in one go -- but this 
         # is ok for most of what we see
         try:
+            # We only realign the columns that we compare
             if len(old_df) < len(new_df):
-                df1 = old_df
-                df2 = new_df.loc[old_df.index]
+                df1 = old_df[shared_columns]
+                df2 = new_df[shared_columns].loc[old_df.index]
             else:
-                df1 = old_df.loc[new_df.index]
-                df2 = new_df
+                df1 = old_df[shared_columns].loc[new_df.index]
+                df2 = new_df[shared_columns]
 
             modified_columns = [ch for ch in shared_columns if not df1[ch].equals(df2[ch])]
         except IndexError:
@@ -287,13 +338,17 @@ def update_state_by_reconing_dataframes(
         sheet_index: int, 
         old_df: pd.DataFrame,
         new_df: pd.DataFrame,
-        column_headers_to_column_ids: Optional[Dict[ColumnHeader, ColumnID]]=None
+        column_headers_to_column_ids: Optional[Dict[ColumnHeader, ColumnID]]=None,
+        modified_column_ids: Optional[Collection[ColumnID]]=None
     ) -> Tuple[State, ModifiedDataframeReconData]:
     """
     This function is the work-horse for modified dataframes. It compares the old dataframe at the index 
     to the new dataframe, and then updates the state accordingly -- making sure all the metadata is correct.
 
     This includes: handling deleted columns, added columns, renamed columns, and modified columns.
+
+    If the modified_column_ids are passed, only these columns are checked for modifications. 
+    See StepPerformer.get_modified_column_ids.
     """
     # Check there aren't any duplicated columns in the new dataframe
     c = Counter(new_df.columns)
@@ -302,7 +357,12 @@ def update_state_by_reconing_dataframes(
         if count > 1:
             raise make_column_exists_error(ch)
 
-    modified_dataframe_recon = get_modified_dataframe_recon_data(old_df, new_df)
+    modified_column_headers = [
+        state.column_ids.get_column_header_by_id(sheet_index, column_id) for column_id in modified_column_ids
+        if column_id in state.column_ids.column_id_to_column_header[sheet_index]
+    ] if modified_column_ids is not None else None
+
+    modified_dataframe_recon = get_modified_dataframe_recon_data(old_df, new_df, modified_column_headers=modified_column_headers)
 
     # Add new columns to the state
     if len(modified_dataframe_recon['column_recon']['created_columns']) > 0:
@@ -328,6 +388,28 @@ def update_state_by_reconing_dataframes(
     return state, modified_dataframe_recon
 
 
+def get_changed_column_ids(state: State, sheet_index: int, modified_dataframe_recon: ModifiedDataframeReconData) -> Optional[List[ColumnID]]:
+    """
+    Given the state after update_state_by_reconing_dataframes, returns the ids of the columns
+    in the sheet that were added, modified or renamed. The deleted columns are no longer in
+    the sheet.
+
+    If rows were added or removed, the recon does not report every modified column, and
+    so this returns None, as any column may have changed.
+    """
+    if modified_dataframe_recon['num_added_or_removed_rows'] != 0:
+        return None
+
+    column_recon = modified_dataframe_recon['column_recon']
+    changed_column_headers = column_recon['created_columns'] + column_recon['modified_columns'] + list(column_recon['renamed_columns'].values())
+
+    column_header_to_column_id = state.column_ids.column_header_to_column_id[sheet_index]
+    if any(column_header not in column_header_to_column_id for column_header in changed_column_headers):
+        return None
+
+    return state.column_ids.get_column_ids_by_headers(sheet_index, changed_column_headers)
+
+
 def exec_and_get_new_state_and_result(state: State, code: str) -> Tuple[State, Optional[Any], AITransformFrontendResult]:
 
     # Fix up the code, so we can ensure that we execute it properly
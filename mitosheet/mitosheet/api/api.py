@@ -32,6 +32,7 @@ from mitosheet.api.get_parameterizable_params import get_parameterizable_params
 from mitosheet.api.get_params import get_params
 from mitosheet.api.get_path_contents import get_path_contents
 from mitosheet.api.get_path_join import get_path_join
+from mitosheet.api.get_performance_report import get_performance_report
 from mitosheet.api.get_pr_url_of_new_pr import get_pr_url_of_new_pr
 from mitosheet.api.get_render_count import get_render_count
 from mitosheet.api.get_search_matches import get_search_matches
@@ -43,6 +44,8 @@ from mitosheet.api.get_validate_snowflake_credentials import \
     get_validate_snowflake_credentials
 from mitosheet.saved_analyses.save_utils import read_analysis
 from mitosheet.steps_manager import StepsManager
+from mitosheet.api.get_rows_window import get_rows_window
+from mitosheet.api.get_columns_window import get_columns_window
 # AUTOGENERATED LINE: API.PY IMPORT (DO NOT DELETE)
 from mitosheet.telemetry.telemetry_utils import log_event_processed
 from mitosheet.types import MitoWidgetType
@@ -239,6 +242,12 @@ def handle_api_event(
             result = get_pr_url_of_new_pr(params, steps_manager)
         elif event["type"] == "get_saved_analysis_code":
             result = get_saved_analysis_code(params, steps_manager)
+        elif event["type"] == "get_performance_report":
+            result = get_performance_report(params, steps_manager)
+        elif event["type"] == "get_rows_window":
+            result = get_rows_window(params, steps_manager)
+        elif event["type"] == "get_columns_window":
+            result = get_columns_window(params, steps_manager)
         # AUTOGENERATED LINE: API.PY CALL (DO NOT DELETE)
         else:
             raise Exception(f"Event: {event} is not a valid API call")
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+from typing import Any, Dict
+
+from mitosheet.api.get_rows_window import get_rows_window
+from mitosheet.types import StepsManagerType
+from mitosheet.utils import MAX_ROWS
+
+
+def get_columns_window(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Returns the data of the columns from start_column up to end_column of the sheet at 
+    sheet_index, so that the frontend can display the columns past the first MAX_COLUMNS 
+    columns, which have no data in the sheet data, as the user scrolls to them.
+
+    Optionally takes a start_row and end_row, and otherwise returns the first MAX_ROWS
+    rows. The result is in the same format as get_rows_window.
+    """
+    return get_rows_window(
+        {
+            'sheet_index': params['sheet_index'],
+            'start_row': params.get('start_row', 0),
+            'end_row': params.get('end_row', MAX_ROWS),
+            'start_column': params['start_column'],
+            'end_column': params['end_column'],
+        },
+        steps_manager
+    )
@@ -9,9 +9,10 @@ from mitosheet.types import StepsManagerType
 
 def get_dataframe_as_csv(params: Dict[str, Any], steps_manager: StepsManagerType) -> str:
     """
-    Sends a dataframe as a CSV string
+    Sends a dataframe as a CSV string. In preview mode, this is the full
+    dataframe rather than the sample displayed in the sheet.
     """
     sheet_index = params['sheet_index']
-    df = steps_manager.dfs[sheet_index]
+    df = steps_manager.get_full_data_state().dfs[sheet_index]
 
     return df.to_csv(index=False)
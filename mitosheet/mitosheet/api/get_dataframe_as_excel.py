@@ -15,7 +15,8 @@ from mitosheet.utils import write_to_excel
 
 def get_dataframe_as_excel(params: Dict[str, Any], steps_manager: StepsManagerType) -> str:
     """
-    Sends a dataframe as a excel string.
+    Sends a dataframe as a excel string. In preview mode, these are the full
+    dataframes rather than the samples displayed in the sheet.
     """
     sheet_indexes = params['sheet_indexes']
 
@@ -26,7 +27,8 @@ def get_dataframe_as_excel(params: Dict[str, Any], steps_manager: StepsManagerTy
     # We write to a buffer so that we don't have to save the file
     # to the file system for no reason
     buffer = io.BytesIO()
-    write_to_excel(buffer, sheet_indexes, steps_manager.curr_step.post_state, allow_formatting=allow_formatting)    
+    state = steps_manager.get_full_data_state() if steps_manager.is_preview else steps_manager.curr_step.post_state
+    write_to_excel(buffer, sheet_indexes, state, allow_formatting=allow_formatting)    
     # Go back to the start of the buffer
     buffer.seek(0)
     
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+from typing import Any, Dict
+from mitosheet.comm_compression import comm_compression_metrics
+from mitosheet.pro.conditional_formatting_utils import conditional_formatting_cache
+from mitosheet.step import Step, get_step_memory_usage
+from mitosheet.transpiler.compiled_code_cache import compiled_code_cache
+from mitosheet.types import StepsManagerType
+
+
+def get_step_performance_report(step: Step, step_idx: int, skipped: bool) -> Dict[str, Any]:
+    """
+    Returns the memory and time accounting for a single step. Times are in seconds,
+    and are None if that part of the work has not happened for this step yet, or 
+    if the step does not record it.
+    """
+    # Steps that have their states evicted from memory do not retain anything
+    bytes_retained = 0 if step.states_evicted else get_step_memory_usage(step)
+    execution_data: Dict[str, Any] = step.execution_data if step.execution_data is not None else {}
+
+    return {
+        'step_id': step.step_id,
+        'step_idx': step_idx,
+        'step_type': step.step_type,
+        'skipped': skipped,
+        'states_evicted': step.states_evicted,
+        'bytes_retained': bytes_retained,
+        'execution_time': step.execution_time,
+        'pandas_processing_time': execution_data.get('pandas_processing_time', None),
+        'recon_time': execution_data.get('recon_time', None),
+        'serialization_time': step.serialization_time,
+        'transpile_time': step.transpile_time,
+    }
+
+
+def get_performance_report(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Returns the bytes of dataframes that each step retains, and the time that was
+    spent executing, reconing, serializing and transpiling it, so that it is possible 
+    to find which steps in an analysis are using the most resources.
+    """
+    skipped_step_indexes = steps_manager.step_skip_index.get_step_indexes_to_skip()
+
+    step_performance_reports = [
+        get_step_performance_report(step, step_idx, step_idx in skipped_step_indexes)
+        for step_idx, step in enumerate(steps_manager.steps_including_skipped)
+    ]
+
+    step_result_cache = steps_manager.step_result_cache
+
+    return {
+        'steps': step_performance_reports,
+        'total_bytes_retained': sum(report['bytes_retained'] for report in step_performance_reports),
+        'step_state_eviction_count': steps_manager.step_state_eviction_count,
+        'step_state_recompute_count': steps_manager.step_state_recompute_count,
+        'step_state_spill_count': steps_manager.step_state_spill_count,
+        'step_state_load_count': steps_manager.step_state_load_count,
+        'compiled_code_cache_hits': compiled_code_cache.hits,
+        'compiled_code_cache_misses': compiled_code_cache.misses,
+        'sheet_data_cache_hits': steps_manager.sheet_data_cache.hits,
+        'sheet_data_cache_misses': steps_manager.sheet_data_cache.misses,
+        'conditional_formatting_cache_hits': conditional_formatting_cache.hits,
+        'conditional_formatting_cache_misses': conditional_formatting_cache.misses,
+        # These count the messages sent over comms that compress large messages, see mitosheet/comm_compression.py
+        'comm_num_messages': comm_compression_metrics.num_messages,
+        'comm_num_compressed_messages': comm_compression_metrics.num_compressed_messages,
+        'comm_raw_bytes': comm_compression_metrics.raw_bytes,
+        'comm_sent_bytes': comm_compression_metrics.sent_bytes,
+        'comm_compression_ratio': comm_compression_metrics.compression_ratio,
+        'comm_encode_time': comm_compression_metrics.encode_time,
+        # These are None if the step result cache is not turned on in the mito_config
+        'step_result_cache_hits': step_result_cache.hits if step_result_cache is not None else None,
+        'step_result_cache_misses': step_result_cache.misses if step_result_cache is not None else None,
+        'step_result_cache_hit_rate': step_result_cache.hit_rate if step_result_cache is not None else None,
+    }
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+from typing import Any, Dict
+
+from mitosheet.types import StepsManagerType
+from mitosheet.utils import MAX_COLUMNS, MAX_ROWS, get_rows_window_json_dumpsable
+
+
+def get_rows_window(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Returns the data of the rows from start_row up to end_row of the sheet at sheet_index,
+    so that the frontend can display rows past the first MAX_ROWS rows that are in the
+    sheet data, as the user scrolls to them.
+
+    Optionally takes a start_column and end_column, in which case only the columns in
+    this window are returned. At most MAX_ROWS rows and MAX_COLUMNS columns are returned.
+    """
+    sheet_index = params['sheet_index']
+    start_row = params['start_row']
+    end_row = params['end_row']
+    start_column = params.get('start_column', 0)
+    end_column = params.get('end_column', None)
+
+    num_rows, num_columns = steps_manager.dfs[sheet_index].shape
+
+    start_row = min(max(start_row, 0), num_rows)
+    end_row = min(max(end_row, start_row), start_row + MAX_ROWS, num_rows)
+    start_column = min(max(start_column, 0), num_columns)
+    end_column = num_columns if end_column is None else end_column
+    end_column = min(max(end_column, start_column), start_column + MAX_COLUMNS, num_columns)
+
+    return get_rows_window_json_dumpsable(
+        steps_manager.curr_step.final_defined_state,
+        sheet_index,
+        start_row,
+        end_row,
+        start_column,
+        end_column
+    )
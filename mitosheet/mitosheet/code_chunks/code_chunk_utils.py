@@ -6,7 +6,8 @@
 
 
 from copy import copy
-from typing import TYPE_CHECKING, List, Optional, Any, Type
+from time import perf_counter
+from typing import TYPE_CHECKING, List, Optional, Any, Set, Type
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.column_steps.delete_column_code_chunk import DeleteColumnsCodeChunk
 from mitosheet.code_chunks.step_performers.filter_code_chunk import FilterCodeChunk
@@ -19,16 +20,19 @@ else:
     Step = Any
     
 
-def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChunk]:
+def get_code_chunks(all_steps: List[Step], optimize: bool=True, step_indexes_to_skip: Optional[Set[int]]=None) -> List[CodeChunk]:
     """
     A utility for taking all the steps in the steps manager, and returning a list
     of CodeChunks that correspond to these steps. 
 
     optimize is by default True, which results in these CodeChunks being optimized
     down to the smallest possible list of CodeChunks that implements the same ops.
+
+    If the step_indexes_to_skip are not passed, they are computed from all_steps.
     """
-    from mitosheet.steps_manager import get_step_indexes_to_skip
-    step_indexes_to_skip = get_step_indexes_to_skip(all_steps)
+    if step_indexes_to_skip is None:
+        from mitosheet.steps_manager import get_step_indexes_to_skip
+        step_indexes_to_skip = get_step_indexes_to_skip(all_steps)
 
     all_code_chunks: List[CodeChunk] = []
     for step_index, step in enumerate(all_steps):
@@ -36,11 +40,14 @@ def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChun
         if step.step_type == 'initialize' or step_index in step_indexes_to_skip:
             continue
 
+        prev_state = step.prev_state
+        transpile_start_time = perf_counter()
         all_code_chunks.extend(step.step_performer.transpile(
-            step.prev_state, # type: ignore
+            prev_state, # type: ignore
             step.params,
             step.execution_data,
         ))
+        step.transpile_time = perf_counter() - transpile_start_time
 
     if optimize:
         code_chunks_list = optimize_code_chunks(all_code_chunks)
@@ -7,11 +7,15 @@
 
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.errors import MitoError
-from mitosheet.state import State
+from mitosheet.state import ENGINE_POLARS, State
 from mitosheet.transpiler.transpile_utils import (
-    get_column_header_list_as_transpiled_code, get_column_header_as_transpiled_code)
+    NEWLINE_TAB, get_column_header_list_as_transpiled_code, get_column_header_as_transpiled_code)
 from mitosheet.types import ColumnID, ColumnHeader
 
 LOOKUP = 'lookup'
@@ -19,6 +23,83 @@ UNIQUE_IN_LEFT = 'unique in left'
 UNIQUE_IN_RIGHT = 'unique in right'
 
 
+# The merges that we execute with polars when using the polars engine
+POLARS_JOIN_HOWS = ['inner', 'left', LOOKUP, UNIQUE_IN_LEFT, UNIQUE_IN_RIGHT]
+# The numpy dtype kinds (bool, int, float, datetime and timedelta) of the columns that come back 
+# from polars with the same dtype and values. Other columns (e.g. nullable ints or categoricals) 
+# come back with a different dtype
+POLARS_MERGE_DTYPE_KINDS = 'biufmM'
+# For rows of the first dataframe without a match, pandas fills the columns of the second dataframe
+# with NaN, and polars with null. These are the same for numeric and datetime columns, but pandas 
+# makes bool columns into objects with NaN, where polars gives None
+POLARS_UNMATCHED_DTYPE_KINDS = 'iufmM'
+
+
+def is_polars_round_trip_exact(series: pd.Series) -> bool:
+    """
+    Returns True if converting the series to polars and back to pandas gives the 
+    same dtype and values. Object columns are only the same if they are strings, 
+    where any missing values are None, as polars turns NaN into None.
+    """
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype):
+        return False
+    if dtype == object:
+        return infer_dtype(series, skipna=True) == 'string' and all(value is None for value in series[series.isna()])
+    return dtype.kind in POLARS_MERGE_DTYPE_KINDS
+
+
+def get_polars_merge_code(
+        new_df_name: str,
+        how: str,
+        df_one_name: str,
+        df_two_name: str,
+        column_headers_one: List[ColumnHeader],
+        column_headers_two: List[ColumnHeader],
+        merge_keys_one: List[ColumnHeader],
+        merge_keys_two: List[ColumnHeader],
+        suffix_one: str,
+        suffix_two: str,
+    ) -> Optional[List[str]]:
+    """
+    Returns code that merges the two dataframes with a lazy polars join, which
+    gives the same result as the pandas merge. Returns None if the merge cannot
+    be done with polars, in which case it should be done with pandas.
+
+    NOTE: unlike pandas, polars does not match null merge keys to each other, so 
+    this should only be used when the merge keys have no null values.
+    """
+    # Polars requires string column headers
+    if how not in POLARS_JOIN_HOWS or not all(isinstance(ch, str) for ch in column_headers_one + column_headers_two):
+        return None
+
+    keys_one = get_column_header_list_as_transpiled_code(merge_keys_one)
+    keys_two = get_column_header_list_as_transpiled_code(merge_keys_two)
+
+    # Keeping only the rows without a match is an anti join
+    if how == UNIQUE_IN_LEFT:
+        return [f'{new_df_name} = pl.from_pandas({df_one_name}).lazy().join(pl.from_pandas({df_two_name}[{keys_two}]).lazy(), left_on={keys_one}, right_on={keys_two}, how="anti").collect().to_pandas()']
+    if how == UNIQUE_IN_RIGHT:
+        return [f'{new_df_name} = pl.from_pandas({df_two_name}).lazy().join(pl.from_pandas({df_one_name}[{keys_one}]).lazy(), left_on={keys_two}, right_on={keys_one}, how="anti").collect().to_pandas()']
+
+    # Polars only keeps one of the merge keys, which is the same as pandas when they have the same header
+    if merge_keys_one != merge_keys_two:
+        return None
+
+    # Pandas adds the suffixes to the columns that are in both dataframes, so we rename them first
+    shared_column_headers = [ch for ch in column_headers_one if ch in column_headers_two and ch not in merge_keys_one]
+    rename_one = f'.rename({ {ch: f"{ch}_{suffix_one}" for ch in shared_column_headers} })' if len(shared_column_headers) > 0 else ''
+    rename_two = f'.rename({ {ch: f"{ch}_{suffix_two}" for ch in shared_column_headers} })' if len(shared_column_headers) > 0 else ''
+
+    # A lookup only returns the first match from the second dataframe
+    unique_two = f'.unique(subset={keys_two}, keep="first", maintain_order=True)' if how == LOOKUP else ''
+    how_to_use = 'left' if how == LOOKUP else how
+
+    return [
+        f'{new_df_name} = pl.from_pandas({df_one_name}).lazy(){rename_one}.join({NEWLINE_TAB}pl.from_pandas({df_two_name}).lazy(){unique_two}{rename_two},{NEWLINE_TAB}on={keys_one},{NEWLINE_TAB}how="{how_to_use}",{NEWLINE_TAB}maintain_order="left"\n).collect().to_pandas()'
+    ]
+
+
 class MergeCodeChunk(CodeChunk):
 
 
@@ -149,6 +230,12 @@ class MergeCodeChunk(CodeChunk):
 
         # Now, we build the merge code 
         merge_code = []
+
+        # With the polars engine, we drop the columns we don't need and merge with polars
+        if self.prev_state.engine == ENGINE_POLARS:
+            polars_merge_code = self._get_polars_merge_code(merge_keys_one, merge_keys_two, selected_column_headers_one, selected_column_headers_two)
+            if polars_merge_code is not None:
+                return polars_merge_code, ['import polars as pl']
         if self.how == 'lookup':
             # If the mege is a lookup, then we add the drop duplicates code
             temp_df_name = 'temp_df'
@@ -200,6 +287,72 @@ class MergeCodeChunk(CodeChunk):
         # And then return it
         return merge_code, []
 
+    def _get_polars_merge_code(
+            self, 
+            merge_keys_one: List[ColumnHeader], 
+            merge_keys_two: List[ColumnHeader], 
+            selected_column_headers_one: List[ColumnHeader],
+            selected_column_headers_two: List[ColumnHeader]
+        ) -> Optional[List[str]]:
+        """
+        With the polars engine, we only execute merges with polars when polars gives the same
+        result as pandas. Otherwise, we return None and fall back to pandas.
+        """
+        # We insist column names are unique in dataframes, so we default the suffixes to be the dataframe names
+        suffix_one = self.df_one_name
+        suffix_two = self.df_two_name if self.df_two_name != self.df_one_name else f'{self.df_two_name}_2'
+
+        # We only select the columns we need from each dataframe, in their original order
+        column_headers_one = [ch for ch in self.prev_state.dfs[self.sheet_index_one].columns if ch in selected_column_headers_one or ch in merge_keys_one]
+        column_headers_two = [ch for ch in self.prev_state.dfs[self.sheet_index_two].columns if ch in selected_column_headers_two or ch in merge_keys_two]
+        if not self._can_use_polars(merge_keys_one, merge_keys_two, column_headers_one, column_headers_two):
+            return None
+
+        all_column_headers_one = len(column_headers_one) == len(self.prev_state.dfs[self.sheet_index_one].columns)
+        all_column_headers_two = len(column_headers_two) == len(self.prev_state.dfs[self.sheet_index_two].columns)
+        df_one_to_merge = self.df_one_name if all_column_headers_one else f'{self.df_one_name}[{get_column_header_list_as_transpiled_code(column_headers_one)}]'
+        df_two_to_merge = self.df_two_name if all_column_headers_two else f'{self.df_two_name}[{get_column_header_list_as_transpiled_code(column_headers_two)}]'
+
+        return get_polars_merge_code(
+            self.new_df_name, self.how, df_one_to_merge, df_two_to_merge, column_headers_one, column_headers_two, 
+            merge_keys_one, merge_keys_two, suffix_one, suffix_two
+        )
+
+    def _can_use_polars(
+            self, 
+            merge_keys_one: List[ColumnHeader], 
+            merge_keys_two: List[ColumnHeader], 
+            column_headers_one: List[ColumnHeader],
+            column_headers_two: List[ColumnHeader]
+        ) -> bool:
+        """
+        Polars does not match null merge keys to each other, and does not round trip every column 
+        exactly, so we only merge with polars when the merge keys have no nulls and the same dtypes, 
+        and every column comes back from polars unchanged.
+        """
+        df_one = self.prev_state.dfs[self.sheet_index_one]
+        df_two = self.prev_state.dfs[self.sheet_index_two]
+
+        for merge_key_one, merge_key_two in zip(merge_keys_one, merge_keys_two):
+            if df_one[merge_key_one].dtype != df_two[merge_key_two].dtype or df_one[merge_key_one].isna().any() or df_two[merge_key_two].isna().any():
+                return False
+
+        # The anti joins only take the columns of one dataframe
+        if self.how == UNIQUE_IN_LEFT:
+            return all(is_polars_round_trip_exact(df_one[ch]) for ch in column_headers_one)
+        if self.how == UNIQUE_IN_RIGHT:
+            return all(is_polars_round_trip_exact(df_two[ch]) for ch in column_headers_two)
+
+        if not all(is_polars_round_trip_exact(df_one[ch]) for ch in column_headers_one) or \
+            not all(is_polars_round_trip_exact(df_two[ch]) for ch in column_headers_two):
+            return False
+
+        # The rows of the first dataframe without a match are filled with nulls in a left merge
+        if self.how in ['left', LOOKUP]:
+            return all(df_two[ch].dtype.kind in POLARS_UNMATCHED_DTYPE_KINDS for ch in column_headers_two if ch not in merge_keys_two)
+
+        return True
+
     def get_created_sheet_indexes(self) -> List[int]:
         return [len(self.prev_state.dfs)]
     
@@ -8,13 +8,15 @@ from copy import deepcopy
 from distutils.version import LooseVersion
 from typing import Any, Collection, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype
 
 from mitosheet.array_utils import deduplicate_array
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.filter_code_chunk import (
     combine_filter_strings, get_single_filter_string)
-from mitosheet.state import State
+from mitosheet.state import ENGINE_POLARS, State
 from mitosheet.transpiler.transpile_utils import (
     NEWLINE_TAB, get_column_header_list_as_transpiled_code,
     get_column_header_as_transpiled_code)
@@ -60,6 +62,65 @@ def values_to_functions_code(values: Dict[ColumnHeader, Collection[str]]) -> str
     # also note that we overwrite the quotes around Count Unique
     return string_values.replace('\'count unique\'', 'pd.Series.nunique')
 
+# The polars expressions that compute each aggregation of a numeric or bool column, which 
+# match the pandas aggregations. Polars counts as uint32, where pandas counts as int64
+POLARS_AGGREGATION_EXPRESSIONS = {
+    'sum': '{column}.sum()',
+    'mean': '{column}.mean()',
+    'median': '{column}.median()',
+    'min': '{column}.min()',
+    'max': '{column}.max()',
+    'count': '{column}.count().cast(pl.Int64)',
+    'std': '{column}.std()',
+    # Like pd.Series.nunique, we don't count nulls as a unique value
+    'count unique': '{column}.drop_nulls().n_unique().cast(pl.Int64)',
+}
+# Polars sums bools as uint32, where pandas sums them as int64
+POLARS_BOOL_SUM_EXPRESSION = '{column}.sum().cast(pl.Int64)'
+# The numpy dtype kinds (bool, signed int and float) of the columns we aggregate with polars. Polars
+# and pandas give different dtypes for the aggregations of other columns (e.g. unsigned or nullable ints)
+POLARS_AGGREGATION_DTYPE_KINDS = 'bif'
+
+# The names pandas gives the columns of each aggregation
+PANDAS_AGGREGATION_NAMES = {
+    'count unique': 'nunique'
+}
+
+
+def get_polars_pivot_code(
+        df_name: str, 
+        pivot_rows: List[ColumnHeader], 
+        values: Dict[ColumnHeader, Collection[str]],
+        bool_column_headers: Collection[ColumnHeader]
+    ) -> List[str]:
+    """
+    Returns code that computes the same flattened pivot_table as pandas pivot_table
+    with only pivot rows, but with a lazy polars group by, which uses every core. 
+    """
+    # Pandas orders the columns of the pivot table by the value and then the aggregation
+    aggregations = sorted(
+        (column_header, PANDAS_AGGREGATION_NAMES.get(aggregation, aggregation), aggregation)
+        for column_header, aggregations in values.items() for aggregation in aggregations
+    )
+    aggregation_expressions = [
+        (POLARS_BOOL_SUM_EXPRESSION if aggregation == 'sum' and column_header in bool_column_headers else POLARS_AGGREGATION_EXPRESSIONS[aggregation]).format(
+            column=f'pl.col({get_column_header_as_transpiled_code(column_header)})'
+        ) + f'.alias({get_column_header_as_transpiled_code(f"{column_header} {aggregation_name}")})'
+        for column_header, aggregation_name, aggregation in aggregations
+    ]
+    aggregation_names: List[ColumnHeader] = [f"{column_header} {aggregation_name}" for column_header, aggregation_name, _ in aggregations]
+    aggregation_names_list = get_column_header_list_as_transpiled_code(aggregation_names)
+
+    # Like pandas, we drop the rows where any of the pivot rows are null, drop the rows where
+    # all of the aggregations are null (as pivot_table does with dropna=True), and sort by the pivot rows
+    pivot_rows_list = get_column_header_list_as_transpiled_code(pivot_rows)
+    return [
+        f'pivot_table = pl.from_pandas({df_name}).lazy().drop_nulls({pivot_rows_list}).group_by({pivot_rows_list}).agg([{NEWLINE_TAB}' +
+        f',{NEWLINE_TAB}'.join(aggregation_expressions) + 
+        f'\n]).filter(~pl.all_horizontal(pl.col({aggregation_names_list}).is_null())).sort({pivot_rows_list}).collect().to_pandas()'
+    ]
+
+
 def build_args_code(
         pivot_rows_with_transforms: List[ColumnHeaderWithPivotTransform],
         pivot_columns_with_transforms: List[ColumnHeaderWithPivotTransform],
@@ -135,6 +196,43 @@ class PivotCodeChunk(CodeChunk):
     def get_description_comment(self) -> str:
         return f'Pivoted {self.old_df_name} into {self.new_df_name}'
 
+    def _can_use_polars(
+            self, 
+            pivot_rows_with_transforms: List[ColumnHeaderWithPivotTransform], 
+            pivot_columns_with_transforms: List[ColumnHeaderWithPivotTransform], 
+            values: Dict[ColumnHeader, Collection[str]]
+        ) -> bool:
+        """
+        With the polars engine, we only execute pivots with polars when they are group bys 
+        that polars can compute identically. Otherwise, we fall back to pandas.
+
+        Polars and pandas aggregate other types differently (e.g. pandas sums strings, 
+        and polars takes the mean of them), so we only aggregate bool, int and float columns.
+        """
+        from mitosheet.step_performers.pivot import PCT_NO_OP
+
+        if self.prev_state.engine != ENGINE_POLARS or not self.flatten_column_headers or len(pivot_columns_with_transforms) > 0:
+            return False
+        
+        # Polars requires string column headers
+        column_headers = [chwpt['column_header'] for chwpt in pivot_rows_with_transforms] + list(values.keys())
+        if not all(isinstance(column_header, str) for column_header in column_headers):
+            return False
+
+        df = self.prev_state.dfs[self.sheet_index]
+        if not all(isinstance(df[column_header].dtype, np.dtype) and df[column_header].dtype.kind in POLARS_AGGREGATION_DTYPE_KINDS for column_header in values.keys()):
+            return False
+
+        # Polars cannot group by object columns with mixed types, and gives different dtypes for
+        # nullable pivot rows, so we only group by numpy columns and object columns of strings
+        for chwpt in pivot_rows_with_transforms:
+            dtype = df[chwpt['column_header']].dtype
+            if not isinstance(dtype, np.dtype) or (dtype == object and infer_dtype(df[chwpt['column_header']], skipna=True) != 'string'):
+                return False
+
+        return all(chwpt['transformation'] == PCT_NO_OP for chwpt in pivot_rows_with_transforms) and \
+            all(aggregation in POLARS_AGGREGATION_EXPRESSIONS for aggregations in values.values() for aggregation in aggregations)
+
     def get_code(self) -> Tuple[List[str], List[str]]:
     
         # Get just the column headers in a list, for convenience
@@ -184,6 +282,12 @@ class PivotCodeChunk(CodeChunk):
         # Drop any columns we don't need, to avoid issues where pandas freaks out
         # and says there is a non-1-dimensional grouper
         column_headers_list = get_column_header_list_as_transpiled_code(list(set(pivot_rows + pivot_columns + list(values.keys()))))
+
+        if self._can_use_polars(pivot_rows_with_transforms, pivot_columns_with_transforms, values):
+            bool_column_headers = [column_header for column_header in values.keys() if self.prev_state.dfs[self.sheet_index][column_header].dtype.kind == 'b']
+            transpiled_code.extend(get_polars_pivot_code(f'{old_df_name}[{column_headers_list}]', deduplicate_array(pivot_rows), values, bool_column_headers))
+            transpiled_code.append(f'{self.new_df_name} = pivot_table')
+            return transpiled_code, ['import polars as pl']
         transpiled_code.append(f'tmp_df = {old_df_name}[{column_headers_list}].copy()')
 
         # Create any new temporary columns that are formed by the pivot transforms
@@ -23,6 +23,7 @@ import numpy as np
 
 import pandas as pd
 
+from mitosheet.copy_on_write import copy_on_write
 from mitosheet.errors import make_no_column_error
 from mitosheet.types import ColumnHeader, ColumnID, MultiLevelColumnHeader
 
@@ -111,6 +112,16 @@ class ColumnIDMap():
                 self.column_id_to_column_header[sheet_index][column_id] = column_header
                 self.column_header_to_column_id[sheet_index][column_header] = column_id
 
+    def copy(self) -> "ColumnIDMap":
+        """
+        Returns a copy of the column id map, which shares the mappings for
+        each sheet with this map until they are accessed in the copy.
+        """
+        new_column_id_map = ColumnIDMap([])
+        new_column_id_map.column_id_to_column_header = copy_on_write(self.column_id_to_column_header)
+        new_column_id_map.column_header_to_column_id = copy_on_write(self.column_header_to_column_id)
+        return new_column_id_map
+
     def set_column_header(self, sheet_index: int, column_id: ColumnID, column_header: ColumnHeader) -> None:
         """
         Sets a column id and column header to match to eachother. 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Every response to an edit or update sends the sheet data, the analysis data and the
+user profile to the frontend over the comm. When the kernel is on a slow connection
+to the browser, like on a remote JupyterHub, the user waits on this transfer rather
+than on pandas.
+
+If the mito_config sets a comm_compression_threshold, and the frontend says that it
+supports a compression when it opens the comm, then the messages that are larger
+than the threshold are compressed. A compressed message is sent as:
+{
+    event: string,
+    id: string,
+    compressed_message: {
+        encoding: 'zlib',
+        bufferIndex: number
+    }
+}
+where the buffer at bufferIndex in the buffers of the message is the compressed utf8
+JSON of the original message. Any buffers of the original message, like the Arrow
+sheet data, are sent before it, at the same indexes.
+
+The CommCompressionMetrics count the bytes of the messages before and after they are
+compressed, and the time spent encoding them, for all of the comms in this process.
+"""
+import json
+import threading
+import zlib
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from mitosheet.enterprise.mito_config import MitoConfig
+from mitosheet.utils import get_json_string
+
+# In order of preference
+SUPPORTED_COMM_COMPRESSIONS = ['zlib']
+
+# Lower levels compress sheet data JSON almost as well, and many times faster
+COMM_COMPRESSION_LEVEL = 1
+
+
+class CommCompressionMetrics:
+    """
+    Counts the messages sent over comms that can compress them, and their bytes
+    before and after they are compressed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.clear()
+
+    def record(self, raw_bytes: int, sent_bytes: int, encode_time: float, compressed: bool) -> None:
+        with self._lock:
+            self.num_messages += 1
+            self.num_compressed_messages += 1 if compressed else 0
+            self.raw_bytes += raw_bytes
+            self.sent_bytes += sent_bytes
+            self.encode_time += encode_time
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if self.sent_bytes == 0:
+            return None
+        return self.raw_bytes / self.sent_bytes
+
+    def clear(self) -> None:
+        self.num_messages = 0
+        self.num_compressed_messages = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.encode_time = 0.0
+
+
+comm_compression_metrics = CommCompressionMetrics()
+
+
+def get_negotiated_comm_compression(mito_config: MitoConfig, open_data: Any) -> Optional[str]:
+    """
+    Returns the compression to use for the messages sent on a comm, given the data that
+    the frontend sent when it opened the comm, or None if messages should not be compressed.
+    """
+    if mito_config.comm_compression_threshold is None or not isinstance(open_data, dict):
+        return None
+
+    frontend_compressions = open_data.get('compressions', [])
+    if not isinstance(frontend_compressions, list):
+        return None
+
+    for compression in SUPPORTED_COMM_COMPRESSIONS:
+        if compression in frontend_compressions:
+            return compression
+    return None
+
+
+def get_compressed_message(message: Dict[str, Any], buffers: Optional[List[bytes]], threshold: int) -> Optional[Dict[str, Any]]:
+    """
+    Returns the compressed message to send in place of the message, and the buffers to send 
+    with it, or None if the message is smaller than the threshold or does not compress.
+    """
+    start_time = perf_counter()
+    message_bytes = get_json_string(message).encode('utf8')
+    buffers_bytes = sum(len(buffer) for buffer in buffers) if buffers is not None else 0
+    raw_bytes = len(message_bytes) + buffers_bytes
+
+    if len(message_bytes) < threshold:
+        comm_compression_metrics.record(raw_bytes, raw_bytes, perf_counter() - start_time, False)
+        return None
+
+    compressed_message_bytes = zlib.compress(message_bytes, COMM_COMPRESSION_LEVEL)
+    if len(compressed_message_bytes) >= len(message_bytes):
+        comm_compression_metrics.record(raw_bytes, raw_bytes, perf_counter() - start_time, False)
+        return None
+
+    new_buffers = (buffers if buffers is not None else []) + [compressed_message_bytes]
+    compressed_message = {
+        'event': message.get('event'),
+        'id': message.get('id'),
+        'compressed_message': {
+            'encoding': 'zlib',
+            'bufferIndex': len(new_buffers) - 1
+        }
+    }
+    comm_compression_metrics.record(raw_bytes, len(compressed_message_bytes) + buffers_bytes, perf_counter() - start_time, True)
+    return {'message': compressed_message, 'buffers': new_buffers}
+
+
+def get_compressing_send(send: Callable, threshold: int) -> Callable:
+    """
+    Returns a send function that compresses the messages larger than the threshold before
+    sending them with the given send function.
+    """
+    def compressing_send(message: Dict[str, Any], buffers: Optional[List[bytes]]=None) -> None:
+        compressed = get_compressed_message(message, buffers, threshold)
+        if compressed is not None:
+            send(compressed['message'], buffers=compressed['buffers'])
+        elif buffers is not None:
+            send(message, buffers=buffers)
+        else:
+            send(message)
+
+    return compressing_send
+
+
+def get_decompressed_message(message: Dict[str, Any], buffers: Optional[List[bytes]]) -> Dict[str, Any]:
+    """
+    Returns the original message if the message is compressed, as the frontend reads it.
+    Useful for testing.
+    """
+    if 'compressed_message' not in message or buffers is None:
+        return message
+    return json.loads(zlib.decompress(buffers[message['compressed_message']['bufferIndex']]).decode('utf8'))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains a copy-on-write list, which the State uses to store the metadata
+that it keeps for each sheet (formulas, filters, formats, etc).
+
+When the State is copied for a new step, deep copying all of this metadata
+can cost more than the pandas work the step does, especially for wide sheets
+with many formats. However, most steps only change the metadata for a single
+sheet. So instead, the copy shares the items of the list it was copied from,
+and only makes a deep copy of an item the first time it is accessed.
+
+Since we do not know if an item is accessed to read or to write it, any access
+through indexing or iterating copies the item. Reading the list in other ways
+(e.g. len or ==) does not.
+"""
+import operator
+from copy import deepcopy
+from typing import Any, Dict, Iterable, Iterator, List, Set, SupportsIndex
+
+
+class CopyOnWriteList(list):
+    """
+    A list that shares some of its items with the list it was copied
+    from, until they are first accessed.
+    """
+
+    def __init__(self, items: Iterable[Any]=()):
+        # NOTE: we copy lists with list.copy, so we do not iterate over (and so
+        # copy) the items of another CopyOnWriteList
+        super().__init__(list.copy(items) if isinstance(items, list) else items)
+        # The indexes of the items that are shared with the list this was copied from
+        self._shared_indexes: Set[int] = set()
+
+    def _normalize_index(self, index: int) -> int:
+        return index + len(self) if index < 0 else index
+
+    def _own_index(self, index: int) -> None:
+        index = self._normalize_index(index)
+        if index in self._shared_indexes:
+            self._shared_indexes.discard(index)
+            list.__setitem__(self, index, deepcopy(list.__getitem__(self, index)))
+
+    def _own_all(self) -> None:
+        for index in list(self._shared_indexes):
+            self._own_index(index)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            for i in range(*index.indices(len(self))):
+                self._own_index(i)
+        elif -len(self) <= index < len(self):
+            self._own_index(index)
+        return super().__getitem__(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __reversed__(self) -> Iterator[Any]:
+        for index in range(len(self) - 1, -1, -1):
+            yield self[index]
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            # Slice assignment may change the length of the list, so we stop sharing
+            self._own_all()
+        elif -len(self) <= index < len(self):
+            self._shared_indexes.discard(self._normalize_index(index))
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index: Any) -> None:
+        if isinstance(index, slice):
+            self._own_all()
+        elif -len(self) <= index < len(self):
+            self._remove_shared_index(self._normalize_index(index))
+        super().__delitem__(index)
+
+    def _remove_shared_index(self, index: int) -> None:
+        self._shared_indexes = {
+            i if i < index else i - 1 for i in self._shared_indexes if i != index
+        }
+
+    def pop(self, index: SupportsIndex=-1) -> Any:
+        index = operator.index(index)
+        if -len(self) <= index < len(self):
+            self._own_index(index)
+            self._remove_shared_index(self._normalize_index(index))
+        return super().pop(index)
+
+    def insert(self, index: SupportsIndex, value: Any) -> None:
+        index = max(0, min(self._normalize_index(operator.index(index)), len(self)))
+        self._shared_indexes = {
+            i if i < index else i + 1 for i in self._shared_indexes
+        }
+        super().insert(index, value)
+
+    def remove(self, value: Any) -> None:
+        del self[self.index(value)]
+
+    def clear(self) -> None:
+        self._shared_indexes = set()
+        super().clear()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        self._own_all()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._own_all()
+        super().reverse()
+
+    def copy(self) -> List[Any]: # type: ignore
+        return list(self)
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __add__(self, other: Any) -> List[Any]: # type: ignore
+        self._own_all()
+        return super().__add__(other)
+
+    def __mul__(self, n: Any) -> List[Any]: # type: ignore
+        self._own_all()
+        return super().__mul__(n)
+
+    def __imul__(self, n: Any) -> 'CopyOnWriteList': # type: ignore
+        self._own_all()
+        return super().__imul__(n) # type: ignore
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'CopyOnWriteList':
+        return CopyOnWriteList(deepcopy(list.copy(self), memo))
+
+
+def copy_on_write(items: List[Any]) -> CopyOnWriteList:
+    """
+    Returns a copy of the list that shares all of its items with the
+    given list, until they are accessed in the copy.
+
+    NOTE: the given list must not be mutated afterwards, as these
+    changes may be visible in the copy.
+    """
+    new_list = CopyOnWriteList(items)
+    new_list._shared_indexes = set(range(len(new_list)))
+    return new_list
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Executing an edit can take a long time, e.g. a merge of two very large
+sheets. If the edit is executed in the comm's message handler, the kernel
+is blocked until it finishes, and the user cannot do anything but wait or
+restart the kernel.
+
+The EditExecutor instead executes edits, one at a time and in order, on a
+worker thread. While an edit executes, progress events are sent to the frontend,
+and the user can cancel it with a cancel_edit message.
+
+Python threads cannot be stopped, so a cancelled edit stops at the next point
+it checks if it was cancelled: before each step, and inside of each step between
+its code and the recon of the dataframes it changed (see check_current_edit_cancelled).
+A single long pandas call, like the merge itself, still runs to the end. The frontend
+is told the edit was cancelled right away, but the next edit only starts once that
+call returns, as edits share caches and would otherwise hold two copies of large
+results at once. Either way, the steps of the StepsManager are only updated if the edit 
+was not cancelled. See EditExecution.commit.
+"""
+from queue import Queue
+from threading import Event, Lock, Thread, local
+from typing import Any, Callable, Dict, List, NoReturn, Optional
+
+from mitosheet.errors import make_edit_cancelled_error
+
+# The execution that is executing on the current thread, if any
+_current = local()
+
+
+def get_current_edit_execution() -> Optional['EditExecution']:
+    return getattr(_current, 'edit_execution', None)
+
+
+def check_current_edit_cancelled() -> None:
+    """
+    Raises an edit_cancelled_error if the edit executing on this thread has been
+    cancelled. Called while a step executes, so that a cancelled edit does not
+    keep going until the next step.
+    """
+    edit_execution = get_current_edit_execution()
+    if edit_execution is not None:
+        edit_execution.check_cancelled()
+
+
+class EditExecution:
+    """
+    A single event that is being executed by the EditExecutor, which tracks
+    if it has been cancelled.
+    """
+
+    def __init__(
+            self,
+            event: Dict[str, Any],
+            send: Optional[Callable[[Dict[str, Any]], None]]=None,
+            cancellable: bool=True
+        ):
+        self.event = event
+        # If send is given, progress events are sent with it
+        self.send = send
+        # Update events are not cancellable, as they do not check if they are
+        # cancelled before updating the steps
+        self.cancellable = cancellable
+
+        self.cancelled = False
+        self.committed = False
+        # Set once this execution is finished or cancelled
+        self.finished = Event()
+
+        self._lock = Lock()
+
+    @property
+    def id(self) -> str:
+        return self.event['id']
+
+    def check_cancelled(self) -> None:
+        """
+        Raises an edit_cancelled_error if this execution has been cancelled.
+        """
+        if self.cancelled:
+            raise make_edit_cancelled_error()
+
+    def report_progress(self, num_steps_executed: int, num_steps: int, step_type: str) -> None:
+        """
+        Called before each step is executed. Stops the execution if it has been
+        cancelled, and otherwise tells the frontend how far along it is.
+        """
+        self.check_cancelled()
+
+        if self.send is not None:
+            self.send({
+                'event': 'progress',
+                'id': self.id,
+                'data': {
+                    'num_steps_executed': num_steps_executed,
+                    'num_steps': num_steps,
+                    'step_type': step_type,
+                }
+            })
+
+    def commit(self) -> None:
+        """
+        Must be called right before the new steps are saved. After this,
+        the execution can no longer be cancelled.
+        """
+        with self._lock:
+            self.check_cancelled()
+            self.committed = True
+
+    def cancel(self) -> bool:
+        """
+        Cancels this execution, returning False if it is too late to cancel it.
+        """
+        with self._lock:
+            if not self.cancellable or self.committed or self.finished.is_set():
+                return False
+            self.cancelled = True
+
+        self.finished.set()
+        return True
+
+
+class EditExecutor:
+    """
+    Executes the events that change the steps, one at a time and in the order
+    they were submitted.
+
+    If threaded, the events are executed on a worker thread, and progress events
+    are sent to the frontend. Otherwise, they are executed as they are submitted,
+    which we do in tests and in locations like Streamlit and Dash where each
+    message must be responded to before the message handler returns.
+    """
+
+    def __init__(
+            self,
+            execute: Callable[[EditExecution], bool],
+            send: Callable[[Dict[str, Any]], None],
+            threaded: bool=False
+        ):
+        # Executes the event, and sends the response to it
+        self.execute = execute
+        self.send = send
+        self.threaded = threaded
+
+        self.queue: Queue = Queue()
+        self.thread: Optional[Thread] = None
+
+        # The executions that are queued or executing, in order
+        self.pending_executions: List[EditExecution] = []
+        self._lock = Lock()
+
+    def submit(self, event: Dict[str, Any], cancellable: bool=True) -> bool:
+        """
+        Executes the event after all of the events submitted before it. If not
+        threaded, returns if the event was executed successfully.
+        """
+        if not self.threaded:
+            return self._execute(EditExecution(event, cancellable=cancellable))
+
+        if self.thread is None:
+            # NOTE: the thread is a daemon thread, so it does not stop the process from exiting
+            self.thread = Thread(target=self._handle_edit_executions_thread, daemon=True)
+            self.thread.start()
+
+        edit_execution = EditExecution(event, send=self.send, cancellable=cancellable)
+        with self._lock:
+            self.pending_executions.append(edit_execution)
+        self.queue.put(edit_execution)
+        return True
+
+    def cancel(self, event_id: Optional[str]=None) -> List[str]:
+        """
+        Cancels the execution of the event with this event_id, or all of the
+        pending executions if no event_id is given. Returns the ids of the
+        events that were cancelled.
+        """
+        with self._lock:
+            edit_executions = [
+                edit_execution for edit_execution in self.pending_executions
+                if event_id is None or edit_execution.id == event_id
+            ]
+
+        cancelled_event_ids = []
+        for edit_execution in edit_executions:
+            if edit_execution.cancel():
+                cancelled_event_ids.append(edit_execution.id)
+                self._remove_pending_execution(edit_execution)
+
+        return cancelled_event_ids
+
+    def _remove_pending_execution(self, edit_execution: EditExecution) -> None:
+        with self._lock:
+            if edit_execution in self.pending_executions:
+                self.pending_executions.remove(edit_execution)
+
+    def _execute(self, edit_execution: EditExecution) -> bool:
+        _current.edit_execution = edit_execution
+        try:
+            return self.execute(edit_execution)
+        finally:
+            _current.edit_execution = None
+
+    def _execute_and_finish(self, edit_execution: EditExecution) -> None:
+        try:
+            self._execute(edit_execution)
+        finally:
+            self._remove_pending_execution(edit_execution)
+            edit_execution.finished.set()
+
+    def _handle_edit_executions_thread(self) -> NoReturn:
+        """
+        The worker thread, which lives forever, and executes each of the events
+        in the queue.
+
+        If an event is cancelled while it executes, we still wait for it to return
+        before executing the next event, so that only one edit executes at a time.
+        """
+        while True:
+            edit_execution = self.queue.get()
+            if edit_execution.cancelled:
+                continue
+
+            self._execute_and_finish(edit_execution)
@@ -37,6 +37,14 @@ MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH = 'MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PA
 MITO_CONFIG_CUSTOM_IMPORTERS_PATH = 'MITO_CONFIG_CUSTOM_IMPORTERS_PATH'
 MITO_CONFIG_LOG_SERVER_URL = 'MITO_CONFIG_LOG_SERVER_URL'
 MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL = 'MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL'
+MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET = 'MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET'
+MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL = 'MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL'
+MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK = 'MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK'
+MITO_CONFIG_STEP_RESULT_CACHE_SIZE = 'MITO_CONFIG_STEP_RESULT_CACHE_SIZE'
+MITO_CONFIG_PREVIEW_ROW_THRESHOLD = 'MITO_CONFIG_PREVIEW_ROW_THRESHOLD'
+MITO_CONFIG_PANDAS_COPY_ON_WRITE = 'MITO_CONFIG_PANDAS_COPY_ON_WRITE'
+MITO_CONFIG_ARROW_SHEET_DATA = 'MITO_CONFIG_ARROW_SHEET_DATA'
+MITO_CONFIG_COMM_COMPRESSION_THRESHOLD = 'MITO_CONFIG_COMM_COMPRESSION_THRESHOLD'
 
 
 # Note: The below keys can change since they are not set by the user.
@@ -45,6 +53,7 @@ MITO_CONFIG_CODE_SNIPPETS = 'MITO_CONFIG_CODE_SNIPPETS'
 # The default values to use if the mec does not define them
 DEFAULT_MITO_CONFIG_SUPPORT_EMAIL = 'founders@sagacollab.com'
 DEFAULT_MITO_CONFIG_CODE_SNIPPETS_SUPPORT_EMAIL = 'founders@sagacollab.com'
+DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL = 10
 
 # Since Mito needs to look up individual environment variables, we need to 
 # know the names of the variables associated with each mito config version. 
@@ -73,6 +82,14 @@ MEC_VERSION_KEYS = {
         MITO_CONFIG_ENTERPRISE_TEMP_LICENSE,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH,
         MITO_CONFIG_CUSTOM_IMPORTERS_PATH,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET,
+        MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
+        MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK,
+        MITO_CONFIG_STEP_RESULT_CACHE_SIZE,
+        MITO_CONFIG_PREVIEW_ROW_THRESHOLD,
+        MITO_CONFIG_PANDAS_COPY_ON_WRITE,
+        MITO_CONFIG_ARROW_SHEET_DATA,
+        MITO_CONFIG_COMM_COMPRESSION_THRESHOLD,
     ]
 }
 
@@ -397,6 +414,112 @@ class MitoConfig:
             self.mec[MITO_CONFIG_ENTERPRISE_TEMP_LICENSE]
         )
 
+    @property
+    def step_history_memory_budget(self) -> Optional[float]:
+        """
+        The number of megabytes of dataframes that the step history is allowed to 
+        hold onto. If the step history grows past this, the states of the steps 
+        that are not checkpoints are evicted, and recomputed when they are needed.
+
+        If this is not set, then no states are ever evicted.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET] is None:
+            return None
+        return float(self.mec[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET])
+
+    @property
+    def step_history_checkpoint_interval(self) -> int:
+        """
+        Every step_history_checkpoint_interval-th step is a checkpoint, which means
+        its state is never evicted.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL] is None:
+            return DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL
+        return max(int(self.mec[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL]), 1)
+
+    @property
+    def step_history_spill_to_disk(self) -> bool:
+        """
+        If True, the states evicted from the step history are written to a cache
+        on disk, and read back in when they are needed, rather than recomputed. 
+        
+        If no step_history_memory_budget is set, then the states of all steps 
+        other than the initialize step, the current step and the last step are 
+        written to disk.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK] is None:
+            return False
+        return is_env_variable_set_to_true(self.mec[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK])
+
+    @property
+    def step_result_cache_size(self) -> Optional[float]:
+        """
+        The number of megabytes of dataframes that the step result cache is allowed
+        to hold onto. The step result cache is shared by every analysis in this process, 
+        and stores the result of executing each step, so that replaying the same steps 
+        on the same data does not execute them again. If step_history_spill_to_disk is 
+        set, then the results evicted from memory are written to disk instead.
+
+        If this is not set, then no step results are cached.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_RESULT_CACHE_SIZE] is None:
+            return None
+        return float(self.mec[MITO_CONFIG_STEP_RESULT_CACHE_SIZE])
+
+    @property
+    def preview_row_threshold(self) -> Optional[int]:
+        """
+        The number of rows above which a dataframe is previewed on a deterministic 
+        sample of this many rows. The steps are executed interactively on the sample, 
+        and are only executed on the full data when it is downloaded or exported.
+        The generated code always executes on the full data.
+
+        If this is not set, then steps are always executed on the full data.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_PREVIEW_ROW_THRESHOLD] is None:
+            return None
+        return int(self.mec[MITO_CONFIG_PREVIEW_ROW_THRESHOLD])
+
+    @property
+    def pandas_copy_on_write(self) -> bool:
+        """
+        If True, Mito turns on pandas Copy-on-Write, which makes every copy of a dataframe
+        lazy. Mito then no longer makes deep copies of dataframes to protect the dataframes
+        passed to it and the dataframes in its step history from being modified, which 
+        greatly reduces its memory usage.
+
+        Note that this option is global, so it is also on for the rest of the notebook.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_PANDAS_COPY_ON_WRITE] is None:
+            return False
+        return is_env_variable_set_to_true(self.mec[MITO_CONFIG_PANDAS_COPY_ON_WRITE])
+
+    @property
+    def arrow_sheet_data(self) -> bool:
+        """
+        If True, and pyarrow is installed, the data of the sheets is sent to the frontend 
+        as a binary Arrow buffer rather than as JSON, which is smaller for numeric data and 
+        does not need to be parsed. This is only done in JupyterLab and Streamlit. See 
+        mitosheet/sheet_data_arrow.py
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_ARROW_SHEET_DATA] is None:
+            return False
+        return is_env_variable_set_to_true(self.mec[MITO_CONFIG_ARROW_SHEET_DATA])
+
+    @property
+    def comm_compression_threshold(self) -> Optional[int]:
+        """
+        The number of bytes above which the responses sent to the frontend over the comm
+        are compressed, if the frontend supports it. This is useful when the kernel is on
+        a slow connection to the browser, like on a remote JupyterHub. See 
+        mitosheet/comm_compression.py
+
+        If this is not set, then responses are never compressed.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_COMM_COMPRESSION_THRESHOLD] is None:
+            return None
+        return int(self.mec[MITO_CONFIG_COMM_COMPRESSION_THRESHOLD])
+
     # Add new mito configuration options here ...
 
     @property
@@ -419,6 +542,14 @@ class MitoConfig:
             MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: self.custom_sheet_functions_path,
             MITO_CONFIG_CUSTOM_IMPORTERS_PATH: self.custom_importers_path,
             MITO_CONFIG_PRO: self.pro,
-            MITO_CONFIG_ENTERPRISE: self.enterprise
+            MITO_CONFIG_ENTERPRISE: self.enterprise,
+            MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET: self.step_history_memory_budget,
+            MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL: self.step_history_checkpoint_interval,
+            MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK: self.step_history_spill_to_disk,
+            MITO_CONFIG_STEP_RESULT_CACHE_SIZE: self.step_result_cache_size,
+            MITO_CONFIG_PREVIEW_ROW_THRESHOLD: self.preview_row_threshold,
+            MITO_CONFIG_PANDAS_COPY_ON_WRITE: self.pandas_copy_on_write,
+            MITO_CONFIG_ARROW_SHEET_DATA: self.arrow_sheet_data,
+            MITO_CONFIG_COMM_COMPRESSION_THRESHOLD: self.comm_compression_threshold,
         }
 
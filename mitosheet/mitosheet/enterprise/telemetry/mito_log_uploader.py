@@ -108,6 +108,10 @@ def preprocess_log_for_upload(log_event: str, log_params: Dict[str, Any]) -> Opt
     # Remove any log params that are not part of whitelisted params or start with "params", ie: params_sheet_index
     filtered_log_params = {k: v for k, v in log_params.items() if k in whitelisted_log_params or k.startswith('params_')}
 
+    # For edit events, also keep the memory and time accounting for the step, ie: performance_execution_time
+    if log_event == 'edit_event':
+        filtered_log_params.update({k: v for k, v in log_params.items() if k.startswith('performance_')})
+
     # Add the gmt timestamp formatted as 2023-10-25T15:30:00Z
     filtered_log_params['timestamp_gmt'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
 
@@ -281,6 +281,42 @@ def make_execution_error(error_modal: bool=True) -> MitoError:
         error_modal=error_modal
     )
 
+def make_edit_cancelled_error() -> MitoError:
+    """
+    Helper function for creating a edit_cancelled_error.
+
+    Occurs when:
+    -  the user cancels an edit before it finishes executing.
+    """
+    return MitoError(
+        'edit_cancelled_error',
+        'Edit Cancelled',
+        'The edit was cancelled before it finished executing, so the sheet was not changed.',
+        error_modal=False
+    )
+
+def make_invalid_engine_error(engine: Any, engine_installed: bool=True) -> MitoError:
+    """
+    Helper function for creating a invalid_engine_error.
+
+    Occurs when:
+    -  the engine in the code_options is not one Mito supports, or is not installed.
+    """
+    if not engine_installed:
+        return MitoError(
+            'invalid_engine_error',
+            'Engine Not Installed',
+            f'To execute this analysis with the {engine} engine, install it with `pip install {engine}` and restart the kernel.',
+            error_modal=False
+        )
+
+    return MitoError(
+        'invalid_engine_error',
+        'Invalid Engine',
+        f'{engine} is not a supported engine. The engine must be either pandas or polars.',
+        error_modal=False
+    )
+
 def make_function_execution_error(function: str) -> MitoError:
     """
     Helper function for creating a function_execution_error.
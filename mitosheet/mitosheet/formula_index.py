@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Each formula in the column_formulas stores the index of the dataframe at the
+time the formula was set, so that the frontend can figure out which index label
+a relative row reference in the formula points to.
+
+Storing this as a list of index labels means every formula costs O(rows) memory,
+and this list is then copied every time the state is copied. Instead, we store a
+FormulaIndex, which is either just the start, stop and step of the index (for a
+RangeIndex or any index of evenly spaced integers) or a reference to the pandas
+index itself. Pandas indexes are immutable, so this reference can safely be
+shared between states rather than copied.
+"""
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class FormulaIndex:
+    """
+    A compact, immutable representation of the index a formula was applied to.
+    """
+
+    __slots__ = ('range', 'index')
+
+    def __init__(self, index: pd.Index):
+        self.range: Optional[Tuple[int, int, int]] = get_range_of_index(index)
+        # We only keep a reference to the index if we cannot store it as a range
+        self.index: Optional[pd.Index] = index if self.range is None else None
+
+    def __len__(self) -> int:
+        if self.range is not None:
+            return len(range(*self.range))
+        return len(self.index) # type: ignore
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, FormulaIndex):
+            return False
+        if self.range is not None or other.range is not None:
+            return self.range == other.range
+        return self.index.equals(other.index) # type: ignore
+
+    def __repr__(self) -> str:
+        if self.range is not None:
+            return f'FormulaIndex(range{self.range})'
+        return f'FormulaIndex({self.index!r})'
+
+    # The FormulaIndex is immutable, so copies of the state can share it
+    def __copy__(self) -> 'FormulaIndex':
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'FormulaIndex':
+        return self
+
+    def to_list(self) -> List[Any]:
+        if self.range is not None:
+            return list(range(*self.range))
+        return self.index.to_list() # type: ignore
+
+    def to_json(self) -> Union[List[Any], Dict[str, Any]]:
+        """
+        Returns the representation that is sent to the frontend. Ranges are
+        sent as just their bounds, and any other index as a list of labels.
+        """
+        if self.range is not None:
+            start, stop, step = self.range
+            return {'type': 'range', 'start': start, 'stop': stop, 'step': step}
+        return self.to_list()
+
+
+def get_range_of_index(index: pd.Index) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns the (start, stop, step) of the index if it is a RangeIndex or
+    an index of evenly spaced integers, and None otherwise.
+    """
+    if isinstance(index, pd.RangeIndex):
+        # NOTE: we read the private attributes for older pandas versions, which
+        # do not have start, stop and step
+        start = index.start if hasattr(index, 'start') else index._start # type: ignore
+        stop = index.stop if hasattr(index, 'stop') else index._stop # type: ignore
+        step = index.step if hasattr(index, 'step') else index._step # type: ignore
+        return int(start), int(stop), int(step)
+
+    if len(index) < 2 or not pd.api.types.is_signed_integer_dtype(index.dtype):
+        return None
+
+    values = index.to_numpy()
+    step = int(values[1] - values[0])
+    if step == 0:
+        return None
+
+    if not np.all(np.diff(values) == step):
+        return None
+
+    start = int(values[0])
+    return start, start + step * len(values), step
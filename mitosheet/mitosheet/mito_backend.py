@@ -7,14 +7,15 @@
 """
 Main file containing the mito widget.
 """
+import base64
 import json
 import os
 import re
 import time
+import zlib
 from sysconfig import get_python_version
 from typing import Any, Dict, List, Optional, Union, Callable
 
-import numpy as np
 import pandas as pd
 from IPython import get_ipython
 from IPython.display import HTML, display
@@ -22,10 +23,14 @@ from mitosheet.enterprise.telemetry.mito_log_uploader import MitoLogUploader
 
 from mitosheet.kernel_utils import get_current_kernel_id, Comm
 from mitosheet.api import API
+from mitosheet.api.api import get_api_should_be_threaded
+from mitosheet.comm_compression import get_compressing_send, get_negotiated_comm_compression
+from mitosheet.edit_executor import EditExecution, EditExecutor
 from mitosheet.enterprise.mito_config import MitoConfig
 from mitosheet.errors import (MitoError, get_recent_traceback,
-                              make_execution_error)
+                              make_edit_cancelled_error, make_execution_error)
 from mitosheet.saved_analyses import write_save_analysis_file
+from mitosheet.sheet_data_arrow import is_arrow_sheet_data_enabled
 from mitosheet.steps_manager import StepsManager
 from mitosheet.telemetry.telemetry_utils import (log, log_event_processed,
                                                  telemetry_turned_on)
@@ -125,6 +130,22 @@ class MitoBackend():
 
         self.mito_send: Callable = lambda x: None # type: ignore
 
+        # If the comm is registered and the mito_config turns on arrow_sheet_data, the data of the
+        # sheets is sent in a binary buffer of the response. See mitosheet/sheet_data_arrow.py
+        self.arrow_sheet_data = False
+
+        # If the comm is registered, we only send the changes to the sheet data after the first
+        # response, as the frontend has the sheet data we last sent. See mitosheet/sheet_data_delta.py
+        self.sheet_data_deltas = False
+        self.last_sent_sheet_data: Optional[List[Dict[str, Any]]] = None
+
+        # The events that change the steps are executed in order by the edit executor. It
+        # is only threaded once the comm is registered. See register_comm_target_on_mito_backend
+        self.edit_executor = EditExecutor(
+            lambda edit_execution: self.process_message(edit_execution.event, edit_execution=edit_execution),
+            lambda message: self.mito_send(message)
+        )
+
         self.theme = theme
 
     @property
@@ -139,17 +160,59 @@ class MitoBackend():
     def analysis_name(self):
         return self.steps_manager.analysis_name
 
-    def get_shared_state_variables(self) -> Dict[str, Any]:
+    def get_shared_state_variables(self, sheet_data_json: Optional[str]=None) -> Dict[str, Any]:
         """
         Helper function for updating all the variables that are shared
         between the backend and the frontend through trailets.
         """
         return {
-            'sheet_data_json': self.steps_manager.sheet_data_json,
+            'sheet_data_json': self.steps_manager.sheet_data_json if sheet_data_json is None else sheet_data_json,
             'analysis_data_json': self.steps_manager.analysis_data_json,
             'user_profile_json': self.get_user_profile_json()
         }
 
+    def send_response_with_shared_state_variables(self, event_id: str) -> None:
+        """
+        Responds to the event with the shared state variables, so the frontend
+        renders the new sheet and the new code. 
+        
+        If arrow_sheet_data is turned on, the data of the sheets is sent in the 
+        buffers of the message, rather than in the sheet_data_json. Otherwise, if
+        sheet_data_deltas is turned on, only the changes to the sheet data since 
+        the last response are sent.
+        """
+        if not self.arrow_sheet_data and self.sheet_data_deltas and self.last_sent_sheet_data is not None:
+            sheet_data_delta_json = self.steps_manager.get_sheet_data_delta_json(self.last_sent_sheet_data)
+            self.last_sent_sheet_data = self.steps_manager.saved_sheet_data
+            self.mito_send({
+                'event': 'response',
+                'id': event_id,
+                'shared_variables': {
+                    **self.get_shared_state_variables(sheet_data_json=sheet_data_delta_json),
+                    'sheet_data_delta': True
+                }
+            })
+            return
+
+        if not self.arrow_sheet_data:
+            self.mito_send({
+                'event': 'response',
+                'id': event_id,
+                'shared_variables': self.get_shared_state_variables()
+            })
+            self.last_sent_sheet_data = self.steps_manager.saved_sheet_data
+            return
+
+        sheet_data_json, arrow_buffer = self.steps_manager.get_sheet_data_arrow()
+        self.mito_send({
+            'event': 'response',
+            'id': event_id,
+            'shared_variables': {
+                **self.get_shared_state_variables(sheet_data_json=sheet_data_json),
+                'sheet_data_arrow': True
+            }
+        }, buffers=[arrow_buffer])
+
     def get_user_profile_json(self) -> str:
         return json.dumps({
             # Dynamic, update each time
@@ -169,7 +232,7 @@ class MitoBackend():
         })
 
 
-    def handle_edit_event(self, event: Dict[str, Any]) -> None:
+    def handle_edit_event(self, event: Dict[str, Any], edit_execution: Optional[EditExecution]=None) -> None:
         """
         Handles an edit_event. Per the spec, an edit_event
         updates both the sheet and the codeblock, and as such
@@ -181,7 +244,7 @@ class MitoBackend():
         """
 
         # First, we send this new edit to the evaluator
-        self.steps_manager.handle_edit_event(event)
+        self.steps_manager.handle_edit_event(event, edit_execution=edit_execution)
 
         # Also, write the analysis to a file!
         write_save_analysis_file(self.steps_manager)
@@ -189,12 +252,23 @@ class MitoBackend():
         # Tell the front-end to render the new sheet and new code with an empty
         # response. NOTE: in the future, we can actually send back some data
         # with the response (like an error), to get this response in-place!        
-        self.mito_send({
-            'event': 'response',
-            'id': event['id'],
-            'shared_variables': self.get_shared_state_variables()
-        })
+        self.send_response_with_shared_state_variables(event['id'])
+
+
+    def handle_batch_edit_event(self, event: Dict[str, Any], edit_execution: Optional[EditExecution]=None) -> None:
+        """
+        Handles a batch_edit_event, which contains a list of edit_events that
+        are the result of a single bulk action by the user, like pasting into 
+        many cells. 
+        
+        All of the steps are executed in a single pass, and then the analysis
+        is written and the sheet is serialized once, rather than once per edit.
+        """
+        self.steps_manager.handle_batch_edit_event(event, edit_execution=edit_execution)
 
+        write_save_analysis_file(self.steps_manager)
+
+        self.send_response_with_shared_state_variables(event['id'])
 
     def handle_update_event(self, event: Dict[str, Any]) -> None:
         """
@@ -227,10 +301,36 @@ class MitoBackend():
 
         # Tell the front-end to render the new sheet and new code with an empty
         # response. 
+        self.send_response_with_shared_state_variables(event['id'])
+
+    def handle_cancel_edit(self, event: Dict[str, Any]) -> None:
+        """
+        Cancels the edit with the edit_event_id in the params, or all of the edits
+        that have not finished executing if there is no edit_event_id. 
+        
+        The cancelled edits are responded to with an error right away, so the frontend 
+        does not wait for them, and the steps are left as they were before them.
+        """
+        edit_event_id = event.get('params', {}).get('edit_event_id')
+        cancelled_event_ids = self.edit_executor.cancel(edit_event_id)
+
+        error = make_edit_cancelled_error()
+        for cancelled_event_id in cancelled_event_ids:
+            self.mito_send({
+                'event': 'error',
+                'id': cancelled_event_id,
+                'error': error.to_fix,
+                'errorShort': error.header,
+                'traceback': None,
+                'showErrorModal': error.error_modal
+            })
+
         self.mito_send({
             'event': 'response',
             'id': event['id'],
-            'shared_variables': self.get_shared_state_variables()
+            'data': {
+                'cancelled_edit_event_ids': cancelled_event_ids
+            }
         })
 
     def receive_message(self, content: Dict[str, Any]) -> bool:
@@ -249,16 +349,39 @@ class MitoBackend():
         updating the backend state.
 
         4. A log_event is just an event that should get logged on the backend.
+
+        5. batch_edit_event: a list of edit_events that are executed together, and
+        lead to a single reevaluation and re-transpile.
+
+        6. cancel_edit: cancels edit_events and batch_edit_events that have not finished
+        executing yet.
+
+        The events that change the steps are executed in order by the edit_executor, which 
+        executes them on a worker thread when in Jupyter, so they do not block the kernel.
+        """
+        event = content
+        if event['event'] in ['edit_event', 'update_event', 'batch_edit_event']:
+            return self.edit_executor.submit(event, cancellable=event['event'] != 'update_event')
+
+        return self.process_message(event)
+
+    def process_message(self, event: Dict[str, Any], edit_execution: Optional[EditExecution]=None) -> bool:
+        """
+        Processes a message from the JS widget. See receive_message. Returns True
+        if the message was processed successfully.
         """
 
         start_time: Optional[float] = time.perf_counter()
-        event = content
 
         try:
             if event['event'] == 'edit_event':
-                self.handle_edit_event(event)
+                self.handle_edit_event(event, edit_execution=edit_execution)
             elif event['event'] == 'update_event':
                 self.handle_update_event(event)
+            elif event['event'] == 'batch_edit_event':
+                self.handle_batch_edit_event(event, edit_execution=edit_execution)
+            elif event['event'] == 'cancel_edit':
+                self.handle_cancel_edit(event)
             elif event['event'] == 'api_call':
                 self.api.process_new_api_call(event)
                 # NOTE: since API calls are in a seperate thread, their start time and end
@@ -281,6 +404,10 @@ class MitoBackend():
             # Log processing this event failed
             log_event_processed(event, self.steps_manager, failed=True, error=e, start_time=start_time)
 
+            # The error for a cancelled edit was already sent when it was cancelled
+            if edit_execution is not None and edit_execution.cancelled:
+                return False
+
             # Report it to the user, and then return
             self.mito_send({
                 'event': 'error',
@@ -296,6 +423,10 @@ class MitoBackend():
             
             # We log that processing failed, but have no edit error
             log_event_processed(event, self.steps_manager, failed=True, start_time=start_time)
+
+            if edit_execution is not None and edit_execution.cancelled:
+                return False
+
             # Report it to the user, and then return
             self.mito_send({
                 'event': 'error',
@@ -308,6 +439,9 @@ class MitoBackend():
 
         return False
 
+# Payloads smaller than this are not worth the time to deflate and inflate
+FRONTEND_PAYLOAD_DEFLATE_MIN_BYTES = 1024
+
 with open(os.path.normpath(os.path.join(__file__, '..', 'mito_frontend.js'))) as f:
     js_code_from_file = f.read()
 with open(os.path.normpath(os.path.join(__file__, '..', 'mito_frontend.css'))) as f:
@@ -353,8 +487,26 @@ def register_comm_target_on_mito_backend(
             # Register handler for any incoming messages
             mito_backend.receive_message(msg['content']['data'])
         
-        # Save the comm in the mito widget, so we can use this .send function
-        mito_backend.mito_send = comm.send
+        # Save the comm in the mito widget, so we can use this .send function. If the frontend 
+        # supports compressed messages, and they are turned on, we compress large messages
+        comm_compression = get_negotiated_comm_compression(mito_backend.steps_manager.mito_config, open_msg['content']['data'])
+        comm_compression_threshold = mito_backend.steps_manager.mito_config.comm_compression_threshold
+        if comm_compression is not None and comm_compression_threshold is not None:
+            mito_backend.mito_send = get_compressing_send(comm.send, comm_compression_threshold)
+        else:
+            mito_backend.mito_send = comm.send
+
+        # The comm can send binary buffers, so we send the sheet data as Arrow if it is turned on
+        mito_backend.arrow_sheet_data = is_arrow_sheet_data_enabled(mito_backend.steps_manager.mito_config)
+
+        # The frontend of the comm only has the sheet data it rendered with, so we send it all of the 
+        # sheet data with the first response, and only the changes to it after that
+        mito_backend.sheet_data_deltas = True
+        mito_backend.last_sent_sheet_data = None
+
+        # Now that edits can be responded to after the message handler returns, we execute 
+        # them on a worker thread, so that long edits do not block the kernel
+        mito_backend.edit_executor.threaded = get_api_should_be_threaded()
 
         # Send data to the frontend on creation, so the frontend knows that we have
         # actually registered the comm on the backend
@@ -365,6 +517,29 @@ def register_comm_target_on_mito_backend(
 
     return mito_backend
 
+def get_frontend_payload(string: str) -> str:
+    """
+    Returns the string encoded so it can be embedded in the frontend code, which is the
+    encoding, a colon, and then the base64 of the utf8 bytes of the string, which are
+    deflated first if the string is large.
+    """
+    string_bytes = string.encode('utf8')
+    if len(string_bytes) >= FRONTEND_PAYLOAD_DEFLATE_MIN_BYTES:
+        return 'deflate:' + base64.b64encode(zlib.compress(string_bytes)).decode('ascii')
+    return 'base64:' + base64.b64encode(string_bytes).decode('ascii')
+
+
+def get_string_from_frontend_payload(payload: str) -> str:
+    """
+    Returns the string encoded in the payload, as the frontend decodes it. Useful for testing.
+    """
+    encoding, encoded_string = payload.split(':', 1)
+    string_bytes = base64.b64decode(encoded_string)
+    if encoding == 'deflate':
+        string_bytes = zlib.decompress(string_bytes)
+    return string_bytes.decode('utf8')
+
+
 def get_mito_frontend_code(kernel_id: str, comm_target_id: str, div_id: str, mito_backend: MitoBackend) -> str:
 
     js_code = js_code_from_file.replace('REPLACE_THIS_WITH_DIV_ID', div_id)
@@ -374,14 +549,16 @@ def get_mito_frontend_code(kernel_id: str, comm_target_id: str, div_id: str, mit
     # with ` quotes, which properly contain the CSS string
     js_code = js_code.replace('"REPLACE_THIS_WITH_CSS"', "`" + css_code_from_file + "`")
     js_code = js_code.replace('`REPLACE_THIS_WITH_CSS`', "`" + css_code_from_file + "`")
-    # NOTE: we encode these as utf8 encoded byte arrays, so that we can avoid having to do complicated things with 
+    # NOTE: we encode these as base64 strings, so that we can avoid having to do complicated things with 
     # replacing \t, etc, which is required because JSON.parse limits what characters are valid in strings (bah humbug)
-    def to_uint8_arr(string: str) -> List[int]:
-        return np.frombuffer(string.encode("utf8"), dtype=np.uint8).tolist()
-
-    js_code = js_code.replace('["REPLACE_THIS_WITH_SHEET_DATA_BYTES"]', f'{to_uint8_arr(mito_backend.steps_manager.sheet_data_json)}')
-    js_code = js_code.replace('["REPLACE_THIS_WITH_ANALYSIS_DATA_BYTES"]', f'{to_uint8_arr(mito_backend.steps_manager.analysis_data_json)}')
-    js_code = js_code.replace('["REPLACE_THIS_WITH_USER_PROFILE_BYTES"]', f'{to_uint8_arr(mito_backend.get_user_profile_json())}')
+    payloads = {
+        'REPLACE_THIS_WITH_SHEET_DATA_PAYLOAD': get_frontend_payload(mito_backend.steps_manager.get_initial_render_sheet_data_json()),
+        'REPLACE_THIS_WITH_ANALYSIS_DATA_PAYLOAD': get_frontend_payload(mito_backend.steps_manager.analysis_data_json),
+        'REPLACE_THIS_WITH_USER_PROFILE_PAYLOAD': get_frontend_payload(mito_backend.get_user_profile_json()),
+    }
+    for placeholder, payload in payloads.items():
+        js_code = js_code.replace(f'"{placeholder}"', f'"{payload}"')
+        js_code = js_code.replace(f"'{placeholder}'", f'"{payload}"')
 
     return js_code
 
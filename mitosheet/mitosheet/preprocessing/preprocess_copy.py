@@ -9,12 +9,16 @@ import pandas as pd
 from mitosheet.preprocessing.preprocess_step_performer import \
     PreprocessStepPerformer
 from mitosheet.types import StepsManagerType
+from mitosheet.utils import is_pandas_copy_on_write_enabled
 
 
 class CopyPreprocessStepPerformer(PreprocessStepPerformer):
     """
     This preprocessing step is responsible for making a copy of all of the
     passed arguments, so that dataframes aren't modified incorrectly.
+
+    With pandas Copy-on-Write, the copies of dataframes are shallow, as they
+    cannot be modified through each other anyways.
     """
 
     @classmethod
@@ -28,11 +32,13 @@ class CopyPreprocessStepPerformer(PreprocessStepPerformer):
     @classmethod
     def execute(cls, args: Collection[Any]) -> Tuple[List[Any], Optional[List[str]], Optional[Dict[str, Any]]]:
         
+        deep_copy = not is_pandas_copy_on_write_enabled()
+
         new_args = []
         for arg in args:
             if isinstance(arg, pd.DataFrame):
                 # Do a pandas copy if it's a dataframe
-                arg_copy = arg.copy(deep=True)
+                arg_copy = arg.copy(deep=deep_copy)
             else:
                 # Simple deepcopy if it's a string
                 arg_copy = deepcopy(arg)
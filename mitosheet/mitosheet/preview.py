@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Every edit in Mito executes on the full dataframes, which makes exploring a
+dataframe with hundreds of millions of rows impossible, as each click takes
+minutes.
+
+If the mito_config sets a preview_row_threshold, then any dataframe with more
+rows than this is replaced with a deterministic sample of this many rows after
+the step that creates it, and is marked as a preview. Any sheet a step creates
+or edits from a preview is also a preview. The frontend displays a badge on
+these sheets.
+
+The generated code does not depend on the sample, so it always executes on the
+full data. When the full data is needed by Mito itself, e.g. to download a sheet
+or to export it to a file, the StepsManager executes the steps again without
+sampling. See StepsManager.get_full_data_state.
+"""
+from typing import Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.state import State
+
+# The seed of the sample, so the same rows are sampled every time the steps are executed
+PREVIEW_SAMPLE_SEED = 0
+
+
+def get_preview_sample(df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    """
+    Returns a deterministic sample of num_rows rows of the dataframe, in the order
+    they are in the dataframe. The index labels of the rows are kept, so that steps
+    that edit specific rows edit the same rows in the full data.
+    """
+    row_positions = np.random.default_rng(PREVIEW_SAMPLE_SEED).choice(len(df), size=num_rows, replace=False)
+    row_positions.sort()
+    return df.iloc[row_positions]
+
+
+def get_post_state_preview_sheet_indexes(
+        prev_state: State,
+        post_state: State,
+        sheet_reads_and_writes: Optional[Tuple[Set[int], Set[int]]]
+    ) -> Set[int]:
+    """
+    Returns the sheets in the post_state that are created or edited from a preview
+    in the prev_state, plus the sheets that were previews already.
+
+    If the step does not tell us which sheets it reads and writes, then we conservatively
+    say that every sheet is a preview, as long as any of the sheets are.
+    """
+    # NOTE: the step may have updated the preview sheets already, e.g. if it deletes a sheet
+    preview_sheet_indexes = set(post_state.preview_sheet_indexes)
+    if len(prev_state.preview_sheet_indexes) == 0:
+        return preview_sheet_indexes
+
+    if sheet_reads_and_writes is None:
+        if len(preview_sheet_indexes) == 0:
+            return preview_sheet_indexes
+        return set(range(len(post_state.dfs)))
+
+    read_sheet_indexes, written_sheet_indexes = sheet_reads_and_writes
+    if len(read_sheet_indexes.intersection(prev_state.preview_sheet_indexes)) > 0:
+        preview_sheet_indexes.update(written_sheet_indexes)
+
+    return preview_sheet_indexes
+
+
+def get_sampled_post_state(
+        prev_state: State,
+        post_state: State,
+        sheet_reads_and_writes: Optional[Tuple[Set[int], Set[int]]],
+        preview_row_threshold: int
+    ) -> State:
+    """
+    Returns the post_state with every dataframe with more than preview_row_threshold rows
+    replaced with a sample of them, and with the sheets that are previews updated.
+
+    If any dataframe is sampled, this returns a copy of the post_state, as the post_state
+    may be identified by the step that created it in the step result cache.
+    """
+    preview_sheet_indexes = get_post_state_preview_sheet_indexes(prev_state, post_state, sheet_reads_and_writes)
+
+    sheet_indexes_to_sample = [sheet_index for sheet_index, df in enumerate(post_state.dfs) if len(df) > preview_row_threshold]
+    if len(sheet_indexes_to_sample) > 0:
+        post_state = post_state.copy()
+        for sheet_index in sheet_indexes_to_sample:
+            post_state.dfs[sheet_index] = get_preview_sample(post_state.dfs[sheet_index], preview_row_threshold)
+            preview_sheet_indexes.add(sheet_index)
+
+    post_state.preview_sheet_indexes = preview_sheet_indexes
+    return post_state
+
+
+def get_sampled_initial_state(initial_state: State, preview_row_threshold: int) -> State:
+    """
+    Returns the state the analysis starts from, with every dataframe with more than 
+    preview_row_threshold rows replaced with a sample of them.
+    """
+    return get_sampled_post_state(initial_state, initial_state, None, preview_row_threshold)
@@ -1,9 +1,185 @@
+"""
+Conditional formats are evaluated every time the sheet data or a window of rows of a
+sheet is sent to the frontend, as well as every time code is generated. Filters that
+need the full dataframe, like most frequent or highest values, have to compute the
+value_counts or nlargest of the entire column each time.
+
+So, the result of each filter of a conditional format on a column is cached as a bitmap
+of the row positions that it applies to. A result is keyed by the dataframe it is computed
+on, which is only weakly referenced, and so is cached for as long as the state that the
+dataframe is in. Results of filters that need the full dataframe are computed for all rows
+once and then sliced for each window of rows, and other filters are only computed on the
+window of rows that is displayed.
+"""
 import json
-from typing import Any, Dict, List, Optional
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
-from mitosheet.types import ConditionalFormattingCellResults, ConditionalFormattingInvalidResults, ConditionalFormattingResult, StateType
+
+from mitosheet.types import ColumnHeader, ConditionalFormattingCellResults, ConditionalFormattingInvalidResults, ConditionalFormattingResult, StateType
 from mitosheet.utils import MAX_ROWS, NpEncoder
 
+# The bitmaps take a bit per row, so this is about 20 results for 10 million rows
+CONDITIONAL_FORMATTING_CACHE_MAX_NUM_BYTES = 25_000_000
+
+
+class ConditionalFormattingCache:
+    """
+    An LRU cache from a dataframe, a column header, the filters of a conditional format and a
+    window of rows, to a bitmap of the rows in the window that the filters apply to, or None
+    if the filters are invalid for the column.
+
+    The cache is used both when executing edits and when answering API calls, which happen on
+    different threads, so all reads and writes of it take a lock. When a dataframe is garbage
+    collected, which can happen in the middle of changing the cache, its key is only recorded,
+    and its result is removed the next time the cache is used.
+    """
+
+    def __init__(self, max_num_bytes: int=CONDITIONAL_FORMATTING_CACHE_MAX_NUM_BYTES):
+        self.max_num_bytes = max_num_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # From the id of the dataframe, the column header, the filters and the window, to a weakref to
+        # the dataframe and the bitmap, which is None if the filters are invalid
+        self._results: 'OrderedDict[Tuple[int, Any, str, Tuple[int, int]], Tuple[weakref.ReferenceType, Optional[np.ndarray]]]' = OrderedDict()
+        self.num_bytes = 0
+
+        # The keys of the results whose dataframes were garbage collected
+        self._collected_keys: List[Tuple[int, Any, str, Tuple[int, int]]] = []
+
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_collected_results()
+            return len(self._results)
+
+    def get(self, df: pd.DataFrame, column_header: ColumnHeader, filters_key: str, window: Tuple[int, int]) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Returns if there is a result cached, as well as the bitmap of it.
+        """
+        key = (id(df), column_header, filters_key, window)
+        with self._lock:
+            self._remove_collected_results()
+            entry = self._results.get(key)
+            if entry is None or entry[0]() is not df:
+                self.misses += 1
+                return False, None
+
+            self._results.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, df: pd.DataFrame, column_header: ColumnHeader, filters_key: str, window: Tuple[int, int], bitmap: Optional[np.ndarray]) -> None:
+        key = (id(df), column_header, filters_key, window)
+        with self._lock:
+            self._remove_collected_results()
+            self._remove(key)
+
+            num_bytes = bitmap.nbytes if bitmap is not None else 0
+            if num_bytes > self.max_num_bytes:
+                return
+
+            df_ref = weakref.ref(df, lambda _: self._collected_keys.append(key))
+            self._results[key] = (df_ref, bitmap)
+            self.num_bytes += num_bytes
+
+            while self.num_bytes > self.max_num_bytes:
+                _, (_, evicted_bitmap) = self._results.popitem(last=False)
+                self.num_bytes -= evicted_bitmap.nbytes if evicted_bitmap is not None else 0
+
+    def _remove(self, key: Tuple[int, Any, str, Tuple[int, int]]) -> None:
+        entry = self._results.pop(key, None)
+        if entry is not None and entry[1] is not None:
+            self.num_bytes -= entry[1].nbytes
+
+    def _remove_collected_results(self) -> None:
+        while len(self._collected_keys) > 0:
+            key = self._collected_keys.pop()
+            entry = self._results.get(key)
+            # The id may already be used by a new dataframe, which we keep the result of
+            if entry is not None and entry[0]() is None:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._collected_keys.clear()
+            self.num_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+conditional_formatting_cache = ConditionalFormattingCache()
+
+
+def _get_window_row_positions(bitmap: np.ndarray, start_row: int, end_row: int) -> np.ndarray:
+    """
+    Returns the positions of the rows between start_row and end_row that are set in the bitmap,
+    relative to start_row.
+    """
+    start_byte = start_row // 8
+    end_byte = (end_row + 7) // 8
+    mask = np.unpackbits(bitmap[start_byte:end_byte])
+    offset = start_row - start_byte * 8
+    return np.flatnonzero(mask[offset:offset + (end_row - start_row)])
+
+
+def _get_json_indexes(index: pd.Index) -> List[str]:
+    """
+    Returns the index labels as they are keyed in the results, which are consistent with how the
+    index is sent to the frontend, except that strings do not have quotes around them.
+    """
+    if pd.api.types.is_integer_dtype(index.dtype):
+        return index.astype(str).tolist()
+
+    index_list = index.tolist()
+    if index.dtype == object and all(isinstance(label, str) for label in index_list):
+        return index_list
+    return [label if isinstance(label, str) else json.dumps(label, cls=NpEncoder) for label in index_list]
+
+
+def _get_filters_bitmap(df: pd.DataFrame, column_header: ColumnHeader, filters: List[Any], start_row: int, end_row: int) -> Tuple[np.ndarray, int, int]:
+    """
+    Returns the bitmap of the rows that the filters apply to, as well as the rows it starts and ends at,
+    which are either the rows of the window, or all rows if the filters need the full dataframe.
+    """
+    from mitosheet.step_performers.filter import (
+        check_filters_contain_condition_that_needs_full_df,
+        get_full_applied_filter)
+
+    filters_key = json.dumps(filters, sort_keys=True, cls=NpEncoder)
+
+    # Certain filter conditions require the entire dataframe to be present, as they calculate based
+    # on the full dataframe. In other cases, we only operate on the rows we display, for speed
+    if check_filters_contain_condition_that_needs_full_df(filters):
+        bitmap_start_row, bitmap_end_row = 0, len(df)
+    else:
+        bitmap_start_row, bitmap_end_row = start_row, end_row
+
+    window = (bitmap_start_row, bitmap_end_row)
+    found, bitmap = conditional_formatting_cache.get(df, column_header, filters_key, window)
+    if found:
+        if bitmap is None:
+            raise ValueError(f'Filters are invalid for column {column_header}')
+        return bitmap, bitmap_start_row, bitmap_end_row
+
+    try:
+        df_window = df if window == (0, len(df)) else df.iloc[bitmap_start_row:bitmap_end_row]
+        full_applied_filter, _ = get_full_applied_filter(df_window, column_header, 'And', filters)
+        bitmap = np.packbits(full_applied_filter.to_numpy(dtype=bool))
+    except Exception:
+        conditional_formatting_cache.put(df, column_header, filters_key, window, None)
+        raise
+
+    conditional_formatting_cache.put(df, column_header, filters_key, window, bitmap)
+    return bitmap, bitmap_start_row, bitmap_end_row
+
 
 def get_conditonal_formatting_result(
         state: StateType,
@@ -11,57 +187,51 @@ def get_conditonal_formatting_result(
         df: pd.DataFrame,
         conditional_formatting_rules: List[Dict[str, Any]],
         max_rows: Optional[int]=MAX_ROWS,
-    ) -> ConditionalFormattingResult: 
-    from mitosheet.step_performers.filter import check_filters_contain_condition_that_needs_full_df
-
+        start_row: int=0,
+    ) -> ConditionalFormattingResult:
+    """
+    Returns the cells in the max_rows rows from start_row that each conditional format applies to,
+    as well as the conditional formats that are invalid for some of their columns.
+    """
     invalid_conditional_formats: ConditionalFormattingInvalidResults = dict()
     formatted_result: ConditionalFormattingCellResults = dict()
 
-    for conditional_format in conditional_formatting_rules:
-        try:
+    start_row = min(max(start_row, 0), len(df))
+    end_row = len(df) if max_rows is None else min(start_row + max_rows, len(df))
 
-            format_uuid = conditional_format["format_uuid"]
-            column_ids = conditional_format["columnIDs"]
+    # We only turn the index labels into json for the rows that are formatted, and only once
+    json_indexes: Dict[int, str] = dict()
+    index = df.index
 
-            for column_id in column_ids:
-                if column_id not in formatted_result:
-                    formatted_result[column_id] = dict()
+    for conditional_format in conditional_formatting_rules:
+        format_uuid = conditional_format["format_uuid"]
+        filters  = conditional_format["filters"]
+        cell_format = {'backgroundColor': conditional_format.get("backgroundColor", None), 'color': conditional_format.get("color", None)}
 
-                filters  = conditional_format["filters"]
-                backgroundColor = conditional_format.get("backgroundColor", None)
-                color = conditional_format.get("color", None)
-                
-                # Certain filter conditions require the entire dataframe to be present, as they calculate based
-                # on the full dataframe. In other cases, we only operate on the first 1500 rows, for speed
-                _df = df
-                if not check_filters_contain_condition_that_needs_full_df(filters):
-                    df = df.head(max_rows)
+        for column_id in conditional_format["columnIDs"]:
+            if column_id not in formatted_result:
+                formatted_result[column_id] = dict()
 
+            try:
                 column_header = state.column_ids.get_column_header_by_id(sheet_index, column_id)
+                bitmap, bitmap_start_row, bitmap_end_row = _get_filters_bitmap(df, column_header, filters, start_row, end_row)
+            except Exception:
+                if format_uuid not in invalid_conditional_formats:
+                    invalid_conditional_formats[format_uuid] = []
+                invalid_conditional_formats[format_uuid].append(column_id)
+                continue
 
-                # Use the get_applied_filter function from our filtering infrastructure
-                from mitosheet.step_performers.filter import \
-                    get_full_applied_filter
-                full_applied_filter, _ = get_full_applied_filter(_df, column_header, 'And', filters)
-
-                # We can only take the first max_rows here, as this is all we need
-                applied_indexes = _df[full_applied_filter].head(max_rows).index.tolist()
+            row_positions = _get_window_row_positions(bitmap, start_row - bitmap_start_row, end_row - bitmap_start_row) + start_row
 
-                for index in applied_indexes:
-                    # We need to make this index valid json, and do so in a way that is consistent with how indexes
-                    # are sent to the frontend. However, if the index is a string, we don't want to add quotes around it
-                    if isinstance(index, str):
-                        json_index = index
-                    else:
-                        json_index = json.dumps(index, cls=NpEncoder)
-                    formatted_result[column_id][json_index] = {'backgroundColor': backgroundColor, 'color': color}
+            new_row_positions = [row_position for row_position in row_positions.tolist() if row_position not in json_indexes]
+            if len(new_row_positions) > 0:
+                json_indexes.update(zip(new_row_positions, _get_json_indexes(index[new_row_positions])))
 
-        except Exception as e:
-            if format_uuid not in invalid_conditional_formats:
-                invalid_conditional_formats[format_uuid] = []
-            invalid_conditional_formats[format_uuid].append(column_id)
+            column_result = formatted_result[column_id]
+            for row_position in row_positions.tolist():
+                column_result[json_indexes[row_position]] = cell_format
 
     return {
         'invalid_conditional_formats': invalid_conditional_formats,
         'results': formatted_result
-    }
\ No newline at end of file
+    }
@@ -11,7 +11,7 @@ in analyses.
 from mitosheet.step import Step
 import os
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from mitosheet._version import __version__
 from mitosheet.types import CodeOptions, StepsManagerType
 from mitosheet.utils import NpEncoder
@@ -120,7 +120,7 @@ def rename_saved_analysis(old_analysis_name, new_analysis_name):
 def get_saved_analysis_string(steps_manager: StepsManagerType) -> str:
     saved_analysis_string = json.dumps({
         'version': __version__,
-        'steps_data': get_steps_obj_for_saved_analysis(steps_manager.steps_including_skipped),
+        'steps_data': get_steps_obj_for_saved_analysis(steps_manager.steps_including_skipped, steps_manager.step_skip_index.get_step_indexes_to_skip()),
         'public_interface_version': steps_manager.public_interface_version,
         'args': steps_manager.original_args_raw_strings,
         'code': steps_manager.code(),
@@ -135,7 +135,8 @@ def _write_saved_analysis_file(analysis_path: str, steps_manager: StepsManagerTy
 
 
 def get_steps_obj_for_saved_analysis(
-        steps: List[Step]
+        steps: List[Step],
+        skipped_step_indexes: Optional[Set[int]]=None
     ) -> List[Dict[str, Any]]:
     """
     Given a steps dictonary from a steps_manager, puts the steps
@@ -157,13 +158,14 @@ def get_steps_obj_for_saved_analysis(
 
     Notably, does not return any skipped steps, which is necessary
     because we don't save the step id, so then we cannot detect
-    which should be skipped properly
+    which should be skipped properly. If the skipped_step_indexes are not
+    passed, they are computed from the steps.
     """
-    from mitosheet.steps_manager import get_step_indexes_to_skip
-
     steps_json_obj = []
 
-    skipped_step_indexes = get_step_indexes_to_skip(steps)
+    if skipped_step_indexes is None:
+        from mitosheet.steps_manager import get_step_indexes_to_skip
+        skipped_step_indexes = get_step_indexes_to_skip(steps)
 
     for step_index, step in enumerate(steps):
         # Skip the initialize step
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+The sheet data is sent to the frontend as JSON, which for numeric data is larger 
+than the data itself, and which the frontend has to parse.
+
+If the mito_config turns on arrow_sheet_data, and pyarrow is installed, then the
+data of the columns is instead sent as a single binary buffer, which contains an
+Arrow IPC stream for each sheet. The rest of the sheet data, e.g. the column headers,
+the index and the formatting, is still sent as JSON. Each sheet in the JSON has an
+arrowStream with the offset and length of its stream in the buffer, and the columns
+in the stream have a columnData of None.
+
+The values in the Arrow are the values that are in the JSON, except that the 'NaN'
+of float columns are nulls, which the frontend turns back into 'NaN'. Columns with
+dtypes that Arrow cannot represent with a single type, like mixed objects, are still
+sent as JSON.
+
+In JupyterLab, the buffer is sent in the buffers of the comm message, and in Streamlit,
+it is a bytes argument of the component. Dash props must be JSON, so Dash always
+sends JSON.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.column_headers import ColumnIDMap
+from mitosheet.enterprise.mito_config import MitoConfig
+from mitosheet.is_type_utils import is_datetime_dtype, is_timedelta_dtype
+from mitosheet.types import (ColumnID, DataframeFormat,
+                             FrontendFormulaAndLocation, StateType)
+from mitosheet.utils import (MAX_COLUMNS, MAX_ROWS, df_to_json_dumpsable,
+                             get_column_json_data, get_columnar_json_data,
+                             get_rounded_float_values, is_pyarrow_installed)
+
+INT32_MIN = np.iinfo(np.int32).min
+INT32_MAX = np.iinfo(np.int32).max
+
+
+def is_arrow_sheet_data_enabled(mito_config: MitoConfig) -> bool:
+    return mito_config.arrow_sheet_data and is_pyarrow_installed()
+
+
+def _get_arrow_column(column: pd.Series) -> Optional[Any]:
+    """
+    Returns the column as an Arrow array with the same values as in the sheet data JSON,
+    or None if it cannot be represented as a single Arrow type.
+    """
+    import pyarrow as pa
+
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind == 'b':
+        return pa.array(column.to_numpy())
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        values = column.to_numpy()
+        # The frontend reads 64 bit integers as BigInts, so we send integers as int32 if they fit, and
+        # otherwise as float64, which is what JSON.parse reads them as anyways
+        if len(values) == 0 or (values.min() >= INT32_MIN and values.max() <= INT32_MAX):
+            return pa.array(values.astype(np.int32))
+        return pa.array(values.astype(np.float64))
+    if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+        rounded_values = get_rounded_float_values(column.to_numpy())
+        return pa.array(rounded_values, mask=np.isnan(rounded_values))
+
+    dtype_str = str(dtype)
+    if is_datetime_dtype(dtype_str) or is_timedelta_dtype(dtype_str) or dtype_str == 'string' or dtype == object:
+        column_data = get_column_json_data(column)
+        if column_data is None:
+            return None
+        try:
+            return pa.array(column_data, type=pa.string())
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return None
+
+    return None
+
+
+def get_arrow_stream_and_column_indexes(df: pd.DataFrame) -> Tuple[bytes, List[int]]:
+    """
+    Returns an Arrow IPC stream with the columns of the dataframe that can be represented
+    in Arrow, named by their index in the dataframe, as well as these indexes.
+    """
+    import pyarrow as pa
+
+    arrow_columns = []
+    arrow_column_indexes = []
+    for column_index in range(df.shape[1]):
+        arrow_column = _get_arrow_column(df.iloc[:, column_index])
+        if arrow_column is not None:
+            arrow_columns.append(arrow_column)
+            arrow_column_indexes.append(column_index)
+
+    record_batch = pa.RecordBatch.from_arrays(arrow_columns, names=[str(column_index) for column_index in arrow_column_indexes])
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, record_batch.schema) as writer:
+        writer.write_batch(record_batch)
+
+    return sink.getvalue().to_pybytes(), arrow_column_indexes
+
+
+def df_to_json_dumpsable_and_arrow_stream(
+        state: StateType,
+        original_df: pd.DataFrame,
+        sheet_index: int,
+        df_name: str,
+        df_source: str,
+        column_formulas: Dict[ColumnID, List[FrontendFormulaAndLocation]],
+        column_filters: Dict[ColumnID, Any],
+        column_headers_to_column_ids: Dict[Any, ColumnID],
+        df_format: DataframeFormat,
+    ) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Returns the same sheet data as df_to_json_dumpsable, except that the columnData
+    of the columns in the returned Arrow IPC stream is None.
+    """
+    # We get everything but the data of the columns, which we fill in below
+    sheet_data = df_to_json_dumpsable(
+        state,
+        original_df,
+        sheet_index,
+        df_name,
+        df_source,
+        column_formulas,
+        column_filters,
+        column_headers_to_column_ids,
+        df_format,
+        max_rows=MAX_ROWS,
+        max_columns=MAX_COLUMNS,
+        include_column_data=False
+    )
+
+    df = original_df.head(MAX_ROWS).iloc[:, :MAX_COLUMNS]
+    arrow_stream, arrow_column_indexes = get_arrow_stream_and_column_indexes(df)
+
+    json_column_indexes = sorted(set(range(df.shape[1])).difference(arrow_column_indexes))
+    if len(json_column_indexes) > 0:
+        columns_data, _ = get_columnar_json_data(df.iloc[:, json_column_indexes], max_rows=None, max_columns=len(json_column_indexes))
+        for column_index, column_data in zip(json_column_indexes, columns_data):
+            sheet_data['data'][column_index]['columnData'] = column_data
+
+    return sheet_data, arrow_stream
+
+
+def dfs_to_array_for_json_and_arrow(
+        state: StateType,
+        modified_sheet_indexes: Set[int],
+        previous_array_and_arrow_streams: List[Tuple[Dict[str, Any], bytes]],
+        dfs: List[pd.DataFrame],
+        df_names: List[str],
+        df_sources: List[str],
+        column_formulas_array: List[Dict[ColumnID, List[FrontendFormulaAndLocation]]],
+        column_filters_array: List[Dict[ColumnID, Any]],
+        column_ids: ColumnIDMap,
+        df_formats: List[DataframeFormat]
+    ) -> List[Tuple[Dict[str, Any], bytes]]:
+    """
+    Like dfs_to_array_for_json, but returns the sheet data and Arrow IPC stream of each sheet.
+    """
+    new_array_and_arrow_streams = []
+    for sheet_index, df in enumerate(dfs):
+        if sheet_index in modified_sheet_indexes:
+            new_array_and_arrow_streams.append(
+                df_to_json_dumpsable_and_arrow_stream(
+                    state,
+                    df,
+                    sheet_index,
+                    df_names[sheet_index],
+                    df_sources[sheet_index],
+                    column_formulas_array[sheet_index],
+                    column_filters_array[sheet_index],
+                    column_ids.column_header_to_column_id[sheet_index],
+                    df_formats[sheet_index],
+                )
+            )
+        else:
+            new_array_and_arrow_streams.append(previous_array_and_arrow_streams[sheet_index])
+
+    return new_array_and_arrow_streams
+
+
+def get_array_and_arrow_buffer(array_and_arrow_streams: List[Tuple[Dict[str, Any], bytes]]) -> Tuple[List[Dict[str, Any]], bytes]:
+    """
+    Returns the sheet data of each sheet with the arrowStream that locates its stream
+    in the returned buffer, which contains all of the streams.
+    """
+    array = []
+    offset = 0
+    for sheet_data, arrow_stream in array_and_arrow_streams:
+        array.append({**sheet_data, 'arrowStream': {'offset': offset, 'length': len(arrow_stream)}})
+        offset += len(arrow_stream)
+
+    return array, b''.join(arrow_stream for _, arrow_stream in array_and_arrow_streams)
+
+
+def get_array_from_array_and_arrow_buffer(array: List[Dict[str, Any]], arrow_buffer: bytes) -> List[Dict[str, Any]]:
+    """
+    Returns the sheet data with the data of the columns read from the Arrow buffer, as
+    the frontend reads it. Useful for testing.
+    """
+    import pyarrow as pa
+
+    new_array = []
+    for sheet_data in array:
+        sheet_data = {**sheet_data, 'data': [{**column} for column in sheet_data['data']]}
+        arrow_stream = sheet_data.pop('arrowStream')
+        table = pa.ipc.open_stream(arrow_buffer[arrow_stream['offset']:arrow_stream['offset'] + arrow_stream['length']]).read_all()
+        for column_name in table.column_names:
+            sheet_data['data'][int(column_name)]['columnData'] = [
+                'NaN' if value is None else value for value in table.column(column_name).to_pylist()
+            ]
+        new_array.append(sheet_data)
+
+    return new_array
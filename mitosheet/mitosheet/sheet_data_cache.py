@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+The sheet data of a sheet only depends on the state it is in. When the user
+undoes, redoes, or checks out a step, we display a state that we have likely
+displayed before, and so we can send the sheet data we serialized for it then,
+rather than serializing all of the sheets again.
+
+The SheetDataCache is an LRU cache from a state and a sheet index to the sheet
+data of that sheet. It is bounded by the number of cells of sheet data it holds,
+as the sheet data of a single sheet can be large.
+"""
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from mitosheet.state import State
+
+# Sheet data is at most MAX_ROWS rows, but for wide sheets, a single sheet can
+# still have a few million cells
+SHEET_DATA_CACHE_MAX_NUM_CELLS = 5_000_000
+
+
+def get_sheet_data_num_cells(sheet_data: Dict[str, Any]) -> int:
+    return len(sheet_data['index']) * max(len(sheet_data['data']), 1)
+
+
+class SheetDataCache:
+    """
+    An LRU cache from a state and sheet index to the sheet data of that sheet. The
+    states are only weakly referenced, so states that are evicted from the step
+    history are not kept in memory.
+    """
+
+    def __init__(self, max_num_cells: int=SHEET_DATA_CACHE_MAX_NUM_CELLS):
+        self.max_num_cells = max_num_cells
+        self.hits = 0
+        self.misses = 0
+
+        # From the id of a state and a sheet index, to a weakref to the state, the name and source
+        # of the sheet when it was serialized, the sheet data and its number of cells
+        self._sheet_data: 'OrderedDict[Tuple[int, int], Tuple[weakref.ReferenceType, str, str, Dict[str, Any], int]]' = OrderedDict()
+        self.num_cells = 0
+
+    def get(self, state: State, sheet_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns the sheet data cached for this sheet of the state, or None if there is none.
+        """
+        key = (id(state), sheet_index)
+        entry = self._sheet_data.get(key)
+
+        # NOTE: the names and sources of the dataframes are changed in place on the state
+        # when the dataframes are named by the frontend, so we make sure they are the same
+        if entry is None or entry[0]() is not state or sheet_index >= len(state.dfs) \
+            or entry[1] != state.df_names[sheet_index] or entry[2] != state.df_sources[sheet_index]:
+            self.misses += 1
+            return None
+
+        self._sheet_data.move_to_end(key)
+        self.hits += 1
+        return entry[3]
+
+    def put(self, state: State, sheet_index: int, sheet_data: Dict[str, Any]) -> None:
+        """
+        Caches the sheet data of this sheet of the state, evicting the least recently
+        used sheet data if the cache holds too many cells.
+        """
+        key = (id(state), sheet_index)
+        entry = self._sheet_data.get(key)
+        if entry is not None and entry[0]() is state and entry[3] is sheet_data:
+            self._sheet_data.move_to_end(key)
+            return
+
+        self._remove(key)
+        num_cells = get_sheet_data_num_cells(sheet_data)
+        if num_cells > self.max_num_cells:
+            return
+
+        state_ref = weakref.ref(state, lambda _: self._remove_if_state_deleted(key))
+        self._sheet_data[key] = (state_ref, state.df_names[sheet_index], state.df_sources[sheet_index], sheet_data, num_cells)
+        self.num_cells += num_cells
+
+        while self.num_cells > self.max_num_cells:
+            _, (_, _, _, _, evicted_num_cells) = self._sheet_data.popitem(last=False)
+            self.num_cells -= evicted_num_cells
+
+    def _remove(self, key: Tuple[int, int]) -> None:
+        entry = self._sheet_data.pop(key, None)
+        if entry is not None:
+            self.num_cells -= entry[4]
+
+    def _remove_if_state_deleted(self, key: Tuple[int, int]) -> None:
+        entry = self._sheet_data.get(key)
+        if entry is not None and entry[0]() is None:
+            self._remove(key)
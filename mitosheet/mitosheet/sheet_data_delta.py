@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+After every edit, the sheet data of every modified sheet is sent to the frontend.
+For wide sheets, this is megabytes of data, even when the edit only added a single
+column.
+
+So, when the frontend already has the previous sheet data, we instead send it the
+changes from it, and it patches the sheet data that it has. 
+
+Steps that execute through StepPerformer.execute_through_transpile record which 
+columns of each sheet they reconed were added, modified or renamed. When the sheet
+data is serialized right after such a step, the entries of the other columns are 
+reused from the previous sheet data, as are all the entries of sheets whose version
+did not change. The changed columns of these sheets are just the ones with new entries. 
+For other sheets, the changes are found by comparing the sheet data of each column 
+with the data that was last sent.
+
+The delta has the format:
+{
+    numSheets: number,
+    sheets: ({
+        sheetIndex: number,
+        full: SheetData
+    } | {
+        sheetIndex: number,
+        metadata: Partial<SheetData>,
+        columnIDs: ColumnID[],
+        columns: SheetData['data']
+    })[]
+}
+
+Sheets that have not changed are not included. For the other sheets, the metadata
+contains the keys of the sheet data other than data that have changed, the columnIDs
+are all the column ids of the sheet in order, and the columns are the entries in the
+data of the columns that are new or changed. If every column changed, the full sheet
+data is sent instead.
+"""
+from typing import Any, Dict, List, Optional, Set
+
+
+def get_sheet_delta(sheet_index: int, previous_sheet_data: Optional[Dict[str, Any]], sheet_data: Dict[str, Any], reused_columns: bool=False) -> Optional[Dict[str, Any]]:
+    """
+    Returns the changes from the previous_sheet_data to the sheet_data, or None if
+    there are no changes.
+
+    If reused_columns is True, the columns that did not change have the same entries 
+    as in the previous_sheet_data, so the other columns are not compared.
+    """
+    if sheet_data is previous_sheet_data:
+        return None
+    if previous_sheet_data is None:
+        return {'sheetIndex': sheet_index, 'full': sheet_data}
+
+    metadata = {
+        key: value for key, value in sheet_data.items()
+        if key != 'data' and (key not in previous_sheet_data or previous_sheet_data[key] != value)
+    }
+
+    previous_columns = {column['columnID']: column for column in previous_sheet_data['data']}
+    if reused_columns:
+        columns = [column for column in sheet_data['data'] if previous_columns.get(column['columnID']) is not column]
+    else:
+        columns = [
+            column for column in sheet_data['data']
+            if column['columnID'] not in previous_columns or previous_columns[column['columnID']] != column
+        ]
+    column_ids = [column['columnID'] for column in sheet_data['data']]
+
+    if len(columns) > 0 and len(columns) == len(sheet_data['data']):
+        return {'sheetIndex': sheet_index, 'full': sheet_data}
+    if len(metadata) == 0 and len(columns) == 0 and column_ids == [column['columnID'] for column in previous_sheet_data['data']]:
+        return None
+
+    return {
+        'sheetIndex': sheet_index,
+        'metadata': metadata,
+        'columnIDs': column_ids,
+        'columns': columns,
+    }
+
+
+def get_sheet_data_delta(previous_array: List[Dict[str, Any]], array: List[Dict[str, Any]], sheet_indexes_with_reused_columns: Optional[Set[int]]=None) -> Dict[str, Any]:
+    """
+    Returns the changes from the previous_array to the array, which are both the
+    sheet data of all the sheets. 
+    
+    The sheet_indexes_with_reused_columns are the sheets that reuse the entries of 
+    their unchanged columns from the previous_array. See StepsManager.get_sheet_data_array.
+    """
+    sheets = []
+    for sheet_index, sheet_data in enumerate(array):
+        previous_sheet_data = previous_array[sheet_index] if sheet_index < len(previous_array) else None
+        reused_columns = sheet_indexes_with_reused_columns is not None and sheet_index in sheet_indexes_with_reused_columns
+        sheet_delta = get_sheet_delta(sheet_index, previous_sheet_data, sheet_data, reused_columns=reused_columns)
+        if sheet_delta is not None:
+            sheets.append(sheet_delta)
+
+    return {
+        'numSheets': len(array),
+        'sheets': sheets
+    }
+
+
+def apply_sheet_data_delta(previous_array: List[Dict[str, Any]], sheet_data_delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Returns the sheet data of all the sheets after applying the delta to the
+    previous_array, as the frontend does. Useful for testing.
+    """
+    array = previous_array[:sheet_data_delta['numSheets']]
+    for sheet_delta in sheet_data_delta['sheets']:
+        sheet_index = sheet_delta['sheetIndex']
+        if 'full' in sheet_delta:
+            if sheet_index < len(array):
+                array[sheet_index] = sheet_delta['full']
+            else:
+                array.append(sheet_delta['full'])
+            continue
+
+        previous_sheet_data = array[sheet_index]
+        columns = {column['columnID']: column for column in previous_sheet_data['data']}
+        columns.update({column['columnID']: column for column in sheet_delta['columns']})
+        array[sheet_index] = {
+            **previous_sheet_data,
+            **sheet_delta['metadata'],
+            'data': [columns[column_id] for column_id in sheet_delta['columnIDs']]
+        }
+
+    return array
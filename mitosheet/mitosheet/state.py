@@ -5,13 +5,14 @@
 # Distributed under the terms of the GPL License.
 from collections import OrderedDict
 from copy import deepcopy
-from typing import Any, Callable, Collection, List, Dict, Optional, Set, Union
+from typing import Any, Callable, Collection, List, Dict, Mapping, Optional, Set, Union
 import pandas as pd
 
 from mitosheet.column_headers import ColumnIDMap
+from mitosheet.copy_on_write import copy_on_write
 from mitosheet.types import FrontendFormulaAndLocation, OverwriteSheetIndexParams
 from mitosheet.types import ColumnHeader, ColumnID, DataframeFormat
-from mitosheet.utils import  get_first_unused_dataframe_name
+from mitosheet.utils import  get_first_unused_dataframe_name, is_pandas_copy_on_write_enabled, is_prev_version
 
 # Constants for where the dataframe in the state came from
 DATAFRAME_SOURCE_PASSED = "passed"  # passed in mitosheet.sheet
@@ -31,6 +32,17 @@ NUMBER_FORMAT_ACCOUNTING = "accounting"
 NUMBER_FORMAT_PERCENTAGE = "percentage"
 NUMBER_FORMAT_SCIENTIFIC_NOTATION = "scientific notation"
 
+# Constants for the engine that steps execute with, set by the engine in the code_options
+ENGINE_PANDAS = "pandas"
+ENGINE_POLARS = "polars"  # Heavy steps like pivots and merges execute with lazy polars code
+ENGINES = [ENGINE_PANDAS, ENGINE_POLARS]
+
+# Starting in pandas 1.5, setting a column with df[column_header] = ... always inserts
+# a new array, rather than writing into the block that backs the existing column. This 
+# means we can give a step a shallow copy of a dataframe, with fresh arrays for only the 
+# columns it writes into, without the step being able to modify the previous state
+SUPPORTS_COLUMN_LEVEL_COPY = not is_prev_version(pd.__version__, '1.5.0')
+
 
 def get_default_dataframe_format() -> DataframeFormat:
     return {
@@ -45,6 +57,23 @@ def get_default_dataframe_format() -> DataframeFormat:
     }
 
 
+def copy_dataframe_columns(df: pd.DataFrame, column_headers: Collection[ColumnHeader]) -> pd.DataFrame:
+    """
+    Returns a shallow copy of the dataframe, where only the columns with the given
+    column headers are backed by new arrays. All other columns share their underlying
+    data with the original dataframe, so they take no additional memory. Note that
+    pandas may still copy columns that are stored in the same block as a copied column.
+
+    NOTE: this is only safe if the code run on the returned dataframe writes in place
+    only to the given columns, and only on versions of pandas where SUPPORTS_COLUMN_LEVEL_COPY.
+    """
+    new_df = df.copy(deep=False)
+    for column_header in column_headers:
+        if column_header in new_df.columns:
+            new_df[column_header] = df[column_header].copy(deep=True)
+    return new_df
+
+
 class State:
     """
     State is a container that stores the current state of a Mito analysis,
@@ -70,6 +99,8 @@ class State:
         user_defined_functions: Optional[List[Callable]]=None,
         user_defined_importers: Optional[List[Callable]]=None,
         user_defined_editors: Optional[List[Callable]]=None,
+        engine: str=ENGINE_PANDAS,
+        preview_sheet_indexes: Optional[Set[int]]=None,
     ):
 
         # The dataframes that are in the state
@@ -144,30 +175,99 @@ class State:
         self.user_defined_importers = user_defined_importers if user_defined_importers is not None else []
         self.user_defined_editors = user_defined_editors if user_defined_editors is not None else []
 
-    def copy(self, deep_sheet_indexes: Optional[Union[List[int], Set[int], None]]=None) -> "State":
+        # The engine that steps generate code for, and so execute with. See get_engine
+        self.engine = engine
+
+        # The sheets that are a preview of the full data, as they are a sample of a large 
+        # dataframe, or were created from one. See mitosheet/preview.py
+        self.preview_sheet_indexes: Set[int] = preview_sheet_indexes if preview_sheet_indexes is not None else set()
+
+    def copy(
+            self, 
+            deep_sheet_indexes: Optional[Union[List[int], Set[int], None]]=None,
+            deep_column_ids: Optional[Mapping[int, Collection[ColumnID]]]=None
+        ) -> "State":
         """
         Returns a copy of the state, while only making deep copies of
-        those dataframes in the deep_sheet_indexes. Ideally, we'd copy
-        even less than that deeply.
+        those dataframes in the deep_sheet_indexes. 
+
+        If deep_column_ids is passed for a sheet index in deep_sheet_indexes,
+        then only those columns are copied deeply, and the rest of the columns 
+        share their data with this state. See copy_dataframe_columns.
         """
         if deep_sheet_indexes is None:
             deep_sheet_indexes = []
+        if deep_column_ids is None:
+            deep_column_ids = {}
+
+        # With pandas Copy-on-Write, a shallow copy already keeps the dataframes in this
+        # state from being modified by whoever writes to the copy
+        pandas_copy_on_write = is_pandas_copy_on_write_enabled()
+
+        dfs = []
+        for sheet_index, df in enumerate(self.dfs):
+            if sheet_index not in deep_sheet_indexes or pandas_copy_on_write:
+                dfs.append(df.copy(deep=False))
+            elif sheet_index in deep_column_ids and SUPPORTS_COLUMN_LEVEL_COPY:
+                column_headers = self.column_ids.get_column_headers_by_ids(
+                    sheet_index, 
+                    [column_id for column_id in deep_column_ids[sheet_index] if column_id in self.column_ids.column_id_to_column_header[sheet_index]]
+                )
+                dfs.append(copy_dataframe_columns(df, column_headers))
+            else:
+                dfs.append(df.copy(deep=True))
         
         return State(
-            [df.copy(deep=index in deep_sheet_indexes) for index, df in enumerate(self.dfs)],
+            dfs,
             self.public_interface_version,
-            df_names=deepcopy(self.df_names),
-            df_sources=deepcopy(self.df_sources),
-            column_ids=deepcopy(self.column_ids),
-            column_formulas=deepcopy(self.column_formulas),
-            column_filters=deepcopy(self.column_filters),
-            df_formats=deepcopy(self.df_formats),
-            graph_data_array=deepcopy(self.graph_data_array),
-            user_defined_functions=deepcopy(self.user_defined_functions),
-            user_defined_importers=deepcopy(self.user_defined_importers),
-            user_defined_editors=deepcopy(self.user_defined_editors),
+            df_names=list(self.df_names),
+            df_sources=list(self.df_sources),
+            # The per sheet and per graph metadata is only copied when it is accessed
+            column_ids=self.column_ids.copy(),
+            column_formulas=copy_on_write(self.column_formulas),
+            column_filters=copy_on_write(self.column_filters),
+            df_formats=copy_on_write(self.df_formats),
+            graph_data_array=copy_on_write(self.graph_data_array),
+            user_defined_functions=list(self.user_defined_functions),
+            user_defined_importers=list(self.user_defined_importers),
+            user_defined_editors=list(self.user_defined_editors),
+            engine=self.engine,
+            preview_sheet_indexes=set(self.preview_sheet_indexes),
         )
 
+    def copy_with_sheets_from(self, other_state: "State", sheet_indexes: Collection[int]) -> "State":
+        """
+        Returns a copy of the state, where the sheets at the given sheet_indexes are 
+        taken from the other_state instead. Any of these sheet indexes that are past
+        the end of this state are added to the end of the copy, in order.
+        """
+        new_state = self.copy()
+
+        for sheet_index in sorted(sheet_indexes):
+            sheet_items = [
+                (new_state.dfs, other_state.dfs[sheet_index].copy(deep=False)),
+                (new_state.df_names, other_state.df_names[sheet_index]),
+                (new_state.df_sources, other_state.df_sources[sheet_index]),
+                (new_state.column_ids.column_id_to_column_header, deepcopy(other_state.column_ids.column_id_to_column_header[sheet_index])),
+                (new_state.column_ids.column_header_to_column_id, deepcopy(other_state.column_ids.column_header_to_column_id[sheet_index])),
+                (new_state.column_formulas, deepcopy(other_state.column_formulas[sheet_index])),
+                (new_state.column_filters, deepcopy(other_state.column_filters[sheet_index])),
+                (new_state.df_formats, deepcopy(other_state.df_formats[sheet_index])),
+            ]
+
+            for sheet_list, sheet_item in sheet_items:
+                if sheet_index < len(sheet_list):
+                    sheet_list[sheet_index] = sheet_item
+                else:
+                    sheet_list.append(sheet_item)
+
+            if sheet_index in other_state.preview_sheet_indexes:
+                new_state.preview_sheet_indexes.add(sheet_index)
+            else:
+                new_state.preview_sheet_indexes.discard(sheet_index)
+
+        return new_state
+
     def add_df_to_state(
         self,
         new_df: pd.DataFrame,
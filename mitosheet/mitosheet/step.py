@@ -4,7 +4,8 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
-from typing import Any, Dict, List, Optional, Set, Type
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Type
 import json
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.step_performers.step_performer import StepPerformer
@@ -14,6 +15,9 @@ from mitosheet.state import State
 from mitosheet.step_performers import STEP_TYPE_TO_STEP_PERFORMER
 from mitosheet.types import FORMULA_SPECIFIC_INDEX_LABELS_TYPE, ColumnHeader, ColumnID, FORMULA_ENTIRE_COLUMN_TYPE
 
+if TYPE_CHECKING:
+    from mitosheet.step_result_cache import StepResultCache
+
 
 class Step:
     """
@@ -56,14 +60,88 @@ class Step:
         self.params = params
 
         # The state at the start of this step; is None only for the initialize step
-        self.prev_state = prev_state
+        self._prev_state = prev_state
         # The state you get from executing the prev_state with the passed params
-        self.post_state = post_state
+        self._post_state = post_state
+        # If the states of this step have been evicted to save memory, this is the
+        # function that recomputes them. See StepsManager.evict_step_states
+        self._rematerialize_states: Optional[Callable[[], None]] = None
         # execution_data is data from the execution of the data transformation that
         # is useful for the transpiler - that means the transpiler can do way less
         # work if it has already been done. See simple_import for an example
         self.execution_data = execution_data if execution_data is not None else {}
+        # The sheets that this step reads and writes, and the versions of the sheets
+        # before and after this step. See set_step_sheet_dependencies
+        self.sheet_reads_and_writes: Optional[Tuple[Set[int], Set[int]]] = None
+        self.prev_sheet_versions: Optional[Tuple[int, ...]] = None
+        self.sheet_versions: Optional[Tuple[int, ...]] = None
+        # A best guess of the number of bytes of dataframes that this step creates,
+        # which is used to decide when states should be evicted. Filled in lazily
+        self.memory_usage: Optional[int] = None
+        # The seconds spent executing this step, serializing its sheet data for the 
+        # frontend, and transpiling it. See get_performance_report
+        self.execution_time: Optional[float] = None
+        self.serialization_time: Optional[float] = None
+        self.transpile_time: Optional[float] = None
+
+    @property
+    def prev_state(self) -> Optional[State]:
+        if self._rematerialize_states is not None:
+            self._rematerialize_states()
+        return self._prev_state
+
+    @prev_state.setter
+    def prev_state(self, prev_state: Optional[State]) -> None:
+        self._prev_state = prev_state
+
+    @property
+    def post_state(self) -> Optional[State]:
+        if self._rematerialize_states is not None:
+            self._rematerialize_states()
+        return self._post_state
+
+    @post_state.setter
+    def post_state(self, post_state: Optional[State]) -> None:
+        self._post_state = post_state
 
+    @property
+    def states_evicted(self) -> bool:
+        return self._rematerialize_states is not None
+
+    def evict_states(self, rematerialize_states: Callable[[], None]) -> None:
+        """
+        Drops the references this step holds to its prev_state and post_state, so 
+        that they can be garbage collected. The next time either is accessed, the 
+        rematerialize_states function is called, which must set them again.
+        """
+        self._prev_state = None
+        self._post_state = None
+        self._rematerialize_states = rematerialize_states
+
+    def rematerialize_states(self, new_prev_state: State, step_is_skipped: bool=False) -> None:
+        """
+        Recomputes the states of a step that had its states evicted, by executing
+        the step again on the new_prev_state with the params it was run with. 
+
+        Skipped steps are not part of the analysis, so they are not executed,
+        and instead just get the new_prev_state as both of their states.
+        """
+        new_post_state = new_prev_state
+        if not step_is_skipped:
+            post_state_and_execution_data = self.step_performer.execute(new_prev_state, self.params)
+            if post_state_and_execution_data is not None:
+                new_post_state = post_state_and_execution_data[0]
+
+        self.restore_states(new_prev_state, new_post_state)
+
+    def restore_states(self, prev_state: Optional[State], post_state: Optional[State]) -> None:
+        """
+        Sets the states of a step that had its states evicted, without executing 
+        the step, e.g. when the states are read back in from disk.
+        """
+        self._prev_state = prev_state
+        self._post_state = post_state
+        self._rematerialize_states = None
 
     @property
     def dfs(self):
@@ -131,7 +209,12 @@ class Step:
         return self.post_state if self.post_state is not None else \
             (self.prev_state if self.prev_state is not None else State([], 1))
 
-    def set_prev_state_and_execute(self, new_prev_state: State, previous_steps: List["Step"]) -> bool:
+    def set_prev_state_and_execute(
+            self, 
+            new_prev_state: State, 
+            previous_steps: List["Step"], 
+            step_result_cache: Optional["StepResultCache"]=None
+        ) -> bool:
         """
         Changes the prev_state of this step, which in turns triggers
         a reexecution with the same parameters. 
@@ -139,6 +222,10 @@ class Step:
         If successful, will update the step in-place. If it fails, 
         this will not update the step.
 
+        If a step_result_cache is passed, and this step has already been 
+        executed with the same params on the same state, the cached result
+        is used instead of executing the step again.
+
         NOTE: this is the only function you should use to get a step
         to execute!
 
@@ -148,10 +235,24 @@ class Step:
         # Saturate the event to get up to date parameters
         # TODO: this should fill in the execution data - hopefully
         # we can get all of it without executing. I think we probably can
+        execution_start_time = perf_counter()
         params = self.step_performer.saturate(new_prev_state, self.params, previous_steps)
 
-        # Actually execute the data transformation
-        post_state_and_execution_data = self.step_performer.execute(new_prev_state, params)
+        step_result_cache_key = None
+        if step_result_cache is not None and self.step_performer.is_deterministic(params):
+            step_result_cache_key = step_result_cache.get_key(
+                self.step_type, self.step_performer.step_version(), params, new_prev_state
+            )
+
+        cached_post_state_and_execution_data = step_result_cache.get(step_result_cache_key) \
+            if step_result_cache is not None and step_result_cache_key is not None else None
+
+        if cached_post_state_and_execution_data is not None:
+            post_state_and_execution_data: Optional[Tuple[State, Optional[Dict[str, Any]]]] = cached_post_state_and_execution_data
+        else:
+            # Actually execute the data transformation
+            post_state_and_execution_data = self.step_performer.execute(new_prev_state, params)
+        execution_time = perf_counter() - execution_start_time
 
         if post_state_and_execution_data is not None:
             # If we don't get anything new back, then we just make this
@@ -167,9 +268,16 @@ class Step:
         # Update the relevant state variables
         self.prev_state = new_prev_state
         self.post_state = new_post_state
+        self._rematerialize_states = None
+        self.memory_usage = None
+        self.execution_time = execution_time
         self.execution_data = execution_data if execution_data is not None else {}
         self.params = params
 
+        if step_result_cache is not None and step_result_cache_key is not None \
+                and cached_post_state_and_execution_data is None and post_state_and_execution_data is not None:
+            step_result_cache.put(step_result_cache_key, new_post_state, self.execution_data, get_step_memory_usage(self))
+
         return post_state_and_execution_data is not None
     
 
@@ -202,17 +310,8 @@ class Step:
             previous_step: Step = all_steps_before_this_step[-1]
             
             # Check (3) and (4)
-            if self.step_type == SetColumnFormulaStepPerformer.step_type() and previous_step.step_type == SetColumnFormulaStepPerformer.step_type():
-                both_entire_column = self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE
-                same_indexes = (
-                    self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE \
-                    and self.params['index_labels_formula_is_applied_to']['index_labels'] == previous_step.params['index_labels_formula_is_applied_to']['index_labels']
-                )
-                
-                if (both_entire_column or same_indexes) \
-                    and self.params['sheet_index'] == previous_step.params['sheet_index'] \
-                    and self.params['column_id'] == previous_step.params['column_id']:
-                    step_indexes_to_skip.add(len(all_steps_before_this_step) - 1)
+            if is_formula_step_overwriting_previous_step(self, previous_step):
+                step_indexes_to_skip.add(len(all_steps_before_this_step) - 1)
 
         return step_indexes_to_skip
 
@@ -242,3 +341,73 @@ class Step:
             'step_type': self.step_type,
             'params': self.params
         })
+
+
+def get_filter_step_key(step: Step) -> Optional[Tuple[int, ColumnID]]:
+    """
+    For a filter step, returns the sheet index and column id it filters, 
+    as a filter step skips any filter step before it with the same key.
+    Returns None for any other step.
+    """
+    if step.step_type != FilterStepPerformer.step_type():
+        return None
+    return (step.params['sheet_index'], step.params['column_id'])
+
+
+def is_formula_step_overwriting_previous_step(step: Step, previous_step: Step) -> bool:
+    """
+    Returns True if step is a formula step that overwrites the formula step
+    directly before it, because they both set the entire column or they both
+    set the same indexes of the same column.
+    """
+    if step.step_type != SetColumnFormulaStepPerformer.step_type() or previous_step.step_type != SetColumnFormulaStepPerformer.step_type():
+        return False
+
+    both_entire_column = step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE
+    same_indexes = (
+        step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE \
+        and step.params['index_labels_formula_is_applied_to']['index_labels'] == previous_step.params['index_labels_formula_is_applied_to']['index_labels']
+    )
+    
+    return (both_entire_column or same_indexes) \
+        and step.params['sheet_index'] == previous_step.params['sheet_index'] \
+        and step.params['column_id'] == previous_step.params['column_id']
+
+
+def get_step_memory_usage(step: Step) -> int:
+    """
+    Returns a best guess for the number of bytes of dataframes that this step
+    holds onto that the step before it does not. 
+
+    This is the memory used by the sheets the step modifies, as the other sheets 
+    share their data with the previous step. We include the memory of the objects
+    in object columns (e.g. strings), as these often take most of the memory, so
+    this is not fast on large dataframes. The result is cached on the step.
+    """
+    if step.memory_usage is not None:
+        return step.memory_usage
+
+    prev_state = step.prev_state
+    post_state = step.post_state
+
+    if post_state is None:
+        modified_sheet_indexes: Set[int] = set()
+    elif prev_state is None:
+        modified_sheet_indexes = set(range(len(post_state.dfs)))
+    else:
+        modified_sheet_indexes = set(step.step_performer.get_modified_dataframe_indexes(step.params))
+        # See get_modified_sheet_indexes for what an empty set and -1 mean
+        if len(modified_sheet_indexes) == 0:
+            modified_sheet_indexes = set(range(len(post_state.dfs)))
+        elif -1 in modified_sheet_indexes:
+            modified_sheet_indexes.remove(-1)
+            if len(prev_state.dfs) != len(post_state.dfs):
+                modified_sheet_indexes.update(range(len(prev_state.dfs), len(post_state.dfs)))
+            else:
+                modified_sheet_indexes.add(len(post_state.dfs) - 1)
+
+    step.memory_usage = sum(
+        int(post_state.dfs[sheet_index].memory_usage(index=True, deep=True).sum())
+        for sheet_index in modified_sheet_indexes if post_state is not None and 0 <= sheet_index < len(post_state.dfs)
+    )
+    return step.memory_usage
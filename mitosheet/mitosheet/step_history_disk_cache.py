@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+import os
+import shutil
+import tempfile
+import weakref
+from copy import copy
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from mitosheet.state import State
+from mitosheet.utils import get_new_id, is_pyarrow_installed
+
+ARROW_FILE_FORMAT = 'arrow'
+PICKLE_FILE_FORMAT = 'pickle'
+
+
+class SpilledDataframe:
+    """
+    A dataframe that has been written to a file in the StepHistoryDiskCache. 
+    The file is deleted once nothing refers to this object anymore.
+    """
+
+    def __init__(self, path: str, file_format: str, df: pd.DataFrame):
+        self.path = path
+        self.file_format = file_format
+        # Arrow does not keep all possible column headers (e.g. tuples), so 
+        # we keep the original headers to put back when reading the file
+        self.columns = df.columns
+        # The dataframe that was written or last read from the file. If some other
+        # step still holds it, we use it rather than reading the file again
+        self._loaded_df: 'weakref.ReferenceType[pd.DataFrame]' = weakref.ref(df)
+
+        weakref.finalize(self, _remove_file, path)
+
+    def load(self) -> pd.DataFrame:
+        df = self._loaded_df()
+        if df is not None:
+            return df
+
+        if self.file_format == ARROW_FILE_FORMAT:
+            import pyarrow.feather as feather
+            # The file is memory mapped, so it is not read into memory before it is 
+            # converted to the dataframe
+            df = feather.read_table(self.path, memory_map=True).to_pandas()
+            if not df.columns.equals(self.columns):
+                df.columns = self.columns
+        else:
+            df = pd.read_pickle(self.path)
+
+        self._loaded_df = weakref.ref(df)
+        return df
+
+
+class SpilledState:
+    """
+    A state that has had its dataframes written to the StepHistoryDiskCache.
+
+    The rest of the state (column ids, formulas, formats, graphs) is small in 
+    comparison, and can hold user defined functions that cannot always be 
+    written to disk, so it is kept in memory.
+    """
+
+    def __init__(self, state_without_dfs: State, spilled_dataframes: List[SpilledDataframe]):
+        self.state_without_dfs = state_without_dfs
+        self.spilled_dataframes = spilled_dataframes
+
+
+class StepHistoryDiskCache:
+    """
+    A cache in a temporary directory that the StepsManager writes the states of 
+    old steps to, so that they do not need to be held in memory. See 
+    StepsManager.evict_step_states.
+
+    Dataframes are written as Arrow (Feather) files and memory mapped when they 
+    are read back in. If pyarrow is not installed, or a dataframe cannot be 
+    converted to Arrow and back without changing it (e.g. it has columns with 
+    mixed types, object columns of ints, or NaN in object columns), it is pickled.
+
+    Steps share most of their dataframes with the steps around them, so each 
+    dataframe is only written once while it is still in memory.
+    """
+
+    def __init__(self, directory: Optional[str]=None):
+        self._parent_directory = directory
+        self._directory: Optional[str] = None
+        # From the id of a dataframe that has been written, to the dataframe and 
+        # the file it was written to
+        self._spilled_dataframes: Dict[int, Tuple['weakref.ReferenceType[pd.DataFrame]', 'weakref.ReferenceType[SpilledDataframe]']] = {}
+
+    @property
+    def directory(self) -> str:
+        # We only create the directory once we write to it
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='mito-step-history-', dir=self._parent_directory)
+            weakref.finalize(self, shutil.rmtree, self._directory, ignore_errors=True)
+        return self._directory
+
+    def spill_state(self, state: State) -> SpilledState:
+        state_without_dfs = copy(state)
+        state_without_dfs.dfs = []
+        return SpilledState(
+            state_without_dfs,
+            [self._spill_dataframe(df) for df in state.dfs]
+        )
+
+    def load_state(self, spilled_state: SpilledState) -> State:
+        state = copy(spilled_state.state_without_dfs)
+        state.dfs = []
+        for spilled_dataframe in spilled_state.spilled_dataframes:
+            df = spilled_dataframe.load()
+            # If this state is spilled again, there is no need to write this dataframe again
+            self._spilled_dataframes[id(df)] = (weakref.ref(df), weakref.ref(spilled_dataframe))
+            state.dfs.append(df)
+        return state
+
+    def _spill_dataframe(self, df: pd.DataFrame) -> SpilledDataframe:
+        # If this dataframe has already been written, and the file is still in use
+        # then we reuse that file
+        df_ref, spilled_dataframe_ref = self._spilled_dataframes.get(id(df), (None, None))
+        if df_ref is not None and df_ref() is df and spilled_dataframe_ref is not None:
+            spilled_dataframe = spilled_dataframe_ref()
+            if spilled_dataframe is not None:
+                return spilled_dataframe
+
+        self._remove_unused_spilled_dataframes()
+
+        path = os.path.join(self.directory, get_new_id())
+        spilled_dataframe = None
+        if is_pyarrow_installed():
+            spilled_dataframe = _write_arrow_file(df, path)
+        if spilled_dataframe is None:
+            df.to_pickle(path)
+            spilled_dataframe = SpilledDataframe(path, PICKLE_FILE_FORMAT, df)
+
+        self._spilled_dataframes[id(df)] = (weakref.ref(df), weakref.ref(spilled_dataframe))
+        return spilled_dataframe
+
+    def _remove_unused_spilled_dataframes(self) -> None:
+        for df_id, (df_ref, spilled_dataframe_ref) in list(self._spilled_dataframes.items()):
+            if df_ref() is None or spilled_dataframe_ref() is None:
+                del self._spilled_dataframes[df_id]
+
+
+def _write_arrow_file(df: pd.DataFrame, path: str) -> Optional[SpilledDataframe]:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+    # Arrow infers the types of object columns, so e.g. an object column of ints
+    # would be read back as int64. In these cases we pickle the dataframe instead.
+    # The dtypes only depend on the schema, so we read them from an empty table
+    empty_df = table.slice(0, 0).to_pandas()
+    if list(empty_df.dtypes) != list(df.dtypes) or empty_df.index.dtype != df.index.dtype:
+        return None
+
+    # Arrow reads missing values in object columns back as None, so we also pickle 
+    # dataframes with other missing values in them, like NaN
+    for series in [df.index.to_series()] + [df.iloc[:, column_index] for column_index in range(len(df.columns))]:
+        if series.dtype == object and not all(value is None for value in series[series.isna()]):
+            return None
+
+    # We do not compress the file, so it can be memory mapped
+    feather.write_feather(table, path, compression='uncompressed')
+    return SpilledDataframe(path, ARROW_FILE_FORMAT, df)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -76,6 +76,11 @@ class AITransformationStepPerformer(StepPerformer):
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return set() # NOTE: We act as though we modify all sheet indexes, as we can't easily figure out what we do modify
 
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The code can read from outside the sheet
+        return False
+
     @classmethod
     def get_created_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {-1} # NOTE: We act as though we create all sheet indexes, as we can't easily figure out what we do modify
\ No newline at end of file
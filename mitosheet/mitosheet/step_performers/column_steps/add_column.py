@@ -12,6 +12,7 @@ from mitosheet.column_headers import get_column_header_id
 from mitosheet.state import State
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils.utils import get_param
+from mitosheet.types import ColumnID
 
 
 class AddColumnStepPerformer(StepPerformer):
@@ -71,4 +72,9 @@ class AddColumnStepPerformer(StepPerformer):
 
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
-        return {get_param(params, 'sheet_index')}
\ No newline at end of file
+        return {get_param(params, 'sheet_index')}
+
+    @classmethod
+    def get_modified_column_ids(cls, params: Dict[str, Any]) -> Optional[Set[ColumnID]]:
+        # If the column already exists, adding it sets it to 0 again
+        return {get_column_header_id(get_param(params, 'column_header'))}
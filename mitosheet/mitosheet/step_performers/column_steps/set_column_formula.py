@@ -15,6 +15,7 @@ from mitosheet.code_chunks.step_performers.column_steps.set_column_formula_code_
 from mitosheet.errors import (MitoError, make_execution_error,
                               make_operator_type_error,
                               make_unsupported_function_error)
+from mitosheet.formula_index import FormulaIndex
 from mitosheet.parser import get_frontend_formula, parse_formula
 from mitosheet.state import State
 from mitosheet.step_performers.step_performer import StepPerformer
@@ -118,13 +119,16 @@ class SetColumnFormulaStepPerformer(StepPerformer):
                 sheet_index
             )
             
+            # We store the index compactly, as a range or a reference to the immutable index, rather than a list of labels
+            formula_index = FormulaIndex(df.index)
+
             # If the user is setting the entire column, then there is only one formula for every cell in
             # the entire column. But if they are just setting specific indexes, we need to store the formulas
             # before this as well, so that we can figure out what formula is applied to each index
             if index_labels_formula_is_applied_to['type'] == FORMULA_ENTIRE_COLUMN_TYPE:
-                post_state.column_formulas[sheet_index][column_id] = [{'frontend_formula': frontend_formula, 'location': index_labels_formula_is_applied_to, 'index': df.index.to_list()}]
+                post_state.column_formulas[sheet_index][column_id] = [{'frontend_formula': frontend_formula, 'location': index_labels_formula_is_applied_to, 'index': formula_index}]
             else:
-                post_state.column_formulas[sheet_index][column_id].append({'frontend_formula': frontend_formula, 'location': index_labels_formula_is_applied_to, 'index': df.index.to_list()})
+                post_state.column_formulas[sheet_index][column_id].append({'frontend_formula': frontend_formula, 'location': index_labels_formula_is_applied_to, 'index': formula_index})
 
             return post_state, execution_data
         except TypeError as e:
@@ -180,6 +184,15 @@ class SetColumnFormulaStepPerformer(StepPerformer):
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {get_param(params, 'sheet_index')}
 
+    @classmethod
+    def get_modified_column_ids(cls, params: Dict[str, Any]) -> Optional[Set[ColumnID]]:
+        return {get_param(params, 'column_id')}
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The result of TODAY changes every day
+        return 'TODAY(' not in get_param(params, 'new_formula').upper()
+
 
 def _get_fixed_invalid_formula(
         new_formula: str, 
@@ -348,4 +361,4 @@ def get_user_defined_sheet_function_objects(state: Optional[State]) -> List[Any]
             'syntax_elements': syntax_elements
         })
     
-    return sheet_function_objects
\ No newline at end of file
+    return sheet_function_objects
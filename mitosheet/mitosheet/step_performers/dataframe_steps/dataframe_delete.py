@@ -73,4 +73,8 @@ def delete_dataframe_from_state(state: State, sheet_index: int) -> None:
     state.df_formats.pop(sheet_index)
     state.dfs.pop(sheet_index)
     state.df_names.pop(sheet_index)
-    state.df_sources.pop(sheet_index)
\ No newline at end of file
+    state.df_sources.pop(sheet_index)
+    state.preview_sheet_indexes = {
+        preview_sheet_index if preview_sheet_index < sheet_index else preview_sheet_index - 1
+        for preview_sheet_index in state.preview_sheet_indexes if preview_sheet_index != sheet_index
+    }
\ No newline at end of file
@@ -107,4 +107,9 @@ class DataframeImportStepPerformer(StepPerformer):
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {-1}
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The dataframes are read from the variables the user passes to the sheet, which can change
+        return False
     
\ No newline at end of file
@@ -77,3 +77,8 @@ class ExcelImportStepPerformer(StepPerformer):
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {-1}
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The file can change between executions
+        return False
@@ -74,4 +74,9 @@ class ExcelRangeImportStepPerformer(StepPerformer):
         # Because this step is live updating, we need to just reset all of the dataframes
         # when the user overwrites a step
         return set()
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The file can change between executions
+        return False
     
\ No newline at end of file
@@ -151,6 +151,11 @@ class SimpleImportStepPerformer(StepPerformer):
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {-1}
 
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The file can change between executions
+        return False
+
 
 def read_csv_get_delimiter_and_encoding(file_name: str) -> Tuple[pd.DataFrame, str, str]:
     """
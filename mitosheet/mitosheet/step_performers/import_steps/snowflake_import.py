@@ -107,6 +107,11 @@ class SnowflakeImportStepPerformer(StepPerformer):
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {-1}
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The database can change between executions
+        return False
     
 
 def get_connection_param_dict (credentials: SnowflakeCredentials, table_loc_and_warehouse: SnowflakeTableLocationAndWarehouse) -> Dict[str, str]:
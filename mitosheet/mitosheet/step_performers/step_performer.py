@@ -8,7 +8,9 @@ from time import perf_counter
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
+from mitosheet.edit_executor import check_current_edit_cancelled
 from mitosheet.state import State
+from mitosheet.transpiler.compiled_code_cache import compiled_code_cache
 from mitosheet.transpiler.transpile_utils import get_globals_for_exec
 from mitosheet.types import (ColumnHeader, ColumnID,
                              ExecuteThroughTranspileNewDataframeParams, StepType)
@@ -125,7 +127,8 @@ class StepPerformer(ABC, object):
         it expects to change, so the various parameters are how the caller of this method can tell this function what
         should be different before and after in dataframes.
         """
-        from mitosheet.ai.recon import update_state_by_reconing_dataframes
+        from mitosheet.ai.recon import (get_changed_column_ids,
+                                        update_state_by_reconing_dataframes)
 
         if execution_data is None:
             execution_data = {}
@@ -136,7 +139,13 @@ class StepPerformer(ABC, object):
         if modified_dataframe_indexes == {-1}:
             modified_dataframe_indexes = set()
 
-        post_state = prev_state.copy(deep_sheet_indexes=modified_dataframe_indexes)
+        # If the step tells us exactly which columns it writes to, we only copy those columns
+        modified_column_ids = cls.get_modified_column_ids(params)
+        deep_column_ids = {
+            sheet_index: modified_column_ids for sheet_index in modified_dataframe_indexes
+        } if modified_column_ids is not None else None
+
+        post_state = prev_state.copy(deep_sheet_indexes=modified_dataframe_indexes, deep_column_ids=deep_column_ids)
 
         code_chunks = cls.transpile(post_state, params, execution_data)
         code = []
@@ -152,15 +161,26 @@ class StepPerformer(ABC, object):
         exec_globals = get_globals_for_exec(post_state, post_state.public_interface_version)
         exec_locals = {**exec_globals}
         
+        # We compile through a cache, as the same code is executed many times when an analysis is replayed
+        compiled_code = compiled_code_cache.compile(final_code)
+
         pandas_start_time = perf_counter()
-        exec(final_code, exec_globals, exec_locals)
+        exec(compiled_code, exec_globals, exec_locals)
+
+        # If the edit was cancelled while the code executed, we stop before doing any more work. 
+        # NOTE: we check outside of the try excepts below, so the cancellation is not swallowed
+        check_current_edit_cancelled()
 
-        # Go through the optional code lines
+        # Go through the optional code lines, which are compiled in one batch
         optional_code_that_successfully_executed: Tuple[List[str], List[str]] = ([], [])
         if optional_code is not None:
-            for optional_import in optional_code[1]:
+            compiled_optional_imports = compiled_code_cache.compile_lines(optional_code[1])
+            for optional_import, compiled_optional_import in zip(optional_code[1], compiled_optional_imports):
+                if compiled_optional_import is None:
+                    break
+                check_current_edit_cancelled()
                 try:
-                    exec(optional_import, exec_globals, exec_locals)
+                    exec(compiled_optional_import, exec_globals, exec_locals)
                     optional_code_that_successfully_executed = (
                         optional_code_that_successfully_executed[0],
                         optional_code_that_successfully_executed[1] + [optional_import],
@@ -172,18 +192,24 @@ class StepPerformer(ABC, object):
             # the code itself executes successfully
 
             non_code_lines_before_optional_line = []
-            for optional_code_line in optional_code[0]:
+            compiled_optional_code_lines = compiled_code_cache.compile_lines(optional_code[0])
+            for optional_code_line, compiled_optional_code_line in zip(optional_code[0], compiled_optional_code_lines):
 
                 # We don't need to exec spaces
                 if optional_code_line == '' or optional_code_line.strip().startswith('#'):
                     non_code_lines_before_optional_line.append(optional_code_line)
                     continue
 
+                if compiled_optional_code_line is None:
+                    break
+
+                check_current_edit_cancelled()
+
                 # TODO: we should make it so it rolls back the state if this fails
                 # but it's fine for now -- since partial updates don't seem to 
                 # manifest in practice
                 try:
-                    exec(optional_code_line, exec_globals, exec_locals)
+                    exec(compiled_optional_code_line, exec_globals, exec_locals)
                     optional_code_that_successfully_executed = (
                         optional_code_that_successfully_executed[0] + non_code_lines_before_optional_line + [optional_code_line],
                         optional_code_that_successfully_executed[1],
@@ -195,33 +221,46 @@ class StepPerformer(ABC, object):
 
         pandas_processing_time = perf_counter() - pandas_start_time
 
+        recon_start_time = perf_counter()
+        # For each modified sheet, the columns that the recon found changed, which means only 
+        # these columns need to be sent to the frontend again. See StepsManager.get_sheet_data_array
+        changed_column_ids: Dict[int, Optional[List[ColumnID]]] = {}
         for modified_dataframe_index in modified_dataframe_indexes:
+            check_current_edit_cancelled()
             df_name = prev_state.df_names[modified_dataframe_index]
             new_df = exec_locals[df_name]
-            post_state, _ = update_state_by_reconing_dataframes(
+            post_state, modified_dataframe_recon = update_state_by_reconing_dataframes(
                 post_state, 
                 modified_dataframe_index, 
                 prev_state.dfs[modified_dataframe_index],
                 new_df, 
-                column_headers_to_column_ids=column_headers_to_column_ids
+                column_headers_to_column_ids=column_headers_to_column_ids,
+                modified_column_ids=modified_column_ids
             )
+            changed_column_ids[modified_dataframe_index] = get_changed_column_ids(post_state, modified_dataframe_index, modified_dataframe_recon)
 
         if new_dataframe_params:
             for new_df_name in new_dataframe_params['new_df_names']:
                 df_source = new_dataframe_params['df_source']
 
                 new_df = exec_locals[new_df_name] 
-                post_state.add_df_to_state(
+                new_sheet_index = post_state.add_df_to_state(
                     new_df, 
                     df_name=new_df_name, 
                     df_source=df_source, 
                     overwrite=new_dataframe_params['overwrite'], 
                     use_deprecated_id_algorithm=use_deprecated_id_algorithm
                 )
+                # If a sheet is overwritten, it does not keep any of its old columns
+                changed_column_ids.pop(new_sheet_index, None)
+
+        recon_time = perf_counter() - recon_start_time
 
         return post_state, {
             'pandas_processing_time': pandas_processing_time,
+            'recon_time': recon_time,
             'optional_code_that_successfully_executed': optional_code_that_successfully_executed,
+            'changed_column_ids_by_sheet_index': changed_column_ids,
             **execution_data
         }
         
@@ -239,4 +278,34 @@ class StepPerformer(ABC, object):
         If it returned -1, then it modified all new dataframes (on
         the left side of the dfs array).
         """
-        pass
\ No newline at end of file
+        pass
+
+    @classmethod
+    def get_modified_column_ids(cls, params: Dict[str, Any]) -> Optional[Set[ColumnID]]:
+        """
+        Returns the set of column ids that the code for this step writes to in 
+        place, in the dataframes returned by get_modified_dataframe_indexes. Any
+        other columns in these dataframes are shared with the previous state rather
+        than copied, so a step must only return this set if it is sure its code 
+        does not write to any other existing column in place. 
+        
+        Adding, deleting, renaming, or reassigning entire columns with 
+        df[column_header] = ... does not count as writing in place.
+
+        Recon also only checks these columns for modifications, so the code must
+        not change the values of any other existing column, even by reassigning it.
+
+        If it returns None, then the entire modified dataframes are copied.
+        """
+        return None
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        """
+        Returns True if executing this step with these params on the same state
+        always gives the same result, so that the result can be cached.
+
+        Steps that read from outside of the state (e.g. files, databases or
+        the current date) or that call user code must return False.
+        """
+        return True
@@ -118,4 +118,9 @@ class UserDefinedEditStepPerformer(StepPerformer):
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         # TODO: we could improve this ideally, but for now we return everything
         return set()
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The user defined editor can do anything
+        return False
     
\ No newline at end of file
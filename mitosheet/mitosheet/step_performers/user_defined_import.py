@@ -87,4 +87,9 @@ class UserDefinedImportStepPerformer(StepPerformer):
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {-1}
+
+    @classmethod
+    def is_deterministic(cls, params: Dict[str, Any]) -> bool:
+        # The user defined importer can read anything
+        return False
     
\ No newline at end of file
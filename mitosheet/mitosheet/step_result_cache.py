@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Saved analyses get replayed often: when the notebook is rerun, when imports
+are updated, and on every rerun of a Streamlit, Dash or Flask app. Each replay
+executes every step again, even though the result is the same as last time.
+
+The StepResultCache is a content addressed cache of the results of executing
+steps, which is shared by every analysis in this process. It is turned on by
+setting a step_result_cache_size in the mito_config.
+
+A result is keyed by the step type and version, its saturated params, and a
+fingerprint of the state the step is executed on. The fingerprint of a state
+that a step creates is derived from the key of that step, as the same step on
+the same state always gives the same result. So the dataframes only need to be
+hashed when they come from outside of Mito: the dataframes passed to the sheet,
+and the results of steps that are not deterministic (e.g. imports).
+"""
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+from mitosheet.enterprise.mito_config import MitoConfig
+from mitosheet.state import State
+from mitosheet.step_history_disk_cache import SpilledState, StepHistoryDiskCache
+from mitosheet.utils import NpEncoder
+
+
+def _get_hash(*parts: Any) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        hasher.update(b'\0')
+    return hasher.hexdigest()
+
+
+def get_dataframe_content_fingerprint(df: pd.DataFrame) -> Optional[str]:
+    """
+    Returns a hash of the contents of the dataframe, including its column headers,
+    dtypes and index, or None if the dataframe contains values that cannot be hashed.
+    """
+    try:
+        parts: List[Any] = [
+            repr(df.columns.tolist()),
+            repr(df.dtypes.tolist()),
+            repr(df.index.names),
+            pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()
+        ]
+        # Pandas hashes object values by their string representation, so we
+        # also hash their types, so that e.g. 1 and '1' are different. We only
+        # need the type of each value if the column has more than one type
+        for column_index, dtype in enumerate(df.dtypes):
+            if dtype == object:
+                values = df.iloc[:, column_index].to_numpy()
+                inferred_type = infer_dtype(values, skipna=False)
+                parts.append(inferred_type)
+                if inferred_type.startswith('mixed'):
+                    types = np.array([type(value).__name__ for value in values], dtype=object)
+                    parts.append(pd.util.hash_array(types).tobytes())
+    except (TypeError, ValueError):
+        return None
+
+    return _get_hash(*parts)
+
+
+def get_function_fingerprint(function: Callable) -> Optional[str]:
+    """
+    Returns a hash of a user defined function, or None if it cannot be hashed. 
+
+    Functions are hashed by their code, as well as their defaults, closures and the
+    globals they read, so a function that is defined again in the same way (e.g. on 
+    every rerun of a Streamlit app) has the same fingerprint, but a new function that 
+    reuses the id of one that was garbage collected does not. 
+    """
+    code = getattr(function, '__code__', None)
+    if code is None:
+        # Other callables (e.g. builtins or classes) are hashed by their name
+        return _get_hash(getattr(function, '__module__', None), getattr(function, '__qualname__', None) or repr(function))
+
+    function_globals = getattr(function, '__globals__', {})
+    try:
+        return _get_hash(
+            function.__module__,
+            function.__qualname__,
+            code.co_code,
+            repr(code.co_consts),
+            code.co_names,
+            repr(function.__defaults__),
+            repr(function.__kwdefaults__),
+            repr([cell.cell_contents for cell in function.__closure__ or []]),
+            repr([(name, function_globals[name]) for name in code.co_names if name in function_globals]),
+        )
+    except Exception:
+        return None
+
+
+class StepResultCache:
+    """
+    A size bounded LRU cache from the key of a step to the post state and execution
+    data that executing it created. Results that are evicted from memory are
+    written to disk if there is a disk_cache.
+    """
+
+    def __init__(self, max_size_bytes: int, disk_cache: Optional[StepHistoryDiskCache]=None):
+        self.max_size_bytes = max_size_bytes
+        self.disk_cache = disk_cache
+        self.hits = 0
+        self.misses = 0
+
+        # From the key of a step, to its post state (or spilled post state), its
+        # execution data, and the bytes of dataframes it holds
+        self._results: 'OrderedDict[str, Tuple[Union[State, SpilledState], Dict[str, Any], int]]' = OrderedDict()
+        self._spilled_results: 'OrderedDict[str, Tuple[Union[State, SpilledState], Dict[str, Any], int]]' = OrderedDict()
+        self.size_bytes = 0
+        self.spilled_size_bytes = 0
+
+        # From the id of a state or dataframe, to a weakref to it and its fingerprint
+        self._fingerprints: Dict[int, Tuple[weakref.ReferenceType, str]] = {}
+        # The ids of states and dataframes that have been garbage collected. The weakref 
+        # callbacks can run at any point (e.g. while _fingerprints is being changed), so
+        # they only record the id, and the fingerprint is removed under the lock
+        self._collected_fingerprint_ids: List[int] = []
+
+        self._lock = threading.RLock()
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        if self.hits + self.misses == 0:
+            return None
+        return self.hits / (self.hits + self.misses)
+
+    def _get_fingerprint(self, obj: Any) -> Optional[str]:
+        with self._lock:
+            self._remove_collected_fingerprints()
+            fingerprint = self._fingerprints.get(id(obj))
+            if fingerprint is not None and fingerprint[0]() is obj:
+                return fingerprint[1]
+            return None
+
+    def _set_fingerprint(self, obj: Any, fingerprint: str) -> None:
+        obj_id = id(obj)
+        with self._lock:
+            self._remove_collected_fingerprints()
+            self._fingerprints[obj_id] = (weakref.ref(obj, lambda _: self._collected_fingerprint_ids.append(obj_id)), fingerprint)
+
+    def _remove_collected_fingerprints(self) -> None:
+        while len(self._collected_fingerprint_ids) > 0:
+            obj_id = self._collected_fingerprint_ids.pop()
+            fingerprint = self._fingerprints.get(obj_id)
+            # The id may already be used by a new object, which we keep the fingerprint of
+            if fingerprint is not None and fingerprint[0]() is None:
+                del self._fingerprints[obj_id]
+
+    def get_state_fingerprint(self, state: State) -> Optional[str]:
+        """
+        Returns the fingerprint of the state, hashing its dataframes and metadata
+        if it was not created by a step in this cache. Returns None if the state
+        cannot be fingerprinted.
+        """
+        fingerprint = self._get_fingerprint(state)
+        if fingerprint is not None:
+            return fingerprint
+
+        df_fingerprints = []
+        for df in state.dfs:
+            df_fingerprint = self._get_fingerprint(df)
+            if df_fingerprint is None:
+                df_fingerprint = get_dataframe_content_fingerprint(df)
+                if df_fingerprint is None:
+                    return None
+                self._set_fingerprint(df, df_fingerprint)
+            df_fingerprints.append(df_fingerprint)
+
+        try:
+            # NOTE: we use list.copy so we read the copy-on-write metadata without copying it
+            metadata = json.dumps([
+                list.copy(state.column_ids.column_id_to_column_header),
+                list.copy(state.column_formulas),
+                list.copy(state.column_filters),
+                list.copy(state.df_formats),
+                list.copy(state.graph_data_array),
+            ], cls=NpEncoder, sort_keys=True, default=repr)
+        except (TypeError, ValueError):
+            return None
+
+        user_defined_functions = [
+            get_function_fingerprint(function) for function in state.user_defined_functions + state.user_defined_importers + state.user_defined_editors
+        ]
+        if None in user_defined_functions:
+            return None
+
+        fingerprint = _get_hash(state.public_interface_version, state.engine, sorted(state.preview_sheet_indexes), *df_fingerprints, metadata, user_defined_functions)
+        self._set_fingerprint(state, fingerprint)
+        return fingerprint
+
+    def get_key(self, step_type: str, step_version: int, params: Dict[str, Any], prev_state: State) -> Optional[str]:
+        """
+        Returns the key of a step with these saturated params executing on the prev_state,
+        or None if the result of this step cannot be cached.
+        """
+        state_fingerprint = self.get_state_fingerprint(prev_state)
+        if state_fingerprint is None:
+            return None
+
+        try:
+            params_json = json.dumps(params, cls=NpEncoder, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+        # NOTE: we include the names and sources of the dataframes directly, as these
+        # are changed in place on the state when the dataframes are named by the frontend
+        return _get_hash(step_type, step_version, params_json, state_fingerprint, prev_state.df_names, prev_state.df_sources)
+
+    def get(self, key: str) -> Optional[Tuple[State, Dict[str, Any]]]:
+        """
+        Returns a copy of the post state and execution data cached for this key,
+        or None if there is none.
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                post_state, execution_data, _ = self._results[key]
+            elif key in self._spilled_results:
+                post_state, execution_data, size_bytes = self._spilled_results.pop(key)
+                self.spilled_size_bytes -= size_bytes
+                post_state = self.disk_cache.load_state(post_state) # type: ignore
+                self._add_result(key, post_state, execution_data, size_bytes)
+            else:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        # We return a copy, as the post state of a step can be changed in place
+        assert isinstance(post_state, State)
+        new_post_state = post_state.copy()
+        self._set_state_fingerprints(key, new_post_state)
+        return new_post_state, dict(execution_data)
+
+    def put(self, key: str, post_state: State, execution_data: Dict[str, Any], size_bytes: int) -> None:
+        """
+        Caches the result of the step with this key. The fingerprint of the post_state
+        is derived from the key, so the result of the next step can be found as well.
+        """
+        self._set_state_fingerprints(key, post_state)
+        if size_bytes > self.max_size_bytes:
+            return
+
+        with self._lock:
+            if key in self._results or key in self._spilled_results:
+                return
+            self._add_result(key, post_state.copy(), dict(execution_data), size_bytes)
+
+    def _set_state_fingerprints(self, key: str, state: State) -> None:
+        self._set_fingerprint(state, _get_hash('state', key))
+        for sheet_index, df in enumerate(state.dfs):
+            self._set_fingerprint(df, _get_hash('df', key, sheet_index))
+
+    def _add_result(self, key: str, post_state: State, execution_data: Dict[str, Any], size_bytes: int) -> None:
+        self._results[key] = (post_state, execution_data, size_bytes)
+        self.size_bytes += size_bytes
+
+        while self.size_bytes > self.max_size_bytes and len(self._results) > 0:
+            evicted_key, (evicted_post_state, evicted_execution_data, evicted_size_bytes) = self._results.popitem(last=False)
+            self.size_bytes -= evicted_size_bytes
+            self._spill_result(evicted_key, evicted_post_state, evicted_execution_data, evicted_size_bytes)
+
+    def _spill_result(self, key: str, post_state: Union[State, SpilledState], execution_data: Dict[str, Any], size_bytes: int) -> None:
+        if self.disk_cache is None or not isinstance(post_state, State):
+            return
+
+        try:
+            spilled_post_state = self.disk_cache.spill_state(post_state)
+        except OSError:
+            return
+
+        self._spilled_results[key] = (spilled_post_state, execution_data, size_bytes)
+        self.spilled_size_bytes += size_bytes
+
+        # We keep the same number of bytes on disk as in memory
+        while self.spilled_size_bytes > self.max_size_bytes and len(self._spilled_results) > 0:
+            _, (_, _, evicted_size_bytes) = self._spilled_results.popitem(last=False)
+            self.spilled_size_bytes -= evicted_size_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._spilled_results.clear()
+            self.size_bytes = 0
+            self.spilled_size_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# The step result cache is shared by all of the analyses in this process
+_step_result_cache: Optional[StepResultCache] = None
+
+
+def get_step_result_cache(mito_config: MitoConfig) -> Optional[StepResultCache]:
+    """
+    Returns the step result cache for this process if the mito_config turns it
+    on, and None otherwise.
+    """
+    global _step_result_cache
+
+    step_result_cache_size = mito_config.step_result_cache_size
+    if step_result_cache_size is None:
+        return None
+
+    max_size_bytes = int(step_result_cache_size * 1024 * 1024)
+    if _step_result_cache is None:
+        disk_cache = StepHistoryDiskCache() if mito_config.step_history_spill_to_disk else None
+        _step_result_cache = StepResultCache(max_size_bytes, disk_cache=disk_cache)
+    else:
+        _step_result_cache.max_size_bytes = max_size_bytes
+
+    return _step_result_cache
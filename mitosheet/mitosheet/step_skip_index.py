@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mitosheet.step import Step, get_filter_step_key, is_formula_step_overwriting_previous_step
+from mitosheet.types import ColumnID
+
+
+def is_same_step_for_skipping(step: Step, other_step: Step) -> bool:
+    """
+    Which steps a step skips only depends on its step type, step id and params. 
+    Reexecuting a step creates a new Step object with these same values, so 
+    we treat such steps as the same step.
+    """
+    return step is other_step or (
+        step.step_id == other_step.step_id 
+        and step.step_type == other_step.step_type 
+        and step.params is other_step.params
+    )
+
+
+class StepSkipIndex:
+    """
+    Keeps track of which steps in a list of steps are skipped, so that we
+    do not need to compare every step to every step before it on every edit.
+
+    The rules for which steps skip which other steps are documented in
+    Step.step_indexes_to_skip. This index applies the same rules, but looks
+    up the steps a new step skips by filter key and step id, rather than 
+    by scanning all the steps before it.
+
+    Steps can only be appended to and popped from the end of the index, which
+    is all that appending, overwriting, undoing and redoing steps needs. Use 
+    sync to update the index to a new list of steps.
+    """
+
+    def __init__(self, steps: Optional[List[Step]]=None):
+        self.steps: List[Step] = []
+        # For each step, the indexes of the steps it skips
+        self._skipped_by_step: List[Tuple[int, ...]] = []
+        # For each skipped step, the index of the first step that skips it
+        self._first_skipping_step_index: Dict[int, int] = {}
+
+        self._filter_step_indexes_by_key: Dict[Tuple[int, ColumnID], List[int]] = {}
+        self._step_indexes_by_id: Dict[str, List[int]] = {}
+        self._non_filter_step_indexes_by_id: Dict[str, List[int]] = {}
+
+        if steps is not None:
+            for step in steps:
+                self.append(step)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def append(self, step: Step) -> None:
+        step_index = len(self.steps)
+        filter_key = get_filter_step_key(step)
+
+        skipped_step_indexes: Set[int] = set()
+        if filter_key is not None:
+            # A filter step skips filters on the same column, and any other 
+            # steps with the same step id
+            skipped_step_indexes.update(self._filter_step_indexes_by_key.get(filter_key, []))
+            skipped_step_indexes.update(self._non_filter_step_indexes_by_id.get(step.step_id, []))
+        else:
+            skipped_step_indexes.update(self._step_indexes_by_id.get(step.step_id, []))
+
+        if step_index > 0 and is_formula_step_overwriting_previous_step(step, self.steps[-1]):
+            skipped_step_indexes.add(step_index - 1)
+
+        self.steps.append(step)
+        self._skipped_by_step.append(tuple(skipped_step_indexes))
+        for skipped_step_index in skipped_step_indexes:
+            self._first_skipping_step_index.setdefault(skipped_step_index, step_index)
+
+        if filter_key is not None:
+            self._filter_step_indexes_by_key.setdefault(filter_key, []).append(step_index)
+        else:
+            self._non_filter_step_indexes_by_id.setdefault(step.step_id, []).append(step_index)
+        self._step_indexes_by_id.setdefault(step.step_id, []).append(step_index)
+
+    def pop(self) -> Step:
+        step = self.steps.pop()
+        step_index = len(self.steps)
+
+        # As this is the last step, any step it skipped that was not skipped
+        # by an earlier step is no longer skipped
+        for skipped_step_index in self._skipped_by_step.pop():
+            if self._first_skipping_step_index[skipped_step_index] == step_index:
+                del self._first_skipping_step_index[skipped_step_index]
+
+        filter_key = get_filter_step_key(step)
+        if filter_key is not None:
+            _pop_index(self._filter_step_indexes_by_key, filter_key)
+        else:
+            _pop_index(self._non_filter_step_indexes_by_id, step.step_id)
+        _pop_index(self._step_indexes_by_id, step.step_id)
+
+        return step
+
+    def sync(self, steps: List[Step]) -> None:
+        """
+        Updates the index to the given list of steps. Only the steps after the
+        longest prefix shared with the current steps are popped and appended, 
+        so this is cheap when steps are added to or removed from the end.
+        """
+        shared_prefix_length = 0
+        max_shared_prefix_length = min(len(steps), len(self.steps))
+        while shared_prefix_length < max_shared_prefix_length and is_same_step_for_skipping(steps[shared_prefix_length], self.steps[shared_prefix_length]):
+            shared_prefix_length += 1
+
+        while len(self.steps) > shared_prefix_length:
+            self.pop()
+
+        for step in steps[shared_prefix_length:]:
+            self.append(step)
+
+        # Keep the current step objects, as steps are replaced when reexecuted
+        self.steps[:shared_prefix_length] = steps[:shared_prefix_length]
+
+    def get_step_indexes_skipped_by(self, step_index: int) -> Set[int]:
+        """
+        Returns the indexes of the steps that the step at step_index skips.
+        """
+        return set(self._skipped_by_step[step_index])
+
+    def get_step_indexes_to_skip(self, num_steps: Optional[int]=None) -> Set[int]:
+        """
+        Returns the indexes of the skipped steps. If num_steps is passed, returns
+        the indexes of the steps that are skipped in the first num_steps steps.
+        """
+        if num_steps is None or num_steps >= len(self.steps):
+            return set(self._first_skipping_step_index.keys())
+
+        return {
+            skipped_step_index for skipped_step_index, skipping_step_index in self._first_skipping_step_index.items()
+            if skipping_step_index < num_steps
+        }
+
+
+def _pop_index(step_indexes_by_key: Dict[Any, List[int]], key: Any) -> None:
+    step_indexes = step_indexes_by_key[key]
+    step_indexes.pop()
+    if len(step_indexes) == 0:
+        del step_indexes_by_key[key]
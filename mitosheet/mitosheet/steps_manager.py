@@ -8,6 +8,9 @@ import json
 import random
 import string
 from copy import copy, deepcopy
+from functools import partial
+from itertools import count
+from time import perf_counter
 from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple, Union
 
 import pandas as pd
@@ -25,7 +28,15 @@ from mitosheet.telemetry.telemetry_utils import log
 from mitosheet.preprocessing import PREPROCESS_STEP_PERFORMERS
 from mitosheet.saved_analyses.save_utils import get_analysis_exists
 from mitosheet.state import State
-from mitosheet.step import Step
+from mitosheet.step import Step, get_step_memory_usage
+from mitosheet.step_history_disk_cache import SpilledState, StepHistoryDiskCache
+from mitosheet.preview import get_sampled_initial_state, get_sampled_post_state
+from mitosheet.step_result_cache import StepResultCache, get_step_result_cache
+from mitosheet.sheet_data_cache import SheetDataCache
+from mitosheet.sheet_data_arrow import dfs_to_array_for_json_and_arrow, get_array_and_arrow_buffer
+from mitosheet.sheet_data_delta import get_sheet_data_delta
+from mitosheet.edit_executor import EditExecution
+from mitosheet.step_skip_index import StepSkipIndex
 from mitosheet.step_performers import EVENT_TYPE_TO_STEP_PERFORMER
 from mitosheet.step_performers.import_steps.excel_import import \
     ExcelImportStepPerformer
@@ -34,11 +45,11 @@ from mitosheet.step_performers.import_steps.simple_import import \
 from mitosheet.step_performers.import_steps.snowflake_import import \
     SnowflakeImportStepPerformer
 from mitosheet.transpiler.transpile import transpile
-from mitosheet.transpiler.transpile_utils import get_default_code_options
-from mitosheet.types import CodeOptions, ColumnDefinintion, ColumnDefinitions, DefaultEditingMode, MitoTheme, ParamMetadata
+from mitosheet.transpiler.transpile_utils import get_default_code_options, get_engine
+from mitosheet.types import CodeOptions, ColumnDefinintion, ColumnDefinitions, ColumnID, DefaultEditingMode, MitoTheme, ParamMetadata
 from mitosheet.updates import UPDATES
 from mitosheet.user.utils import is_enterprise, is_pro, is_running_test
-from mitosheet.utils import NpEncoder, dfs_to_array_for_json, get_default_df_formats, get_new_id, is_default_df_names
+from mitosheet.utils import INITIAL_RENDER_MAX_COLUMNS, INITIAL_RENDER_MAX_ROWS, NpEncoder, dfs_to_array_for_json, get_default_df_formats, get_json_string, get_new_id, enable_pandas_copy_on_write, is_default_df_names, is_pandas_copy_on_write_enabled
 from mitosheet.step_performers.utils.user_defined_function_utils import get_user_defined_importers_for_frontend, get_user_defined_editors_for_frontend
 from mitosheet.step_performers.utils.user_defined_function_utils import validate_and_wrap_sheet_functions, validate_user_defined_editors
 
@@ -46,19 +57,163 @@ def get_step_indexes_to_skip(step_list: List[Step]) -> Set[int]:
     """
     Given a list of steps, will collect all of the steps
     from this list that should be skipped.
+
+    NOTE: this builds the skip index from scratch. The steps manager keeps
+    a StepSkipIndex up to date for its steps, which should be used instead
+    where possible.
     """
-    step_indexes_to_skip: Set[int] = set()
+    return StepSkipIndex(step_list).get_step_indexes_to_skip()
 
-    for step_index, step in enumerate(step_list):
-        step_indexes_to_skip = step_indexes_to_skip.union(
-            step.step_indexes_to_skip(step_list[:step_index])
-        )
 
-    return step_indexes_to_skip
+# Every time a sheet is changed by a step, it gets a new sheet version. 
+_sheet_version_counter = count()
+
+def get_new_sheet_versions(num_sheets: int) -> Tuple[int, ...]:
+    return tuple(next(_sheet_version_counter) for _ in range(num_sheets))
+
+
+def get_step_sheet_reads_and_writes(step: Step) -> Optional[Tuple[Set[int], Set[int]]]:
+    """
+    Returns the sheet indexes that this step reads from, and the sheet indexes that
+    this step edits or creates, using the code chunks that the step transpiles to. 
+
+    If the code chunks do not tell us exactly which sheets the step touches, returns
+    None, which means the step might read or write any sheet.
+    """
+    prev_state = step.prev_state
+    post_state = step.post_state
+    if prev_state is None or post_state is None:
+        return None
+
+    read_sheet_indexes: Set[int] = set()
+    written_sheet_indexes: Set[int] = set()
+    for code_chunk in step.step_performer.transpile(prev_state, step.params, step.execution_data):
+        created_sheet_indexes = code_chunk.get_created_sheet_indexes()
+        edited_sheet_indexes = code_chunk.get_edited_sheet_indexes()
+        source_sheet_indexes = code_chunk.get_source_sheet_indexes()
+        if (created_sheet_indexes is None and edited_sheet_indexes is None) or source_sheet_indexes is None:
+            return None
+
+        read_sheet_indexes.update(edited_sheet_indexes or [])
+        read_sheet_indexes.update(source_sheet_indexes)
+        written_sheet_indexes.update(edited_sheet_indexes or [])
+        written_sheet_indexes.update(created_sheet_indexes or [])
+
+    # A step that says it touches no sheets might touch any of them
+    if len(written_sheet_indexes) == 0:
+        return None
+
+    # Code chunks do not report the sheets that formulas reference, so we conservatively
+    # say any sheet whose name is referenced in the params is read
+    for sheet_index, df_name in enumerate(prev_state.df_names):
+        if any(isinstance(value, str) and f'{df_name}!' in value for value in step.params.values()):
+            read_sheet_indexes.add(sheet_index)
+
+    # Make sure the code chunks agree with the step performer about what is modified
+    modified_sheet_indexes = step.step_performer.get_modified_dataframe_indexes(step.params)
+    if len(modified_sheet_indexes) == 0 or not (modified_sheet_indexes - {-1}).issubset(written_sheet_indexes):
+        return None
+
+    # Make sure the created sheets are exactly those added to the end of the state
+    if len(post_state.dfs) < len(prev_state.dfs) or \
+        not set(range(len(prev_state.dfs), len(post_state.dfs))).issubset(written_sheet_indexes) or \
+        any(sheet_index >= len(post_state.dfs) for sheet_index in written_sheet_indexes):
+        return None
+
+    return read_sheet_indexes, written_sheet_indexes
+
+
+def set_step_sheet_dependencies(step: Step, prev_step: Step) -> None:
+    """
+    After a step is executed on the final state of the prev_step, records which 
+    sheets the step reads and writes, and the version of each sheet before and 
+    after the step. Sheets the step writes get new versions.
+
+    Together, these make up the dependency graph between steps and sheets, and
+    allow us to tell if a step needs to be rerun when earlier steps change.
+    """
+    step.prev_sheet_versions = prev_step.sheet_versions
+    step.sheet_reads_and_writes = get_step_sheet_reads_and_writes(step)
+
+    num_sheets = len(step.final_defined_state.dfs)
+    if step.prev_sheet_versions is None or step.sheet_reads_and_writes is None:
+        step.sheet_versions = get_new_sheet_versions(num_sheets)
+        return
+
+    _, written_sheet_indexes = step.sheet_reads_and_writes
+    sheet_versions = list(step.prev_sheet_versions) + [-1] * (num_sheets - len(step.prev_sheet_versions))
+    for sheet_index in written_sheet_indexes:
+        sheet_versions[sheet_index] = next(_sheet_version_counter)
+    step.sheet_versions = tuple(sheet_versions)
+
+
+def get_step_with_reused_execution(step: Step, prev_step: Step) -> Optional[Step]:
+    """
+    Given a step that was previously executed, and the step it should now be 
+    executed after, returns a new step that reuses the result of the previous 
+    execution if this is possible. 
+
+    This is possible if none of the sheets the step reads or writes have changed 
+    since the previous execution, in which case the new post state is just the
+    final state of the prev_step with the sheets the step wrote taken from the 
+    previous execution. Otherwise, returns None, and the step must be executed.
+    """
+    # Don't recompute evicted states just to check if they can be reused
+    if step.states_evicted or prev_step.states_evicted:
+        return None
+
+    new_prev_state = prev_step.final_defined_state
+    new_prev_sheet_versions = prev_step.sheet_versions
+    old_prev_state = step.prev_state
+    old_post_state = step.post_state
+
+    if step.sheet_reads_and_writes is None or step.prev_sheet_versions is None or step.sheet_versions is None \
+        or new_prev_sheet_versions is None or old_prev_state is None or old_post_state is None:
+        return None
+
+    if len(new_prev_sheet_versions) != len(step.prev_sheet_versions):
+        return None
+
+    changed_sheet_indexes = {
+        sheet_index for sheet_index, (old_version, new_version) in enumerate(zip(step.prev_sheet_versions, new_prev_sheet_versions))
+        if old_version != new_version
+    }
+
+    read_sheet_indexes, written_sheet_indexes = step.sheet_reads_and_writes
+    if len(changed_sheet_indexes.intersection(read_sheet_indexes.union(written_sheet_indexes))) > 0:
+        return None
+
+    # Dataframe names are used across sheets (e.g. when naming new sheets), and graphs are
+    # not tracked by sheet, so only reuse steps when these are unaffected
+    if old_prev_state.df_names != new_prev_state.df_names or old_prev_state.graph_data_array != old_post_state.graph_data_array:
+        return None
+
+    new_step = Step(
+        step.step_type, 
+        step.step_id, 
+        step.params, 
+        new_prev_state, 
+        new_prev_state.copy_with_sheets_from(old_post_state, written_sheet_indexes), 
+        step.execution_data
+    )
+    new_step.sheet_reads_and_writes = step.sheet_reads_and_writes
+    new_step.execution_time = step.execution_time
+    new_step.prev_sheet_versions = new_prev_sheet_versions
+    new_step.sheet_versions = tuple(
+        step.sheet_versions[sheet_index] if sheet_index in written_sheet_indexes else new_prev_sheet_versions[sheet_index]
+        for sheet_index in range(len(step.sheet_versions))
+    )
+
+    return new_step
 
 
 def execute_step_list_from_index(
-    step_list: List[Step], start_index: Optional[int]=None
+    step_list: List[Step], 
+    start_index: Optional[int]=None, 
+    step_indexes_to_skip: Optional[Set[int]]=None, 
+    step_result_cache: Optional[StepResultCache]=None,
+    edit_execution: Optional[EditExecution]=None,
+    preview_row_threshold: Optional[int]=None
 ) -> List[Step]:
     """
     Given a list of steps, and a specific index to start from, will assume that
@@ -69,7 +224,13 @@ def execute_step_list_from_index(
     means that the returned step list will only have valid prev_state/post_states
     for the steps that are not skipped.
 
-    If start_index is not given, will start from the initialize step.
+    If start_index is not given, will start from the initialize step. If the
+    step_indexes_to_skip are not given, they are computed from the step_list.
+    If a step_result_cache is given, cached step results are used when possible.
+    If an edit_execution is given, progress is reported to it before each step is
+    executed, which stops the execution if the edit has been cancelled.
+    If a preview_row_threshold is given, the dataframes each step creates are sampled 
+    down to this many rows. See mitosheet/preview.py.
     """
 
     # Make sure start index is not None
@@ -77,7 +238,8 @@ def execute_step_list_from_index(
         start_index = 0
 
     # Get the steps to skip, so that we can skip them
-    step_indexes_to_skip = get_step_indexes_to_skip(step_list)
+    if step_indexes_to_skip is None:
+        step_indexes_to_skip = get_step_indexes_to_skip(step_list)
 
     # Get the steps that are valid, and the last valid step, so we can execute from there
     new_step_list = step_list[: start_index + 1]
@@ -91,14 +253,29 @@ def execute_step_list_from_index(
             new_step_list.append(step)
             continue
             
-        # Create a new step with the same params
-        new_step = Step(step.step_type, step.step_id, step.params)
-
-        # Set the previous state of the new step, and then update
-        # what the last valid step is. Note that we find the actually
-        # executed steps before passing them
-        non_skipped_steps = [step for index, step in enumerate(new_step_list) if index not in step_indexes_to_skip]
-        new_step.set_prev_state_and_execute(last_valid_step.final_defined_state, non_skipped_steps)
+        # If the step does not depend on any sheet that changed since it was last
+        # executed, we can reuse the result of that execution rather than rerunning it
+        new_step = get_step_with_reused_execution(step, last_valid_step)
+
+        if new_step is None:
+            if edit_execution is not None:
+                edit_execution.report_progress(partial_index, len(step_list) - start_index - 1, step.step_type)
+
+            # Create a new step with the same params
+            new_step = Step(step.step_type, step.step_id, step.params)
+
+            # Set the previous state of the new step, and then update
+            # what the last valid step is. Note that we find the actually
+            # executed steps before passing them
+            non_skipped_steps = [step for index, step in enumerate(new_step_list) if index not in step_indexes_to_skip]
+            new_step.set_prev_state_and_execute(last_valid_step.final_defined_state, non_skipped_steps, step_result_cache=step_result_cache)
+            set_step_sheet_dependencies(new_step, last_valid_step)
+
+            if preview_row_threshold is not None and new_step.prev_state is not None and new_step.post_state is not None:
+                new_step.post_state = get_sampled_post_state(
+                    new_step.prev_state, new_step.post_state, new_step.sheet_reads_and_writes, preview_row_threshold
+                )
+
         last_valid_step = new_step
 
         new_step_list.append(new_step)
@@ -106,6 +283,19 @@ def execute_step_list_from_index(
     return new_step_list
 
 
+def get_initialize_step_with_engine(initialize_step: Step, engine: str) -> Step:
+    """
+    Returns a copy of the initialize step, where the steps after it execute with
+    the given engine.
+    """
+    initial_state = initialize_step.final_defined_state.copy()
+    initial_state.engine = engine
+
+    new_initialize_step = Step(initialize_step.step_type, initialize_step.step_id, initialize_step.params, None, initial_state, {})
+    new_initialize_step.sheet_versions = get_new_sheet_versions(len(initial_state.dfs))
+    return new_initialize_step
+
+
 def get_modified_sheet_indexes(
     steps: List[Step], starting_step_index: int, ending_step_index: int
 ) -> Set[int]:
@@ -214,10 +404,16 @@ class StepsManager:
         # inside this folder
         self.import_folder = import_folder
 
+        # If the mito_config turns on pandas Copy-on-Write, we turn it on before copying 
+        # any dataframes, so that none of the copies below need to be deep copies
+        if mito_config.pandas_copy_on_write:
+            enable_pandas_copy_on_write()
+        deep_copy = not is_pandas_copy_on_write_enabled()
+
         # The args are a tuple of dataframes or strings, and we start by making them
         # into a list, and making copies of them for safe keeping
         self.original_args = [
-            arg.copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
+            arg.copy(deep=deep_copy) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
             for arg in args
         ]
 
@@ -266,23 +462,36 @@ class StepsManager:
         self.public_interface_version = 3
 
         df_formats = get_default_df_formats(column_definitions, list(args))
+
+        initial_state = State(
+            args, 
+            self.public_interface_version,
+            df_names=df_names,
+            user_defined_functions=self.user_defined_functions, 
+            user_defined_importers=self.user_defined_importers,
+            user_defined_editors=self.user_defined_editors,
+            df_formats=df_formats,
+            engine=get_engine(code_options)
+        )
+
+        # If the mito_config sets a preview row threshold, the steps execute on samples of any
+        # dataframes larger than this. We keep the full initial state, so that we can execute 
+        # the steps on the full data when we need it. See mitosheet/preview.py
+        self.preview_row_threshold = mito_config.preview_row_threshold
+        self.full_data_initial_state = initial_state
+        if self.preview_row_threshold is not None:
+            initial_state = get_sampled_initial_state(initial_state, self.preview_row_threshold)
+        self._full_data_state_cache: Optional[Tuple[List[Step], int, State]] = None
         
         # Then we initialize the analysis with just a simple initialize step
         self.steps_including_skipped: List[Step] = [
-            Step(
-                "initialize", "initialize", {}, None, 
-                State(
-                    args, 
-                    self.public_interface_version,
-                    df_names=df_names,
-                    user_defined_functions=self.user_defined_functions, 
-                    user_defined_importers=self.user_defined_importers,
-                    user_defined_editors=self.user_defined_editors,
-                    df_formats=df_formats
-                ), 
-                {}
-            )
+            Step("initialize", "initialize", {}, None, initial_state, {})
         ]
+        self.steps_including_skipped[0].sheet_versions = get_new_sheet_versions(len(self.steps_including_skipped[0].dfs))
+
+        # We keep track of which steps are skipped as steps are added and removed, 
+        # so we don't have to recompute it from all the steps on every edit
+        self.step_skip_index = StepSkipIndex(self.steps_including_skipped)
 
         """
         To help with redo, we store a list of a list of the steps that 
@@ -310,7 +519,7 @@ class StepsManager:
         # into json, so that we can package it and send it to the front-end
         # faster and with less work. Make sure to cache the starting values
         # for the saved sheet data
-        self.saved_sheet_data: List[Dict] = dfs_to_array_for_json(
+        self.saved_sheet_data: List[Dict[str, Any]] = dfs_to_array_for_json(
             self.curr_step.final_defined_state,
             set(range(len(args))),
             [],
@@ -323,6 +532,21 @@ class StepsManager:
             self.curr_step.df_formats,
         )
         self.last_step_index_we_wrote_sheet_json_on = 0
+        # The versions of the sheets in the saved sheet data, and the sheets in it that were 
+        # built by reusing the unchanged columns of the sheet data saved before it
+        self.saved_sheet_versions = self.curr_step.sheet_versions
+        self.saved_sheet_indexes_with_reused_columns: Set[int] = set()
+
+        # We also cache the sheet data of the states that we have displayed, so that
+        # when undoing, redoing or checking out a step, we can send it again without
+        # serializing all of the sheets again. See mitosheet/sheet_data_cache.py
+        self.sheet_data_cache = SheetDataCache()
+
+        # If the mito_config turns on arrow_sheet_data, we also cache the sheet data with the
+        # data of the columns in Arrow IPC streams. See mitosheet/sheet_data_arrow.py. As this
+        # is only used by some frontends, we only fill it in the first time it is requested
+        self.saved_sheet_data_arrow: List[Tuple[Dict[str, Any], bytes]] = []
+        self.last_step_index_we_wrote_sheet_arrow_on: Optional[int] = None
 
         # We store the number of update events that have been processed successfully,
         # which allows us to have some awareness about undos and redos in the front-end
@@ -345,6 +569,22 @@ class StepsManager:
         # Store the mito_log_uploader
         self.mito_log_uploader = mito_log_uploader
 
+        # If the mito_config sets a step history memory budget, we evict the states of 
+        # steps to stay under it, and recompute them when they are needed. We count how
+        # often this happens, so that the budget and checkpoint interval can be tuned
+        self.step_state_eviction_count = 0
+        self.step_state_recompute_count = 0
+
+        # If the mito_config turns on spilling the step history to disk, evicted states are 
+        # written to this cache instead, and read back in rather than recomputed
+        self.step_history_disk_cache = StepHistoryDiskCache() if self.mito_config.step_history_spill_to_disk else None
+        self.step_state_spill_count = 0
+        self.step_state_load_count = 0
+
+        # If the mito_config sets a step result cache size, steps that were already executed 
+        # on the same state, by this or any other analysis in this process, are not executed again
+        self.step_result_cache = get_step_result_cache(self.mito_config)
+
         # The options for the transpiled code. The user can optionally pass these 
         # in, but if they don't, we use the default options
         # We also do some checks for the user_defined_importers
@@ -368,6 +608,79 @@ class StepsManager:
     def dfs(self) -> List[pd.DataFrame]:
         return self.steps_including_skipped[self.curr_step_idx].dfs
 
+    def get_sheet_data_array(self) -> List[Dict[str, Any]]:
+        """
+        Returns the sheet data of each sheet, in a form that can be turned
+        into json. Only the sheets that were modified since this was last 
+        called are serialized again.
+        """
+        state = self.curr_step.final_defined_state
+        modified_sheet_indexes = set(get_modified_sheet_indexes(
+            self.steps_including_skipped, self.last_step_index_we_wrote_sheet_json_on, self.curr_step_idx
+        ))
+
+        # Steps before the current one may have been executed again, e.g. when an earlier step 
+        # is skipped, so we also include any sheet with a different version than we serialized
+        curr_sheet_versions = self.curr_step.sheet_versions
+        saved_sheet_versions = self.saved_sheet_versions
+        if curr_sheet_versions is not None and saved_sheet_versions is not None:
+            modified_sheet_indexes.update(
+                sheet_index for sheet_index, sheet_version in enumerate(curr_sheet_versions)
+                if sheet_index >= len(saved_sheet_versions) or sheet_version != saved_sheet_versions[sheet_index]
+            )
+
+        # If we moved to a different step, e.g. by undoing, we reuse the sheet data of the sheets
+        # we serialized for its state before. We don't if we are on the same step, as updates can
+        # change the state in place
+        previous_array: List[Optional[Dict[str, Any]]] = [
+            self.saved_sheet_data[sheet_index] if sheet_index < len(self.saved_sheet_data) else None 
+            for sheet_index in range(len(state.dfs))
+        ]
+        if self.curr_step_idx != self.last_step_index_we_wrote_sheet_json_on:
+            for sheet_index in list(modified_sheet_indexes):
+                cached_sheet_data = self.sheet_data_cache.get(state, sheet_index)
+                if cached_sheet_data is not None:
+                    previous_array[sheet_index] = cached_sheet_data
+                    modified_sheet_indexes.remove(sheet_index)
+
+        # For the sheets with the same version as when we serialized them last, no columns changed.
+        # Otherwise, if the current step was executed on the sheets we serialized last, then the 
+        # sheets it reconed record which of their columns changed. The other columns are reused
+        changed_column_ids: Dict[int, Optional[List[ColumnID]]] = {}
+        if curr_sheet_versions is not None and saved_sheet_versions is not None:
+            step_changed_column_ids = self.curr_step.execution_data.get('changed_column_ids_by_sheet_index', {}) \
+                if self.curr_step.prev_sheet_versions == saved_sheet_versions else {}
+            for sheet_index in modified_sheet_indexes:
+                if sheet_index >= len(saved_sheet_versions) or previous_array[sheet_index] is None:
+                    continue
+                if curr_sheet_versions[sheet_index] == saved_sheet_versions[sheet_index]:
+                    changed_column_ids[sheet_index] = []
+                elif sheet_index in step_changed_column_ids:
+                    changed_column_ids[sheet_index] = step_changed_column_ids[sheet_index]
+
+        array = dfs_to_array_for_json(
+            state,
+            modified_sheet_indexes,
+            previous_array,
+            self.curr_step.dfs,
+            self.curr_step.df_names,
+            self.curr_step.df_sources,
+            self.curr_step.column_formulas,
+            self.curr_step.column_filters,
+            self.curr_step.column_ids,
+            self.curr_step.df_formats,
+            changed_column_ids=changed_column_ids
+        )
+
+        for sheet_index, sheet_data in enumerate(array):
+            self.sheet_data_cache.put(state, sheet_index, sheet_data)
+
+        self.saved_sheet_data = array
+        self.saved_sheet_versions = self.curr_step.sheet_versions
+        self.saved_sheet_indexes_with_reused_columns = set(changed_column_ids.keys())
+        self.last_step_index_we_wrote_sheet_json_on = self.curr_step_idx
+        return array
+
     @property
     def sheet_data_json(self) -> str:
         """
@@ -378,14 +691,64 @@ class StepsManager:
         for speed reasons. This results in way less data getting
         passed around
         """
-        modified_sheet_indexes = get_modified_sheet_indexes(
-            self.steps_including_skipped, self.last_step_index_we_wrote_sheet_json_on, self.curr_step_idx
-        )
+        serialization_start_time = perf_counter()
+        sheet_data_json = get_json_string(self.get_sheet_data_array())
+        self.curr_step.serialization_time = perf_counter() - serialization_start_time
+        return sheet_data_json
 
-        array = dfs_to_array_for_json(
+    def get_initial_render_sheet_data_json(self) -> str:
+        """
+        Returns the sheet data of each sheet with only the rows and columns that are
+        displayed when the sheet is first rendered, which is embedded in the notebook
+        output. The rest of the sheet data is fetched as the sheet is scrolled, and sent
+        in full with the next response.
+        """
+        return get_json_string(dfs_to_array_for_json(
+            self.curr_step.final_defined_state,
+            set(range(len(self.curr_step.dfs))),
+            [],
+            self.curr_step.dfs,
+            self.curr_step.df_names,
+            self.curr_step.df_sources,
+            self.curr_step.column_formulas,
+            self.curr_step.column_filters,
+            self.curr_step.column_ids,
+            self.curr_step.df_formats,
+            max_rows=INITIAL_RENDER_MAX_ROWS,
+            max_columns=INITIAL_RENDER_MAX_COLUMNS
+        ))
+
+    def get_sheet_data_delta_json(self, previous_array: List[Dict[str, Any]]) -> str:
+        """
+        Returns the changes to the sheet data since the previous_array, which 
+        was returned from get_sheet_data_array. See mitosheet/sheet_data_delta.py
+        """
+        serialization_start_time = perf_counter()
+        array = self.get_sheet_data_array()
+        sheet_data_delta_json = get_json_string(get_sheet_data_delta(
+            previous_array, array, sheet_indexes_with_reused_columns=self.saved_sheet_indexes_with_reused_columns
+        ))
+        self.curr_step.serialization_time = perf_counter() - serialization_start_time
+        return sheet_data_delta_json
+
+    def get_sheet_data_arrow(self) -> Tuple[str, bytes]:
+        """
+        Returns the same sheet data as sheet_data_json, but with the data of the
+        columns in a buffer of Arrow IPC streams, rather than in the JSON. See
+        mitosheet/sheet_data_arrow.py for the format.
+        """
+        serialization_start_time = perf_counter()
+        if self.last_step_index_we_wrote_sheet_arrow_on is None:
+            modified_sheet_indexes = set(range(len(self.curr_step.dfs)))
+        else:
+            modified_sheet_indexes = get_modified_sheet_indexes(
+                self.steps_including_skipped, self.last_step_index_we_wrote_sheet_arrow_on, self.curr_step_idx
+            )
+
+        array_and_arrow_streams = dfs_to_array_for_json_and_arrow(
             self.curr_step.final_defined_state,
             modified_sheet_indexes,
-            self.saved_sheet_data,
+            self.saved_sheet_data_arrow,
             self.curr_step.dfs,
             self.curr_step.df_names,
             self.curr_step.df_sources,
@@ -395,10 +758,13 @@ class StepsManager:
             self.curr_step.df_formats,
         )
 
-        self.saved_sheet_data = array
-        self.last_step_index_we_wrote_sheet_json_on = self.curr_step_idx
+        self.saved_sheet_data_arrow = array_and_arrow_streams
+        self.last_step_index_we_wrote_sheet_arrow_on = self.curr_step_idx
 
-        return json.dumps(array, cls=NpEncoder)
+        array, arrow_buffer = get_array_and_arrow_buffer(array_and_arrow_streams)
+        sheet_data_json = get_json_string(array)
+        self.curr_step.serialization_time = perf_counter() - serialization_start_time
+        return sheet_data_json, arrow_buffer
 
     @property
     def analysis_data_json(self):
@@ -442,7 +808,7 @@ class StepsManager:
         the skipped steps
         """
         step_summary_list = []
-        step_indexes_to_skip = get_step_indexes_to_skip(self.steps_including_skipped)
+        step_indexes_to_skip = self.step_skip_index.get_step_indexes_to_skip()
         for index, step in enumerate(self.steps_including_skipped):
             if step.step_type == "initialize":
                 step_summary_list.append(
@@ -510,13 +876,14 @@ class StepsManager:
     def param_metadata(self) -> List[ParamMetadata]:
         return get_parameterizable_params_metadata(self)
 
-    def handle_edit_event(self, edit_event: Dict[str, Any]) -> None:
+    def handle_edit_event(self, edit_event: Dict[str, Any], edit_execution: Optional[EditExecution]=None) -> None:
         """
         Updates the widget state with a new step that was created
         by the edit_event. Each edit event creates one new step.
 
-        If there is an error in the creation of the new step, this
-        function will not create the new invalid step.
+        If there is an error in the creation of the new step, or the 
+        edit_execution is cancelled, this function will not create the 
+        new step.
         """
 
         # NOTE: We ignore any edit if we are in a historical state, for now. This is a result
@@ -524,6 +891,12 @@ class StepsManager:
         if self.curr_step_idx != len(self.steps_including_skipped) - 1:
             return
 
+        new_step = self._get_step_from_edit_event(edit_event)
+
+        new_steps = self.steps_including_skipped + [new_step]
+
+        self.execute_and_update_steps(new_steps, edit_execution=edit_execution)
+
         # If the event included a flag to refresh the use of live updating hooks, then we
         # increment the update_event_count. The update_event_count variable is usually used to detect
         # redo/ undo events, but in this case we're using it to make API calls in conjunction with
@@ -531,20 +904,6 @@ class StepsManager:
         if edit_event.get('refresh_use_live_updating_hooks'):
             self.update_event_count += 1
 
-        step_performer = EVENT_TYPE_TO_STEP_PERFORMER[edit_event["type"]]
-
-        # First, we add the public interface to the params, as we might need it for any step
-        edit_event["params"]['public_interface_version'] = self.public_interface_version
-
-        # Then, we make a new step
-        new_step = Step(
-            step_performer.step_type(), edit_event["step_id"], edit_event["params"]
-        )
-
-        new_steps = self.steps_including_skipped + [new_step]
-
-        self.execute_and_update_steps(new_steps)
-
         # If we add a new step, then we clear the last_undone_list_store, as
         # you cannot redo something after you make a new edit
         self.undone_step_list_store = []
@@ -559,6 +918,50 @@ class StepsManager:
         if len(self.steps_including_skipped) == 2 and is_default_df_names(self.curr_step.df_names): # NOTE: two means we have done at least one edit.
             log('args_update_remains_failed')
 
+    def handle_batch_edit_event(self, batch_edit_event: Dict[str, Any], edit_execution: Optional[EditExecution]=None) -> None:
+        """
+        Updates the widget state with the new steps created by each of the 
+        edit_events in the batch_edit_event, in order. 
+        
+        The new steps are executed in a single pass, rather than executing
+        all of the steps after each one is added. If there is an error in 
+        the creation of any of the new steps, none of them are created.
+        """
+        
+        # NOTE: We ignore any edit if we are in a historical state, just like handle_edit_event
+        if self.curr_step_idx != len(self.steps_including_skipped) - 1:
+            return
+
+        edit_events: List[Dict[str, Any]] = batch_edit_event['params']['edit_events']
+        if len(edit_events) == 0:
+            return
+
+        new_steps = self.steps_including_skipped + [
+            self._get_step_from_edit_event(edit_event) for edit_event in edit_events
+        ]
+
+        self.execute_and_update_steps(new_steps, edit_execution=edit_execution)
+
+        if any(edit_event.get('refresh_use_live_updating_hooks') for edit_event in edit_events):
+            self.update_event_count += 1
+
+        # As with a single edit, you cannot redo something after you make new edits
+        self.undone_step_list_store = []
+
+    def _get_step_from_edit_event(self, edit_event: Dict[str, Any]) -> Step:
+        """
+        Returns the new step that the edit_event creates.
+        """
+        step_performer = EVENT_TYPE_TO_STEP_PERFORMER[edit_event["type"]]
+
+        # First, we add the public interface to the params, as we might need it for any step
+        edit_event["params"]['public_interface_version'] = self.public_interface_version
+
+        # Then, we make a new step
+        return Step(
+            step_performer.step_type(), edit_event["step_id"], edit_event["params"]
+        )
+
     def handle_update_event(self, update_event: Dict[str, Any]) -> None:
         """
         Handles any event that isn't caused by an edit, but instead
@@ -584,19 +987,21 @@ class StepsManager:
         Given the new_steps, this function performs some logic to figure
         out what the last valid index in the steps is (that execution can
         then start from).
+
+        NOTE: this updates the step_skip_index to the new_steps. 
         """
+        num_old_steps = len(self.steps_including_skipped)
 
         # Currently, we only remove steps in an undo
-        if len(new_steps) < len(self.steps_including_skipped):
+        if len(new_steps) < num_old_steps:
             # If we are removing steps, then we figure out what skipped steps
             # we are losing, and run from right before where we are no longer
             # skipped steps
             no_longer_skipped_indexes: Set[int] = set()
-            for step_index, removed_step in enumerate(self.steps_including_skipped[len(new_steps) :]):
-                previous_steps = self.steps_including_skipped[: len(new_steps) + step_index]
-                no_longer_skipped_indexes = no_longer_skipped_indexes.union(
-                    removed_step.step_indexes_to_skip(previous_steps)
-                )
+            for step_index in range(len(new_steps), num_old_steps):
+                no_longer_skipped_indexes.update(self.step_skip_index.get_step_indexes_skipped_by(step_index))
+
+            self.step_skip_index.sync(new_steps)
 
             last_valid_index = (
                 min(no_longer_skipped_indexes.union({len(new_steps)})) - 1
@@ -604,21 +1009,19 @@ class StepsManager:
         else:
             # Otherwise, if we're adding steps, we figure out which skipped steps
             # we're adding, and run from right before the oldest new skipped step
+            self.step_skip_index.sync(new_steps)
 
             # Collect anything that is newly skipped
             newly_skipped_indexes: Set[int] = set()
-            for step_index, new_step in enumerate(new_steps[len(self.steps_including_skipped) :]):
-                previous_steps = new_steps[: len(self.steps_including_skipped) + step_index]
-                newly_skipped_indexes = newly_skipped_indexes.union(
-                    new_step.step_indexes_to_skip(previous_steps)
-                )
+            for step_index in range(num_old_steps, len(new_steps)):
+                newly_skipped_indexes.update(self.step_skip_index.get_step_indexes_skipped_by(step_index))
 
             # The last valid index is the minimum of the newly skipped things - 1
             # or the last valid step (if nothing is skipped)
-            last_valid_index = min(newly_skipped_indexes.union({len(self.steps_including_skipped)})) - 1
+            last_valid_index = min(newly_skipped_indexes.union({num_old_steps})) - 1
 
         # Make sure that this step isn't itself skipped, and decrement until it is not
-        all_skipped_indexes = get_step_indexes_to_skip(new_steps)
+        all_skipped_indexes = self.step_skip_index.get_step_indexes_to_skip()
         while last_valid_index in all_skipped_indexes:
             last_valid_index -= 1
 
@@ -746,7 +1149,7 @@ class StepsManager:
 
 
     def execute_and_update_steps(
-        self, new_steps: List[Step], last_valid_index: Optional[int] = None
+        self, new_steps: List[Step], last_valid_index: Optional[int] = None, edit_execution: Optional[EditExecution] = None
     ) -> None:
         """
         Given a list of new_steps, runs them from the last valid index,
@@ -762,15 +1165,249 @@ class StepsManager:
         in the new_steps array. Otherwise, the step manager can calculate
         the last valid index without help.
         """
-        if last_valid_index is None:
-            last_valid_index = self.find_last_valid_index(new_steps)
+        try:
+            # If the engine in the code options changed, all of the steps must be executed 
+            # again with it, so that the generated code uses the engine as well
+            engine = get_engine(self.code_options)
+            if new_steps[0].final_defined_state.engine != engine:
+                new_steps = [get_initialize_step_with_engine(new_steps[0], engine)] + new_steps[1:]
+                last_valid_index = 0
+
+            if last_valid_index is None:
+                last_valid_index = self.find_last_valid_index(new_steps)
+            else:
+                self.step_skip_index.sync(new_steps)
+
+            final_steps = execute_step_list_from_index(
+                new_steps, 
+                start_index=last_valid_index, 
+                step_indexes_to_skip=self.step_skip_index.get_step_indexes_to_skip(),
+                step_result_cache=self.step_result_cache,
+                edit_execution=edit_execution,
+                preview_row_threshold=self.preview_row_threshold
+            )
+
+            # If the edit was cancelled while it executed, we do not save the new steps
+            if edit_execution is not None:
+                edit_execution.commit()
+        except:
+            # If the new steps fail to execute, we keep the old steps, so we
+            # make sure the skip index is for these steps as well
+            self.step_skip_index.sync(self.steps_including_skipped)
+            raise
 
-        final_steps = execute_step_list_from_index(
-            new_steps, start_index=last_valid_index
-        )
         self.steps_including_skipped = final_steps
+        self.step_skip_index.sync(final_steps)
         self.curr_step_idx = len(self.steps_including_skipped) - 1
 
+        self.evict_step_states()
+
+    @property
+    def is_preview(self) -> bool:
+        """
+        Returns True if any of the sheets currently displayed are samples of the full data.
+        """
+        return len(self.curr_step.final_defined_state.preview_sheet_indexes) > 0
+
+    def get_full_data_state(self) -> State:
+        """
+        Returns the state after the current step, executed on the full data rather 
+        than on the samples the steps were executed on in preview mode. 
+
+        This executes all of the steps again, so the result is cached until the steps
+        or the current step change.
+        """
+        if not self.is_preview:
+            return self.curr_step.final_defined_state
+
+        if self._full_data_state_cache is not None:
+            cached_steps, cached_curr_step_idx, cached_state = self._full_data_state_cache
+            if cached_steps is self.steps_including_skipped and cached_curr_step_idx == self.curr_step_idx:
+                return cached_state
+
+        initial_state = self.full_data_initial_state.copy()
+        initial_state.engine = self.steps_including_skipped[0].final_defined_state.engine
+        initialize_step = Step("initialize", "initialize", {}, None, initial_state, {})
+        initialize_step.sheet_versions = get_new_sheet_versions(len(initial_state.dfs))
+
+        # We execute new steps, so that none of the sampled results of the steps are reused
+        step_indexes_to_skip = self.step_skip_index.get_step_indexes_to_skip()
+        full_data_steps = execute_step_list_from_index(
+            [initialize_step] + [
+                Step(step.step_type, step.step_id, step.params) 
+                for step in self.steps_including_skipped[1:self.curr_step_idx + 1]
+            ],
+            step_indexes_to_skip=step_indexes_to_skip,
+            step_result_cache=self.step_result_cache
+        )
+
+        last_executed_step = [step for index, step in enumerate(full_data_steps) if index not in step_indexes_to_skip][-1]
+        full_data_state = last_executed_step.final_defined_state
+        self._full_data_state_cache = (self.steps_including_skipped, self.curr_step_idx, full_data_state)
+        return full_data_state
+
+    def evict_step_states(self, protected_step_indexes: Optional[Set[int]]=None) -> None:
+        """
+        If the steps hold onto more dataframe memory than the step history memory
+        budget in the mito_config, evicts the states of steps, oldest first, until
+        the steps are under the budget. 
+
+        The initialize step, every step_history_checkpoint_interval-th step, the 
+        current step, the last step, and any protected_step_indexes are checkpoints,
+        and are never evicted. When an evicted state is accessed, it is recomputed 
+        from the closest checkpoint before it. See _rematerialize_step_states.
+
+        Steps that are not deterministic are never recomputed, as they could give a
+        different result than the user saw, so they are also never evicted, unless
+        their states are written to disk.
+
+        If the step history is spilled to disk, evicted states are instead written 
+        to the step_history_disk_cache, and read back in when they are accessed. 
+        As nothing needs to be recomputed, only the initialize step, the current 
+        step, the last step and the protected_step_indexes are kept in memory.
+        """
+        memory_budget = self.mito_config.step_history_memory_budget
+        if memory_budget is None:
+            if self.step_history_disk_cache is None:
+                return
+            memory_budget = 0
+
+        checkpoint_interval = self.mito_config.step_history_checkpoint_interval if self.step_history_disk_cache is None else None
+        checkpoint_indexes = {0, self.curr_step_idx, len(self.steps_including_skipped) - 1}
+        if protected_step_indexes is not None:
+            checkpoint_indexes.update(protected_step_indexes)
+
+        # The post_state of a step is the prev_state of the step after it (and of any
+        # skipped steps after that), so a state is only freed once every step that
+        # holds it has been evicted. We track the bytes each state adds over the
+        # state before it, and the indexes of the steps that hold it, by the id of 
+        # the state, as the states are kept alive by the steps until they are freed
+        step_indexes_to_skip = self.step_skip_index.get_step_indexes_to_skip()
+        state_memory_usage: Dict[int, int] = {}
+        state_step_indexes: Dict[int, Set[int]] = {}
+        last_executed_step_index = 0
+        evictable_step_indexes: List[int] = []
+        for step_index, step in enumerate(self.steps_including_skipped):
+            if not step.states_evicted:
+                prev_state, post_state = step.prev_state, step.post_state
+                if prev_state is not None and id(prev_state) not in state_memory_usage:
+                    # The step that created this state is evicted, so we use the memory 
+                    # usage that was cached on it before it was evicted
+                    state_memory_usage[id(prev_state)] = self.steps_including_skipped[last_executed_step_index].memory_usage or 0
+                if post_state is not None and post_state is not prev_state:
+                    state_memory_usage[id(post_state)] = get_step_memory_usage(step)
+                for state in [prev_state, post_state]:
+                    if state is not None:
+                        state_step_indexes.setdefault(id(state), set()).add(step_index)
+
+                if (checkpoint_interval is None or step_index % checkpoint_interval != 0) and step_index not in checkpoint_indexes:
+                    evictable_step_indexes.append(step_index)
+
+            if step_index not in step_indexes_to_skip:
+                last_executed_step_index = step_index
+
+        memory_usage = sum(state_memory_usage.values())
+        for step_index in evictable_step_indexes:
+            if memory_usage <= memory_budget * 1024 * 1024:
+                break
+
+            step = self.steps_including_skipped[step_index]
+            state_ids = {id(state) for state in [step.prev_state, step.post_state] if state is not None}
+
+            if not self._spill_step_states(step):
+                # Steps that are not deterministic (e.g. imports, or formulas with TODAY) could give a 
+                # different result if they were executed again, so we only evict them if they are on disk
+                if not step.step_performer.is_deterministic(step.params):
+                    continue
+                step.evict_states(partial(self._rematerialize_step_states, step))
+            self.step_state_eviction_count += 1
+
+            for state_id in state_ids:
+                state_step_indexes[state_id].discard(step_index)
+                if len(state_step_indexes[state_id]) == 0:
+                    memory_usage -= state_memory_usage[state_id]
+
+    def _spill_step_states(self, step: Step) -> bool:
+        """
+        Writes the states of the step to the step_history_disk_cache, and evicts 
+        them from memory. Returns False if the states are not written to disk, 
+        because spilling is turned off or writing fails (e.g. the disk is full).
+        """
+        if self.step_history_disk_cache is None:
+            return False
+
+        prev_state, post_state = step.prev_state, step.post_state
+        try:
+            spilled_prev_state = self.step_history_disk_cache.spill_state(prev_state) if prev_state is not None else None
+            if post_state is prev_state:
+                spilled_post_state = spilled_prev_state
+            else:
+                spilled_post_state = self.step_history_disk_cache.spill_state(post_state) if post_state is not None else None
+        except OSError:
+            return False
+
+        step.evict_states(partial(self._load_spilled_step_states, step, spilled_prev_state, spilled_post_state))
+        self.step_state_spill_count += 1
+        return True
+
+    def _load_spilled_step_states(self, step: Step, spilled_prev_state: Optional[SpilledState], spilled_post_state: Optional[SpilledState]) -> None:
+        """
+        Reads the states of a step that were spilled to disk by _spill_step_states 
+        back into memory.
+        """
+        step_index = next((index for index, other_step in enumerate(self.steps_including_skipped) if other_step is step), None)
+
+        step_history_disk_cache: StepHistoryDiskCache = self.step_history_disk_cache # type: ignore
+        prev_state = step_history_disk_cache.load_state(spilled_prev_state) if spilled_prev_state is not None else None
+        if spilled_post_state is spilled_prev_state:
+            post_state = prev_state
+        else:
+            post_state = step_history_disk_cache.load_state(spilled_post_state) if spilled_post_state is not None else None
+
+        step.restore_states(prev_state, post_state)
+        self.step_state_load_count += 1
+
+        # Make sure that reading states back in does not take us over budget, while 
+        # keeping the states that were just asked for
+        if step_index is not None:
+            self.evict_step_states(protected_step_indexes={step_index})
+
+    def _rematerialize_step_states(self, step: Step) -> None:
+        """
+        Recomputes the states of a step that were evicted by evict_step_states, 
+        by reexecuting the steps from the closest checkpoint before it. 
+        """
+        step_index = next((index for index, other_step in enumerate(self.steps_including_skipped) if other_step is step), None)
+        if step_index is None:
+            raise ValueError(f'Cannot recompute the state of step {step.step_id}, as it is no longer in the analysis')
+
+        step_indexes_to_skip = self.step_skip_index.get_step_indexes_to_skip()
+
+        # Find the closest step before this one that has a valid state. The 
+        # initialize step is never evicted, so this always exists
+        checkpoint_index = step_index - 1
+        while self.steps_including_skipped[checkpoint_index].states_evicted or checkpoint_index in step_indexes_to_skip:
+            checkpoint_index -= 1
+
+        prev_state = self.steps_including_skipped[checkpoint_index].final_defined_state
+        for index in range(checkpoint_index + 1, step_index + 1):
+            rematerialized_step = self.steps_including_skipped[index]
+            step_is_skipped = index in step_indexes_to_skip
+            if rematerialized_step.states_evicted:
+                rematerialized_step.rematerialize_states(prev_state, step_is_skipped=step_is_skipped)
+                if self.preview_row_threshold is not None and not step_is_skipped:
+                    assert rematerialized_step.post_state is not None
+                    rematerialized_step.restore_states(prev_state, get_sampled_post_state(
+                        prev_state, rematerialized_step.post_state, rematerialized_step.sheet_reads_and_writes, self.preview_row_threshold
+                    ))
+                self.step_state_recompute_count += 1
+            if not step_is_skipped:
+                prev_state = rematerialized_step.final_defined_state
+
+        # Make sure that recomputing states does not take us over budget, while 
+        # keeping the states that were just asked for
+        self.evict_step_states(protected_step_indexes={step_index})
+
     def execute_steps_data(self, new_steps_data: Optional[List[Dict[str, Any]]] = None) -> None:
         """
         Given steps data (e.g. from a saved analysis), will turn
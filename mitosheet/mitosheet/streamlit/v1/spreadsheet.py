@@ -13,6 +13,7 @@ import pandas as pd
 
 from mitosheet.mito_backend import MitoBackend
 from mitosheet.selection_utils import get_selected_element
+from mitosheet.sheet_data_arrow import is_arrow_sheet_data_enabled
 from mitosheet.types import CodeOptions, ColumnDefinitions, ConditionalFormat, DefaultEditingMode, ParamMetadata, ParamType
 from mitosheet.user.utils import is_pro
 from mitosheet.utils import get_new_id
@@ -387,8 +388,14 @@ try:
         if key is None:
             key = mito_backend.analysis_name
 
-        sheet_data_json = mito_backend.steps_manager.sheet_data_json,
-        analysis_data_json = mito_backend.steps_manager.analysis_data_json,
+        # If it is turned on, we send the data of the sheets as bytes, which is much 
+        # smaller and faster to read than JSON. See mitosheet/sheet_data_arrow.py
+        sheet_data_arrow: Optional[bytes] = None
+        if is_arrow_sheet_data_enabled(mito_backend.steps_manager.mito_config):
+            sheet_data_json, sheet_data_arrow = mito_backend.steps_manager.get_sheet_data_arrow()
+        else:
+            sheet_data_json = mito_backend.steps_manager.sheet_data_json
+        analysis_data_json = mito_backend.steps_manager.analysis_data_json
         user_profile_json = mito_backend.get_user_profile_json()
 
         msg = message_passer_component(key=str(key) + 'message_passer')
@@ -413,16 +420,28 @@ try:
         # waste a component value update setting the value
         selection = _mito_component_func(
             key=key, 
-            sheet_data_json=sheet_data_json, analysis_data_json=analysis_data_json, user_profile_json=user_profile_json, 
+            sheet_data_json=sheet_data_json, sheet_data_arrow=sheet_data_arrow, analysis_data_json=analysis_data_json, user_profile_json=user_profile_json, 
             responses_json=responses_json, id=id(mito_backend),
             height=height,
             return_type=return_type
         )
 
-        # We return a mapping from dataframe names to dataframes
-        final_state = mito_backend.steps_manager.curr_step.final_defined_state
         code = "\n".join(mito_backend.steps_manager.code())
 
+        if return_type == 'code':
+            return code
+        elif return_type == 'function':
+            if code_options is None or not code_options['as_function'] or code_options['call_function']:
+                raise ValueError(f"""You must set code_options with `as_function=True` and `call_function=False` in order to return a function.""")
+            
+            return get_function_from_code_unsafe(code)
+        elif return_type == 'analysis':
+            return RunnableAnalysis(code, code_options, mito_backend.fully_parameterized_function, mito_backend.param_metadata)
+
+        # We return a mapping from dataframe names to dataframes. In preview mode, the 
+        # sheets only hold samples of the data, so we return the full data instead
+        final_state = mito_backend.steps_manager.get_full_data_state()
+
         ordered_dict = OrderedDict()
         for df_name, df in zip(final_state.df_names, final_state.dfs):
             ordered_dict[df_name] = df
@@ -435,17 +454,8 @@ try:
             return final_state.dfs, code
         elif return_type == 'dfs_dict':
             return ordered_dict
-        elif return_type == 'code':
-            return code
         elif return_type == 'dfs_list':
             return final_state.dfs
-        elif return_type == 'function':
-            if code_options is None or not code_options['as_function'] or code_options['call_function']:
-                raise ValueError(f"""You must set code_options with `as_function=True` and `call_function=False` in order to return a function.""")
-            
-            return get_function_from_code_unsafe(code)
-        elif return_type == 'analysis':
-            return RunnableAnalysis(code, code_options, mito_backend.fully_parameterized_function, mito_backend.param_metadata)
         else:
             raise ValueError(f'Invalid value for return_type={return_type}. Must be "default", "default_list", "dfs", "code", "dfs_list", or "function".')
 
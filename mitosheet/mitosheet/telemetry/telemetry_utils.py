@@ -207,6 +207,36 @@ def _get_processing_time_log_params(steps_manager: Optional[StepsManagerType]=No
         
     return processing_time_params
 
+def _get_performance_log_params(steps_manager: Optional[StepsManagerType]=None) -> Dict[str, Any]:
+    """
+    Get the memory and time accounting for the current step, so we can find 
+    which steps use the most resources. See get_performance_report.
+
+    Counting the bytes a step retains scans the objects in object columns, which
+    is slow on large dataframes, so we only include the bytes if they have already 
+    been counted (e.g. because there is a step history memory budget).
+    """
+    if steps_manager is None:
+        return {}
+
+    curr_step = steps_manager.curr_step
+    execution_data: Dict[str, Any] = curr_step.execution_data if curr_step.execution_data is not None else {}
+
+    performance_params: Dict[str, Any] = {}
+    for key, value in [
+            ('bytes_retained', curr_step.memory_usage if not curr_step.states_evicted else None),
+            ('execution_time', curr_step.execution_time), 
+            ('pandas_processing_time', execution_data.get('pandas_processing_time', None)), 
+            ('recon_time', execution_data.get('recon_time', None)), 
+            ('serialization_time', curr_step.serialization_time), 
+            ('transpile_time', curr_step.transpile_time)
+        ]:
+        if value is None:
+            continue
+        performance_params['performance_' + key] = round(value, 3) if isinstance(value, float) else value
+
+    return performance_params
+
 
 try:
     from jupyterlab import __version__ as jupyterlab_version
@@ -299,6 +329,13 @@ def log_event_processed(event: Dict[str, Any], steps_manager: StepsManagerType,
     # and we append a _failed if the event failed in doing this.
     log_event: str = event['type'] + ('_failed' if failed else '')
     params_copy = copy(event['params'])
+
+    # A batch edit can contain many edits, so we only log how many there are and their types
+    if event['event'] == 'batch_edit_event':
+        edit_events = params_copy.pop('edit_events', [])
+        params_copy['num_edit_events'] = len(edit_events)
+        params_copy['edit_event_types'] = sorted(set(edit_event['type'] for edit_event in edit_events))
+
     if failed: 
         params_copy['failed_log_event'] = log_event
 
@@ -470,4 +507,6 @@ def log(
 
     mito_log_uploader = steps_manager.mito_log_uploader if steps_manager is not None else None
     if mito_log_uploader is not None:
-        mito_log_uploader.log(log_event, final_params)
+        # The memory and time accounting for the current step is only uploaded to the log 
+        # server, and is not part of the general telemetry
+        mito_log_uploader.log(log_event, {**final_params, **_get_performance_log_params(steps_manager=steps_manager)})
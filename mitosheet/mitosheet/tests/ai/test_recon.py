@@ -591,6 +591,49 @@ def test_get_column_recon(old_df, new_df, recon):
     assert recon == _recon
 
 
+def test_get_column_recon_skips_columns_with_shared_data():
+    old_df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    new_df = old_df.copy(deep=False)
+    new_df['B'] = [7, 8, 9]
+
+    _recon = get_modified_dataframe_recon_data(old_df, new_df)
+    assert _recon['column_recon']['modified_columns'] == ['B']
+
+
+def test_get_column_recon_detects_in_place_modification_of_copied_column():
+    old_df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    new_df = old_df.copy(deep=True)
+    new_df.loc[1, 'A'] = 10
+
+    _recon = get_modified_dataframe_recon_data(old_df, new_df)
+    assert _recon['column_recon']['modified_columns'] == ['A']
+
+
+def test_get_column_recon_only_compares_modified_column_headers():
+    old_df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6], 'C': [7, 8, 9]})
+    new_df = pd.DataFrame({'A': [0, 2, 3], 'B': [0, 5, 6], 'D': [7, 8, 9]})
+
+    _recon = get_modified_dataframe_recon_data(old_df, new_df, modified_column_headers=['B'])
+    assert _recon == {
+        'column_recon': {
+            'created_columns': [],
+            'deleted_columns': [],
+            'modified_columns': ['B'],
+            'renamed_columns': {'C': 'D'}
+        }, 
+        'num_added_or_removed_rows': 0
+    }
+
+
+def test_get_column_recon_with_modified_column_headers_and_removed_rows():
+    old_df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    new_df = pd.DataFrame({'A': [1, 2], 'B': [0, 5]})
+
+    _recon = get_modified_dataframe_recon_data(old_df, new_df, modified_column_headers=['B'])
+    assert _recon['column_recon']['modified_columns'] == ['B']
+    assert _recon['num_added_or_removed_rows'] == -1
+
+
 EXEC_AND_GET_NEW_STATE_TESTS: List[Tuple[Dict[str, pd.DataFrame], str, Dict[str, pd.DataFrame]]] = [
     (
         {},
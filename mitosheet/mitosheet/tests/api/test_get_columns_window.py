@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the get_columns_window api call.
+"""
+import json
+
+import pandas as pd
+
+from mitosheet.api.get_columns_window import get_columns_window
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import MAX_COLUMNS
+
+DF_FORMAT_WITH_CONDITIONAL_FORMAT = {
+    'columns': {},
+    'headers': {},
+    'rows': {'even': {}, 'odd': {}},
+    'border': {},
+    'conditional_formats': [{
+        'format_uuid': '12345',
+        'columnIDs': ['C0', f'C{MAX_COLUMNS + 1}'],
+        'filters': [{'condition': 'greater', 'value': 1}],
+        'invalidFilterColumnIDs': [],
+        'color': '#FFFFFF',
+        'backgroundColor': '#000000'
+    }]
+}
+
+
+def get_wide_df() -> pd.DataFrame:
+    return pd.DataFrame({f'C{i}': [i, i + 1, i + 2] for i in range(MAX_COLUMNS + 10)})
+
+
+def test_sheet_data_has_metadata_but_no_data_past_max_columns():
+    mito = create_mito_wrapper(get_wide_df())
+    sheet_data = json.loads(mito.mito_backend.steps_manager.sheet_data_json)[0]
+
+    assert sheet_data['numColumns'] == MAX_COLUMNS + 10
+    assert len(sheet_data['data']) == MAX_COLUMNS + 10
+    assert sheet_data['data'][MAX_COLUMNS - 1]['columnData'] == [MAX_COLUMNS - 1, MAX_COLUMNS, MAX_COLUMNS + 1]
+    assert sheet_data['data'][MAX_COLUMNS] == {
+        'columnID': f'C{MAX_COLUMNS}',
+        'columnHeader': f'C{MAX_COLUMNS}',
+        'columnDtype': 'int64',
+        'columnData': []
+    }
+    assert sheet_data['columnDtypeMap'][f'C{MAX_COLUMNS + 9}'] == 'int64'
+
+
+def test_get_columns_window_past_max_columns():
+    mito = create_mito_wrapper(get_wide_df())
+
+    columns_window = get_columns_window({'sheet_index': 0, 'start_column': MAX_COLUMNS, 'end_column': MAX_COLUMNS + 2}, mito.mito_backend.steps_manager)
+
+    assert columns_window['startColumn'] == MAX_COLUMNS
+    assert columns_window['endColumn'] == MAX_COLUMNS + 2
+    assert columns_window['startRow'] == 0
+    assert columns_window['endRow'] == 3
+    assert columns_window['index'] == [0, 1, 2]
+    assert columns_window['data'] == [
+        {'columnID': f'C{MAX_COLUMNS}', 'columnData': [MAX_COLUMNS, MAX_COLUMNS + 1, MAX_COLUMNS + 2]},
+        {'columnID': f'C{MAX_COLUMNS + 1}', 'columnData': [MAX_COLUMNS + 1, MAX_COLUMNS + 2, MAX_COLUMNS + 3]},
+    ]
+
+
+def test_get_columns_window_clips_to_dataframe():
+    mito = create_mito_wrapper(get_wide_df())
+
+    columns_window = get_columns_window({'sheet_index': 0, 'start_column': MAX_COLUMNS + 5, 'end_column': MAX_COLUMNS + 100, 'start_row': 1, 'end_row': 10}, mito.mito_backend.steps_manager)
+    assert columns_window['endColumn'] == MAX_COLUMNS + 10
+    assert columns_window['startRow'] == 1
+    assert columns_window['endRow'] == 3
+    assert len(columns_window['data']) == 5
+
+
+def test_conditional_formatting_past_max_columns_is_in_columns_window():
+    mito = create_mito_wrapper(get_wide_df())
+    mito.mito_backend.steps_manager.curr_step.final_defined_state.df_formats[0] = DF_FORMAT_WITH_CONDITIONAL_FORMAT
+    sheet_data = json.loads(mito.mito_backend.steps_manager.sheet_data_json)[0]
+    assert list(sheet_data['conditionalFormattingResult']['results'].keys()) == ['C0']
+
+    columns_window = get_columns_window({'sheet_index': 0, 'start_column': MAX_COLUMNS, 'end_column': MAX_COLUMNS + 10}, mito.mito_backend.steps_manager)
+    assert columns_window['conditionalFormattingResult']['results'] == {
+        f'C{MAX_COLUMNS + 1}': {str(i): {'backgroundColor': '#000000', 'color': '#FFFFFF'} for i in range(3)}
+    }
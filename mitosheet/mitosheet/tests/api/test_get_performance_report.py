@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the get_performance_report API call.
+"""
+
+import pandas as pd
+
+from mitosheet.api.api import handle_api_event
+from mitosheet.api.get_performance_report import get_performance_report
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def test_get_performance_report_reports_every_step():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    mito.filter(0, 'A', 'And', 'greater', 1)
+    mito.filter(0, 'A', 'And', 'greater', 2)
+
+    performance_report = get_performance_report({}, mito.mito_backend.steps_manager)
+    step_reports = performance_report['steps']
+
+    assert [step_report['step_type'] for step_report in step_reports] == ['initialize', 'add_column', 'set_column_formula', 'filter_column', 'filter_column']
+    assert [step_report['skipped'] for step_report in step_reports] == [False, False, False, True, False]
+    assert performance_report['total_bytes_retained'] == sum(step_report['bytes_retained'] for step_report in step_reports)
+    assert performance_report['compiled_code_cache_hits'] + performance_report['compiled_code_cache_misses'] > 0
+    assert performance_report['sheet_data_cache_hits'] + performance_report['sheet_data_cache_misses'] > 0
+
+    set_formula_report = step_reports[2]
+    assert set_formula_report['bytes_retained'] > 0
+    assert set_formula_report['execution_time'] > 0
+    assert set_formula_report['execution_time'] >= set_formula_report['pandas_processing_time'] + set_formula_report['recon_time']
+    assert set_formula_report['transpile_time'] > 0
+
+    # Only the steps that were displayed are serialized
+    assert step_reports[-1]['serialization_time'] > 0
+    assert step_reports[0]['execution_time'] is None
+
+
+def test_get_performance_report_counts_string_memory():
+    df = pd.DataFrame({'A': ['a' * 100] * 1000})
+    mito = create_mito_wrapper(df)
+
+    step_reports = get_performance_report({}, mito.mito_backend.steps_manager)['steps']
+    assert step_reports[0]['bytes_retained'] >= df.memory_usage(index=True, deep=True).sum()
+    assert step_reports[0]['bytes_retained'] > 100 * 1000
+
+
+def test_get_performance_report_through_api_call():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.add_column(0, 'B')
+
+    responses = []
+    handle_api_event(responses.append, {'event': 'api_call', 'id': '1', 'type': 'get_performance_report', 'params': {}}, mito.mito_backend.steps_manager)
+
+    assert len(responses[0]['data']['steps']) == 2
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the get_rows_window api call.
+"""
+
+import pandas as pd
+
+from mitosheet.api.get_rows_window import get_rows_window
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import MAX_ROWS
+
+DF_FORMAT_WITH_CONDITIONAL_FORMAT = {
+    'columns': {},
+    'headers': {},
+    'rows': {'even': {}, 'odd': {}},
+    'border': {},
+    'conditional_formats': [{
+        'format_uuid': '12345',
+        'columnIDs': ['A'],
+        'filters': [{'condition': 'greater', 'value': 1995}],
+        'invalidFilterColumnIDs': [],
+        'color': '#FFFFFF',
+        'backgroundColor': '#000000'
+    }]
+}
+
+
+def get_large_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        'A': range(2000),
+        'B': [f'value {i}' for i in range(2000)],
+        'C': [i / 2 for i in range(2000)]
+    }, index=[f'row {i}' for i in range(2000)])
+
+
+def test_get_rows_window_past_max_rows():
+    mito = create_mito_wrapper(get_large_df())
+
+    rows_window = get_rows_window({'sheet_index': 0, 'start_row': 1700, 'end_row': 1705}, mito.mito_backend.steps_manager)
+
+    assert rows_window['startRow'] == 1700
+    assert rows_window['endRow'] == 1705
+    assert rows_window['numRows'] == 2000
+    assert rows_window['index'] == [f'row {i}' for i in range(1700, 1705)]
+    assert rows_window['data'] == [
+        {'columnID': 'A', 'columnData': list(range(1700, 1705))},
+        {'columnID': 'B', 'columnData': [f'value {i}' for i in range(1700, 1705)]},
+        {'columnID': 'C', 'columnData': [i / 2 for i in range(1700, 1705)]},
+    ]
+
+
+def test_get_rows_window_with_column_window():
+    mito = create_mito_wrapper(get_large_df())
+
+    rows_window = get_rows_window({'sheet_index': 0, 'start_row': 0, 'end_row': 2, 'start_column': 1, 'end_column': 2}, mito.mito_backend.steps_manager)
+
+    assert rows_window['startColumn'] == 1
+    assert rows_window['endColumn'] == 2
+    assert rows_window['data'] == [{'columnID': 'B', 'columnData': ['value 0', 'value 1']}]
+
+
+def test_get_rows_window_clips_to_dataframe():
+    mito = create_mito_wrapper(get_large_df())
+
+    rows_window = get_rows_window({'sheet_index': 0, 'start_row': 1990, 'end_row': 5000, 'start_column': -1, 'end_column': 10}, mito.mito_backend.steps_manager)
+    assert rows_window['startRow'] == 1990
+    assert rows_window['endRow'] == 2000
+    assert rows_window['startColumn'] == 0
+    assert rows_window['endColumn'] == 3
+    assert len(rows_window['index']) == 10
+
+    rows_window = get_rows_window({'sheet_index': 0, 'start_row': 0, 'end_row': 2000}, mito.mito_backend.steps_manager)
+    assert rows_window['endRow'] == MAX_ROWS
+
+
+def test_get_rows_window_after_sort():
+    mito = create_mito_wrapper(get_large_df())
+    mito.sort(0, 'A', 'descending')
+
+    rows_window = get_rows_window({'sheet_index': 0, 'start_row': 1998, 'end_row': 2000}, mito.mito_backend.steps_manager)
+    assert rows_window['data'][0]['columnData'] == [1, 0]
+
+
+def test_get_rows_window_conditional_formatting():
+    mito = create_mito_wrapper(get_large_df())
+    mito.mito_backend.steps_manager.curr_step.final_defined_state.df_formats[0] = DF_FORMAT_WITH_CONDITIONAL_FORMAT
+
+    rows_window = get_rows_window({'sheet_index': 0, 'start_row': 1990, 'end_row': 2000}, mito.mito_backend.steps_manager)
+    assert rows_window['conditionalFormattingResult'] == {
+        'invalid_conditional_formats': {},
+        'results': {
+            'A': {f'row {i}': {'backgroundColor': '#000000', 'color': '#FFFFFF'} for i in range(1996, 2000)}
+        }
+    }
+
+    rows_window = get_rows_window({'sheet_index': 0, 'start_row': 1990, 'end_row': 2000, 'start_column': 1}, mito.mito_backend.steps_manager)
+    assert rows_window['conditionalFormattingResult'] == {
+        'invalid_conditional_formats': {},
+        'results': {}
+    }
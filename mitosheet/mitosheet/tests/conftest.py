@@ -7,6 +7,20 @@ import pytest
 import os
 
 from mitosheet.saved_analyses import _get_all_analysis_filenames, _delete_analyses
+from mitosheet.utils import enable_pandas_copy_on_write
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--pandas-copy-on-write', 
+        action='store_true', 
+        help='Run the tests with pandas Copy-on-Write turned on, to check that Mito behaves the same with it'
+    )
+
+
+def pytest_configure(config):
+    if config.getoption('--pandas-copy-on-write'):
+        enable_pandas_copy_on_write()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -14,7 +14,7 @@ import pandas as pd
 import sys
 from mitosheet.ai.ai_utils import is_open_ai_credentials_available
 
-from mitosheet.utils import is_flask_installed, is_prev_version, is_snowflake_connector_python_installed, is_snowflake_credentials_available, is_streamlit_installed, is_dash_installed
+from mitosheet.utils import is_flask_installed, is_polars_installed, is_prev_version, is_pyarrow_installed, is_snowflake_connector_python_installed, is_snowflake_credentials_available, is_streamlit_installed, is_dash_installed
 
 pandas_pre_1_only = pytest.mark.skipif(
     not pd.__version__.startswith('0.'), 
@@ -51,6 +51,11 @@ pandas_post_1_5_only = pytest.mark.skipif(
     reason='This test only runs on later versions of Pandas. API inconsistencies make it fail on earlier versions'
 )
 
+pandas_post_2_only = pytest.mark.skipif(
+    is_prev_version(pd.__version__, '2.0.0'), 
+    reason='This test only runs on later versions of Pandas. API inconsistencies make it fail on earlier versions'
+)
+
 pandas_pre_1_2_only = pytest.mark.skipif(
     not is_prev_version(pd.__version__, '1.2.0'), 
     reason='This test only runs on later versions of Pandas. API inconsistencies make it fail on earlier versions'
@@ -81,6 +86,16 @@ requires_dash = pytest.mark.skipif(
     reason='requires dash to be installed'
 )
 
+requires_polars = pytest.mark.skipif(
+    not is_polars_installed(),
+    reason='requires polars to be installed'
+)
+
+requires_pyarrow = pytest.mark.skipif(
+    not is_pyarrow_installed(),
+    reason='requires pyarrow to be installed'
+)
+
 requires_open_ai_credentials = pytest.mark.skipif(
     not is_open_ai_credentials_available(),
     reason='Requires a set OPENAI_API_KEY'
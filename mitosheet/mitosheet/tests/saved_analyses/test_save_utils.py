@@ -15,6 +15,7 @@ import pytest
 from mitosheet.saved_analyses import SAVED_ANALYSIS_FOLDER, write_save_analysis_file
 from mitosheet.saved_analyses.save_utils import read_and_upgrade_analysis
 from mitosheet.types import FC_NUMBER_EXACTLY
+from mitosheet.utils import NpEncoder
 from mitosheet.tests.test_utils import (create_mito_wrapper_with_data,
                                         create_mito_wrapper)
 
@@ -41,7 +42,7 @@ def test_recover_analysis(b_value, b_formula):
     curr_step = new_mito.curr_step
 
     assert new_mito.dfs[0]['B'].tolist() == [b_value]
-    assert json.dumps(new_mito.curr_step.column_formulas) == json.dumps(curr_step.column_formulas)
+    assert json.dumps(new_mito.curr_step.column_formulas, cls=NpEncoder) == json.dumps(curr_step.column_formulas, cls=NpEncoder)
 
 
 @pytest.mark.parametrize("b_value,b_formula", PERSIST_ANALYSIS_TESTS)
@@ -64,7 +65,7 @@ def test_persist_analysis_multi_sheet(b_value, b_formula):
     assert new_mito.dfs[0]['B'].tolist() == [b_value]
     assert new_mito.dfs[1]['B'].tolist() == [b_value]
     
-    assert json.dumps(new_mito.curr_step.column_formulas) == json.dumps(curr_step.column_formulas)
+    assert json.dumps(new_mito.curr_step.column_formulas, cls=NpEncoder) == json.dumps(curr_step.column_formulas, cls=NpEncoder)
     assert json.loads(new_mito.analysis_data_json)['code'] == json.loads(mito.analysis_data_json)['code']
 
 
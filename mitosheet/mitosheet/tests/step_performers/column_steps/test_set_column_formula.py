@@ -6,6 +6,8 @@
 """
 Contains tests for set column formula edit events
 """
+import json
+
 import pandas as pd
 import pytest
 
@@ -724,4 +726,28 @@ def test_set_formula_wrong_column_order_wrong_index_order():
     mito.add_column(0, 'D')
     mito.set_formula('=SUM(C1:A0)', 0, 'D')
 
-    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [1, 2, 3], 'C': [1, 2, 3], 'D': [9, 15, 9]}))
\ No newline at end of file
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [1, 2, 3], 'C': [1, 2, 3], 'D': [9, 15, 9]}))
+
+
+INDEX_AND_EXPECTED_FORMULA_INDEX_JSON = [
+    (pd.RangeIndex(3), {'type': 'range', 'start': 0, 'stop': 3, 'step': 1}),
+    (pd.Index([10, 8, 6]), {'type': 'range', 'start': 10, 'stop': 4, 'step': -2}),
+    (pd.Index([2, 1, 5]), [2, 1, 5]),
+    (pd.Index(['a', 'b', 'c']), ['a', 'b', 'c']),
+]
+
+@pytest.mark.parametrize("index, expected_formula_index_json", INDEX_AND_EXPECTED_FORMULA_INDEX_JSON)
+def test_set_formula_stores_compact_shared_index(index, expected_formula_index_json):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}, index=index))
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B')
+    mito.add_column(0, 'C')
+
+    formula_index = mito.curr_step.column_formulas[0]['B'][0]['index']
+    assert formula_index.to_list() == index.to_list()
+    assert formula_index.to_json() == expected_formula_index_json
+    # The index is not copied between states
+    assert mito.mito_backend.steps_manager.steps_including_skipped[-2].column_formulas[0]['B'][0]['index'] is formula_index
+
+    sheet_data = json.loads(mito.mito_backend.steps_manager.sheet_data_json)
+    assert sheet_data[0]['columnFormulasMap']['B'][0]['index'] == expected_formula_index_json
@@ -21,4 +21,20 @@ def test_delete_graph():
     assert mito.curr_step.step_type == 'graph_delete'
 
     graph_data = mito.get_graph_data(graph_id)
-    assert len(graph_data) == 0
\ No newline at end of file
+    assert len(graph_data) == 0
+
+
+def test_delete_graphs_in_one_batch():
+    df = pd.DataFrame({'A': ['aaron', 'jake', 'nate'], 'B': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    mito.generate_graph('123', BAR, 0, False, ['A'], ['B'], 400, 400)
+    mito.generate_graph('456', BAR, 0, False, ['A'], ['B'], 400, 400)
+
+    sent_messages = []
+    mito.mito_backend.mito_send = sent_messages.append
+    assert mito.delete_graphs(['123', '456'])
+
+    assert [step.step_type for step in mito.steps_including_skipped[-2:]] == ['graph_delete', 'graph_delete']
+    assert len(mito.get_graph_data('123')) == 0
+    assert len(mito.get_graph_data('456')) == 0
+    assert len(sent_messages) == 1
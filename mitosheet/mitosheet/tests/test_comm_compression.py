@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for compressing the messages sent over the comm
+"""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from mitosheet.comm_compression import (comm_compression_metrics,
+                                        get_compressed_message,
+                                        get_compressing_send,
+                                        get_decompressed_message,
+                                        get_negotiated_comm_compression)
+from mitosheet.enterprise.mito_config import MITO_CONFIG_COMM_COMPRESSION_THRESHOLD, MITO_CONFIG_VERSION, MitoConfig
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import get_json_string
+
+
+def get_mito_config(threshold):
+    """
+    Returns a mito config with the given comm compression threshold, leaving 
+    the environment variables as they were.
+    """
+    old_environ = dict(os.environ)
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    if threshold is not None:
+        os.environ[MITO_CONFIG_COMM_COMPRESSION_THRESHOLD] = threshold
+    else:
+        os.environ.pop(MITO_CONFIG_COMM_COMPRESSION_THRESHOLD, None)
+    try:
+        return MitoConfig()
+    finally:
+        os.environ.clear()
+        os.environ.update(old_environ)
+
+
+@pytest.mark.parametrize("threshold, open_data, expected", [
+    (None, {'compressions': ['zlib']}, None),
+    ('1000', {'compressions': ['zlib']}, 'zlib'),
+    ('1000', {'compressions': ['lz4', 'zlib']}, 'zlib'),
+    ('1000', {'compressions': ['lz4']}, None),
+    ('1000', {'compressions': 'zlib'}, None),
+    ('1000', {}, None),
+    ('1000', None, None),
+])
+def test_get_negotiated_comm_compression(threshold, open_data, expected):
+    assert get_negotiated_comm_compression(get_mito_config(threshold), open_data) == expected
+
+
+def test_comm_compression_threshold_in_mito_config():
+    assert get_mito_config('1000').comm_compression_threshold == 1000
+    assert get_mito_config(None).comm_compression_threshold is None
+
+
+def test_small_messages_are_not_compressed():
+    comm_compression_metrics.clear()
+    message = {'event': 'response', 'id': '1', 'data': 'a' * 10}
+
+    assert get_compressed_message(message, None, 1000) is None
+    assert comm_compression_metrics.num_messages == 1
+    assert comm_compression_metrics.num_compressed_messages == 0
+    assert comm_compression_metrics.raw_bytes == comm_compression_metrics.sent_bytes == len(get_json_string(message))
+
+
+def test_large_messages_are_compressed():
+    comm_compression_metrics.clear()
+    message = {'event': 'response', 'id': '1', 'data': 'a' * 10_000}
+
+    compressed = get_compressed_message(message, None, 1000)
+    assert compressed is not None
+    assert compressed['message'] == {'event': 'response', 'id': '1', 'compressed_message': {'encoding': 'zlib', 'bufferIndex': 0}}
+    assert get_decompressed_message(compressed['message'], compressed['buffers']) == message
+
+    assert comm_compression_metrics.num_compressed_messages == 1
+    assert comm_compression_metrics.sent_bytes < comm_compression_metrics.raw_bytes
+    assert comm_compression_metrics.compression_ratio > 10
+    assert comm_compression_metrics.encode_time > 0
+
+
+def test_compressed_message_is_after_other_buffers():
+    message = {'event': 'response', 'id': '1', 'data': 'a' * 10_000}
+
+    compressed = get_compressed_message(message, [b'arrow'], 1000)
+    assert compressed is not None
+    assert compressed['buffers'][0] == b'arrow'
+    assert compressed['message']['compressed_message']['bufferIndex'] == 1
+    assert get_decompressed_message(compressed['message'], compressed['buffers']) == message
+
+
+def test_messages_that_do_not_compress_are_not_compressed():
+    comm_compression_metrics.clear()
+    message = {'event': 'response', 'id': '1'}
+
+    assert get_compressed_message(message, None, 1) is None
+    assert comm_compression_metrics.num_compressed_messages == 0
+
+
+def test_mito_backend_sends_compressed_responses():
+    mito = create_mito_wrapper(pd.DataFrame({'A': list(range(1000))}))
+    sent_messages = []
+    mito.mito_backend.mito_send = get_compressing_send(lambda message, buffers=None: sent_messages.append((message, buffers)), 1000)
+
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+
+    messages = [get_decompressed_message(message, buffers) for message, buffers in sent_messages]
+    assert any('compressed_message' in message for message, _ in sent_messages)
+    assert all('compressed_message' not in message for message in messages)
+
+    sheet_data = json.loads(messages[-1]['shared_variables']['sheet_data_json'])
+    assert sheet_data[0]['data'][1]['columnData'] == [i + 1 for i in range(1000)]
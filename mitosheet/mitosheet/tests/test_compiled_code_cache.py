@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the compiled code cache
+"""
+import pandas as pd
+import pytest
+
+from mitosheet.transpiler.compiled_code_cache import CompiledCodeCache, compiled_code_cache
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def test_compiled_code_cache_hits_and_misses():
+    cache = CompiledCodeCache()
+    code_object = cache.compile('a = 1')
+    assert cache.compile('a = 1') is code_object
+    cache.compile('a = 2')
+
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+    exec_locals = {}
+    exec(code_object, {}, exec_locals)
+    assert exec_locals['a'] == 1
+
+def test_compiled_code_cache_evicts_least_recently_used():
+    cache = CompiledCodeCache(max_size=2)
+    code_object = cache.compile('a = 1')
+    cache.compile('a = 2')
+    cache.compile('a = 1')
+    cache.compile('a = 3')
+
+    assert len(cache) == 2
+    assert cache.compile('a = 1') is code_object
+    cache.compile('a = 2')
+    assert cache.misses == 4
+
+def test_compiled_code_cache_raises_syntax_errors():
+    cache = CompiledCodeCache()
+    with pytest.raises(SyntaxError):
+        cache.compile('a = ')
+
+def test_compiled_code_cache_compile_lines():
+    cache = CompiledCodeCache()
+    code_objects = cache.compile_lines(['a = 1', '# comment', 'a = ', 'b = 2'])
+
+    assert code_objects[2] is None
+    assert all(code_object is not None for code_object in code_objects[:2] + code_objects[3:])
+    assert cache.compile_lines(['a = 1', '# comment', 'a = ', 'b = 2']) is code_objects
+    assert cache.hits == 1 and cache.misses == 1
+
+def test_executing_same_steps_again_hits_compiled_code_cache():
+    def create_analysis():
+        mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+        mito.set_formula('=A + 1', 0, 'B', add_column=True)
+        mito.filter(0, 'A', 'And', 'greater', 1)
+        return mito
+
+    create_analysis()
+    hits, misses = compiled_code_cache.hits, compiled_code_cache.misses
+    mito = create_analysis()
+
+    assert compiled_code_cache.hits >= hits + 3
+    assert compiled_code_cache.misses == misses
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [2, 3], 'B': [3, 4]}, index=[1, 2]))
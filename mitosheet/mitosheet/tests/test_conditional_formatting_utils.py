@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for evaluating conditional formats, and caching their results
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.pro.conditional_formatting_utils import (
+    ConditionalFormattingCache, _get_window_row_positions,
+    conditional_formatting_cache, get_conditonal_formatting_result)
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def get_conditional_format(filters, column_ids=['A'], format_uuid='12345'):
+    return {
+        'format_uuid': format_uuid,
+        'columnIDs': column_ids,
+        'filters': filters,
+        'invalidFilterColumnIDs': [],
+        'color': '#FFFFFF',
+        'backgroundColor': '#000000'
+    }
+
+
+CELL_FORMAT = {'backgroundColor': '#000000', 'color': '#FFFFFF'}
+
+
+@pytest.mark.parametrize("start_row, end_row", [
+    (0, 0),
+    (0, 1),
+    (0, 8),
+    (3, 11),
+    (7, 9),
+    (8, 16),
+    (5, 37),
+    (0, 37),
+])
+def test_get_window_row_positions(start_row, end_row):
+    mask = np.array([i % 3 == 0 or i % 7 == 0 for i in range(37)])
+    bitmap = np.packbits(mask)
+    assert _get_window_row_positions(bitmap, start_row, end_row).tolist() == np.flatnonzero(mask[start_row:end_row]).tolist()
+
+
+@pytest.mark.parametrize("index, expected_keys", [
+    (pd.RangeIndex(0, 4), ['1', '3']),
+    (pd.Index([10, 20, 30, 40]), ['20', '40']),
+    (pd.Index(['a', 'b', 'c', 'd']), ['b', 'd']),
+    (pd.Index([1.5, 2.5, 3.5, 4.5]), ['2.5', '4.5']),
+    (pd.Index(['a', 1, 'c', 2]), ['1', '2']),
+    (pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-03', '2020-01-04']), ['"2020-01-02 00:00:00"', '"2020-01-04 00:00:00"']),
+])
+def test_conditional_formatting_result_index_keys(index, expected_keys):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3, 4]}, index=index))
+    state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+
+    result = get_conditonal_formatting_result(state, 0, state.dfs[0], [get_conditional_format([{'condition': 'number_exactly', 'value': 2}, ])])
+    result_or = get_conditonal_formatting_result(state, 0, state.dfs[0], [get_conditional_format([{'operator': 'Or', 'filters': [{'condition': 'number_exactly', 'value': 2}, {'condition': 'number_exactly', 'value': 4}]}])])
+
+    assert list(result['results']['A'].keys()) == expected_keys[:1]
+    assert result_or['results'] == {'A': {key: CELL_FORMAT for key in expected_keys}}
+
+
+def test_conditional_formatting_result_full_df_filter_is_cached_across_windows():
+    df = pd.DataFrame({'A': list(range(100)) + [7] * 10})
+    mito = create_mito_wrapper(df)
+    state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+    conditional_formats = [get_conditional_format([{'condition': 'most_frequent', 'value': 1}])]
+
+    conditional_formatting_cache.clear()
+    first_window = get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats, max_rows=10, start_row=0)
+    second_window = get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats, max_rows=20, start_row=95)
+
+    assert first_window['results'] == {'A': {'7': CELL_FORMAT}}
+    assert second_window['results'] == {'A': {str(i): CELL_FORMAT for i in range(100, 110)}}
+    assert conditional_formatting_cache.misses == 1
+    assert conditional_formatting_cache.hits == 1
+
+
+def test_conditional_formatting_result_is_cached_for_state():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': [3, 2, 1]}))
+    state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+    conditional_formats = [get_conditional_format([{'condition': 'greater', 'value': 1}], column_ids=['A', 'B'])]
+
+    conditional_formatting_cache.clear()
+    result = get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats)
+    assert conditional_formatting_cache.misses == 2
+    assert get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats) == result
+    assert conditional_formatting_cache.hits == 2
+    assert result['results'] == {'A': {'1': CELL_FORMAT, '2': CELL_FORMAT}, 'B': {'0': CELL_FORMAT, '1': CELL_FORMAT}}
+
+    # Changing the filters of the format does not use the cached result
+    conditional_formats = [get_conditional_format([{'condition': 'greater', 'value': 2}], column_ids=['A', 'B'])]
+    result = get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats)
+    assert conditional_formatting_cache.misses == 4
+    assert result['results'] == {'A': {'2': CELL_FORMAT}, 'B': {'0': CELL_FORMAT}}
+
+
+def test_conditional_formatting_result_not_cached_for_edited_dataframe():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    conditional_formats = [get_conditional_format([{'condition': 'greater', 'value': 1}])]
+
+    state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+    assert get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats)['results'] == {'A': {'1': CELL_FORMAT, '2': CELL_FORMAT}}
+
+    mito.set_cell_value(0, 'A', 0, 5)
+    state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+    assert get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats)['results'] == {'A': {'0': CELL_FORMAT, '1': CELL_FORMAT, '2': CELL_FORMAT}}
+
+
+def test_conditional_formatting_result_invalid_columns_are_cached():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': ['a', 'b', 'c']}))
+    state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+    conditional_formats = [get_conditional_format([{'condition': 'string_starts_with', 'value': 'a'}], column_ids=['A', 'B'])]
+
+    conditional_formatting_cache.clear()
+    for _ in range(2):
+        result = get_conditonal_formatting_result(state, 0, state.dfs[0], conditional_formats)
+        assert result == {
+            'invalid_conditional_formats': {'12345': ['A']},
+            'results': {'A': {}, 'B': {'0': CELL_FORMAT}}
+        }
+    assert conditional_formatting_cache.hits == 2
+
+
+def test_conditional_formatting_cache_evicts_least_recently_used():
+    cache = ConditionalFormattingCache(max_num_bytes=2)
+    df = pd.DataFrame({'A': range(8)})
+
+    cache.put(df, 'A', 'first', (0, 8), np.packbits(np.ones(8, dtype=bool)))
+    cache.put(df, 'A', 'second', (0, 8), np.packbits(np.ones(8, dtype=bool)))
+    assert cache.get(df, 'A', 'first', (0, 8))[0]
+    cache.put(df, 'A', 'third', (0, 8), np.packbits(np.ones(8, dtype=bool)))
+
+    assert cache.get(df, 'A', 'first', (0, 8))[0]
+    assert not cache.get(df, 'A', 'second', (0, 8))[0]
+    assert cache.get(df, 'A', 'third', (0, 8))[0]
+    assert cache.num_bytes == 2
+
+
+def test_conditional_formatting_cache_removes_deleted_dataframes():
+    cache = ConditionalFormattingCache()
+    df = pd.DataFrame({'A': range(8)})
+    cache.put(df, 'A', 'filters', (0, 8), np.packbits(np.ones(8, dtype=bool)))
+    assert len(cache) == 1
+
+    del df
+    assert len(cache) == 0
+    assert cache.num_bytes == 0
+
+
+def test_conditional_formatting_cache_from_many_threads_while_dataframes_are_deleted():
+    cache = ConditionalFormattingCache(max_num_bytes=16)
+
+    def put_and_get(thread_index):
+        for i in range(200):
+            # Each dataframe is deleted after its loop, often while another thread is evicting
+            df = pd.DataFrame({'A': range(8)})
+            cache.put(df, 'A', f'{thread_index}-{i}', (0, 8), np.packbits(np.ones(8, dtype=bool)))
+            cache.get(df, 'A', f'{thread_index}-{i}', (0, 8))
+
+    threads = [threading.Thread(target=put_and_get, args=(thread_index,)) for thread_index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 0
+    assert cache.num_bytes == 0
+    assert cache.hits == 800
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the copy-on-write list
+"""
+from copy import deepcopy
+
+from mitosheet.copy_on_write import CopyOnWriteList, copy_on_write
+
+
+def test_copy_on_write_shares_items_until_accessed():
+    original = [{'a': 1}, {'b': 2}]
+    copied = copy_on_write(original)
+
+    assert list.__getitem__(copied, 0) is original[0]
+    assert copied == original
+
+    copied[0]['a'] = 10
+    assert original == [{'a': 1}, {'b': 2}]
+    assert copied == [{'a': 10}, {'b': 2}]
+    assert list.__getitem__(copied, 1) is original[1]
+
+def test_copy_on_write_iterating_copies_items():
+    original = [{'a': 1}, {'b': 2}]
+    copied = copy_on_write(original)
+    for item in copied:
+        item['c'] = 3
+    for item in reversed(copied):
+        item['d'] = 4
+
+    assert original == [{'a': 1}, {'b': 2}]
+    assert copied == [{'a': 1, 'c': 3, 'd': 4}, {'b': 2, 'c': 3, 'd': 4}]
+
+def test_copy_on_write_negative_index_and_slices():
+    original = [{'a': 1}, {'b': 2}, {'c': 3}]
+    copied = copy_on_write(original)
+    copied[-1]['c'] = 30
+    for item in copied[:2]:
+        item['x'] = 0
+
+    assert original == [{'a': 1}, {'b': 2}, {'c': 3}]
+    assert copied == [{'a': 1, 'x': 0}, {'b': 2, 'x': 0}, {'c': 30}]
+
+def test_copy_on_write_keeps_shared_indexes_in_sync():
+    original = [{'a': 1}, {'b': 2}, {'c': 3}, {'d': 4}]
+    copied = copy_on_write(original)
+
+    del copied[0]
+    copied.pop(0)['b'] = 20
+    copied.insert(0, {'e': 5})
+    copied.append({'f': 6})
+    copied[0]['e'] = 50
+    copied[1]['c'] = 30
+    copied[2]['d'] = 40
+    copied[3]['f'] = 60
+
+    assert original == [{'a': 1}, {'b': 2}, {'c': 3}, {'d': 4}]
+    assert copied == [{'e': 50}, {'c': 30}, {'d': 40}, {'f': 60}]
+
+def test_copy_on_write_setitem_stops_sharing():
+    original = [{'a': 1}, {'b': 2}]
+    copied = copy_on_write(original)
+    new_item = {'c': 3}
+    copied[0] = new_item
+
+    assert copied[0] is new_item
+    assert original == [{'a': 1}, {'b': 2}]
+
+def test_copy_on_write_copies_of_copies():
+    original = [{'a': 1}, {'b': 2}]
+    copied = copy_on_write(original)
+    copied_again = copy_on_write(copied)
+    copied_again[0]['a'] = 10
+    copied[1]['b'] = 20
+
+    assert original == [{'a': 1}, {'b': 2}]
+    assert copied == [{'a': 1}, {'b': 20}]
+    assert copied_again == [{'a': 10}, {'b': 2}]
+
+def test_copy_on_write_deepcopy_is_independent():
+    original = [{'a': 1}]
+    copied = copy_on_write(original)
+    deep_copied = deepcopy(copied)
+    deep_copied[0]['a'] = 10
+    assert isinstance(deep_copied, CopyOnWriteList)
+    assert original == [{'a': 1}]
+    assert copied == [{'a': 1}]
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for executing edits in the background, and cancelling them
+"""
+import time
+from threading import Event
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from mitosheet.edit_executor import EditExecution, EditExecutor
+from mitosheet.tests.test_utils import MitoWidgetTestWrapper, create_mito_wrapper
+
+MAX_WAIT_SECONDS = 10
+
+
+def get_set_formula_event(mito: MitoWidgetTestWrapper, event_id: str, formula: str, column_header: str) -> Dict[str, Any]:
+    return {
+        'event': 'edit_event',
+        'id': event_id,
+        'type': 'set_column_formula_edit',
+        'step_id': event_id,
+        'params': {
+            'sheet_index': 0,
+            'column_id': mito.mito_backend.steps_manager.curr_step.column_ids.get_column_id_by_header(0, column_header),
+            'formula_label': 0,
+            'index_labels_formula_is_applied_to': {'type': 'entire_column'},
+            'new_formula': formula,
+        }
+    }
+
+
+def wait_for_response(sent_messages: List[Dict[str, Any]], event_id: str) -> Dict[str, Any]:
+    start_time = time.perf_counter()
+    while time.perf_counter() - start_time < MAX_WAIT_SECONDS:
+        responses = [message for message in sent_messages if message['id'] == event_id and message['event'] != 'progress']
+        if len(responses) > 0:
+            return responses[0]
+        time.sleep(.01)
+    raise Exception(f'No response to {event_id}')
+
+
+def test_threaded_edit_executes_in_background_and_sends_progress():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.add_column(0, 'B')
+
+    sent_messages: List[Dict[str, Any]] = []
+    mito.mito_backend.mito_send = sent_messages.append
+    mito.mito_backend.edit_executor.threaded = True
+
+    assert mito.mito_backend.receive_message(get_set_formula_event(mito, 'edit_id', '=A + 1', 'B'))
+
+    response = wait_for_response(sent_messages, 'edit_id')
+    assert response['event'] == 'response'
+    progress_events = [message for message in sent_messages if message['event'] == 'progress']
+    assert progress_events == [{
+        'event': 'progress',
+        'id': 'edit_id',
+        'data': {'num_steps_executed': 0, 'num_steps': 1, 'step_type': 'set_column_formula'}
+    }]
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4]}))
+
+
+def test_cancel_edit_responds_before_executing_edit_finishes():
+    started = Event()
+    release = Event()
+    def SLOW(col):
+        started.set()
+        release.wait(MAX_WAIT_SECONDS)
+        return col + 1
+
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), sheet_functions=[SLOW])
+    mito.add_column(0, 'B')
+    num_steps = len(mito.mito_backend.steps_manager.steps_including_skipped)
+
+    sent_messages: List[Dict[str, Any]] = []
+    mito.mito_backend.mito_send = sent_messages.append
+    mito.mito_backend.edit_executor.threaded = True
+
+    mito.mito_backend.receive_message(get_set_formula_event(mito, 'slow_id', '=SLOW(A)', 'B'))
+    assert started.wait(MAX_WAIT_SECONDS)
+
+    mito.mito_backend.receive_message({'event': 'cancel_edit', 'id': 'cancel_id', 'type': 'cancel_edit', 'params': {}})
+
+    # The cancelled edit is responded to right away, without waiting for it to finish
+    error = wait_for_response(sent_messages, 'slow_id')
+    assert error['event'] == 'error'
+    assert error['errorShort'] == 'Edit Cancelled'
+    assert not error['showErrorModal']
+    assert wait_for_response(sent_messages, 'cancel_id')['data'] == {'cancelled_edit_event_ids': ['slow_id']}
+
+    # The next edit only executes once the cancelled edit returns
+    mito.mito_backend.receive_message(get_set_formula_event(mito, 'next_id', '=A + 10', 'B'))
+    time.sleep(.5)
+    assert not any(message['id'] == 'next_id' for message in sent_messages)
+
+    # And the result of the cancelled edit is thrown out
+    release.set()
+    assert wait_for_response(sent_messages, 'next_id')['event'] == 'response'
+    assert len(mito.mito_backend.steps_manager.steps_including_skipped) == num_steps + 1
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [11, 12, 13]}))
+    assert len([message for message in sent_messages if message['id'] == 'slow_id' and message['event'] != 'progress']) == 1
+
+
+def test_cancelled_edit_stops_inside_of_the_step_it_is_executing(monkeypatch):
+    import mitosheet.ai.recon as recon
+    reconed_dfs: List[pd.DataFrame] = []
+    update_state_by_reconing_dataframes = recon.update_state_by_reconing_dataframes
+    def record_update_state_by_reconing_dataframes(*args, **kwargs):
+        reconed_dfs.append(args[3])
+        return update_state_by_reconing_dataframes(*args, **kwargs)
+    monkeypatch.setattr(recon, 'update_state_by_reconing_dataframes', record_update_state_by_reconing_dataframes)
+
+    started = Event()
+    release = Event()
+    def SLOW(col):
+        started.set()
+        release.wait(MAX_WAIT_SECONDS)
+        return col + 1
+
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), sheet_functions=[SLOW])
+    mito.add_column(0, 'B')
+
+    sent_messages: List[Dict[str, Any]] = []
+    mito.mito_backend.mito_send = sent_messages.append
+    mito.mito_backend.edit_executor.threaded = True
+
+    mito.mito_backend.receive_message(get_set_formula_event(mito, 'slow_id', '=SLOW(A)', 'B'))
+    assert started.wait(MAX_WAIT_SECONDS)
+    reconed_dfs.clear()
+
+    mito.mito_backend.receive_message({'event': 'cancel_edit', 'id': 'cancel_id', 'type': 'cancel_edit', 'params': {}})
+    assert wait_for_response(sent_messages, 'cancel_id')['data'] == {'cancelled_edit_event_ids': ['slow_id']}
+    release.set()
+
+    # The cancelled step stops once its code returns, so only the next edit recons its result
+    mito.mito_backend.receive_message(get_set_formula_event(mito, 'next_id', '=A + 10', 'B'))
+    assert wait_for_response(sent_messages, 'next_id')['event'] == 'response'
+    assert len(reconed_dfs) == 1
+    assert reconed_dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [11, 12, 13]}))
+
+
+def test_cancel_edit_with_no_executing_edits():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    sent_messages: List[Dict[str, Any]] = []
+    mito.mito_backend.mito_send = sent_messages.append
+
+    assert mito.mito_backend.receive_message({'event': 'cancel_edit', 'id': 'cancel_id', 'type': 'cancel_edit', 'params': {}})
+    assert sent_messages == [{'event': 'response', 'id': 'cancel_id', 'data': {'cancelled_edit_event_ids': []}}]
+
+
+def test_cancelled_queued_edits_are_not_executed():
+    executed_event_ids: List[str] = []
+    release = Event()
+    def execute(edit_execution: EditExecution) -> bool:
+        release.wait(MAX_WAIT_SECONDS)
+        edit_execution.check_cancelled()
+        executed_event_ids.append(edit_execution.id)
+        return True
+
+    edit_executor = EditExecutor(execute, lambda message: None, threaded=True)
+    for event_id in ['1', '2', '3']:
+        edit_executor.submit({'id': event_id})
+
+    assert edit_executor.cancel('2') == ['2']
+    release.set()
+
+    start_time = time.perf_counter()
+    while len(edit_executor.pending_executions) > 0 and time.perf_counter() - start_time < MAX_WAIT_SECONDS:
+        time.sleep(.01)
+    assert executed_event_ids == ['1', '3']
+    assert edit_executor.cancel('1') == []
+
+
+def test_update_events_are_not_cancellable():
+    edit_execution = EditExecution({'id': 'update_id'}, cancellable=False)
+    assert not edit_execution.cancel()
+    edit_execution.commit()
+    assert edit_execution.committed
@@ -201,4 +201,40 @@ def test_create_backend_default_apply_formula_to_column():
     mito_backend = MitoBackend()
     assert mito_backend.steps_manager.default_apply_formula_to_column == True
 
-    
\ No newline at end of file
+    
+
+def test_batch_edit_event_executes_all_edits_with_one_response():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+    sent_messages = []
+    mito.mito_backend.mito_send = sent_messages.append
+
+    assert mito.set_cell_values(0, [('A', 0, 10), ('B', 1, 50), ('A', 2, 30)])
+
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [10, 2, 30], 'B': [4, 50, 6]}))
+    assert len(mito.mito_backend.steps_manager.steps_including_skipped) == 4
+    assert len(sent_messages) == 1
+    assert sent_messages[0]['event'] == 'response'
+
+    # Each of the edits is still its own step
+    mito.undo()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [10, 2, 3], 'B': [4, 50, 6]}))
+
+
+def test_batch_edit_event_creates_no_steps_if_any_edit_fails():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    column_id = mito.mito_backend.steps_manager.curr_step.column_ids.get_column_id_by_header(0, 'A')
+
+    assert not mito.mito_backend.receive_message({
+        'event': 'batch_edit_event',
+        'id': 'batch_id',
+        'type': 'batch_edit',
+        'params': {
+            'edit_events': [
+                {'event': 'edit_event', 'type': 'set_cell_value_edit', 'step_id': 'step_1', 'params': {'sheet_index': 0, 'column_id': column_id, 'row_index': 0, 'new_value': '10'}},
+                {'event': 'edit_event', 'type': 'set_cell_value_edit', 'step_id': 'step_2', 'params': {'sheet_index': 0, 'column_id': 'missing_column', 'row_index': 0, 'new_value': '10'}},
+            ]
+        }
+    })
+
+    assert len(mito.mito_backend.steps_manager.steps_including_skipped) == 1
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3]}))
@@ -8,6 +8,7 @@ import os
 from mitosheet.enterprise.license_key import encode_date_to_license
 from mitosheet.enterprise.mito_config import (
     DEFAULT_MITO_CONFIG_SUPPORT_EMAIL, 
+    DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
     MEC_VERSION_KEYS,
     MITO_CONFIG_ANALYTICS_URL,
     MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL, 
@@ -34,6 +35,14 @@ from mitosheet.enterprise.mito_config import (
     MITO_CONFIG_FEATURE_DISPLAY_CODE_OPTIONS,
     MITO_CONFIG_FEATURE_TELEMETRY,
     MITO_CONFIG_PRO,
+    MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
+    MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET,
+    MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK,
+    MITO_CONFIG_STEP_RESULT_CACHE_SIZE,
+    MITO_CONFIG_PREVIEW_ROW_THRESHOLD,
+    MITO_CONFIG_PANDAS_COPY_ON_WRITE,
+    MITO_CONFIG_ARROW_SHEET_DATA,
+    MITO_CONFIG_COMM_COMPRESSION_THRESHOLD,
     MitoConfig
 )
 from mitosheet.tests.test_utils import create_mito_wrapper
@@ -88,7 +97,15 @@ def test_none_works():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET: None,
+        MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL: DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
+        MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK: False,
+        MITO_CONFIG_STEP_RESULT_CACHE_SIZE: None,
+        MITO_CONFIG_PREVIEW_ROW_THRESHOLD: None,
+        MITO_CONFIG_PANDAS_COPY_ON_WRITE: False,
+        MITO_CONFIG_ARROW_SHEET_DATA: False,
+        MITO_CONFIG_COMM_COMPRESSION_THRESHOLD: None
     }
 
 def test_none_config_version_is_string():
@@ -132,7 +149,15 @@ def test_version_2_works():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET: None,
+        MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL: DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
+        MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK: False,
+        MITO_CONFIG_STEP_RESULT_CACHE_SIZE: None,
+        MITO_CONFIG_PREVIEW_ROW_THRESHOLD: None,
+        MITO_CONFIG_PANDAS_COPY_ON_WRITE: False,
+        MITO_CONFIG_ARROW_SHEET_DATA: False,
+        MITO_CONFIG_COMM_COMPRESSION_THRESHOLD: None
     }
 
     # Delete the environmnet variables for the next test
@@ -163,7 +188,15 @@ def test_mito_config_update_version_1_to_2():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET: None,
+        MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL: DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
+        MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK: False,
+        MITO_CONFIG_STEP_RESULT_CACHE_SIZE: None,
+        MITO_CONFIG_PREVIEW_ROW_THRESHOLD: None,
+        MITO_CONFIG_PANDAS_COPY_ON_WRITE: False,
+        MITO_CONFIG_ARROW_SHEET_DATA: False,
+        MITO_CONFIG_COMM_COMPRESSION_THRESHOLD: None
     }    
 
     # Delete the environmnet variables for the next test
@@ -194,7 +227,15 @@ def test_mito_config_enable_snowflake_import():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET: None,
+        MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL: DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
+        MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK: False,
+        MITO_CONFIG_STEP_RESULT_CACHE_SIZE: None,
+        MITO_CONFIG_PREVIEW_ROW_THRESHOLD: None,
+        MITO_CONFIG_PANDAS_COPY_ON_WRITE: False,
+        MITO_CONFIG_ARROW_SHEET_DATA: False,
+        MITO_CONFIG_COMM_COMPRESSION_THRESHOLD: None
     }    
 
     delete_all_mito_config_environment_variables()
@@ -227,7 +268,15 @@ def test_mito_config_dont_display_features():
         MITO_CONFIG_PRO: False,
         MITO_CONFIG_ENTERPRISE: False,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH: None,
-        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None
+        MITO_CONFIG_CUSTOM_IMPORTERS_PATH: None,
+        MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET: None,
+        MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL: DEFAULT_MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL,
+        MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK: False,
+        MITO_CONFIG_STEP_RESULT_CACHE_SIZE: None,
+        MITO_CONFIG_PREVIEW_ROW_THRESHOLD: None,
+        MITO_CONFIG_PANDAS_COPY_ON_WRITE: False,
+        MITO_CONFIG_ARROW_SHEET_DATA: False,
+        MITO_CONFIG_COMM_COMPRESSION_THRESHOLD: None
     }    
 
     delete_all_mito_config_environment_variables()
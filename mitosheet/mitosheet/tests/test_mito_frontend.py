@@ -1,12 +1,14 @@
+import json
 import subprocess
 import os
 
 import pandas as pd
 import pytest
 
-from mitosheet.mito_backend import get_mito_frontend_code
+from mitosheet.mito_backend import FRONTEND_PAYLOAD_DEFLATE_MIN_BYTES, get_frontend_payload, get_mito_frontend_code, get_string_from_frontend_payload
 from mitosheet.steps_manager import StepsManager
 from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import INITIAL_RENDER_MAX_COLUMNS, INITIAL_RENDER_MAX_ROWS
 
 
 # See here: https://www.tutorialspoint.com/json_simple/json_simple_escape_characters.htm
@@ -48,4 +50,34 @@ def test_mito_frontend_is_valid_code(tmp_path, string):
     # we want to make sure that there are no failures in parsing, that it runs up to the 
     # ReferenceError: document is not defined 
     assert 'SyntaxError' not in err.decode('utf-8') 
-    assert 'ReferenceError' in err.decode('utf-8') 
\ No newline at end of file
+    assert 'ReferenceError' in err.decode('utf-8') 
+
+
+@pytest.mark.parametrize('string', STRINGS_TO_TEST + ['', 'a' * FRONTEND_PAYLOAD_DEFLATE_MIN_BYTES, '学医\t"' * 1000])
+def test_frontend_payload_round_trips(string):
+    payload = get_frontend_payload(string)
+    assert get_string_from_frontend_payload(payload) == string
+    assert payload.startswith('deflate:') == (len(string.encode('utf8')) >= FRONTEND_PAYLOAD_DEFLATE_MIN_BYTES)
+    # The payload is embedded in a JS string, so it should need no escaping
+    assert json.dumps(payload) == f'"{payload}"'
+
+
+def test_frontend_payload_is_smaller_than_the_json():
+    df = pd.DataFrame({f'Column {i}': range(1000) for i in range(20)})
+    mito = create_mito_wrapper(df)
+    sheet_data_json = mito.mito_backend.steps_manager.sheet_data_json
+
+    assert len(get_frontend_payload(sheet_data_json)) < len(sheet_data_json) / 4
+
+
+def test_initial_render_sheet_data_is_viewport_sized():
+    df = pd.DataFrame({f'Column {i}': range(1000) for i in range(80)}, index=[f'row {i}' for i in range(1000)])
+    mito = create_mito_wrapper(df)
+
+    sheet_data = json.loads(mito.mito_backend.steps_manager.get_initial_render_sheet_data_json())[0]
+    assert sheet_data['numRows'] == 1000
+    assert sheet_data['numColumns'] == 80
+    assert sheet_data['index'] == [f'row {i}' for i in range(INITIAL_RENDER_MAX_ROWS)]
+    assert len(sheet_data['data']) == 80
+    assert all(len(column['columnData']) == INITIAL_RENDER_MAX_ROWS for column in sheet_data['data'][:INITIAL_RENDER_MAX_COLUMNS])
+    assert all(column['columnData'] == [] for column in sheet_data['data'][INITIAL_RENDER_MAX_COLUMNS:])
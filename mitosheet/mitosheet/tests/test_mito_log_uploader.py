@@ -19,7 +19,7 @@ import pandas as pd
 
 from mitosheet.enterprise.mito_config import (
     MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL, MITO_CONFIG_LOG_SERVER_URL,
-    MITO_CONFIG_VERSION)
+    MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET, MITO_CONFIG_VERSION)
 from mitosheet.telemetry.telemetry_utils import PRINT_LOGS
 from mitosheet.tests.test_mito_config import \
     delete_all_mito_config_environment_variables
@@ -64,7 +64,7 @@ def test_log_uploader_single_edit_event():
         data = log_call[1]['data']
         log_payload = json.loads(data)[0]
 
-        assert len(log_payload) == 9
+        assert len(log_payload) == 14
         assert log_payload["params_sheet_index"] == 0
         assert log_payload["params_column_header"] is not None
         assert log_payload["params_column_header_index"] == -1
@@ -74,6 +74,11 @@ def test_log_uploader_single_edit_event():
         assert log_payload["version_mito"] is not None
         assert log_payload["timestamp_gmt"] is not None
         assert log_payload["event"] == "add_column_edit"
+        # The bytes retained are only counted if there is a step history memory budget
+        assert "performance_bytes_retained" not in log_payload
+        assert mito.mito_backend.steps_manager.curr_step.memory_usage is None
+        for key in ["performance_execution_time", "performance_pandas_processing_time", "performance_recon_time", "performance_serialization_time", "performance_transpile_time"]:
+            assert log_payload[key] >= 0
 
     delete_all_mito_config_environment_variables()
 
@@ -110,7 +115,7 @@ def test_log_uploader_multiple_edit_events():
         data = log_call[1]['data']
         add_column_log_event = json.loads(data)[0]
 
-        assert len(add_column_log_event) == 9
+        assert len(add_column_log_event) == 14
         assert add_column_log_event["params_sheet_index"] == 0
         assert add_column_log_event["params_column_header"] is not None
         assert add_column_log_event["params_column_header_index"] == -1
@@ -122,7 +127,7 @@ def test_log_uploader_multiple_edit_events():
         assert add_column_log_event["event"] == "add_column_edit"
 
         delete_columns_log_event = json.loads(data)[1]
-        assert len(delete_columns_log_event) == 8
+        assert len(delete_columns_log_event) == 13
         assert delete_columns_log_event["params_sheet_index"] == 0
         assert len(delete_columns_log_event["params_column_ids"]) == 1
         assert delete_columns_log_event["params_public_interface_version"] == 3
@@ -364,3 +369,33 @@ def test_mito_log_uploader_prints_on_server_error():
     assert mito.mito_backend.steps_manager.mito_log_uploader is not None and mito.mito_backend.steps_manager.mito_log_uploader.current_log_interval == 2
 
     delete_all_mito_config_environment_variables()
+
+
+def test_log_uploader_includes_bytes_retained_with_step_history_memory_budget():
+
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_LOG_SERVER_URL] =  f"{URL}"
+    os.environ[MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL] = "0"
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET] = "100"
+
+    mito = create_mito_wrapper_with_data([123])
+
+    with patch('requests.post') as mock_post:
+        mito.add_column(0, 'B')
+        log_payload = json.loads(mock_post.call_args_list[0][1]['data'])[0]
+        assert log_payload["performance_bytes_retained"] > 0
+
+    delete_all_mito_config_environment_variables()
+
+
+def test_performance_params_are_not_in_general_telemetry():
+    mito = create_mito_wrapper_with_data([123])
+
+    with patch('mitosheet.telemetry.telemetry_utils.is_running_test', return_value=False), \
+        patch('mitosheet.telemetry.telemetry_utils.telemetry_turned_on', return_value=True), \
+        patch('mitosheet.telemetry.telemetry_utils.analytics.track') as mock_track:
+        mito.add_column(0, 'B')
+
+    log_params = [call[0][2] for call in mock_track.call_args_list if call[0][1] == 'add_column_edit'][0]
+    assert not any(key.startswith('performance_') for key in log_params)
+    assert mito.mito_backend.steps_manager.curr_step.memory_usage is None
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for running Mito with pandas Copy-on-Write
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.enterprise.mito_config import (MITO_CONFIG_PANDAS_COPY_ON_WRITE,
+                                              MITO_CONFIG_VERSION, MitoConfig)
+from mitosheet.state import State
+from mitosheet.tests.decorators import pandas_post_2_only
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import (convert_df_to_parsed_json,
+                             is_pandas_copy_on_write_enabled)
+
+
+def test_pandas_copy_on_write_off_by_default():
+    assert not MitoConfig().pandas_copy_on_write
+
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_PANDAS_COPY_ON_WRITE] = 'True'
+    assert MitoConfig().pandas_copy_on_write
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_PANDAS_COPY_ON_WRITE]
+
+
+@pandas_post_2_only
+def test_state_copy_shares_data_with_copy_on_write():
+    with pd.option_context('mode.copy_on_write', True):
+        assert is_pandas_copy_on_write_enabled()
+        state = State([pd.DataFrame({'A': [1, 2, 3]})], 3)
+        copied_state = state.copy(deep_sheet_indexes=[0])
+        assert np.shares_memory(state.dfs[0]['A'].to_numpy(), copied_state.dfs[0]['A'].to_numpy())
+
+        copied_state.dfs[0].loc[0, 'A'] = 10
+        assert state.dfs[0]['A'].tolist() == [1, 2, 3]
+
+
+@pandas_post_2_only
+def test_edits_do_not_modify_passed_dataframe_with_copy_on_write():
+    with pd.option_context('mode.copy_on_write', True):
+        df = pd.DataFrame({'A': [1, 2, 3], 'B': ['a', 'b', 'c']})
+        mito = create_mito_wrapper(df)
+        mito.set_cell_value(0, 'A', 0, 10)
+        mito.set_formula('=A + 1', 0, 'A')
+        mito.fill_na(0, ['B'], {'type': 'value', 'value': 'd'})
+
+        assert df.equals(pd.DataFrame({'A': [1, 2, 3], 'B': ['a', 'b', 'c']}))
+        assert mito.dfs[0]['A'].tolist() == [11, 3, 4]
+        assert mito.mito_backend.steps_manager.steps_including_skipped[1].dfs[0]['A'].tolist() == [10, 2, 3]
+
+
+@pandas_post_2_only
+def test_convert_df_to_parsed_json_does_not_modify_df_with_copy_on_write():
+    with pd.option_context('mode.copy_on_write', True):
+        df = pd.DataFrame({'A': pd.to_datetime(['2020-01-01', '2020-01-02'])})
+        json_obj = convert_df_to_parsed_json(df)
+        assert json_obj['data'] == [['2020-01-01 00:00:00'], ['2020-01-02 00:00:00']]
+        assert df['A'].dtype == 'datetime64[ns]'
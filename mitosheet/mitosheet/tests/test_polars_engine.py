@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for executing steps with the polars engine
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.code_chunks.step_performers.merge_code_chunk import MergeCodeChunk
+from mitosheet.code_chunks.step_performers.pivot_code_chunk import PivotCodeChunk
+from mitosheet.errors import MitoError
+from mitosheet.state import ENGINE_PANDAS, ENGINE_POLARS, State
+from mitosheet.tests.decorators import requires_polars
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.transpiler.transpile_utils import get_default_code_options, get_engine
+from mitosheet.utils import is_polars_installed
+
+DF_ONE = pd.DataFrame({'A': ['x', 'y', 'x', None], 'B': [1, 2, 3, 4], 'C': [1.0, None, 3.0, 4.0]})
+DF_TWO = pd.DataFrame({'A': ['x', 'y'], 'B': [10, 20], 'D': [1, 2]})
+
+
+def get_polars_state() -> State:
+    return State([DF_ONE, DF_TWO], 3, engine=ENGINE_POLARS)
+
+
+def test_get_engine():
+    assert get_engine(None) == ENGINE_PANDAS
+    assert get_engine(get_default_code_options('id-test')) == ENGINE_PANDAS
+    assert get_engine({**get_default_code_options('id-test'), 'engine': ENGINE_PANDAS}) == ENGINE_PANDAS
+
+    with pytest.raises(MitoError) as e:
+        get_engine({**get_default_code_options('id-test'), 'engine': 'spark'})
+    assert e.value.type_ == 'invalid_engine_error'
+
+
+def test_polars_pivot_code():
+    state = get_polars_state()
+    code, imports = PivotCodeChunk(
+        state, 0, None, 
+        [{'column_id': 'A', 'transformation': 'no-op'}], [], [], 
+        {'B': ['sum', 'mean'], 'C': ['count unique']}, 
+        True, 3, 'df1_pivot'
+    ).get_code()
+
+    assert imports == ['import polars as pl']
+    assert code[-1] == 'df1_pivot = pivot_table'
+    # NOTE: the order of the selected columns is not deterministic
+    assert code[-2].startswith("pivot_table = pl.from_pandas(df1[")
+    assert code[-2].split(']]).lazy()')[1] == (
+        ".drop_nulls(['A']).group_by(['A']).agg([\n" + 
+        "    pl.col('B').mean().alias('B mean'),\n" + 
+        "    pl.col('B').sum().alias('B sum'),\n" + 
+        "    pl.col('C').drop_nulls().n_unique().cast(pl.Int64).alias('C nunique')\n" + 
+        "]).filter(~pl.all_horizontal(pl.col(['B mean', 'B sum', 'C nunique']).is_null())).sort(['A']).collect().to_pandas()"
+    )
+
+
+def test_polars_pivot_falls_back_to_pandas_with_pivot_columns():
+    state = get_polars_state()
+    code, imports = PivotCodeChunk(
+        state, 0, None, 
+        [{'column_id': 'A', 'transformation': 'no-op'}], [{'column_id': 'C', 'transformation': 'no-op'}], [], 
+        {'B': ['sum']}, 
+        True, 3, 'df1_pivot'
+    ).get_code()
+
+    assert imports == []
+    assert any('pivot_table(' in line for line in code)
+
+
+def test_polars_pivot_falls_back_to_pandas_for_other_dtypes():
+    state = State([pd.DataFrame({'A': ['x', 'y'], 'B': ['a', 'b'], 'C': pd.array([1, None], dtype='Int64'), 'D': [1, 'x']})], 3, engine=ENGINE_POLARS)
+    for pivot_row_column_id, values in [('A', {'B': ['count']}), ('A', {'C': ['sum']}), ('D', {'B': ['count']})]:
+        code, imports = PivotCodeChunk(
+            state, 0, None, 
+            [{'column_id': pivot_row_column_id, 'transformation': 'no-op'}], [], [], 
+            values, True, 3, 'df1_pivot'
+        ).get_code()
+        assert imports == []
+
+
+def test_polars_merge_code():
+    # Polars does not match null merge keys, so we merge on keys without nulls
+    state = State([DF_ONE.dropna(subset=['A']), DF_TWO], 3, engine=ENGINE_POLARS)
+    code, imports = MergeCodeChunk(state, 'lookup', None, 0, 1, [['A', 'A']], ['A', 'B'], ['B', 'D'], 'df_merge').get_code()
+
+    assert imports == ['import polars as pl']
+    assert code == [
+        "df_merge = pl.from_pandas(df1[['A', 'B']]).lazy().rename({'B': 'B_df1'}).join(\n" + 
+        "    pl.from_pandas(df2).lazy().unique(subset=['A'], keep=\"first\", maintain_order=True).rename({'B': 'B_df2'}),\n" + 
+        "    on=['A'],\n" + 
+        "    how=\"left\",\n" + 
+        "    maintain_order=\"left\"\n" + 
+        ").collect().to_pandas()"
+    ]
+
+
+def test_polars_merge_falls_back_to_pandas_for_outer_merge():
+    state = get_polars_state()
+    code, imports = MergeCodeChunk(state, 'outer', None, 0, 1, [['A', 'A']], ['A', 'B'], ['B', 'D'], 'df_merge').get_code()
+
+    assert imports == []
+    assert code[-1] == "df_merge = df1_tmp.merge(df2, left_on=['A'], right_on=['A'], how='outer', suffixes=['_df1', '_df2'])"
+
+
+@pytest.mark.skipif(is_polars_installed(), reason='requires polars to not be installed')
+def test_polars_engine_not_installed_does_not_change_code_options():
+    mito = create_mito_wrapper(DF_ONE)
+    code_options = mito.mito_backend.steps_manager.code_options
+
+    assert not mito.code_options_update({**code_options, 'engine': ENGINE_POLARS})
+    assert get_engine(mito.mito_backend.steps_manager.code_options) == ENGINE_PANDAS
+    assert mito.mito_backend.steps_manager.curr_step.final_defined_state.engine == ENGINE_PANDAS
+
+
+@requires_polars
+def test_polars_engine_gives_same_pivot_and_merge_as_pandas():
+    pandas_mito = create_mito_wrapper(DF_ONE, DF_TWO)
+    polars_mito = create_mito_wrapper(DF_ONE, DF_TWO)
+    polars_mito.code_options_update({**polars_mito.mito_backend.steps_manager.code_options, 'engine': ENGINE_POLARS})
+
+    for mito in [pandas_mito, polars_mito]:
+        mito.pivot_sheet(0, ['A'], [], {'B': ['sum', 'mean'], 'C': ['count unique', 'count']})
+        mito.merge_sheets('lookup', 0, 1, [['A', 'A']], ['A', 'B', 'C'], ['B', 'D'])
+
+    assert 'import polars as pl' in polars_mito.transpiled_code
+    for pandas_df, polars_df in zip(pandas_mito.dfs, polars_mito.dfs):
+        pd.testing.assert_frame_equal(pandas_df, polars_df, check_dtype=True)
+
+
+@requires_polars
+@pytest.mark.parametrize("values", [
+    {'V': ['sum']}, {'V': ['mean']}, {'V': ['median']}, {'V': ['min']}, {'V': ['max']}, 
+    {'V': ['std']}, {'V': ['count']}, {'V': ['count unique']}, {'V': ['mean', 'count']},
+    {'V': ['sum'], 'W': ['sum', 'mean', 'count']}
+])
+def test_polars_engine_gives_same_pivot_with_null_groups_as_pandas(values):
+    df = pd.DataFrame({'K': ['b', 'a', 'b', 'c'], 'V': [1, 2, 3, np.nan], 'W': [True, False, True, True]})
+    pandas_mito = create_mito_wrapper(df)
+    polars_mito = create_mito_wrapper(df)
+    polars_mito.code_options_update({**polars_mito.mito_backend.steps_manager.code_options, 'engine': ENGINE_POLARS})
+
+    for mito in [pandas_mito, polars_mito]:
+        mito.pivot_sheet(0, ['K'], [], values)
+
+    assert 'import polars as pl' in polars_mito.transpiled_code
+    pd.testing.assert_frame_equal(pandas_mito.dfs[1], polars_mito.dfs[1], check_dtype=True)
+
+
+@requires_polars
+@pytest.mark.parametrize("how", ['inner', 'left', 'lookup', 'unique in left', 'unique in right'])
+@pytest.mark.parametrize("key_one, key_two, uses_polars", [
+    (['x', 'y', 'x', 'z'], ['x', 'y', 'w'], True),
+    ([1, 2, 1, 3], [1, 2, 4], True),
+    (['x', None, 'x', 'z'], ['x', None, 'w'], False),
+    ([1.0, np.nan, 1.0, 3.0], [1.0, np.nan, 4.0], False),
+    (pd.Series([1, 2, 1, 3], dtype=object), pd.Series([1, 2, 4], dtype=object), False),
+])
+@pytest.mark.parametrize("values", [
+    [10, 20, 30],
+    [1.5, np.nan, 3.0],
+    [True, False, True],
+    ['a', None, 'c'],
+    ['a', np.nan, 'c'],
+    [1, 'x', 2.5],
+    pd.array([1, None, 3], dtype='Int64'),
+    pd.Categorical(['a', 'b', 'a']),
+    pd.to_datetime(['2020-01-01', None, '2020-01-03']),
+])
+def test_polars_engine_gives_same_merge_as_pandas(how, key_one, key_two, uses_polars, values):
+    df_one = pd.DataFrame({'K': key_one, 'L': [1, 2, 3, 4]})
+    df_two = pd.DataFrame({'K': key_two, 'V': values})
+    pandas_mito = create_mito_wrapper(df_one, df_two)
+    polars_mito = create_mito_wrapper(df_one, df_two)
+    polars_mito.code_options_update({**polars_mito.mito_backend.steps_manager.code_options, 'engine': ENGINE_POLARS})
+
+    for mito in [pandas_mito, polars_mito]:
+        mito.merge_sheets(how, 0, 1, [['K', 'K']], ['K', 'L'], ['K', 'V'])
+
+    if not uses_polars:
+        assert 'import polars as pl' not in polars_mito.transpiled_code
+    assert len(pandas_mito.dfs) == len(polars_mito.dfs)
+    for pandas_df, polars_df in zip(pandas_mito.dfs, polars_mito.dfs):
+        pd.testing.assert_frame_equal(pandas_df, polars_df, check_dtype=True)
+        # assert_frame_equal treats None and NaN as equal in object columns
+        for column_header in pandas_df.columns:
+            assert [type(value) for value in pandas_df[column_header]] == [type(value) for value in polars_df[column_header]]
+
+
+@requires_polars
+def test_polars_engine_merges_with_polars_when_it_matches_pandas():
+    df_one = pd.DataFrame({'K': ['x', 'y', 'x', 'z'], 'L': [1, 2, 3, 4]})
+    df_two = pd.DataFrame({'K': ['x', 'y', 'w'], 'V': [1.5, np.nan, 3.0], 'W': [True, False, True]})
+    mito = create_mito_wrapper(df_one, df_two)
+    mito.code_options_update({**mito.mito_backend.steps_manager.code_options, 'engine': ENGINE_POLARS})
+
+    # Unmatched rows of a left merge make bool columns into objects with NaN in pandas
+    mito.merge_sheets('left', 0, 1, [['K', 'K']], ['K', 'L'], ['K', 'V'])
+    assert 'import polars as pl' in mito.transpiled_code
+    mito.merge_sheets('left', 0, 1, [['K', 'K']], ['K', 'L'], ['K', 'W'])
+    assert mito.transpiled_code.count('import polars as pl') == 1
+    mito.merge_sheets('inner', 0, 1, [['K', 'K']], ['K', 'L'], ['K', 'W'])
+    assert sum('pl.from_pandas' in line for line in mito.transpiled_code) == 2
+
+
+@requires_polars
+def test_changing_engine_executes_steps_again():
+    mito = create_mito_wrapper(DF_ONE)
+    mito.pivot_sheet(0, ['A'], [], {'B': ['sum']})
+    assert 'import polars as pl' not in mito.transpiled_code
+
+    mito.code_options_update({**mito.mito_backend.steps_manager.code_options, 'engine': ENGINE_POLARS})
+    assert 'import polars as pl' in mito.transpiled_code
+    assert mito.dfs[1].equals(pd.DataFrame({'A': ['x', 'y'], 'B sum': [4, 2]}))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for executing the steps on samples of large dataframes
+"""
+import json
+import os
+
+import pandas as pd
+
+from mitosheet.api.get_dataframe_as_csv import get_dataframe_as_csv
+from mitosheet.enterprise.mito_config import (MITO_CONFIG_PREVIEW_ROW_THRESHOLD,
+                                              MITO_CONFIG_VERSION)
+from mitosheet.preview import get_preview_sample
+from mitosheet.tests.test_utils import (MitoWidgetTestWrapper,
+                                        create_mito_wrapper)
+
+PREVIEW_ROW_THRESHOLD = 10
+
+
+def create_mito_wrapper_with_preview(*args: pd.DataFrame) -> MitoWidgetTestWrapper:
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_PREVIEW_ROW_THRESHOLD] = str(PREVIEW_ROW_THRESHOLD)
+    try:
+        return create_mito_wrapper(*args)
+    finally:
+        del os.environ[MITO_CONFIG_VERSION]
+        del os.environ[MITO_CONFIG_PREVIEW_ROW_THRESHOLD]
+
+
+def get_large_df() -> pd.DataFrame:
+    return pd.DataFrame({'A': list(range(100)), 'B': ['x', 'y'] * 50})
+
+
+def test_preview_off_by_default():
+    mito = create_mito_wrapper(get_large_df())
+    assert mito.mito_backend.steps_manager.preview_row_threshold is None
+    assert not mito.mito_backend.steps_manager.is_preview
+    assert len(mito.dfs[0]) == 100
+
+
+def test_preview_sample_is_deterministic_and_in_order():
+    df = get_large_df()
+    sample = get_preview_sample(df, PREVIEW_ROW_THRESHOLD)
+    assert len(sample) == PREVIEW_ROW_THRESHOLD
+    assert sample.equals(get_preview_sample(df, PREVIEW_ROW_THRESHOLD))
+    assert sample.index.is_monotonic_increasing
+    assert sample.equals(df.loc[sample.index])
+
+
+def test_large_dataframes_are_sampled():
+    mito = create_mito_wrapper_with_preview(get_large_df(), pd.DataFrame({'A': [1, 2, 3]}))
+
+    assert mito.mito_backend.steps_manager.is_preview
+    assert len(mito.dfs[0]) == PREVIEW_ROW_THRESHOLD
+    assert len(mito.dfs[1]) == 3
+    assert mito.mito_backend.steps_manager.curr_step.final_defined_state.preview_sheet_indexes == {0}
+
+    sheet_data = json.loads(mito.sheet_data_json)
+    assert sheet_data[0]['isPreview']
+    assert not sheet_data[1]['isPreview']
+
+
+def test_small_dataframes_are_not_sampled():
+    mito = create_mito_wrapper_with_preview(pd.DataFrame({'A': [1, 2, 3]}))
+    assert not mito.mito_backend.steps_manager.is_preview
+    assert not json.loads(mito.sheet_data_json)[0]['isPreview']
+
+
+def test_edits_execute_on_sample_and_code_on_full_data():
+    mito = create_mito_wrapper_with_preview(get_large_df())
+    mito.add_column(0, 'C')
+    mito.set_formula('=A + 1', 0, 'C')
+
+    sample = get_preview_sample(get_large_df(), PREVIEW_ROW_THRESHOLD)
+    assert mito.dfs[0]['C'].tolist() == (sample['A'] + 1).tolist()
+
+    full_df = mito.mito_backend.steps_manager.get_full_data_state().dfs[0]
+    assert len(full_df) == 100
+    assert full_df['C'].tolist() == list(range(1, 101))
+
+
+def test_sheets_created_from_previews_are_previews():
+    mito = create_mito_wrapper_with_preview(get_large_df(), pd.DataFrame({'B': ['x', 'y'], 'C': [1, 2]}))
+    mito.pivot_sheet(0, ['B'], [], {'A': ['sum']})
+    mito.merge_sheets('lookup', 1, 0, [['B', 'B']], ['B', 'C'], ['B', 'A'])
+
+    final_state = mito.mito_backend.steps_manager.curr_step.final_defined_state
+    # The pivot table and merge are small, but are previews as they are computed from the sample
+    assert len(mito.dfs[2]) == 2
+    assert final_state.preview_sheet_indexes == {0, 2, 3}
+
+    full_data_state = mito.mito_backend.steps_manager.get_full_data_state()
+    assert full_data_state.dfs[2]['A sum'].tolist() == [
+        sum(range(0, 100, 2)), sum(range(1, 100, 2))
+    ]
+
+
+def test_deleting_sheet_updates_previews():
+    mito = create_mito_wrapper_with_preview(pd.DataFrame({'A': [1, 2, 3]}), get_large_df())
+    mito.delete_dataframe(0)
+    assert mito.mito_backend.steps_manager.curr_step.final_defined_state.preview_sheet_indexes == {0}
+
+
+def test_full_data_state_is_cached_and_follows_undo():
+    mito = create_mito_wrapper_with_preview(get_large_df())
+    mito.add_column(0, 'C')
+    steps_manager = mito.mito_backend.steps_manager
+
+    full_data_state = steps_manager.get_full_data_state()
+    assert steps_manager.get_full_data_state() is full_data_state
+    assert 'C' in full_data_state.dfs[0].columns
+
+    mito.undo()
+    undone_full_data_state = steps_manager.get_full_data_state()
+    assert 'C' not in undone_full_data_state.dfs[0].columns
+    assert len(undone_full_data_state.dfs[0]) == 100
+
+
+def test_download_csv_is_full_data():
+    mito = create_mito_wrapper_with_preview(get_large_df())
+    mito.add_column(0, 'C')
+
+    csv = get_dataframe_as_csv({'sheet_index': 0}, mito.mito_backend.steps_manager)
+    assert len(csv.strip().split('\n')) == 101
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for sending the data of the sheets to the frontend as Arrow
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from mitosheet.sheet_data_arrow import get_array_from_array_and_arrow_buffer
+from mitosheet.tests.decorators import requires_pyarrow
+from mitosheet.tests.test_sheet_data_json import DATAFRAMES
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import MAX_COLUMNS
+
+
+def get_sheet_data_from_arrow(steps_manager):
+    sheet_data_json, arrow_buffer = steps_manager.get_sheet_data_arrow()
+    return get_array_from_array_and_arrow_buffer(json.loads(sheet_data_json), arrow_buffer)
+
+
+@requires_pyarrow
+@pytest.mark.parametrize("df", DATAFRAMES)
+def test_arrow_sheet_data_matches_json_sheet_data(df):
+    mito = create_mito_wrapper(df)
+    steps_manager = mito.mito_backend.steps_manager
+
+    assert get_sheet_data_from_arrow(steps_manager) == json.loads(steps_manager.sheet_data_json)
+
+
+@requires_pyarrow
+def test_arrow_sheet_data_with_large_ints_and_many_columns():
+    df = pd.DataFrame({f'C{i}': [2 ** 40, -1, i] for i in range(MAX_COLUMNS + 5)})
+    mito = create_mito_wrapper(df)
+    steps_manager = mito.mito_backend.steps_manager
+
+    sheet_data = get_sheet_data_from_arrow(steps_manager)
+    assert sheet_data == json.loads(steps_manager.sheet_data_json)
+    assert sheet_data[0]['data'][MAX_COLUMNS]['columnData'] == []
+
+
+@requires_pyarrow
+def test_arrow_sheet_data_updates_after_edits():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': ['a', 'b', 'c']}))
+    steps_manager = mito.mito_backend.steps_manager
+    get_sheet_data_from_arrow(steps_manager)
+
+    mito.set_formula('=A * 1.5', 0, 'C', add_column=True)
+    assert get_sheet_data_from_arrow(steps_manager) == json.loads(steps_manager.sheet_data_json)
+
+    mito.delete_dataframe(1)
+    mito.undo()
+    assert get_sheet_data_from_arrow(steps_manager) == json.loads(steps_manager.sheet_data_json)
+
+
+@requires_pyarrow
+def test_mito_backend_sends_arrow_sheet_data_in_buffers():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    sent_messages = []
+    mito.mito_backend.mito_send = lambda message, buffers=None: sent_messages.append((message, buffers))
+    mito.mito_backend.arrow_sheet_data = True
+
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+
+    message, buffers = sent_messages[-1]
+    assert message['shared_variables']['sheet_data_arrow']
+    assert len(buffers) == 1
+
+    sheet_data = get_array_from_array_and_arrow_buffer(json.loads(message['shared_variables']['sheet_data_json']), buffers[0])
+    assert sheet_data[0]['data'][1]['columnData'] == [2, 3, 4]
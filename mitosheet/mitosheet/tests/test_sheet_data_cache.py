@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for caching the sheet data of the states that have been displayed
+"""
+import json
+
+import pandas as pd
+
+from mitosheet.sheet_data_cache import SheetDataCache
+from mitosheet.state import State
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import dfs_to_array_for_json, get_json_string
+
+
+def get_uncached_sheet_data(steps_manager):
+    curr_step = steps_manager.curr_step
+    return json.loads(get_json_string(dfs_to_array_for_json(
+        curr_step.final_defined_state,
+        set(range(len(curr_step.dfs))),
+        [],
+        curr_step.dfs,
+        curr_step.df_names,
+        curr_step.df_sources,
+        curr_step.column_formulas,
+        curr_step.column_filters,
+        curr_step.column_ids,
+        curr_step.df_formats,
+    )))
+
+
+def get_mito_with_six_sheets():
+    mito = create_mito_wrapper(*[pd.DataFrame({'A': [i, i + 1, i + 2]}) for i in range(6)])
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    mito.set_formula('=A * 2', 3, 'B', add_column=True)
+    mito.sort(5, 'A', 'descending')
+    return mito
+
+
+def test_undo_reuses_cached_sheet_data():
+    mito = get_mito_with_six_sheets()
+    steps_manager = mito.mito_backend.steps_manager
+
+    misses = steps_manager.sheet_data_cache.misses
+    mito.undo()
+    mito.undo()
+
+    # Each time we undo, every sheet is found in the cache
+    assert steps_manager.sheet_data_cache.hits == 6 * 2
+    assert steps_manager.sheet_data_cache.misses == misses
+    assert json.loads(steps_manager.sheet_data_json) == get_uncached_sheet_data(steps_manager)
+
+    # Redoing executes the step again, so only the sheet it modifies is serialized again
+    mito.redo()
+    assert steps_manager.sheet_data_cache.misses == misses + 1
+    assert json.loads(steps_manager.sheet_data_json) == get_uncached_sheet_data(steps_manager)
+
+    mito.undo()
+    assert steps_manager.sheet_data_cache.hits == 6 * 3
+    assert json.loads(steps_manager.sheet_data_json) == get_uncached_sheet_data(steps_manager)
+
+
+def test_checkout_step_by_idx_reuses_cached_sheet_data():
+    mito = get_mito_with_six_sheets()
+    steps_manager = mito.mito_backend.steps_manager
+
+    for step_index in [0, 3, 1, 5, 2]:
+        mito.checkout_step_by_idx(step_index)
+        assert json.loads(steps_manager.sheet_data_json) == get_uncached_sheet_data(steps_manager)
+
+    hits = steps_manager.sheet_data_cache.hits
+    mito.checkout_step_by_idx(0)
+    mito.checkout_step_by_idx(5)
+    assert steps_manager.sheet_data_cache.hits == hits + 12
+
+
+def test_cached_sheet_data_is_not_used_after_rename_in_place():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.add_column(0, 'B')
+    steps_manager = mito.mito_backend.steps_manager
+
+    mito.undo()
+    steps_manager.curr_step.final_defined_state.df_names[0] = 'new_name'
+    mito.redo()
+    mito.undo()
+    assert json.loads(steps_manager.sheet_data_json)[0]['dfName'] == 'new_name'
+
+
+def test_sheet_data_cache_evicts_least_recently_used():
+    sheet_data_cache = SheetDataCache(max_num_cells=10)
+    states = [State([pd.DataFrame({'A': [1, 2]})], 1) for _ in range(3)]
+    sheet_data = {'index': [0, 1], 'data': [{'columnID': 'A'}, {'columnID': 'B'}]}
+
+    for state in states:
+        sheet_data_cache.put(state, 0, sheet_data)
+    assert sheet_data_cache.num_cells == 8
+    assert sheet_data_cache.get(states[0], 0) is None
+    assert sheet_data_cache.get(states[1], 0) is sheet_data
+
+    sheet_data_cache.put(states[0], 0, sheet_data)
+    assert sheet_data_cache.get(states[1], 0) is sheet_data
+    assert sheet_data_cache.get(states[2], 0) is None
+
+    # States that are deleted are removed from the cache
+    del states[1]
+    assert sheet_data_cache.num_cells == 4
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for sending only the changes to the sheet data to the frontend
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from mitosheet.sheet_data_delta import apply_sheet_data_delta
+from mitosheet.types import FC_NUMBER_GREATER
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+EDITS = [
+    lambda mito: mito.set_formula('=A + 1', 0, 'C', add_column=True),
+    lambda mito: mito.set_formula('=A * 2', 0, 'B'),
+    lambda mito: mito.delete_columns(0, ['B']),
+    lambda mito: mito.reorder_column(0, 'A', 1),
+    lambda mito: mito.rename_column(0, 'A', 'D'),
+    lambda mito: mito.sort(0, 'A', 'descending'),
+    lambda mito: mito.duplicate_dataframe(0),
+    lambda mito: mito.delete_dataframe(0),
+]
+
+
+def get_mito_sending_deltas(*dfs):
+    mito = create_mito_wrapper(*dfs)
+    sent_messages = []
+    mito.mito_backend.mito_send = sent_messages.append
+    mito.mito_backend.sheet_data_deltas = True
+    return mito, sent_messages
+
+
+def apply_sent_sheet_data_deltas(array, sent_messages):
+    for message in sent_messages:
+        assert message['shared_variables']['sheet_data_delta']
+        array = apply_sheet_data_delta(array, json.loads(message['shared_variables']['sheet_data_json']))
+    return array
+
+
+@pytest.mark.parametrize("edit", EDITS)
+def test_sheet_data_delta_applies_to_previous_sheet_data(edit):
+    mito, sent_messages = get_mito_sending_deltas(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}), pd.DataFrame({'E': ['a', 'b']}))
+
+    # The first response has all of the sheet data
+    mito.add_column(1, 'F')
+    assert 'sheet_data_delta' not in sent_messages[-1]['shared_variables']
+    array = json.loads(sent_messages[-1]['shared_variables']['sheet_data_json'])
+
+    num_sent_messages = len(sent_messages)
+    edit(mito)
+    array = apply_sent_sheet_data_deltas(array, sent_messages[num_sent_messages:])
+    assert array == json.loads(mito.mito_backend.steps_manager.sheet_data_json)
+
+    num_sent_messages = len(sent_messages)
+    mito.undo()
+    array = apply_sent_sheet_data_deltas(array, sent_messages[num_sent_messages:])
+    assert array == json.loads(mito.mito_backend.steps_manager.sheet_data_json)
+
+
+def test_sheet_data_delta_only_sends_changed_columns():
+    mito, sent_messages = get_mito_sending_deltas(pd.DataFrame({f'C{i}': range(10) for i in range(100)}), pd.DataFrame({'A': [1]}))
+    mito.add_column(0, 'D')
+
+    mito.set_formula('=C0 + 1', 0, 'D')
+    sheet_data_delta = json.loads(sent_messages[-1]['shared_variables']['sheet_data_json'])
+
+    assert sheet_data_delta['numSheets'] == 2
+    assert len(sheet_data_delta['sheets']) == 1
+    sheet_delta = sheet_data_delta['sheets'][0]
+    assert sheet_delta['sheetIndex'] == 0
+    assert [column['columnID'] for column in sheet_delta['columns']] == ['D']
+    assert sheet_delta['columns'][0]['columnData'] == list(range(1, 11))
+    assert len(sheet_delta['columnIDs']) == 101
+    assert list(sheet_delta['metadata'].keys()) == ['columnFormulasMap']
+
+
+def test_sheet_data_reuses_columns_the_step_did_not_change():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+    mito.add_column(0, 'C')
+    previous_columns = {column['columnID']: column for column in mito.mito_backend.steps_manager.saved_sheet_data[0]['data']}
+
+    mito.set_formula('=A + 1', 0, 'C')
+    columns = {column['columnID']: column for column in mito.mito_backend.steps_manager.saved_sheet_data[0]['data']}
+
+    assert columns['A'] is previous_columns['A']
+    assert columns['B'] is previous_columns['B']
+    assert columns['C'] is not previous_columns['C']
+    assert columns['C']['columnData'] == [2, 3, 4]
+
+
+def test_sheet_data_delta_includes_sheets_executed_again_after_skipping_a_step():
+    mito, sent_messages = get_mito_sending_deltas(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4, 5, 6]}))
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    array = json.loads(sent_messages[-1]['shared_variables']['sheet_data_json'])
+
+    num_sent_messages = len(sent_messages)
+    mito.merge_sheets('lookup', 0, 1, [['A', 'B']], ['A'], ['B'])
+    mito.set_formula('=B + 1', 1, 'C', add_column=True)
+    # The new filter skips the first one, so the merge is executed again
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 10)
+    array = apply_sent_sheet_data_deltas(array, sent_messages[num_sent_messages:])
+
+    assert array[2]['data'][0]['columnData'] == [1, 2, 3]
+    assert array == json.loads(mito.mito_backend.steps_manager.sheet_data_json)
+
+
+def test_sheet_data_is_sent_in_full_without_deltas():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    sent_messages = []
+    mito.mito_backend.mito_send = sent_messages.append
+
+    mito.add_column(0, 'B')
+    mito.add_column(0, 'C')
+
+    assert 'sheet_data_delta' not in sent_messages[-1]['shared_variables']
+    assert json.loads(sent_messages[-1]['shared_variables']['sheet_data_json']) == json.loads(mito.mito_backend.steps_manager.sheet_data_json)
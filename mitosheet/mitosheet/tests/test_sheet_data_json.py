@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for writing the data of a sheet to JSON for the frontend
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.utils import (NpEncoder, convert_df_to_parsed_json,
+                             get_columnar_json_data, get_json_string)
+
+DATAFRAMES = [
+    pd.DataFrame({'A': [1, 2, 3], 'B': [True, False, True]}),
+    pd.DataFrame({'A': [0.1 + 0.2, 1 / 3, -2.00000000005, 123456.123456789012, np.nan, np.inf, -np.inf]}),
+    pd.DataFrame({'A': [1e20, -1e-20, 1.5e16, 0.0, -0.0, 9.99999999995e-6, 524288.00000000005]}),
+    pd.DataFrame({'A': np.random.default_rng(0).standard_normal(1000) * 10.0 ** np.random.default_rng(1).integers(-8, 8, 1000)}),
+    pd.DataFrame({'A': np.array([1.1, 2.2, np.nan], dtype=np.float32)}),
+    pd.DataFrame({'A': pd.to_datetime(['2020-01-01 00:00:00', '2021-12-31 12:34:56', None])}),
+    pd.DataFrame({'A': pd.to_datetime(['2020-01-01', '2021-12-31']).tz_localize('US/Eastern')}),
+    pd.DataFrame({'A': pd.to_timedelta(['1 days', '2 hours', None])}),
+    pd.DataFrame({'A': ['a', None, 'c'], 'B': ['', 'é', '"quoted"']}),
+    pd.DataFrame({'A': ['a', 1, 2.5], 'B': [[1], {'x': 1}, None]}),
+    pd.DataFrame({'A': pd.Series([1, None, 3], dtype='Int64'), 'B': pd.Series(['a', None, 'c'], dtype='string')}),
+    pd.DataFrame({'A': pd.Categorical(['a', 'b', 'a'])}),
+    pd.DataFrame({'A': [1, 2, 3]}, index=['x', 'y', 'z']),
+    pd.DataFrame({'A': [1, 2, 3]}, index=[0.5, 1.5, 2.5]),
+    pd.DataFrame({'A': [1, 2]}, index=pd.to_datetime(['2020-01-01', '2020-01-02'])),
+    pd.DataFrame({'A': [1, 2]}, index=pd.to_timedelta(['1 days', '2 days'])),
+    pd.DataFrame({'A': [1, 2]}, index=pd.MultiIndex.from_tuples([('a', 1), ('b', 2)])),
+    pd.DataFrame({'A': [1, 2, 3]}, index=range(10, 16, 2)),
+    pd.DataFrame({'A': []}),
+    pd.DataFrame(),
+]
+
+
+@pytest.mark.parametrize("df", DATAFRAMES)
+def test_columnar_json_data_matches_parsed_json(df):
+    columns_data, index = get_columnar_json_data(df)
+    json_obj = convert_df_to_parsed_json(df)
+
+    assert index == json_obj['index']
+    assert columns_data == [[row[column_index] for row in json_obj['data']] for column_index in range(df.shape[1])]
+
+
+def test_columnar_json_data_limits_rows_and_columns():
+    df = pd.DataFrame({f'C{i}': range(20) for i in range(10)})
+    columns_data, index = get_columnar_json_data(df, max_rows=5, max_columns=3)
+    assert len(columns_data) == 3
+    assert index == list(range(5))
+    assert columns_data[2] == list(range(5))
+
+
+def test_columnar_json_data_with_duplicate_columns():
+    df = pd.DataFrame([[1, 'a', 1.5]], columns=['A', 'A', 'B'])
+    columns_data, _ = get_columnar_json_data(df)
+    assert columns_data == [[1], ['a'], [1.5]]
+
+
+@pytest.mark.parametrize("obj", [
+    {'data': [[1, 2.5, 'NaN', None, True]], 'index': ['a', 1]},
+    {'int': np.int64(1), 'float': np.float64(1.5), 'bool': np.bool_(True), 'array': np.array([1, 2])},
+    {1: 'non string keys', 'nested': [{'a': [1, {'b': None}]}]},
+    {'large int': 2 ** 70},
+    {'unicode': 'é ✓  '},
+])
+def test_json_string_matches_json_dumps(obj):
+    assert json.loads(get_json_string(obj)) == json.loads(json.dumps(obj, cls=NpEncoder))
+
+
+@pytest.mark.parametrize("obj", [
+    {'float': np.nan, 'none': None},
+    {'graph': [1.5, np.inf, -np.inf], 'none': None},
+    {'array': np.array([1.0, np.nan]), 'none': None},
+    {'nested': [{'a': np.float32('nan')}], 'none': None},
+    {'array': np.array([None, np.nan], dtype=object), 'none': None},
+])
+def test_json_string_writes_non_finite_floats_like_json_dumps(obj):
+    assert get_json_string(obj) == json.dumps(obj, cls=NpEncoder)
@@ -6,7 +6,9 @@
 """
 Contains tests for the state class
 """
-from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, DATAFRAME_SOURCE_PASSED, State
+from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, DATAFRAME_SOURCE_PASSED, SUPPORTS_COLUMN_LEVEL_COPY, State
+from mitosheet.tests.test_utils import create_mito_wrapper
+import numpy as np
 import pandas as pd
 
 def test_state_can_add_df_to_end():
@@ -29,3 +31,73 @@ def test_state_can_add_df_to_middle():
     
     assert state.df_sources == [DATAFRAME_SOURCE_IMPORTED]
 
+
+
+def test_state_copy_with_deep_column_ids_shares_other_columns():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': ['a', 'b', 'c']})
+    state = State([df], 3)
+    column_id_a = state.column_ids.get_column_id_by_header(0, 'A')
+
+    new_state = state.copy(deep_sheet_indexes=[0], deep_column_ids={0: [column_id_a]})
+    new_state.dfs[0].loc[0, 'A'] = 100
+
+    assert df['A'].tolist() == [1, 2, 3]
+    assert new_state.dfs[0]['A'].tolist() == [100, 2, 3]
+    if SUPPORTS_COLUMN_LEVEL_COPY:
+        assert np.shares_memory(new_state.dfs[0]['B'].to_numpy(), df['B'].to_numpy())
+    else:
+        assert not np.shares_memory(new_state.dfs[0]['B'].to_numpy(), df['B'].to_numpy())
+
+
+def test_state_copy_with_deep_column_ids_ignores_missing_columns():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    state = State([df], 3)
+
+    new_state = state.copy(deep_sheet_indexes=[0], deep_column_ids={0: ['not_a_column_id']})
+
+    assert new_state.dfs[0].equals(df)
+
+
+def test_column_steps_do_not_modify_previous_state():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    mito = create_mito_wrapper(df)
+    mito.set_formula('=A + 1', 0, 'B')
+    mito.change_column_dtype(0, ['A'], 'float')
+    mito.rename_column(0, 'A', 'C')
+    mito.add_column(0, 'D')
+    mito.set_formula('=C * 2', 0, 'D')
+    mito.delete_columns(0, ['B'])
+
+    assert df.equals(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+    assert mito.get_value(0, 'D', 1) == 2
+
+    for step in mito.mito_backend.steps_manager.steps_including_skipped[1:]:
+        assert step.prev_state is not None
+        assert step.prev_state.dfs[0] is not step.post_state.dfs[0]
+
+    mito.undo()
+    mito.undo()
+    assert mito.dfs[0].equals(pd.DataFrame({'C': [1.0, 2.0, 3.0], 'B': [2, 3, 4], 'D': [0, 0, 0]}))
+
+
+def test_state_copy_shares_metadata_of_sheets_until_accessed():
+    state = State([pd.DataFrame({'A': [1]}), pd.DataFrame({'B': [2]})], 3)
+    state.df_formats[1]['columns'] = {'B': {'type': 'decimal'}}
+    state.graph_data_array.append({'graph_id': 'graph', 'graph_params': {}})
+
+    new_state = state.copy()
+    new_state.column_formulas[0]['A'].append({'frontend_formula': [], 'location': {'type': 'entire_column'}, 'index': []})
+    new_state.column_ids.add_column_header(0, 'C')
+    new_state.df_formats[0]['columns']['A'] = {'type': 'decimal'}
+    new_state.graph_data_array[0]['graph_params']['changed'] = True
+
+    # The metadata of the other sheet is not copied
+    assert list.__getitem__(new_state.df_formats, 1) is list.__getitem__(state.df_formats, 1)
+    assert list.__getitem__(new_state.column_formulas, 1) is list.__getitem__(state.column_formulas, 1)
+
+    # And the original state is unchanged
+    assert state.column_formulas[0] == {'A': []}
+    assert state.column_ids.get_column_headers(0) == ['A']
+    assert state.df_formats[0]['columns'] == {}
+    assert state.graph_data_array == [{'graph_id': 'graph', 'graph_params': {}}]
+    assert new_state.df_formats[1]['columns'] == {'B': {'type': 'decimal'}}
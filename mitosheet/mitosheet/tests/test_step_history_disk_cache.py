@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for writing states to the step history disk cache, and reading them back in
+"""
+import gc
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.state import State
+from mitosheet.step_history_disk_cache import (ARROW_FILE_FORMAT, PICKLE_FILE_FORMAT,
+                                               StepHistoryDiskCache)
+from mitosheet.utils import is_pyarrow_installed
+
+
+def spill_and_load(df: pd.DataFrame) -> Tuple[pd.DataFrame, str]:
+    disk_cache = StepHistoryDiskCache()
+    state = State([df.copy()], 3)
+    spilled_state = disk_cache.spill_state(state)
+
+    # Delete the dataframe, so that it is read back in from the file
+    del state
+    gc.collect()
+
+    return disk_cache.load_state(spilled_state).dfs[0], spilled_state.spilled_dataframes[0].file_format
+
+
+@pytest.mark.skipif(not is_pyarrow_installed(), reason='requires pyarrow')
+@pytest.mark.parametrize("df, file_format", [
+    (pd.DataFrame({'A': [1, 2, 3], 'B': [1.0, np.nan, 3.0], 'C': ['a', None, 'c']}), ARROW_FILE_FORMAT),
+    (pd.DataFrame({'A': pd.array([1, None, 3], dtype='Int64'), 'B': pd.Categorical(['a', 'b', 'a'])}, index=['x', 'y', 'z']), ARROW_FILE_FORMAT),
+    (pd.DataFrame({'A': pd.Series([1, 2, 3], dtype='object')}), PICKLE_FILE_FORMAT),
+    (pd.DataFrame({'A': pd.Series([True, None, False], dtype='object')}), PICKLE_FILE_FORMAT),
+    (pd.DataFrame({'A': ['a', np.nan, None]}), PICKLE_FILE_FORMAT),
+    (pd.DataFrame({'A': [1, 'a', 2.0]}), PICKLE_FILE_FORMAT),
+])
+def test_step_history_disk_cache_reads_back_the_same_dataframe(df, file_format):
+    loaded_df, loaded_file_format = spill_and_load(df)
+
+    assert loaded_file_format == file_format
+    pd.testing.assert_frame_equal(loaded_df, df, check_dtype=True)
+    # assert_frame_equal treats None and NaN as equal in object columns
+    for column_header in df.columns:
+        assert [type(value) for value in loaded_df[column_header]] == [type(value) for value in df[column_header]]
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the step result cache
+"""
+import os
+from typing import Any, Callable, Dict
+
+import pandas as pd
+
+from mitosheet.api.get_performance_report import get_performance_report
+from mitosheet.enterprise.mito_config import (
+    MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK, MITO_CONFIG_STEP_RESULT_CACHE_SIZE,
+    MITO_CONFIG_VERSION, MitoConfig)
+from mitosheet.state import State
+from mitosheet.step_history_disk_cache import StepHistoryDiskCache
+from mitosheet.step_result_cache import (StepResultCache,
+                                         get_dataframe_content_fingerprint,
+                                         get_function_fingerprint,
+                                         get_step_result_cache)
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def get_mito_config_with_step_result_cache(size: str='100') -> MitoConfig:
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE] = size
+    mito_config = MitoConfig() # type: ignore
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE]
+    return mito_config
+
+
+def test_step_result_cache_off_by_default():
+    assert get_step_result_cache(MitoConfig()) is None
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    assert mito.mito_backend.steps_manager.step_result_cache is None
+
+
+def test_step_result_cache_is_shared_by_analyses():
+    step_result_cache = get_step_result_cache(get_mito_config_with_step_result_cache())
+    assert step_result_cache is not None
+    assert get_step_result_cache(get_mito_config_with_step_result_cache()) is step_result_cache
+    step_result_cache.clear()
+
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE] = '100'
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    other_mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE]
+
+    for wrapper in [mito, other_mito]:
+        wrapper.add_column(0, 'B')
+        wrapper.set_formula('=A + 1', 0, 'B')
+        wrapper.rename_column(0, 'B', 'C')
+
+    assert mito.dfs[0].equals(other_mito.dfs[0])
+    assert mito.transpiled_code == other_mito.transpiled_code
+
+    # The second analysis gets the result of each of its steps from the cache
+    steps_manager = other_mito.mito_backend.steps_manager
+    assert step_result_cache.hits >= 3
+    performance_report = get_performance_report({}, steps_manager)
+    assert performance_report['step_result_cache_hits'] == step_result_cache.hits
+    assert performance_report['step_result_cache_hit_rate'] == step_result_cache.hit_rate
+
+    # Changing the cached result does not change the result in the other analysis
+    other_mito.set_cell_value(0, 'C', 0, 100)
+    assert mito.dfs[0]['C'].tolist() == [2, 3, 4]
+    step_result_cache.clear()
+
+
+def test_step_result_cache_is_missed_for_different_data():
+    step_result_cache = get_step_result_cache(get_mito_config_with_step_result_cache())
+    assert step_result_cache is not None
+    step_result_cache.clear()
+
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE] = '100'
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    other_mito = create_mito_wrapper(pd.DataFrame({'A': ['1', '2', '3']}))
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE]
+
+    for wrapper in [mito, other_mito]:
+        wrapper.add_column(0, 'B')
+        wrapper.set_formula('=A', 0, 'B')
+
+    assert step_result_cache.hits == 0
+    assert mito.dfs[0]['B'].tolist() == [1, 2, 3]
+    assert other_mito.dfs[0]['B'].tolist() == ['1', '2', '3']
+    step_result_cache.clear()
+
+
+def test_step_result_cache_does_not_cache_non_deterministic_steps():
+    step_result_cache = get_step_result_cache(get_mito_config_with_step_result_cache())
+    assert step_result_cache is not None
+    step_result_cache.clear()
+
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE] = '100'
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_RESULT_CACHE_SIZE]
+
+    mito.add_column(0, 'B')
+    misses = step_result_cache.misses
+    mito.set_formula('=TODAY()', 0, 'B')
+    assert step_result_cache.misses == misses
+    assert len(step_result_cache._results) == 1
+    step_result_cache.clear()
+
+
+def test_dataframe_content_fingerprint():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': ['a', 'b', 'c']})
+    assert get_dataframe_content_fingerprint(df) == get_dataframe_content_fingerprint(df.copy())
+    assert get_dataframe_content_fingerprint(df) != get_dataframe_content_fingerprint(df.rename(columns={'A': 'C'}))
+    assert get_dataframe_content_fingerprint(df) != get_dataframe_content_fingerprint(df.astype({'A': 'float'}))
+    assert get_dataframe_content_fingerprint(df) != get_dataframe_content_fingerprint(df.set_index(pd.Index([1, 2, 3])))
+    assert get_dataframe_content_fingerprint(pd.DataFrame({'A': [1, 'a']})) != get_dataframe_content_fingerprint(pd.DataFrame({'A': ['1', 'a']}))
+
+
+def define_function(source: str, function_globals: Dict[str, Any]) -> Callable:
+    exec(source, function_globals)
+    return function_globals['ADD_OFFSET']
+
+
+def test_function_fingerprint():
+    source = 'def ADD_OFFSET(x):\n    return x + OFFSET'
+    function = define_function(source, {'OFFSET': 1})
+
+    # Defining the same function again gives the same fingerprint
+    assert get_function_fingerprint(function) == get_function_fingerprint(define_function(source, {'OFFSET': 1}))
+    assert get_function_fingerprint(function) != get_function_fingerprint(define_function(source, {'OFFSET': 2}))
+    assert get_function_fingerprint(function) != get_function_fingerprint(define_function('def ADD_OFFSET(x):\n    return x - OFFSET', {'OFFSET': 1}))
+    assert get_function_fingerprint(function) != get_function_fingerprint(define_function('def ADD_OFFSET(x, OFFSET=1):\n    return x + OFFSET', {}))
+
+    def get_add_offset(offset):
+        def ADD_OFFSET(x):
+            return x + offset
+        return ADD_OFFSET
+
+    assert get_function_fingerprint(get_add_offset(1)) == get_function_fingerprint(get_add_offset(1))
+    assert get_function_fingerprint(get_add_offset(1)) != get_function_fingerprint(get_add_offset(2))
+
+
+def test_state_fingerprint_changes_with_user_defined_functions():
+    step_result_cache = StepResultCache(100)
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    source = 'def ADD_OFFSET(x):\n    return x + OFFSET'
+
+    fingerprint = step_result_cache.get_state_fingerprint(State([df], 3, user_defined_functions=[define_function(source, {'OFFSET': 1})]))
+    # The first function is garbage collected, so the new function may have the same id
+    assert fingerprint != step_result_cache.get_state_fingerprint(State([df], 3, user_defined_functions=[define_function(source, {'OFFSET': 2})]))
+    assert fingerprint == step_result_cache.get_state_fingerprint(State([df], 3, user_defined_functions=[define_function(source, {'OFFSET': 1})]))
+
+
+def test_step_result_cache_evicts_least_recently_used_results():
+    step_result_cache = StepResultCache(100)
+    states = [State([pd.DataFrame({'A': [i]})], 3) for i in range(3)]
+
+    step_result_cache.put('0', states[0], {}, 50)
+    step_result_cache.put('1', states[1], {}, 50)
+    assert step_result_cache.get('0') is not None
+    step_result_cache.put('2', states[2], {}, 50)
+
+    assert step_result_cache.get('1') is None
+    assert step_result_cache.get('0') is not None
+    assert step_result_cache.get('2') is not None
+    assert step_result_cache.size_bytes == 100
+    assert step_result_cache.hits == 3 and step_result_cache.misses == 1
+    assert step_result_cache.hit_rate == 0.75
+
+    # Results that are larger than the cache are not cached
+    step_result_cache.put('3', states[0], {}, 101)
+    assert step_result_cache.get('3') is None
+
+
+def test_step_result_cache_spills_evicted_results_to_disk():
+    step_result_cache = StepResultCache(100, disk_cache=StepHistoryDiskCache())
+    states = [State([pd.DataFrame({'A': [i]})], 3) for i in range(3)]
+
+    for i, state in enumerate(states):
+        step_result_cache.put(str(i), state, {'index': i}, 50)
+
+    assert step_result_cache.spilled_size_bytes == 50
+    result = step_result_cache.get('0')
+    assert result is not None
+    post_state, execution_data = result
+    assert post_state.dfs[0].equals(states[0].dfs[0])
+    assert execution_data == {'index': 0}
+
+
+def test_step_result_cache_spills_to_disk_if_configured():
+    os.environ[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK] = 'True'
+    mito_config = get_mito_config_with_step_result_cache()
+    del os.environ[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK]
+
+    import mitosheet.step_result_cache
+    mitosheet.step_result_cache._step_result_cache = None
+    step_result_cache = get_step_result_cache(mito_config)
+    assert step_result_cache is not None and step_result_cache.disk_cache is not None
+    mitosheet.step_result_cache._step_result_cache = None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the StepSkipIndex
+"""
+import random
+from typing import List, Set
+
+import pandas as pd
+
+from mitosheet.step import Step
+from mitosheet.step_skip_index import StepSkipIndex
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE, FORMULA_SPECIFIC_INDEX_LABELS_TYPE
+
+
+def get_step_indexes_to_skip_by_scanning(step_list: List[Step]) -> Set[int]:
+    step_indexes_to_skip: Set[int] = set()
+    for step_index, step in enumerate(step_list):
+        step_indexes_to_skip.update(step.step_indexes_to_skip(step_list[:step_index]))
+    return step_indexes_to_skip
+
+def get_random_step(rng: random.Random, step_index: int) -> Step:
+    step_id = rng.choice([f'step_{step_index}', 'shared_0', 'shared_1'])
+    choice = rng.random()
+    if choice < 0.35:
+        return Step('filter_column', step_id, {'sheet_index': rng.randrange(2), 'column_id': rng.choice(['A', 'B'])})
+    elif choice < 0.75:
+        index_labels_formula_is_applied_to = rng.choice([
+            {'type': FORMULA_ENTIRE_COLUMN_TYPE},
+            {'type': FORMULA_SPECIFIC_INDEX_LABELS_TYPE, 'index_labels': [0]},
+            {'type': FORMULA_SPECIFIC_INDEX_LABELS_TYPE, 'index_labels': [1]},
+        ])
+        return Step('set_column_formula', step_id, {
+            'sheet_index': rng.randrange(2), 
+            'column_id': rng.choice(['A', 'B']), 
+            'index_labels_formula_is_applied_to': index_labels_formula_is_applied_to
+        })
+    return Step('pivot', step_id, {'sheet_index': 0})
+
+def test_step_skip_index_matches_scanning_steps():
+    rng = random.Random(0)
+    for _ in range(20):
+        steps = [Step('initialize', 'initialize', {})]
+        for step_index in range(1, 60):
+            steps.append(get_random_step(rng, step_index))
+
+        skip_index = StepSkipIndex(steps)
+        assert skip_index.get_step_indexes_to_skip() == get_step_indexes_to_skip_by_scanning(steps)
+        for num_steps in range(len(steps)):
+            assert skip_index.get_step_indexes_to_skip(num_steps) == get_step_indexes_to_skip_by_scanning(steps[:num_steps])
+
+def test_step_skip_index_pop_and_sync_match_rebuilding():
+    rng = random.Random(1)
+    steps = [Step('initialize', 'initialize', {})]
+    skip_index = StepSkipIndex(steps)
+    for step_index in range(1, 300):
+        if len(steps) > 1 and rng.random() < 0.2:
+            # Undo a few steps, or undo a few steps and then add new ones
+            steps = steps[:rng.randrange(1, len(steps))]
+        else:
+            steps = steps + [get_random_step(rng, step_index)]
+
+        if rng.random() < 0.5:
+            skip_index.sync(steps)
+        else:
+            while len(skip_index) > 0 and skip_index.steps != steps[:len(skip_index)]:
+                skip_index.pop()
+            for step in steps[len(skip_index):]:
+                skip_index.append(step)
+
+        assert skip_index.steps == steps
+        assert skip_index.get_step_indexes_to_skip() == get_step_indexes_to_skip_by_scanning(steps)
+        for skipping_step_index in range(len(steps)):
+            assert skip_index.get_step_indexes_skipped_by(skipping_step_index) == steps[skipping_step_index].step_indexes_to_skip(steps[:skipping_step_index])
+
+def test_step_skip_index_sync_keeps_reexecuted_steps():
+    steps = [Step('initialize', 'initialize', {}), Step('filter_column', 'a', {'sheet_index': 0, 'column_id': 'A'})]
+    skip_index = StepSkipIndex(steps)
+
+    reexecuted_steps = [steps[0], Step('filter_column', 'a', steps[1].params)]
+    skip_index.sync(reexecuted_steps)
+    assert skip_index.steps[1] is reexecuted_steps[1]
+
+def test_steps_manager_skip_index_updated_on_overwrite_undo_redo_and_clear():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+    steps_manager = mito.mito_backend.steps_manager
+
+    def check_skip_index():
+        assert steps_manager.step_skip_index.steps == steps_manager.steps_including_skipped
+        assert steps_manager.step_skip_index.get_step_indexes_to_skip() == get_step_indexes_to_skip_by_scanning(steps_manager.steps_including_skipped)
+
+    mito.filter(0, 'A', 'And', 'greater', 1)
+    mito.set_formula('=B + 1', 0, 'C', add_column=True)
+    mito.filter(0, 'A', 'And', 'greater', 2)
+    check_skip_index()
+    assert steps_manager.step_skip_index.get_step_indexes_to_skip() == {1}
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [3], 'B': [6], 'C': [7]}, index=[2]))
+
+    mito.undo()
+    check_skip_index()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [2, 3], 'B': [5, 6], 'C': [6, 7]}, index=[1, 2]))
+
+    mito.redo()
+    check_skip_index()
+    assert steps_manager.step_skip_index.get_step_indexes_to_skip() == {1}
+
+    mito.clear()
+    check_skip_index()
+    mito.undo()
+    check_skip_index()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [3], 'B': [6], 'C': [7]}, index=[2]))
+
+def test_steps_manager_skip_index_restored_when_edit_fails():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    steps_manager = mito.mito_backend.steps_manager
+
+    mito.filter(0, 'A', 'And', 'greater', 1)
+    mito.set_formula('=UNKNOWN_FUNCTION(A)', 0, 'A')
+
+    assert steps_manager.step_skip_index.steps == steps_manager.steps_including_skipped
+    assert steps_manager.step_skip_index.get_step_indexes_to_skip() == set()
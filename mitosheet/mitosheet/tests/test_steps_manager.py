@@ -3,15 +3,17 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import os
+import numpy as np
 import pandas as pd
 import pytest
-from mitosheet.enterprise.mito_config import MitoConfig
-from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE
+from mitosheet.enterprise.mito_config import MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL, MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET, MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK, MITO_CONFIG_VERSION, MitoConfig
+from mitosheet.types import FC_NUMBER_GREATER, FORMULA_ENTIRE_COLUMN_TYPE
 
 from mitosheet.utils import get_new_id
 from mitosheet.errors import MitoError
 from mitosheet.steps_manager import StepsManager
-from mitosheet.tests.test_utils import create_mito_wrapper_with_data
+from mitosheet.tests.test_utils import create_mito_wrapper, create_mito_wrapper_with_data
 from mitosheet.column_headers import get_column_header_id
 
 
@@ -104,3 +106,223 @@ def test_failed_overwrite_rolls_back_to_previous_state():
     assert mito.dfs[0].equals(pd.DataFrame(data={'A': [1, 2, 3], 'B': [0, 0, 0]}))
 
 
+
+
+def test_step_history_memory_budget_evicts_and_recomputes_states():
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET] = '0'
+    os.environ[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL] = '3'
+
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    other_mito = create_mito_wrapper(df)
+
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL]
+
+    for wrapper in [mito, other_mito]:
+        for i in range(6):
+            wrapper.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+        wrapper.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+        wrapper.set_formula('=A + 10', 0, 'B5')
+
+    steps_manager = mito.mito_backend.steps_manager
+    evicted_step_indexes = [index for index, step in enumerate(steps_manager.steps_including_skipped) if step.states_evicted]
+    assert steps_manager.step_state_eviction_count > 0
+    assert len(evicted_step_indexes) > 0
+    assert all(index % 3 != 0 for index in evicted_step_indexes)
+    assert len(steps_manager.steps_including_skipped) - 1 not in evicted_step_indexes
+
+    # Accessing evicted steps recomputes them 
+    assert mito.transpiled_code == other_mito.transpiled_code
+    assert steps_manager.step_state_recompute_count > 0
+
+    mito.checkout_step_by_idx(4)
+    other_mito.checkout_step_by_idx(4)
+    assert mito.dfs[0].equals(other_mito.dfs[0])
+
+    mito.checkout_step_by_idx(-1)
+    mito.undo()
+    mito.undo()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B0': [1, 2, 3], 'B1': [2, 3, 4], 'B2': [3, 4, 5], 'B3': [4, 5, 6], 'B4': [5, 6, 7], 'B5': [6, 7, 8]}))
+
+
+def test_step_history_memory_budget_only_counts_freed_states():
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET] = '26'
+    os.environ[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL] = '100'
+
+    # Each column takes 1 MB
+    df = pd.DataFrame({'A': np.arange(131072, dtype='float64')})
+    mito = create_mito_wrapper(df)
+
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL]
+
+    for i in range(6):
+        mito.add_column(0, f'B{i}')
+        mito.set_formula(f'=A + {i}', 0, f'B{i}')
+
+    # A post_state is still in memory if the step after it is not evicted
+    steps = mito.mito_backend.steps_manager.steps_including_skipped
+    memory_usage = sum(
+        step.memory_usage or 0 for index, step in enumerate(steps)
+        if not step.states_evicted or (index + 1 < len(steps) and not steps[index + 1].states_evicted)
+    )
+    assert any(step.states_evicted for step in steps)
+    assert memory_usage <= 26 * 1024 * 1024
+
+
+def test_step_history_memory_budget_does_not_evict_steps_that_are_not_deterministic():
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET] = '0'
+    os.environ[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL] = '100'
+
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL]
+
+    mito.add_column(0, 'B')
+    mito.set_formula('=TODAY()', 0, 'B')
+    for i in range(4):
+        mito.set_formula(f'=A + {i}', 0, f'C{i}', add_column=True)
+
+    steps_manager = mito.mito_backend.steps_manager
+    today_step_index = 2
+    assert steps_manager.steps_including_skipped[today_step_index].params['new_formula'] == '=TODAY()'
+    assert steps_manager.steps_including_skipped[today_step_index - 1].states_evicted
+    assert not steps_manager.steps_including_skipped[today_step_index].states_evicted
+
+    # Recomputing the steps after it starts from it, rather than executing it again
+    today = mito.dfs[0]['B'].copy()
+    mito.checkout_step_by_idx(today_step_index + 2)
+    assert steps_manager.step_state_recompute_count > 0
+    assert mito.dfs[0]['B'].equals(today)
+    assert not steps_manager.steps_including_skipped[today_step_index].states_evicted
+
+
+def test_step_history_no_memory_budget_does_not_evict():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    for i in range(12):
+        mito.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+
+    steps_manager = mito.mito_backend.steps_manager
+    assert steps_manager.step_state_eviction_count == 0
+    assert not any(step.states_evicted for step in steps_manager.steps_including_skipped)
+
+
+def test_step_history_spill_to_disk_writes_and_reads_states():
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK] = 'True'
+
+    df = pd.DataFrame({'A': [1, 2, 3], 'mixed': [1, 'a', 2.0]})
+    mito = create_mito_wrapper(df)
+    other_mito = create_mito_wrapper(df)
+
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK]
+
+    for wrapper in [mito, other_mito]:
+        for i in range(6):
+            wrapper.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+        wrapper.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+        wrapper.set_formula('=A + 10', 0, 'B5')
+
+    steps_manager = mito.mito_backend.steps_manager
+    num_steps = len(steps_manager.steps_including_skipped)
+    spilled_step_indexes = [index for index, step in enumerate(steps_manager.steps_including_skipped) if step.states_evicted]
+    # Only the initialize step, the last step and the step that was last read are in memory
+    assert 0 not in spilled_step_indexes and num_steps - 1 not in spilled_step_indexes
+    assert len(spilled_step_indexes) >= num_steps - 3
+    assert steps_manager.step_state_spill_count > 0
+    assert len(os.listdir(steps_manager.step_history_disk_cache.directory)) > 0
+
+    # Accessing spilled steps reads them back in, rather than recomputing them
+    assert mito.transpiled_code == other_mito.transpiled_code
+    assert steps_manager.step_state_load_count > 0
+    assert steps_manager.step_state_recompute_count == 0
+
+    mito.checkout_step_by_idx(4)
+    other_mito.checkout_step_by_idx(4)
+    assert mito.dfs[0].equals(other_mito.dfs[0])
+
+    mito.checkout_step_by_idx(-1)
+    mito.undo()
+    mito.undo()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'mixed': [1, 'a', 2.0], 'B0': [1, 2, 3], 'B1': [2, 3, 4], 'B2': [3, 4, 5], 'B3': [4, 5, 6], 'B4': [5, 6, 7], 'B5': [6, 7, 8]}))
+    assert [step['step_type'] for step in steps_manager.step_summary_list] == [step['step_type'] for step in other_mito.mito_backend.steps_manager.step_summary_list][:-2]
+
+
+def test_step_history_spill_to_disk_keeps_object_dtypes():
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK] = 'True'
+
+    df = pd.DataFrame({'A': [1, 2, 3], 'ints': pd.Series([1, 2, 3], dtype='object'), 'bools': pd.Series([True, False, True], dtype='object')})
+    mito = create_mito_wrapper(df)
+
+    del os.environ[MITO_CONFIG_VERSION]
+    del os.environ[MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK]
+
+    for i in range(4):
+        mito.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+
+    steps_manager = mito.mito_backend.steps_manager
+    assert steps_manager.step_state_spill_count > 0
+
+    mito.checkout_step_by_idx(2)
+    assert steps_manager.step_state_load_count > 0
+    assert mito.dfs[0]['ints'].dtype == 'object'
+    assert mito.dfs[0]['bools'].dtype == 'object'
+    assert mito.dfs[0][['A', 'ints', 'bools']].equals(df)
+
+
+def test_overwriting_step_reuses_steps_on_other_sheets():
+    df1 = pd.DataFrame({'A': [1, 2, 3]})
+    df2 = pd.DataFrame({'B': [4, 5, 6]})
+    mito = create_mito_wrapper(df1, df2)
+    other_mito = create_mito_wrapper(df1, df2)
+
+    for wrapper in [mito, other_mito]:
+        wrapper.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+        wrapper.set_formula('=B + 1', 1, 'C', add_column=True)
+        wrapper.set_formula('=A * 2', 0, 'D', add_column=True)
+        wrapper.set_formula('=C + 1', 1, 'E', add_column=True)
+
+    old_steps = list(mito.mito_backend.steps_manager.steps_including_skipped)
+
+    # Overwrite the filter, which reexecutes all of the steps after it
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+    new_steps = mito.mito_backend.steps_manager.steps_including_skipped
+
+    # The steps on the second sheet are reused, and the steps on the first sheet are rerun
+    assert np.shares_memory(new_steps[3].post_state.dfs[1]['C'].to_numpy(), old_steps[3].post_state.dfs[1]['C'].to_numpy())
+    assert np.shares_memory(new_steps[7].post_state.dfs[1]['E'].to_numpy(), old_steps[7].post_state.dfs[1]['E'].to_numpy())
+    assert not np.shares_memory(new_steps[5].post_state.dfs[0]['D'].to_numpy(), old_steps[5].post_state.dfs[0]['D'].to_numpy())
+
+    other_mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+    assert mito.dfs[0].equals(other_mito.dfs[0])
+    assert mito.dfs[1].equals(other_mito.dfs[1])
+    assert mito.transpiled_code == other_mito.transpiled_code
+    assert mito.mito_backend.steps_manager.curr_step.column_formulas == other_mito.mito_backend.steps_manager.curr_step.column_formulas
+
+
+def test_overwriting_step_reruns_steps_that_reference_changed_sheet():
+    df1 = pd.DataFrame({'A': [1, 2, 3]})
+    df2 = pd.DataFrame({'B': [4, 5, 6]})
+    mito = create_mito_wrapper(df1, df2)
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.merge_sheets('lookup', 0, 1, [['A', 'B']], ['A'], ['B'])
+    mito.set_formula('=B + 1', 1, 'C', add_column=True)
+
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 10)
+
+    # The new filter is applied at the end, so the merge is rerun without any filter
+    assert len(mito.dfs[0]) == 0
+    assert mito.dfs[2]['A'].tolist() == [1, 2, 3]
+    assert mito.dfs[1]['C'].tolist() == [5, 6, 7]
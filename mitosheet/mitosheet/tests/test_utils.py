@@ -8,7 +8,6 @@ This file contains helpful functions and classes for testing operations.
 """
 
 from copy import deepcopy
-import json
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
@@ -31,7 +30,7 @@ from mitosheet.types import (CodeOptions, ColumnHeader, ColumnHeaderWithFilter,
                              ColumnIDWithFilter, ColumnIDWithPivotTransform,
                              DataframeFormat, FormulaAppliedToType, GraphID,
                              MultiLevelColumnHeader, Filter, FilterGroup, OperatorType)
-from mitosheet.utils import NpEncoder, dfs_to_array_for_json, get_new_id
+from mitosheet.utils import dfs_to_array_for_json, get_json_string, get_new_id
 
 
 def check_transpiled_code_after_call(func):
@@ -61,10 +60,11 @@ def check_dataframes_equal(test_wrapper: "MitoWidgetTestWrapper") -> None:
             test_wrapper.mito_backend.steps_manager.steps_including_skipped[0].df_names
         )
     }
+    # In preview mode, the code executes on the full data, rather than the samples in the sheet
     final_dfs = {
         df_name: df.copy(deep=True) for df, df_name in 
         zip(
-            test_wrapper.mito_backend.steps_manager.curr_step.dfs,
+            test_wrapper.mito_backend.steps_manager.get_full_data_state().dfs,
             test_wrapper.mito_backend.steps_manager.curr_step.df_names
         )
     }
@@ -105,7 +105,7 @@ def check_dataframes_equal(test_wrapper: "MitoWidgetTestWrapper") -> None:
     # We then check that the sheet data json that is saved by the widget, which 
     # notably uses caching, does not get incorrectly cached and is written correctly
     sheet_data_json = test_wrapper.mito_backend.get_shared_state_variables()['sheet_data_json']
-    assert sheet_data_json == json.dumps(dfs_to_array_for_json(
+    assert sheet_data_json == get_json_string(dfs_to_array_for_json(
         test_wrapper.mito_backend.steps_manager.curr_step.final_defined_state, 
         set(i for i in range(len(test_wrapper.mito_backend.steps_manager.curr_step.dfs))),
         [],
@@ -116,7 +116,7 @@ def check_dataframes_equal(test_wrapper: "MitoWidgetTestWrapper") -> None:
         test_wrapper.mito_backend.steps_manager.curr_step.column_filters,
         test_wrapper.mito_backend.steps_manager.curr_step.column_ids,
         test_wrapper.mito_backend.steps_manager.curr_step.df_formats
-    ), cls=NpEncoder)
+    ))
 
 
 class MitoWidgetTestWrapper:
@@ -1221,6 +1221,38 @@ class MitoWidgetTestWrapper:
             }
         )
 
+    @check_transpiled_code_after_call
+    def set_cell_values(self, sheet_index: int, cell_values: List[Tuple[ColumnHeader, int, Any]]) -> bool:
+        """
+        Sets each of the (column_header, row_index, new_value) cell values 
+        in a single batch_edit_event, like pasting into many cells does.
+        """
+        column_ids = self.mito_backend.steps_manager.curr_step.column_ids
+
+        return self.mito_backend.receive_message(
+            {
+                'event': 'batch_edit_event',
+                'id': get_new_id(),
+                'type': 'batch_edit',
+                'params': {
+                    'edit_events': [
+                        {
+                            'event': 'edit_event',
+                            'type': 'set_cell_value_edit',
+                            'step_id': get_new_id(),
+                            'params': {
+                                'sheet_index': sheet_index,
+                                'column_id': column_ids.get_column_id_by_header(sheet_index, column_header),
+                                'row_index': row_index,
+                                'new_value': str(new_value)
+                            }
+                        }
+                        for column_header, row_index, new_value in cell_values
+                    ]
+                }
+            }
+        )
+
     @check_transpiled_code_after_call
     def replay_analysis(self, analysis_name: str, args: Optional[List[str]]=None, step_import_data_list_to_overwrite: Optional[List[Dict[str, Any]]]=None) -> bool:
         return self.mito_backend.receive_message(
@@ -1465,6 +1497,32 @@ class MitoWidgetTestWrapper:
             }
         )
 
+    def delete_graphs(self, graph_ids: List[GraphID]) -> bool:
+        """
+        Deletes all of the graphs in a single batch_edit_event, like the 
+        frontend does when deleting many graphs at once.
+        """
+        return self.mito_backend.receive_message(
+            {
+                'event': 'batch_edit_event',
+                'id': get_new_id(),
+                'type': 'batch_edit',
+                'params': {
+                    'edit_events': [
+                        {
+                            'event': 'edit_event',
+                            'type': 'graph_delete_edit',
+                            'step_id': get_new_id(),
+                            'params': {
+                                'graph_id': graph_id,
+                            }
+                        }
+                        for graph_id in graph_ids
+                    ]
+                }
+            }
+        )
+
     def duplicate_graph(self, old_graph_id: GraphID, new_graph_id: GraphID) -> bool:
         return self.mito_backend.receive_message(
             {
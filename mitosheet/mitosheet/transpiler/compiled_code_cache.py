@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Steps are executed by executing the code that is transpiled for them. When
+an analysis is replayed, or steps are rerun after an earlier step is edited,
+the same code is generated again and again, and so compiling it again each
+time is wasted work.
+
+This file contains a bounded LRU cache of the compiled code objects, keyed
+by the generated code.
+"""
+import threading
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, List, Optional, Tuple
+
+# The filename that exec uses when executing a string, so that tracebacks
+# look the same as they did before the code was compiled ahead of time
+EXEC_FILENAME = '<string>'
+
+DEFAULT_COMPILED_CODE_CACHE_MAX_SIZE = 1000
+
+
+class CompiledCodeCache:
+    """
+    A bounded LRU cache from generated code to compiled code objects,
+    which counts its hits and misses.
+
+    Steps are executed on the EditExecutor thread, while other threads can
+    execute code too, so all reads and writes of the cache take a lock. The
+    code is compiled outside of the lock.
+    """
+
+    def __init__(self, max_size: int=DEFAULT_COMPILED_CODE_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[Any, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _get(self, key: Any) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return True, self._cache[key]
+
+            self.misses += 1
+            return False, None
+
+    def _set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._cache[key] = value
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def compile(self, code: str) -> CodeType:
+        """
+        Returns the compiled code object for the given code, compiling it
+        if it is not in the cache. Raises a SyntaxError if the code does not
+        compile, just as exec would.
+        """
+        found, code_object = self._get(code)
+        if found:
+            return code_object
+
+        code_object = compile(code, EXEC_FILENAME, 'exec')
+        self._set(code, code_object)
+        return code_object
+
+    def compile_lines(self, lines: List[str]) -> List[Optional[CodeType]]:
+        """
+        Compiles each of the given lines on its own, as they are executed one
+        by one, and caches the result for all of them together. Lines that do
+        not compile are returned as None.
+        """
+        key = tuple(lines)
+        found, code_objects = self._get(key)
+        if found:
+            return code_objects
+
+        code_objects = []
+        for line in lines:
+            try:
+                code_objects.append(compile(line, EXEC_FILENAME, 'exec'))
+            except SyntaxError:
+                code_objects.append(None)
+
+        self._set(key, code_objects)
+        return code_objects
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+compiled_code_cache = CompiledCodeCache()
@@ -12,9 +12,10 @@ from collections import OrderedDict
 
 import pandas as pd
 import numpy as np
-from mitosheet.state import State
+from mitosheet.errors import make_invalid_engine_error
+from mitosheet.state import ENGINE_PANDAS, ENGINE_POLARS, ENGINES, State
 from mitosheet.types import CodeOptions, CodeOptionsFunctionParams, ColumnHeader, ParamName, ParamSubtype, ParamValue, StepsManagerType
-from mitosheet.utils import is_prev_version
+from mitosheet.utils import is_polars_installed, is_prev_version
 
 # TAB is used in place of \t in generated code because
 # Jupyter turns \t into a grey arrow, but converts four spaces into a tab.
@@ -375,6 +376,21 @@ def get_default_code_options(analysis_name: str) -> CodeOptions:
     }
 
 
+def get_engine(code_options: Optional[CodeOptions]) -> str:
+    """
+    Returns the engine that the analysis with these code_options executes with. The
+    engine is optional in the code_options, and defaults to pandas.
+
+    Raises an invalid_engine_error if the engine is not supported, or not installed.
+    """
+    engine = code_options.get('engine', ENGINE_PANDAS) if code_options is not None else ENGINE_PANDAS
+    if engine not in ENGINES:
+        raise make_invalid_engine_error(engine)
+    if engine == ENGINE_POLARS and not is_polars_installed():
+        raise make_invalid_engine_error(engine, engine_installed=False)
+    return engine
+
+
 def get_globals_for_exec(state: State, public_interface: int) -> Dict[str, Any]:
     """
     Anytime you are exec'ing transpiled code, you need to pass some global variables including:
@@ -37,6 +37,7 @@ if TYPE_CHECKING:
     StateType = State
     from mitosheet.step import Step
     StepType = Step
+    from mitosheet.formula_index import FormulaIndex
 else:
     StepsManagerType = Any
     MitoWidgetType = Any
@@ -365,7 +366,12 @@ if sys.version_info[:3] > (3, 8, 0):
     # parameterize that specific param
     CodeOptionsFunctionParams = Union[OrderedDict, ParamSubtype, List[ParamSubtype]]
 
-    class CodeOptions(TypedDict):
+    class OptionalCodeOptions(TypedDict, total=False):
+        # The engine that executes the pivots and merges. Missing from code options 
+        # that were saved before it was added, so use get_engine to access it
+        engine: str
+
+    class CodeOptions(OptionalCodeOptions):
         as_function: bool
         call_function: bool
         function_name: str
@@ -479,7 +485,7 @@ if sys.version_info[:3] > (3, 8, 0):
     class FrontendFormulaAndLocation(TypedDict):
         frontend_formula: FrontendFormula
         location: FormulaAppliedToType
-        index: List[Any]
+        index: 'FormulaIndex'
 
 else:
     FrontendFormulaAndLocation = Any # type:ignore
\ No newline at end of file
@@ -28,6 +28,9 @@ def execute_checkout_step_by_idx_update(
 
     steps_manager.curr_step_idx = step_idx
 
+    # The step we move off of may now be evictable
+    steps_manager.evict_step_states()
+
 CHECKOUT_STEP_BY_IDX_UPDATE = {
     'event_type': CHECKOUT_STEP_BY_IDX_UPDATE_EVENT,
     'params': CHECKOUT_STEP_BY_IDX_UPDATE_PARAMS,
@@ -10,8 +10,9 @@ and which of them were file paths, and updates the
 df names in the steps properly.
 """
 
-from copy import deepcopy
+from copy import copy, deepcopy
 from typing import List
+from mitosheet.transpiler.transpile_utils import get_engine
 from mitosheet.types import CodeOptions, StepsManagerType
 from mitosheet.utils import get_valid_python_identifier
 
@@ -47,8 +48,20 @@ def execute_args_update(
         
         final_code_options['function_params'] = function_params
 
+    # Make sure the engine is valid before we change the code options
+    engine = get_engine(final_code_options)
+    previous_engine = get_engine(steps_manager.code_options)
+
     steps_manager.code_options = final_code_options
 
+    # If the engine changed, we execute the steps again with the new engine
+    if engine != previous_engine:
+        try:
+            steps_manager.execute_and_update_steps(copy(steps_manager.steps_including_skipped))
+        except:
+            steps_manager.code_options['engine'] = previous_engine
+            raise
+
 CODE_OPTIONS_UPDATE = {
     'event_type': CODE_OPTIONS_UPDATE_EVENT,
     'params': CODE_OPTIONS_UPDATE_PARAMS,
@@ -12,7 +12,7 @@ from random import randint
 import random
 import re
 import uuid
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple, cast
 import os
 import keyword
 
@@ -20,7 +20,8 @@ import numpy as np
 import pandas as pd
 
 from mitosheet.column_headers import ColumnIDMap, get_column_header_display
-from mitosheet.is_type_utils import get_float_dt_td_columns, is_int_dtype
+from mitosheet.formula_index import FormulaIndex
+from mitosheet.is_type_utils import get_float_dt_td_columns, is_datetime_dtype, is_int_dtype, is_timedelta_dtype
 from mitosheet.types import (FC_BOOLEAN_IS_FALSE, FC_BOOLEAN_IS_TRUE, FC_DATETIME_EXACTLY, FC_DATETIME_GREATER, FC_DATETIME_GREATER_THAN_OR_EQUAL, FC_DATETIME_LESS,
         FC_DATETIME_LESS_THAN_OR_EQUAL, FC_DATETIME_NOT_EXACTLY, FC_EMPTY,
         FC_LEAST_FREQUENT, FC_MOST_FREQUENT, FC_NOT_EMPTY, FC_NUMBER_EXACTLY,
@@ -40,6 +41,10 @@ from mitosheet.public.v3.formatting import add_formatting_to_excel_sheet
 # must match this variable defined on the front-end
 MAX_ROWS = 1_500
 MAX_COLUMNS = 1_500
+# When a sheet is first rendered in a notebook, its sheet data is embedded in the notebook
+# output, so we only embed about a viewport of it, and the rest is fetched as the sheet scrolls
+INITIAL_RENDER_MAX_ROWS = 100
+INITIAL_RENDER_MAX_COLUMNS = 50
 PLAIN_TEXT = 'plain text'
 CURRENCY = 'currency'
 ACCOUNTING = 'accounting'
@@ -141,12 +146,24 @@ def dfs_to_array_for_json(
         column_formulas_array: List[Dict[ColumnID, List[FrontendFormulaAndLocation]]],
         column_filters_array: List[Dict[ColumnID, Any]],
         column_ids: ColumnIDMap,
-        df_formats: List[DataframeFormat]
+        df_formats: List[DataframeFormat],
+        max_rows: Optional[int]=MAX_ROWS,
+        max_columns: int=MAX_COLUMNS,
+        changed_column_ids: Optional[Dict[int, Optional[List[ColumnID]]]]=None,
     ) -> List:
+    """
+    Returns the sheet data of each sheet, serializing the modified sheets again and 
+    taking the others from the previous_array. 
+
+    If changed_column_ids are given for a modified sheet, then only these columns of 
+    the sheet changed since the previous_array, and the data of the other columns 
+    is taken from the previous_array, rather than serialized again.
+    """
 
     new_array = []
     for sheet_index, df in enumerate(dfs):
         if sheet_index in modified_sheet_indexes:
+            sheet_changed_column_ids = changed_column_ids.get(sheet_index) if changed_column_ids is not None else None
             new_array.append(
                 df_to_json_dumpsable(
                     state,
@@ -159,8 +176,10 @@ def dfs_to_array_for_json(
                     column_ids.column_header_to_column_id[sheet_index],
                     df_formats[sheet_index],
                     # We only send the first 1500 rows and 1500 columns
-                    max_rows=MAX_ROWS,
-                    max_columns=MAX_COLUMNS
+                    max_rows=max_rows,
+                    max_columns=max_columns,
+                    previous_sheet_data=previous_array[sheet_index] if sheet_changed_column_ids is not None else None,
+                    changed_column_ids=sheet_changed_column_ids
                 ) 
             )
         else:
@@ -400,6 +419,39 @@ def _get_column_id_from_header_safe(
     
 
 
+def _get_reused_columns(
+        previous_sheet_data: Dict[str, Any],
+        changed_column_ids: Collection[ColumnID],
+        column_ids: List[ColumnID],
+        column_header_displays: List[str],
+        column_dtypes: List[str],
+        max_columns: int
+    ) -> List[Optional[Dict[str, Any]]]:
+    """
+    For each column, returns its entry in the data of the previous_sheet_data if it can
+    be reused, or None if the column must be serialized again. An entry can be reused if 
+    the column did not change, has the same header and dtype, and it still does or does 
+    not have its data sent.
+    """
+    changed_column_ids_lookup = set(changed_column_ids)
+    previous_columns = {
+        column['columnID']: (column_index, column) for column_index, column in enumerate(previous_sheet_data['data'])
+        if column['columnID'] not in changed_column_ids_lookup
+    }
+
+    reused_columns: List[Optional[Dict[str, Any]]] = []
+    for column_index, (column_id, column_header_display, column_dtype) in enumerate(zip(column_ids, column_header_displays, column_dtypes)):
+        previous_column_index, previous_column = previous_columns.get(column_id, (None, None))
+        if previous_column_index is not None and previous_column is not None \
+            and (previous_column_index < max_columns) == (column_index < max_columns) \
+            and previous_column['columnHeader'] == column_header_display \
+            and previous_column['columnDtype'] == column_dtype:
+            reused_columns.append(previous_column)
+        else:
+            reused_columns.append(None)
+    return reused_columns
+
+
 def df_to_json_dumpsable(
         state: StateType,
         original_df: pd.DataFrame,
@@ -411,12 +463,23 @@ def df_to_json_dumpsable(
         column_headers_to_column_ids: Dict[ColumnHeader, ColumnID],
         df_format: DataframeFormat,
         max_rows: Optional[int]=MAX_ROWS, # How many items you want to display. None when using this function to get unique value counts
-        max_columns: int=MAX_COLUMNS # How many columns you want to display. Unlike max_rows, this is always defined
+        max_columns: int=MAX_COLUMNS, # How many columns you want to display. Unlike max_rows, this is always defined
+        include_column_data: bool=True, # If False, the columnData of the displayed columns is None, so it can be sent another way
+        previous_sheet_data: Optional[Dict[str, Any]]=None,
+        changed_column_ids: Optional[Collection[ColumnID]]=None
     ) -> Dict[str, Any]:
     """
     Returns a dataframe and other metadata represented in a way that can be turned into a 
     JSON object with json.dumps.
 
+    The metadata is sent for every column, but the columnData is only sent for the first 
+    max_columns columns. The other columns have an empty columnData, and the frontend 
+    fetches their data with get_columns_window.
+
+    If the previous_sheet_data of this sheet is passed, along with the changed_column_ids 
+    since then, the entries in the data of the other columns are reused from it, rather 
+    than serializing these columns again.
+
     Should follow the format:
     {
         dfName: string;
@@ -435,35 +498,59 @@ def df_to_json_dumpsable(
         columnnDtypeMap: Record<ColumnID, string>;
         index: (string | number)[];
         df_format: DataframeFormat;
-        conditionalFormattingResult: ConditionalFormattingResult
+        conditionalFormattingResult: ConditionalFormattingResult;
+        isPreview: boolean;
     }
     """
 
     (num_rows, num_columns) = original_df.shape 
 
-    json_obj = convert_df_to_parsed_json(original_df, max_rows=max_rows, max_columns=max_columns)
+    column_ids = [_get_column_id_from_header_safe(column_header, column_headers_to_column_ids) for column_header in original_df.columns]
+    column_header_displays = [get_column_header_display(column_header) for column_header in original_df.columns]
+    column_dtypes = [str(dtype) for dtype in original_df.dtypes]
+
+    reused_columns: List[Optional[Dict[str, Any]]] = [None] * num_columns
+    if previous_sheet_data is not None and changed_column_ids is not None and include_column_data:
+        reused_columns = _get_reused_columns(previous_sheet_data, changed_column_ids, column_ids, column_header_displays, column_dtypes, max_columns)
+
+    serialized_column_indexes = [column_index for column_index in range(min(num_columns, max_columns)) if reused_columns[column_index] is None]
+    if len(serialized_column_indexes) == min(num_columns, max_columns):
+        columns_data, index = get_columnar_json_data(original_df, max_rows=max_rows, max_columns=max_columns if include_column_data else 0)
+    else:
+        df_head = original_df if max_rows is None else original_df.head(n=max_rows)
+        serialized_columns_data, index = get_columnar_json_data(df_head.iloc[:, serialized_column_indexes], max_rows=None, max_columns=len(serialized_column_indexes))
+        columns_data = [[] for _ in range(min(num_columns, max_columns))]
+        for column_index, serialized_column_data in zip(serialized_column_indexes, serialized_columns_data):
+            columns_data[column_index] = serialized_column_data
 
     final_data = []
-    column_dtype_map = {}
-    for column_index, column_header in enumerate(original_df.columns):
-        column_id = _get_column_id_from_header_safe(column_header, column_headers_to_column_ids)
+    for column_index, (column_id, column_header_display, column_dtype) in enumerate(zip(column_ids, column_header_displays, column_dtypes)):
+        reused_column = reused_columns[column_index]
+        if reused_column is not None:
+            final_data.append(reused_column)
+            continue
+
+        if column_index >= max_columns:
+            # If we're beyond the max columns, we don't send the data, and the frontend fetches 
+            # it with get_columns_window when the column is scrolled to
+            column_data: Optional[List[Any]] = []
+        else:
+            column_data = columns_data[column_index] if include_column_data else None
 
-        column_final_data: Dict[str, Any] = {
+        final_data.append({
             'columnID': column_id,
-            'columnHeader': get_column_header_display(column_header),
-            'columnDtype': str(original_df[column_header].dtype),
-            'columnData': [],
-        }
-        column_dtype_map[column_id] = str(original_df[column_header].dtype)
-        for row in json_obj['data']:
-            # If we're beyond the max columns, we might not have data, and we leave column data empty
-            # in this case and don't append anything
-            column_final_data['columnData'].append(row[column_index] if column_index < MAX_COLUMNS else None)
-        
-        final_data.append(column_final_data) 
+            'columnHeader': column_header_display,
+            'columnDtype': column_dtype,
+            'columnData': column_data,
+        })
 
     # Import just before we use it to avoid circular imports
     from mitosheet.pro.conditional_formatting_utils import get_conditonal_formatting_result
+
+    # The conditional formatting of the columns beyond the max columns is fetched with their data
+    conditional_formats = df_format['conditional_formats']
+    if num_columns > max_columns:
+        conditional_formats = get_conditional_formats_in_columns(conditional_formats, set(column_ids[:max_columns]))
     
     return {
         "dfName": df_name,
@@ -473,23 +560,98 @@ def df_to_json_dumpsable(
         'data': final_data,
         # NOTE: We make sure that all the maps are in the correct order, so things are easy on the
         # front-end and we don't have to worry about sorting
-        'columnIDsMap': {
-            _get_column_id_from_header_safe(column_header, column_headers_to_column_ids): get_column_header_display(column_header)
-            for column_header in original_df.keys()
-        },
+        'columnIDsMap': dict(zip(column_ids, column_header_displays)),
         'columnFormulasMap': column_formulas,
         'columnFiltersMap': column_filters,
-        'columnDtypeMap': column_dtype_map,
-        'index': json_obj['index'],
+        'columnDtypeMap': dict(zip(column_ids, column_dtypes)),
+        'index': index,
         'dfFormat': df_format,
         'conditionalFormattingResult': get_conditonal_formatting_result(
             state,
             sheet_index,
             original_df,
-            df_format['conditional_formats'],
+            conditional_formats,
             max_rows=max_rows,
-        )
+        ),
+        # If the dataframe is a sample of the full data. See mitosheet/preview.py
+        'isPreview': sheet_index in state.preview_sheet_indexes,
+    }
+
+
+def get_conditional_formats_in_columns(conditional_formats: List[ConditionalFormat], column_ids: Set[ColumnID]) -> List[ConditionalFormat]:
+    """
+    Returns the conditional formats with only the column ids that are in column_ids, 
+    so that only the conditional formatting of these columns is calculated.
+    """
+    return [
+        {**conditional_format, 'columnIDs': [column_id for column_id in conditional_format['columnIDs'] if column_id in column_ids]}
+        for conditional_format in conditional_formats
+    ]
+
 
+def get_rows_window_json_dumpsable(
+        state: StateType,
+        sheet_index: int,
+        start_row: int,
+        end_row: int,
+        start_column: int,
+        end_column: int
+    ) -> Dict[str, Any]:
+    """
+    Returns the data of the rows from start_row up to end_row, in the columns from
+    start_column up to end_column, of a dataframe, as well as the conditional formatting
+    of these cells, in a way that can be turned into a JSON object with json.dumps.
+
+    The data and index are in the same format as in df_to_json_dumpsable, so the
+    frontend can place them in the sheet data. Should follow the format:
+    {
+        sheetIndex: number;
+        startRow: number;
+        endRow: number;
+        startColumn: number;
+        endColumn: number;
+        numRows: number;
+        data: {
+            columnID: string;
+            columnData: (string | number)[];
+        }[];
+        index: (string | number)[];
+        conditionalFormattingResult: ConditionalFormattingResult;
+    }
+    """
+    df = state.dfs[sheet_index]
+    window_df = df.iloc[start_row:end_row, start_column:end_column]
+    columns_data, index = get_columnar_json_data(window_df, max_rows=None, max_columns=window_df.shape[1])
+
+    column_headers_to_column_ids = state.column_ids.column_header_to_column_id[sheet_index]
+    window_column_ids = [_get_column_id_from_header_safe(column_header, column_headers_to_column_ids) for column_header in window_df.columns]
+
+    # We only need the conditional formatting of the columns in the window
+    conditional_formats = get_conditional_formats_in_columns(state.df_formats[sheet_index]['conditional_formats'], set(window_column_ids))
+
+    # Import just before we use it to avoid circular imports
+    from mitosheet.pro.conditional_formatting_utils import get_conditonal_formatting_result
+
+    return {
+        'sheetIndex': sheet_index,
+        'startRow': start_row,
+        'endRow': end_row,
+        'startColumn': start_column,
+        'endColumn': end_column,
+        'numRows': len(df),
+        'data': [
+            {'columnID': column_id, 'columnData': column_data}
+            for column_id, column_data in zip(window_column_ids, columns_data)
+        ],
+        'index': index,
+        'conditionalFormattingResult': get_conditonal_formatting_result(
+            state,
+            sheet_index,
+            df,
+            conditional_formats,
+            max_rows=end_row - start_row,
+            start_row=start_row
+        ),
     }
 
 
@@ -502,13 +664,19 @@ def get_row_data_array(df: pd.DataFrame) -> List[Any]:
 
 def convert_df_to_parsed_json(original_df: pd.DataFrame, max_rows: Optional[int]=MAX_ROWS, max_columns: int=MAX_COLUMNS) -> Dict[str, Any]:
     """
-    Returns a dataframe as a json object with the correct formatting
+    Returns a dataframe as a json object with the correct formatting, with the 
+    data as a list of rows. 
+    
+    NOTE: this goes through df.to_json, and so is much slower than get_columnar_json_data, 
+    which returns the same values for each column, and which the sheet data uses.
     """
+    # We format the columns of the copy for display, so it must not share its data with the original
+    deep_copy = not is_pandas_copy_on_write_enabled()
     if max_rows is None:
-        df = original_df.copy(deep=True) 
+        df = original_df.copy(deep=deep_copy) 
     else:
         # we only show the first max_rows rows!
-        df = original_df.head(n=max_rows).copy(deep=True)
+        df = original_df.head(n=max_rows).copy(deep=deep_copy)
 
     # we only show the first max_columns columns!
     df = df.iloc[: , :max_columns]
@@ -545,6 +713,181 @@ def convert_df_to_parsed_json(original_df: pd.DataFrame, max_rows: Optional[int]
     return json_obj
 
 
+def get_rounded_float_values(values: np.ndarray) -> np.ndarray:
+    """
+    Returns the floats exactly as they are after being written with df.to_json and read
+    back with json.loads, but without making a JSON string, with NaN for NaN and infinite 
+    values.
+
+    to_json writes a float with at most 10 decimal places, by rounding the fraction of 
+    the float to an integer number of 1e-10s, which hides floating point errors like
+    0.1 + 0.2 from the user. Floats larger than 1e16 or smaller than 1e-15 are written 
+    with 10 significant digits instead.
+    """
+    values = values.astype(np.float64, copy=False)
+    is_finite = np.isfinite(values)
+    abs_values = np.abs(np.where(is_finite, values, 0))
+
+    whole = np.trunc(abs_values)
+    fraction = (abs_values - whole) * 1e10
+    rounded_fraction = np.trunc(fraction)
+    remainder = fraction - rounded_fraction
+    # Like to_json, round half to odd, and round up a half if the fraction is 0
+    rounded_fraction += (remainder > .5) | ((remainder == .5) & ((rounded_fraction == 0) | (np.fmod(rounded_fraction, 2) == 1)))
+    is_rollover = rounded_fraction >= 1e10
+    whole = np.where(is_rollover, whole + 1, whole)
+    rounded_fraction = np.where(is_rollover, 0, rounded_fraction)
+
+    # Reading the written float back in gives the closest float to whole + rounded_fraction / 1e10. Below 
+    # 2**19, whole * 1e10 + rounded_fraction is an exact integer, so a single division gives this closest 
+    # float. Above it, floats are more than 1e-10 apart, and so the closest float is the float itself
+    rounded_abs_values = np.where(abs_values >= 2 ** 19, abs_values, (whole * 1e10 + rounded_fraction) / 1e10)
+    rounded_values = np.where(values < 0, -rounded_abs_values, rounded_abs_values)
+
+    is_exponent = is_finite & ((abs_values > 1e16 - 1) | ((abs_values != 0) & (abs_values < 1e-15)))
+    for row_index in np.flatnonzero(is_exponent):
+        rounded_values[row_index] = float(f'{values[row_index]:.10g}')
+
+    rounded_values[~is_finite] = np.nan
+    return rounded_values
+
+
+def _get_float_column_json_data(values: np.ndarray) -> List[Any]:
+    """
+    Returns the floats as they are in convert_df_to_parsed_json, with 'NaN' for NaN and
+    infinite values. See get_rounded_float_values.
+    """
+    rounded_values = get_rounded_float_values(values)
+    column_data = rounded_values.astype(object)
+    column_data[np.isnan(rounded_values)] = 'NaN'
+    return column_data.tolist()
+
+
+def _get_string_column_json_data(values: np.ndarray) -> List[Any]:
+    column_data = values.astype(object)
+    column_data[pd.isna(column_data)] = 'NaN'
+    return column_data.tolist()
+
+
+def get_column_json_data(column: pd.Series) -> Optional[List[Any]]:
+    """
+    Returns the values of the column as they are in convert_df_to_parsed_json, or None
+    if the column has a dtype that we only get these values for through df.to_json.
+    """
+    dtype = column.dtype
+    dtype_str = str(dtype)
+    if is_datetime_dtype(dtype_str):
+        return _get_string_column_json_data(column.dt.strftime('%Y-%m-%d %X').to_numpy())
+    if is_timedelta_dtype(dtype_str):
+        return column.apply(lambda x: str(x)).tolist()
+
+    # NOTE: extension dtypes, e.g. nullable integers, are not numpy dtypes
+    if not isinstance(dtype, np.dtype):
+        if dtype_str == 'string' and pd.api.types.infer_dtype(column, skipna=True) in ('string', 'empty'):
+            return _get_string_column_json_data(column.to_numpy(dtype=object))
+        return None
+
+    if dtype.kind in 'iub':
+        return column.tolist()
+    if dtype.kind == 'f':
+        return _get_float_column_json_data(column.to_numpy())
+    if dtype.kind == 'O' and pd.api.types.infer_dtype(column, skipna=True) in ('string', 'empty'):
+        return _get_string_column_json_data(column.to_numpy())
+    return None
+
+
+def _get_index_json_data(index: pd.Index) -> List[Any]:
+    if isinstance(index, pd.RangeIndex):
+        return list(range(index.start, index.stop, index.step))
+
+    if isinstance(index, pd.DatetimeIndex):
+        index = index.strftime('%Y-%m-%d %X')
+    elif isinstance(index, pd.TimedeltaIndex):
+        index = pd.Index(index.to_series().apply(lambda x: str(x)))
+
+    if not isinstance(index, pd.MultiIndex) and isinstance(index.dtype, np.dtype) and (
+        index.dtype.kind in 'iub' or (index.dtype.kind == 'O' and pd.api.types.infer_dtype(index, skipna=False) == 'string')
+    ):
+        return index.tolist()
+    
+    return json.loads(pd.DataFrame(index=index).to_json(orient="split"))['index']
+
+
+def get_columnar_json_data(original_df: pd.DataFrame, max_rows: Optional[int]=MAX_ROWS, max_columns: int=MAX_COLUMNS) -> Tuple[List[List[Any]], List[Any]]:
+    """
+    Returns the data of the first max_columns columns of the dataframe, as a list of the 
+    values in each column, as well as the index, with the same values and formatting as 
+    convert_df_to_parsed_json. 
+
+    Rather than writing the entire dataframe to a JSON string and reading it back in, 
+    this builds the values for each column directly from its numpy array. Only columns
+    with dtypes that we cannot do this for (e.g. categories, or objects that are not 
+    strings) go through df.to_json.
+    """
+    # we only show the first max_rows rows and the first max_columns columns!
+    df = original_df if max_rows is None else original_df.head(n=max_rows)
+    df = df.iloc[: , :max_columns]
+
+    columns_data: List[Optional[List[Any]]] = [get_column_json_data(df.iloc[:, column_index]) for column_index in range(df.shape[1])]
+
+    # The remaining columns are written to JSON together
+    to_json_column_indexes = [column_index for column_index, column_data in enumerate(columns_data) if column_data is None]
+    if len(to_json_column_indexes) > 0:
+        rows = json.loads(df.iloc[:, to_json_column_indexes].to_json(orient="split"))['data']
+        for to_json_index, column_index in enumerate(to_json_column_indexes):
+            columns_data[column_index] = [row[to_json_index] if row[to_json_index] is not None else 'NaN' for row in rows]
+
+    return cast(List[List[Any]], columns_data), _get_index_json_data(df.index)
+
+
+def _contains_non_finite_float(obj: Any) -> bool:
+    """
+    Returns True if there is a NaN or infinite float anywhere inside of the given 
+    dicts, lists, tuples and numpy arrays.
+    """
+    objs_to_check = [obj]
+    while len(objs_to_check) > 0:
+        curr_obj = objs_to_check.pop()
+        if isinstance(curr_obj, (float, np.floating)):
+            if not np.isfinite(curr_obj):
+                return True
+        elif isinstance(curr_obj, dict):
+            objs_to_check.extend(curr_obj.keys())
+            objs_to_check.extend(curr_obj.values())
+        elif isinstance(curr_obj, (list, tuple)):
+            objs_to_check.extend(curr_obj)
+        elif isinstance(curr_obj, np.ndarray):
+            if curr_obj.dtype.kind in 'fc':
+                if not np.isfinite(curr_obj).all():
+                    return True
+            elif curr_obj.dtype.kind == 'O':
+                objs_to_check.extend(curr_obj.tolist())
+    return False
+
+
+def get_json_string(obj: Any) -> str:
+    """
+    Returns the same JSON as json.dumps(obj, cls=NpEncoder), but uses orjson if it is 
+    installed, which is many times faster on the large sheet data we send to the frontend.
+    """
+    if is_orjson_installed():
+        import orjson
+        try:
+            json_string = orjson.dumps(
+                obj, default=NpEncoder().default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode('utf-8')
+
+            # orjson writes NaN and infinity as null, where json.dumps writes NaN and Infinity. 
+            # The sheet data writes these as strings, so we only look for them if there is a null
+            if 'null' not in json_string or not _contains_non_finite_float(obj):
+                return json_string
+        except TypeError:
+            # orjson cannot write some objects that json can, e.g. integers larger than 64 bits 
+            pass
+
+    return json.dumps(obj, cls=NpEncoder)
+
+
 def get_random_id() -> str:
     """
     Creates a new random ID for the user, which for any given user,
@@ -601,6 +944,8 @@ class NpEncoder(json.JSONEncoder):
             return obj.strftime('%Y-%m-%d %X')
         if isinstance(obj, pd.Timedelta):
             return str(obj)
+        if isinstance(obj, FormulaIndex):
+            return obj.to_json()
         return super(NpEncoder, self).default(obj)
 
 
@@ -622,6 +967,28 @@ def is_prev_version(curr_version: str, benchmark_version: str) -> bool:
 
     return False
 
+def is_pandas_copy_on_write_enabled() -> bool:
+    """
+    Returns True if pandas Copy-on-Write is turned on. In this case, any copy of a
+    dataframe, deep or not, is a lazy copy that shares its data with the original 
+    until either of them is written to, so we never need to make deep copies to keep 
+    the original from being modified. 
+    """
+    # NOTE: Copy-on-Write is experimental before pandas 2.0, and some inplace methods 
+    # (e.g. replace) still write through a shallow copy to the original dataframe
+    if is_prev_version(pd.__version__, '2.0.0'):
+        return False
+    # NOTE: in pandas 2.2, this can also be 'warn', which does not turn it on
+    return pd.get_option('mode.copy_on_write') is True
+
+def enable_pandas_copy_on_write() -> None:
+    """
+    Turns on pandas Copy-on-Write, if this version of pandas fully supports it. Note 
+    that this is a global option, so it is also on for any other code in this process.
+    """
+    if not is_prev_version(pd.__version__, '2.0.0'):
+        pd.set_option('mode.copy_on_write', True)
+
 def is_snowflake_connector_python_installed() -> bool:
     try:
         import snowflake.connector
@@ -651,6 +1018,27 @@ def is_dash_installed() -> bool:
     except ImportError:
         return False
 
+def is_pyarrow_installed() -> bool:
+    try:
+        import pyarrow
+        return True
+    except ImportError:
+        return False
+
+def is_polars_installed() -> bool:
+    try:
+        import polars
+        return True
+    except ImportError:
+        return False
+
+def is_orjson_installed() -> bool:
+    try:
+        import orjson
+        return True
+    except ImportError:
+        return False
+
 
 def is_snowflake_credentials_available() -> bool:
     SNOWFLAKE_USERNAME = os.getenv('SNOWFLAKE_USERNAME')
@@ -112,7 +112,12 @@ setup_args = dict(
             'snowflake-connector-python[pandas]; python_version>="3.7"',
             'streamlit>=1.24,<1.32',
             'dash>=2.9',
-            "flask"
+            "flask",
+            "pyarrow",
+            # According to this documentation (https://pypi.org/project/polars/), polars 
+            # requires at least Python 3.9
+            'polars>=1.18; python_version>="3.9"',
+            "orjson"
         ]
     },
     zip_safe                = False,
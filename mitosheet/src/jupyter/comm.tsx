@@ -37,12 +37,12 @@
  */
 
 import { 
-    MitoResponse,
-    MAX_WAIT_FOR_SEND_CREATION, SendFunction, SendFunctionError, SendFunctionReturnType,
+    EditProgress, MitoProgressResponse, MitoResponse,
+    MAX_WAIT_FOR_SEND_CREATION, SendFunction, SendFunctionError, SendFunctionReturnType, SheetData,
     waitUntilConditionReturnsTrueOrTimeout,
 } from "../mito";
 import { isInJupyterLabOrNotebook } from "../mito/utils/location";
-import { getAnalysisDataFromString, getSheetDataArrayFromString, getUserProfileFromString } from "./jupyterUtils";
+import { applySheetDataDelta, getAnalysisDataFromString, getDecompressedMessage, getSheetDataArrayFromString, getUserProfileFromString, SUPPORTED_COMM_COMPRESSIONS } from "./jupyterUtils";
 
 /**
  * Since Nobtebook 7 is based on Lab, we no longer need to handle the difference between the 
@@ -54,7 +54,7 @@ import { getAnalysisDataFromString, getSheetDataArrayFromString, getUserProfileF
 export interface JupyterComm {
     send: (msg: Record<string, unknown>) => void,
     onMsg: (msg: {content: {data: Record<string, unknown>}}) => void,
-    open: () => void;
+    open: (data?: Record<string, unknown>) => void;
 }
 
 
@@ -121,9 +121,9 @@ export const getJupyterComm = async (kernelID: string, commTargetID: string): Pr
     } else {
         /**
          * If we have successfully made a comm, we need to manually open this comm before we 
-         * use it.
+         * use it. We tell the backend which compressions of messages we can read when we do.
          */
-        (potentialComm as JupyterComm).open() // TODO: why do I have to do this cast? Seems like a complier issue
+        (potentialComm as JupyterComm).open({compressions: SUPPORTED_COMM_COMPRESSIONS}) // TODO: why do I have to do this cast? Seems like a complier issue
         
         if (!(await getJupyterCommConnectedToBackend(potentialComm))) {
             return 'no_backend_comm_registered_error'
@@ -163,9 +163,46 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
 
     // We save the unconsumed responses on the getCommSend function
     const unconsumedResponses = getCommSend.unconsumedResponses || (getCommSend.unconsumedResponses = []);
+    // As well as the latest progress of each of the edits that are executing
+    const editProgress = getCommSend.editProgress || (getCommSend.editProgress = {});
+
+    // The sheet data of the last response with sheet data, which the changes in the next one are 
+    // applied to, and the sheet data of the responses that have not been consumed yet
+    let lastSheetDataArray: SheetData[] | undefined = undefined;
+    const sheetDataArrays: Record<string, SheetData[] | undefined> = {};
 
     function receiveResponse(rawResponse: Record<string, unknown>): void {
-        unconsumedResponses.push((rawResponse as any).content.data as MitoResponse);
+        // Binary buffers, like the Arrow sheet data or the compressed message, are sent outside of the message data
+        const buffers = (rawResponse as any).buffers as (ArrayBuffer | ArrayBufferView)[] | undefined;
+        const response = getDecompressedMessage((rawResponse as any).content.data, buffers) as MitoResponse | MitoProgressResponse;
+
+        // Progress is sent while an edit executes on the backend, and is not the response to it
+        if (response['event'] === 'progress') {
+            editProgress[response.id] = response.data;
+            return;
+        }
+
+        // We read the sheet data as responses are received, rather than when they are consumed, as
+        // the sheet data can be the changes to the sheet data of the previous response
+        if (response['event'] === 'response' && response.shared_variables !== undefined) {
+            const sharedVariables = response.shared_variables;
+
+            if (sharedVariables.sheet_data_delta) {
+                if (lastSheetDataArray === undefined) {
+                    console.error(`Received changes to the sheet data without any sheet data: {id: ${response.id}}`);
+                } else {
+                    lastSheetDataArray = applySheetDataDelta(lastSheetDataArray, JSON.parse(sharedVariables.sheet_data_json));
+                }
+            } else {
+                lastSheetDataArray = getSheetDataArrayFromString(
+                    sharedVariables.sheet_data_json,
+                    sharedVariables.sheet_data_arrow ? buffers?.[0] : undefined
+                );
+            }
+            sheetDataArrays[response.id] = lastSheetDataArray;
+        }
+
+        unconsumedResponses.push(response);
     }
 
     function getResponseData<ResultType> (id: string, maxRetries = MAX_RETRIES): Promise<SendFunctionReturnType<ResultType>> {
@@ -197,6 +234,7 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
 
                     const response = unconsumedResponses[index];
                     unconsumedResponses.splice(index, 1);
+                    delete editProgress[id];
 
                     if (response['event'] == 'error') {
                         return resolve({
@@ -208,9 +246,11 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
                     }
 
                     const sharedVariables = response.shared_variables;
+                    const sheetDataArray = sheetDataArrays[id];
+                    delete sheetDataArrays[id];
                     
                     return resolve({
-                        sheetDataArray: sharedVariables ? getSheetDataArrayFromString(sharedVariables.sheet_data_json) : undefined,
+                        sheetDataArray: sheetDataArray,
                         analysisData: sharedVariables ? getAnalysisDataFromString(sharedVariables.analysis_data_json) : undefined,
                         userProfile: sharedVariables ? getUserProfileFromString(sharedVariables.user_profile_json) : undefined,
                         result: response['data'] as ResultType
@@ -237,6 +277,8 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
         // Return this id
         return response;
     }
+
+    send.getEditProgress = (id: string): EditProgress | undefined => editProgress[id];
     
     return send;
 }
@@ -246,4 +288,5 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
 // eslint-disable-next-line @typescript-eslint/no-namespace
 export declare namespace getCommSend {
     export let unconsumedResponses: MitoResponse[];
+    export let editProgress: Record<string, EditProgress>;
 }
@@ -21,7 +21,10 @@ import {
     MitoAPI,
     PublicInterfaceVersion, SheetData, UserProfile
 } from "../mito";
+import { ColumnID } from "../mito/types";
 import { isInJupyterLabOrNotebook } from "../mito/utils/location";
+import { tableFromIPC } from "apache-arrow";
+import { inflate } from "pako";
 
 
 export const writeAnalysisToReplayToMitosheetCall = (analysisName: string, mitoAPI: MitoAPI): void => {
@@ -108,11 +111,145 @@ export const getArgs = (analysisToReplayName: string | undefined, inputCellExecu
 
 
 
-export const getSheetDataArrayFromString = (sheet_data_json: string): SheetData[] => {
+export const getSheetDataArrayFromString = (sheet_data_json: string, sheetDataArrow?: ArrayBuffer | ArrayBufferView): SheetData[] => {
     if (sheet_data_json.length === 0) {
         return []
     }
-    return JSON.parse(sheet_data_json);
+    const sheetDataArray = JSON.parse(sheet_data_json);
+    if (sheetDataArrow === undefined) {
+        return sheetDataArray;
+    }
+    return getSheetDataArrayWithArrowData(sheetDataArray, sheetDataArrow);
+}
+
+/**
+ * If the backend sends the sheet data as Arrow, then the data of the columns is not in 
+ * the sheet data JSON, but in a buffer with an Arrow IPC stream for each sheet. Each sheet
+ * has the offset and length of its stream in the buffer, and the columns in the stream 
+ * are named by their index in the sheet. See mitosheet/sheet_data_arrow.py.
+ */
+const getSheetDataArrayWithArrowData = (
+    sheetDataArray: (SheetData & {arrowStream?: {offset: number, length: number}})[], 
+    sheetDataArrow: ArrayBuffer | ArrayBufferView
+): SheetData[] => {
+    const arrowBytes = ArrayBuffer.isView(sheetDataArrow) 
+        ? new Uint8Array(sheetDataArrow.buffer, sheetDataArrow.byteOffset, sheetDataArrow.byteLength) 
+        : new Uint8Array(sheetDataArrow);
+
+    sheetDataArray.forEach(sheetData => {
+        const arrowStream = sheetData.arrowStream;
+        if (arrowStream === undefined) {
+            return;
+        }
+        delete sheetData.arrowStream;
+
+        const table = tableFromIPC(arrowBytes.subarray(arrowStream.offset, arrowStream.offset + arrowStream.length));
+        table.schema.fields.forEach(field => {
+            const column = table.getChild(field.name);
+            if (column === null) {
+                return;
+            }
+            // The NaN values of float columns are sent as nulls
+            const columnData: (string | number | boolean)[] = [];
+            for (let rowIndex = 0; rowIndex < column.length; rowIndex++) {
+                const value = column.get(rowIndex);
+                columnData.push(value === null ? 'NaN' : value);
+            }
+            sheetData.data[parseInt(field.name)].columnData = columnData;
+        })
+    })
+
+    return sheetDataArray;
+}
+
+/**
+ * The changes to the sheet data from the previous response. Sheets that did not change
+ * are not included, and sheets that did are either sent in full, or as the changed keys 
+ * of the sheet data, the ids of all the columns in order, and the data of the columns
+ * that are new or changed. See mitosheet/sheet_data_delta.py
+ */
+interface SheetDataDelta {
+    numSheets: number,
+    sheets: ({
+        sheetIndex: number,
+        full: SheetData
+    } | {
+        sheetIndex: number,
+        metadata: Partial<SheetData>,
+        columnIDs: ColumnID[],
+        columns: SheetData['data']
+    })[]
+}
+
+export const applySheetDataDelta = (previousSheetDataArray: SheetData[], sheetDataDelta: SheetDataDelta): SheetData[] => {
+    const sheetDataArray = previousSheetDataArray.slice(0, sheetDataDelta.numSheets);
+
+    sheetDataDelta.sheets.forEach(sheetDelta => {
+        if ('full' in sheetDelta) {
+            sheetDataArray[sheetDelta.sheetIndex] = sheetDelta.full;
+            return;
+        }
+
+        const previousSheetData = sheetDataArray[sheetDelta.sheetIndex];
+        const columns: Record<ColumnID, SheetData['data'][number]> = {};
+        previousSheetData.data.forEach(column => {columns[column.columnID] = column});
+        sheetDelta.columns.forEach(column => {columns[column.columnID] = column});
+
+        sheetDataArray[sheetDelta.sheetIndex] = {
+            ...previousSheetData,
+            ...sheetDelta.metadata,
+            data: sheetDelta.columnIDs.map(columnID => columns[columnID])
+        };
+    })
+
+    return sheetDataArray;
+}
+
+// The compressions of messages over the comm that we can read, see mitosheet/comm_compression.py
+export const SUPPORTED_COMM_COMPRESSIONS = ['zlib'];
+
+/**
+ * If a message sent over the comm is large, the backend can send the compressed JSON of it in 
+ * a buffer of the message instead. Returns the original message if the message is compressed, 
+ * and otherwise returns the message.
+ */
+export const getDecompressedMessage = (message: Record<string, any>, buffers: (ArrayBuffer | ArrayBufferView)[] | undefined): Record<string, any> => {
+    const compressedMessage = message['compressed_message'] as {encoding: string, bufferIndex: number} | undefined;
+    if (compressedMessage === undefined) {
+        return message;
+    }
+
+    const buffer = buffers?.[compressedMessage.bufferIndex];
+    if (buffer === undefined || compressedMessage.encoding !== 'zlib') {
+        console.error(`Could not decompress message: {id: ${message['id']}}`);
+        return message;
+    }
+
+    const bytes = ArrayBuffer.isView(buffer) 
+        ? new Uint8Array(buffer.buffer, buffer.byteOffset, buffer.byteLength) 
+        : new Uint8Array(buffer);
+    return JSON.parse(new TextDecoder().decode(inflate(bytes)));
+}
+
+/**
+ * The sheet data, analysis data and user profile are embedded in the rendered frontend code
+ * as an encoding, a colon, and the base64 of the utf8 bytes of the string, which are deflated
+ * if the string is large. See get_frontend_payload in mitosheet/mito_backend.py.
+ */
+export const getStringFromFrontendPayload = (payload: string): string => {
+    const separatorIndex = payload.indexOf(':');
+    const encoding = payload.slice(0, separatorIndex);
+    const binaryString = atob(payload.slice(separatorIndex + 1));
+
+    let bytes = new Uint8Array(binaryString.length);
+    for (let i = 0; i < binaryString.length; i++) {
+        bytes[i] = binaryString.charCodeAt(i);
+    }
+    if (encoding === 'deflate') {
+        bytes = inflate(bytes);
+    }
+
+    return new TextDecoder().decode(bytes);
 }
 
 export const getUserProfileFromString = (user_profile_json: string): UserProfile => {
@@ -4,6 +4,7 @@ import { Mito } from './mito';
 import { 
     getAnalysisDataFromString, 
     getArgs, getSheetDataArrayFromString, 
+    getStringFromFrontendPayload, 
     getUserProfileFromString, 
     overwriteAnalysisToReplayToMitosheetCall,
     writeAnalysisToReplayToMitosheetCall, 
@@ -12,18 +13,20 @@ import {
 } from './jupyter/jupyterUtils';
 import { getCommSend } from './jupyter/comm';
 
-// We replace the following byte arrays with the real byte arrays of the utf8 encoded
-// JSON for the sheet data array, etc. We pass this encoded because the JSON parsing
+// We replace the following strings with the base64 encoded, and possibly deflated, utf8 
+// bytes of the JSON for the sheet data array, etc. We pass this encoded because the JSON parsing
 // when we don't gets really complicated trying to replace \t, etc.
 // Do not edit the following lines without updating the get_mito_frontend_code which searches 
-// for this code exactly to replace it.
-const sheetDataBytes = new Uint8Array(['REPLACE_THIS_WITH_SHEET_DATA_BYTES' as unknown as number]);
-const analysisDataBytes = new Uint8Array(['REPLACE_THIS_WITH_ANALYSIS_DATA_BYTES' as unknown as number]);
-const userProfileBytes = new Uint8Array(['REPLACE_THIS_WITH_USER_PROFILE_BYTES' as unknown as number]);
+// for these strings exactly to replace them.
+const sheetDataPayload = 'REPLACE_THIS_WITH_SHEET_DATA_PAYLOAD';
+const analysisDataPayload = 'REPLACE_THIS_WITH_ANALYSIS_DATA_PAYLOAD';
+const userProfilePayload = 'REPLACE_THIS_WITH_USER_PROFILE_PAYLOAD';
 
-const sheetDataArray = getSheetDataArrayFromString(new TextDecoder().decode(sheetDataBytes));
-const analysisData = getAnalysisDataFromString(new TextDecoder().decode(analysisDataBytes));
-const userProfile = getUserProfileFromString(new TextDecoder().decode(userProfileBytes));
+// NOTE: the sheet data only has the rows and columns that are displayed first, and the rest 
+// are fetched as the sheet is scrolled
+const sheetDataArray = getSheetDataArrayFromString(getStringFromFrontendPayload(sheetDataPayload));
+const analysisData = getAnalysisDataFromString(getStringFromFrontendPayload(analysisDataPayload));
+const userProfile = getUserProfileFromString(getStringFromFrontendPayload(userProfilePayload));
 
 // We create a distinct comm channel for each Mito instance, so that they can 
 // each communicate with the backend seperately. We replace these values when
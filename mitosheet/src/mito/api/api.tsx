@@ -16,8 +16,8 @@ import { convertFrontendtoBackendGraphParams } from "../components/taskpanes/Gra
 import { AvailableSnowflakeOptionsAndDefaults, SnowflakeCredentials, SnowflakeTableLocationAndWarehouse } from "../components/taskpanes/SnowflakeImport/SnowflakeImportTaskpane";
 import { SplitTextToColumnsParams } from "../components/taskpanes/SplitTextToColumns/SplitTextToColumnsTaskpane";
 import { StepImportData } from "../components/taskpanes/UpdateImports/UpdateImportsTaskpane";
-import { AnalysisData, MergeParams, BackendPivotParams, CodeOptions, CodeSnippetAPIResult, ColumnID, DataframeFormat, FeedbackID, FilterGroupType, FilterType, FormulaLocation, GraphID, ParameterizableParams, SheetData, UIState, UserProfile, GraphParamsBackend, GraphParamsFrontend, StepType } from "../types";
-import { SendFunction, SendFunctionErrorReturnType, SendFunctionSuccessReturnType } from "./send";
+import { AnalysisData, MergeParams, BackendPivotParams, CodeOptions, CodeSnippetAPIResult, ColumnID, DataframeFormat, FeedbackID, FilterGroupType, FilterType, FormulaLocation, GraphID, ParameterizableParams, SheetData, UIState, UserProfile, GraphParamsBackend, GraphParamsFrontend, StepType, PerformanceReport, RowsWindow } from "../types";
+import { EditProgress, SendFunction, SendFunctionErrorReturnType, SendFunctionSuccessReturnType } from "./send";
 
 export type MitoAPIResult<ResultType> = {result: ResultType} | SendFunctionErrorReturnType 
 
@@ -71,7 +71,11 @@ interface MitoSuccessOrInplaceErrorResponse {
     'shared_variables'?: {
         'sheet_data_json': string,
         'analysis_data_json': string,
-        'user_profile_json': string
+        'user_profile_json': string,
+        // If true, the data of the sheets is in the first of the buffers of the message
+        'sheet_data_arrow'?: boolean,
+        // If true, the sheet_data_json is the changes to the sheet data of the previous response
+        'sheet_data_delta'?: boolean
     }
     'data': unknown
 }
@@ -84,6 +88,13 @@ interface MitoErrorModalResponse {
     traceback?: string;
 }
 
+// Sent while an edit is executing on the backend, before the response to it
+export interface MitoProgressResponse {
+    event: 'progress',
+    id: string,
+    data: EditProgress
+}
+
 export type MitoResponse = MitoSuccessOrInplaceErrorResponse | MitoErrorModalResponse
 
 
@@ -211,6 +222,14 @@ export class MitoAPI {
 
     }
 
+    /**
+     * Returns how far along the edit with this id is, if it is executing on 
+     * the backend and the backend has sent progress for it.
+     */
+    getEditProgress(editEventID: string): EditProgress | undefined {
+        return this._send?.getEditProgress?.(editEventID);
+    }
+
     /*
         Gets the path data for given path parts
     */
@@ -577,6 +596,55 @@ export class MitoAPI {
     }
     
 
+    async getPerformanceReport(): Promise<MitoAPIResult<PerformanceReport>> {
+        return await this.send<PerformanceReport>({
+            'event': 'api_call',
+            'type': 'get_performance_report',
+            'params': {}
+        })
+    }
+
+
+    /**
+     * Gets the data of the rows from startRow up to endRow of a sheet, so the
+     * sheet can display rows past the rows that are in the sheet data.
+     * If startColumn and endColumn are not given, gets all the columns.
+     */
+    async getRowsWindow(sheetIndex: number, startRow: number, endRow: number, startColumn?: number, endColumn?: number): Promise<MitoAPIResult<RowsWindow>> {
+        return await this.send<RowsWindow>({
+            'event': 'api_call',
+            'type': 'get_rows_window',
+            'params': {
+                'sheet_index': sheetIndex,
+                'start_row': startRow,
+                'end_row': endRow,
+                'start_column': startColumn,
+                'end_column': endColumn
+            }
+        })
+    }
+
+
+    /**
+     * Gets the data of the columns from startColumn up to endColumn of a sheet, so the
+     * sheet can display the columns past the columns that have data in the sheet data.
+     * If startRow and endRow are not given, gets the rows that are in the sheet data.
+     */
+    async getColumnsWindow(sheetIndex: number, startColumn: number, endColumn: number, startRow?: number, endRow?: number): Promise<MitoAPIResult<RowsWindow>> {
+        return await this.send<RowsWindow>({
+            'event': 'api_call',
+            'type': 'get_columns_window',
+            'params': {
+                'sheet_index': sheetIndex,
+                'start_column': startColumn,
+                'end_column': endColumn,
+                'start_row': startRow,
+                'end_row': endRow
+            }
+        })
+    }
+
+
     // AUTOGENERATED LINE: API GET (DO NOT DELETE)
 
 
@@ -602,6 +670,49 @@ export class MitoAPI {
         });
     }
 
+    /**
+     * Sends a list of edit events that are all executed together in a single pass 
+     * on the backend, which then writes the analysis and sends the sheet back once. 
+     * Use this for bulk actions, like deleting many graphs, that create many steps.
+     * 
+     * @param editEvents the type, params, and step id of each of the edit events, in order
+     */
+    async _batchEdit(
+        editEvents: {editEventType: string, params: unknown, stepID: string}[]
+    ): Promise<MitoAPIResult<never>> {
+        return await this.send({
+            'event': 'batch_edit_event',
+            'type': 'batch_edit',
+            'params': {
+                'edit_events': editEvents.map(editEvent => {
+                    return {
+                        'event': 'edit_event',
+                        'type': editEvent.editEventType,
+                        'step_id': editEvent.stepID,
+                        'params': editEvent.params
+                    }
+                })
+            }
+        });
+    }
+
+    /**
+     * Cancels an edit that has not finished executing on the backend. The steps 
+     * are left as they were before the edit, and the edit resolves with an error.
+     * 
+     * @param editEventID the id of the edit to cancel. If not given, all of the edits 
+     * that have not finished executing are cancelled
+     */
+    async cancelEdit(editEventID?: string): Promise<MitoAPIResult<{cancelled_edit_event_ids: string[]}>> {
+        return await this.send<{cancelled_edit_event_ids: string[]}>({
+            'event': 'cancel_edit',
+            'type': 'cancel_edit',
+            'params': {
+                'edit_event_id': editEventID
+            }
+        });
+    }
+
     async editGraph(
         graphID: GraphID,
         graphParams: GraphParamsFrontend,
@@ -636,18 +747,22 @@ export class MitoAPI {
         })
     }
 
-    async editGraphDelete(
-        graphID: GraphID,
-    ): Promise<void> {
-
-        await this.send<string>({
-            'event': 'edit_event',
-            'type': 'graph_delete_edit',
-            'step_id': getRandomId(),
-            'params': {
-                'graph_id': graphID
+    /*
+        Deletes all of the graphs in a single batch edit, so the sheet is only 
+        sent back once
+    */
+    async editGraphsDelete(
+        graphIDs: GraphID[],
+    ): Promise<MitoAPIResult<never>> {
+        return await this._batchEdit(graphIDs.map(graphID => {
+            return {
+                editEventType: 'graph_delete_edit',
+                params: {
+                    'graph_id': graphID
+                },
+                stepID: getRandomId()
             }
-        })
+        }))
     }
 
     async editGraphRename(
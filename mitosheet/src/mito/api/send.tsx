@@ -28,4 +28,14 @@ export type SendFunctionErrorReturnType = {
 };
 
 export type SendFunctionReturnType<ResultType> =  SendFunctionSuccessReturnType<ResultType> | SendFunctionErrorReturnType;
-export type SendFunction = <ResultType>(msg: Record<string, unknown>) => Promise<SendFunctionReturnType<ResultType>>;
\ No newline at end of file
+// How far along an edit that is executing on the backend is
+export type EditProgress = {
+    num_steps_executed: number,
+    num_steps: number,
+    step_type: string
+};
+
+export type SendFunction = (<ResultType>(msg: Record<string, unknown>) => Promise<SendFunctionReturnType<ResultType>>) & {
+    // If the backend sends progress for the edits it executes, returns the latest progress of the edit with this id
+    getEditProgress?: (id: string) => EditProgress | undefined
+};
\ No newline at end of file
@@ -1,6 +1,7 @@
 // Copyright (c) Mito
 
 import React, { useEffect, useState } from 'react';
+import { MitoAPI } from '../api/api';
 
 // import css
 import "../../../css/loading-indicator.css";
@@ -11,7 +12,8 @@ import NonLoadingCircle from './icons/NonLoadingCircle';
 import { getIcon } from './taskpanes/Steps/StepDataElement';
 
 const isEditEvent = (messageType: string): boolean => {
-    return messageType.endsWith('_edit')
+    // NOTE: cancelling an edit is not an edit itself
+    return messageType.endsWith('_edit') && messageType !== 'cancel_edit'
 }
 const isUpdateEvent = (messageType: string): boolean => {
     return Object.values(UpdateType).includes(messageType as any)
@@ -260,8 +262,11 @@ const getSlowLoadingMessage = (currentLoadingMessage: [number, string] | undefin
 
     By default, does not displaying anything for the first .5 seconds it
     is rendered, so that only long running ops actually display anything.
+
+    The edit that is executing shows how many of its steps have executed, if
+    the backend sends progress for it, and can be cancelled.
 */
-const LoadingIndicator = (props: {loading: [string, string | undefined, string][]}): JSX.Element => {
+const LoadingIndicator = (props: {loading: [string, string | undefined, string][], mitoAPI: MitoAPI}): JSX.Element => {
 
     // We store the message at the top of the loading queue, so that we can 
     // track if it has been running for longer than 10 seconds
@@ -309,6 +314,10 @@ const LoadingIndicator = (props: {loading: [string, string | undefined, string][
             <div className='loading-indicator-content'>
                 {messagesToDisplay.map((([messageType, message_id], index) => {
                     const slowLoadingMessage = getSlowLoadingMessage(currentLoadingMessage, message_id);
+                    // Only edits can be cancelled, and only the first one is executing. NOTE: the progress
+                    // is refreshed each second, as the interval above rerenders this component
+                    const isExecutingEdit = index === 0 && !isUpdateEvent(messageType);
+                    const editProgress = isExecutingEdit ? props.mitoAPI.getEditProgress(message_id) : undefined;
 
                     return (messageType !== undefined && 
                         <div key={index} className={classNames('mb-5px', 'mt-5px', {'text-color-medium-important': index !== 0})}>
@@ -328,6 +337,19 @@ const LoadingIndicator = (props: {loading: [string, string | undefined, string][
                                             {slowLoadingMessage}
                                         </div>
                                     }
+                                    {editProgress !== undefined && editProgress.num_steps > 1 &&
+                                        <div className='text-subtext-1'>
+                                            Executing step {editProgress.num_steps_executed + 1} of {editProgress.num_steps}
+                                        </div>
+                                    }
+                                    {isExecutingEdit &&
+                                        <div 
+                                            className='text-subtext-1 text-underline cursor-pointer'
+                                            onClick={() => {void props.mitoAPI.cancelEdit(message_id)}}
+                                        >
+                                            Cancel
+                                        </div>
+                                    }
                                 </div>
                                 
                                 <div className='loading-indicator-loader'>
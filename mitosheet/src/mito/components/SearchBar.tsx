@@ -10,6 +10,7 @@ import Input from './elements/Input';
 import { MitoAPI } from '../api/api';
 import { useDebouncedEffect } from '../hooks/useDebouncedEffect';
 import LoadingDots from './elements/LoadingDots';
+import { DEFAULT_HEIGHT } from './endo/EndoGrid';
 import { ensureCellVisible, scrollColumnIntoView } from './endo/visibilityUtils';
 import SearchNavigateIcon from './icons/SearchNavigateIcon';
 import CautionIcon from './icons/CautionIcon';
@@ -63,6 +64,7 @@ export const SearchBar: React.FC<SearchBarProps> = (props) => {
                 scrollAndRenderedContainerDiv,
                 sheetView,
                 gridState,
+                DEFAULT_HEIGHT * sheetData.numRows,
                 match.rowIndex,
                 match.colIndex,
             )
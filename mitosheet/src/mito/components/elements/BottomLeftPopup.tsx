@@ -39,7 +39,7 @@ const BottomLeftPopup = (props: {
         <>
             {displayLoadingIndicator && 
                 <div className='bottom-left-popup-container'>
-                    <LoadingIndicator loading={props.loading}/>
+                    <LoadingIndicator loading={props.loading} mitoAPI={props.mitoAPI}/>
                 </div>
             }
         </>
@@ -1,8 +1,8 @@
 import React, { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import '../../../../css/endo/EndoGrid.css';
 import '../../../../css/sitewide/colors.css';
-import { MitoAPI } from "../../api/api";
-import { EditorState, Dimension, GridState, RendererTranslate, SheetData, SheetView, UIState, MitoSelection, AnalysisData } from "../../types";
+import { MitoAPI, MitoAPIResult } from "../../api/api";
+import { EditorState, Dimension, GridState, RendererTranslate, RowsWindow, SheetData, SheetView, UIState, MitoSelection, AnalysisData } from "../../types";
 import FormulaBar from "./FormulaBar";
 import { TaskpaneType } from "../taskpanes/taskpanes";
 import { getCellEditorInputCurrentSelection, getStartingFormula } from "./celleditor/cellEditorUtils";
@@ -12,8 +12,8 @@ import { focusGrid } from "./focusUtils";
 import GridData from "./GridData";
 import IndexHeaders from "./IndexHeaders";
 import { equalSelections, getColumnIndexesInSelections, getIndexesFromMouseEvent, getIsCellSelected, getIsHeader, getNewSelectionAfterKeyPress, getNewSelectionAfterMouseUp, getSelectedRowLabelsWithEntireSelectedRow, isNavigationKeyPressed, isSelectionsOnlyColumnHeaders, isSelectionsOnlyIndexHeaders, reconciliateSelections, removeColumnFromSelections } from "./selectionUtils";
-import { calculateCurrentSheetView, calculateNewScrollPosition, calculateTranslate} from "./sheetViewUtils";
-import { firstNonNullOrUndefined, getColumnIDsArrayFromSheetDataArray } from "./utils";
+import { calculateCurrentSheetView, calculateNewScrollPosition, calculateTranslate, getElementScrollTop, getScrollHeight } from "./sheetViewUtils";
+import { firstNonNullOrUndefined, getColumnIDsArrayFromSheetDataArray, getColumnsWindowToFetch, getRowsWindowToFetch, getSheetDataWithRowsWindow } from "./utils";
 import { ensureCellVisible } from "./visibilityUtils";
 import { reconciliateWidthDataArray } from "./widthUtils";
 import FloatingCellEditor from "./celleditor/FloatingCellEditor";
@@ -27,7 +27,8 @@ export const DEFAULT_WIDTH = 123;
 export const DEFAULT_HEIGHT = 25;
 export const MIN_WIDTH = 50;
 
-// The maximum number of rows sent in the sheet data by the backend
+// The maximum number of rows sent in the sheet data by the backend. The rows
+// after these are fetched as the user scrolls to them
 export const MAX_ROWS = 1500;
 
 
@@ -120,13 +121,67 @@ function EndoGrid(props: {
 
     const totalSize: Dimension = {
         width: gridState.widthDataArray[gridState.sheetIndex]?.totalWidth || 0,
-        height: DEFAULT_HEIGHT * Math.min(sheetData?.numRows || 0, MAX_ROWS)
+        height: DEFAULT_HEIGHT * (sheetData?.numRows || 0)
     }
     
     const currentSheetView: SheetView = useMemo(() => {
         return calculateCurrentSheetView(gridState)
     }, [gridState])
 
+    // If we are currently fetching rows or columns that are not in the sheet data
+    const [fetchingWindow, setFetchingWindow] = useState(false);
+    // The sheet data that we failed to fetch a window for, so we don't try again until it changes
+    const failedWindowSheetDataRef = useRef<SheetData | undefined>(undefined);
+
+    /* 
+        An effect that fetches the rows and columns in the sheet view that are not in the sheet data,
+        as the sheet data only contains the data of the first MAX_ROWS rows of the first MAX_COLUMNS
+        columns, and places them in the sheet data. We only fetch one window at a time.
+    */
+    useEffect(() => {
+        if (sheetData === undefined || fetchingWindow || failedWindowSheetDataRef.current === sheetData) {
+            return;
+        }
+
+        const rowsWindowToFetch = getRowsWindowToFetch(sheetData, currentSheetView);
+        const columnsWindowToFetch = rowsWindowToFetch === undefined ? getColumnsWindowToFetch(sheetData, currentSheetView) : undefined;
+
+        let windowRequest: Promise<MitoAPIResult<RowsWindow>>;
+        if (rowsWindowToFetch !== undefined) {
+            windowRequest = mitoAPI.getRowsWindow(sheetIndex, rowsWindowToFetch.startRow, rowsWindowToFetch.endRow);
+        } else if (columnsWindowToFetch !== undefined) {
+            windowRequest = mitoAPI.getColumnsWindow(
+                sheetIndex, columnsWindowToFetch.startColumn, columnsWindowToFetch.endColumn, columnsWindowToFetch.startRow, columnsWindowToFetch.endRow
+            );
+        } else {
+            return;
+        }
+
+        setFetchingWindow(true);
+        void windowRequest.then(response => {
+            setFetchingWindow(false);
+            if ('error' in response) {
+                failedWindowSheetDataRef.current = sheetData;
+                return;
+            }
+
+            const rowsWindow = response.result;
+            mitoAPI.setSheetDataArray(prevSheetDataArray => {
+                // If the sheet data changed while we were fetching, then this data may be out of date
+                if (prevSheetDataArray[rowsWindow.sheetIndex] !== sheetData) {
+                    return prevSheetDataArray;
+                }
+                const newSheetDataArray = [...prevSheetDataArray];
+                newSheetDataArray[rowsWindow.sheetIndex] = getSheetDataWithRowsWindow(sheetData, rowsWindow);
+                return newSheetDataArray;
+            })
+        })
+    }, [
+        sheetData, sheetIndex, fetchingWindow,
+        currentSheetView.startingRowIndex, currentSheetView.numRowsRendered, 
+        currentSheetView.startingColumnIndex, currentSheetView.numColumnsRendered
+    ])
+
     const translate: RendererTranslate = useMemo(() => {
         return calculateTranslate(gridState);
     }, [gridState])
@@ -659,7 +714,7 @@ function EndoGrid(props: {
                     const newSelection = getNewSelectionAfterKeyPress(gridState.selections[gridState.selections.length - 1], e, sheetData);
                     ensureCellVisible(
                         containerRef.current, scrollAndRenderedContainerRef.current,
-                        currentSheetView, gridState,
+                        currentSheetView, gridState, totalSize.height,
                         newSelection.endingRowIndex, newSelection.endingColumnIndex
                     );
 
@@ -754,12 +809,13 @@ function EndoGrid(props: {
                     />
                     {/* 
                         This is the div we actually scroll inside. We make it so it's styled
-                        to be the size of all the data if it was displayed.
+                        to be the size of all the data if it was displayed, up to the tallest
+                        an element can be. See getScrollHeight
                     */}
                     <div 
                         id='scroller' 
                         style={{
-                            height: `${totalSize.height}px`,
+                            height: `${getScrollHeight(totalSize.height)}px`,
                             width: `${totalSize.width}px`
                         }} 
                     />
@@ -767,7 +823,7 @@ function EndoGrid(props: {
                     <div 
                         className="endo-renderer-container" 
                         style={{
-                            transform: `translate(${gridState.scrollPosition.scrollLeft - translate.x}px, ${gridState.scrollPosition.scrollTop - translate.y}px)`,
+                            transform: `translate(${gridState.scrollPosition.scrollLeft - translate.x}px, ${getElementScrollTop(gridState.scrollPosition.scrollTop, totalSize.height, gridState.viewport.height) - translate.y}px)`,
                         }}
                     >
                         <GridData
@@ -5,7 +5,7 @@ import { useEffectOnResizeElement } from '../../../hooks/useEffectOnElementResiz
 import { AnalysisData, EditorState, FormulaLocation, GridState, SheetData, SheetView, UIState } from '../../../types';
 import { getColumnHeaderParts, getDisplayColumnHeader } from '../../../utils/columnHeaders';
 import { TaskpaneType } from '../../taskpanes/taskpanes';
-import { KEYS_TO_IGNORE_IF_PRESSED_ALONE } from '../EndoGrid';
+import { DEFAULT_HEIGHT, KEYS_TO_IGNORE_IF_PRESSED_ALONE } from '../EndoGrid';
 import { submitRenameColumnHeader } from '../columnHeaderUtils';
 import { focusGrid } from '../focusUtils';
 import { getNewSelectionAfterKeyPress, isNavigationKeyPressed } from '../selectionUtils';
@@ -176,7 +176,7 @@ const CellEditor = (props: {
         
         ensureCellVisible(
             props.containerRef.current, props.scrollAndRenderedContainerRef.current,
-            props.currentSheetView, props.gridState,
+            props.currentSheetView, props.gridState, DEFAULT_HEIGHT * (props.sheetDataArray[props.sheetIndex]?.numRows || 0),
             props.editorState.rowIndex, props.editorState.columnIndex
         );
         
@@ -338,7 +338,7 @@ const CellEditor = (props: {
 
                     ensureCellVisible(
                         props.containerRef.current, props.scrollAndRenderedContainerRef.current,
-                        props.currentSheetView, props.gridState,
+                        props.currentSheetView, props.gridState, DEFAULT_HEIGHT * (props.sheetDataArray[props.sheetIndex]?.numRows || 0),
                         newSelection.endingRowIndex, newSelection.endingColumnIndex
                     );
 
@@ -388,7 +388,7 @@ const CellEditor = (props: {
 
             ensureCellVisible(
                 props.containerRef.current, props.scrollAndRenderedContainerRef.current,
-                props.currentSheetView, props.gridState,
+                props.currentSheetView, props.gridState, DEFAULT_HEIGHT * (props.sheetDataArray[props.sheetIndex]?.numRows || 0),
                 props.editorState.rowIndex, props.editorState.columnIndex
             );
 
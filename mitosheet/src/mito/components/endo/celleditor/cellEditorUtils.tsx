@@ -1,7 +1,7 @@
 // Utilities for the cell editor
 
 import { FunctionDocumentationObject, functionDocumentationObjects } from "../../../data/function_documentation";
-import { AnalysisData, EditorState, FrontendFormulaAndLocation, IndexLabel, MitoSelection, SheetData } from "../../../types";
+import { AnalysisData, EditorState, FormulaIndex, FrontendFormulaAndLocation, IndexLabel, MitoSelection, SheetData } from "../../../types";
 import { getDisplayColumnHeader, isPrimitiveColumnHeader, rowIndexToColumnHeaderLevel } from "../../../utils/columnHeaders";
 import { getUpperLeftAndBottomRight } from "../selectionUtils";
 import { getCellDataFromCellIndexes } from "../utils";
@@ -371,10 +371,28 @@ export const getDocumentationFunction = (formula: string, selectionStart: number
     }
 }
 
-export const getNewIndexLabelAtRowOffsetFromOtherIndexLabel = (index: IndexLabel[], indexLabel: IndexLabel | undefined, rowOffset: number): IndexLabel | undefined => {
+export const getNewIndexLabelAtRowOffsetFromOtherIndexLabel = (index: FormulaIndex, indexLabel: IndexLabel | undefined, rowOffset: number): IndexLabel | undefined => {
     if (indexLabel === undefined) {
         return undefined;
     }
+
+    if (!Array.isArray(index)) {
+        // If the index is a range, we can compute the position of the label directly
+        if (typeof indexLabel !== 'number') {
+            return undefined;
+        }
+        const length = Math.max(0, Math.ceil((index.stop - index.start) / index.step));
+        const positionOfIndexLabel = (indexLabel - index.start) / index.step;
+        if (!Number.isInteger(positionOfIndexLabel) || positionOfIndexLabel < 0 || positionOfIndexLabel >= length) {
+            return undefined;
+        }
+
+        const positionOfNewLabel = positionOfIndexLabel - rowOffset;
+        if (positionOfNewLabel < 0 || positionOfNewLabel >= length) {
+            return undefined;
+        }
+        return index.start + positionOfNewLabel * index.step;
+    }
     
     const indexOfIndexLabel = index.indexOf(indexLabel);
     if (indexOfIndexLabel === -1) {
@@ -3,6 +3,40 @@ import { DEFAULT_HEIGHT } from "./EndoGrid";
 import { Dimension, GridState, RendererTranslate, ScrollPosition, SheetView } from "../../types";
 
 
+/*
+    Browsers cap how tall an element can be (about 33.5M pixels in Chrome, and less 
+    in Firefox), so a sheet with more than about a million rows cannot be scrolled in 
+    an element that is as tall as all of its rows.
+
+    Instead, the element we scroll in is at most MAX_SCROLL_HEIGHT tall, and we scale 
+    its scrollTop to the scrollTop in the sheet, so that scrolling to the bottom of the
+    element scrolls to the last row. The scrollPosition in the grid state is always the
+    scroll position in the sheet.
+*/
+export const MAX_SCROLL_HEIGHT = 10_000_000;
+
+export const getScrollHeight = (totalHeight: number): number => {
+    return Math.min(totalHeight, MAX_SCROLL_HEIGHT);
+}
+
+// How many pixels the sheet scrolls for each pixel the element scrolls
+const getScrollTopScale = (totalHeight: number, viewportHeight: number): number => {
+    const scrollHeight = getScrollHeight(totalHeight);
+    if (scrollHeight === totalHeight || scrollHeight <= viewportHeight) {
+        return 1;
+    }
+    return (totalHeight - viewportHeight) / (scrollHeight - viewportHeight);
+}
+
+export const getSheetScrollTop = (elementScrollTop: number, totalHeight: number, viewportHeight: number): number => {
+    return elementScrollTop * getScrollTopScale(totalHeight, viewportHeight);
+}
+
+export const getElementScrollTop = (sheetScrollTop: number, totalHeight: number, viewportHeight: number): number => {
+    return sheetScrollTop / getScrollTopScale(totalHeight, viewportHeight);
+}
+
+
 /* 
     Calculates the current sheet view based on the widths of the columns, 
     and the scroll location in the sheet.
@@ -89,13 +123,15 @@ export const calculateNewScrollPosition = (
     scrollAndRenderedContainerDiv: HTMLDivElement | null
 ): ScrollPosition | undefined => {
     
-    // Maximum amount you can scroll in any direction
+    // Maximum amount you can scroll in any direction. NOTE: the element we scroll
+    // in may not be as tall as the sheet, see getScrollHeight
+    const scrollHeight = getScrollHeight(totalSize.height);
     const maxScrollLeft = totalSize.width - viewport.width;
-    const maxScrollTop = totalSize.height - viewport.height;
+    const maxScrollTop = scrollHeight - viewport.height;
     
     // And it might not even be possible to scroll at all
     const noScrollLeft = totalSize.width < (scrollAndRenderedContainerDiv?.clientWidth || 0);
-    const noScrollDown = totalSize.height < (scrollAndRenderedContainerDiv?.clientHeight || 0);
+    const noScrollDown = scrollHeight < (scrollAndRenderedContainerDiv?.clientHeight || 0);
 
     const target = e.target as HTMLDivElement | null;
     if (target === null) {
@@ -123,7 +159,7 @@ export const calculateNewScrollPosition = (
 
     return {
         scrollLeft: newScrollLeft || 0,
-        scrollTop: newScrollTop || 0
+        scrollTop: getSheetScrollTop(newScrollTop || 0, totalSize.height, viewport.height)
     };
 }
 
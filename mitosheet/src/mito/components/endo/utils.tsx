@@ -1,4 +1,4 @@
-import { Action, ActionEnum, ColumnFilters, ColumnFormatType, ColumnHeader, ColumnID, GridState, IndexLabel, SheetData, UIState } from "../../types";
+import { Action, ActionEnum, ColumnFilters, ColumnFormatType, ColumnHeader, ColumnID, GridState, IndexLabel, RowsWindow, SheetData, SheetView, UIState } from "../../types";
 import { isBoolDtype, isDatetimeDtype, isFloatDtype, isIntDtype, isTimedeltaDtype } from "../../utils/dtypes";
 import { getKeyboardShortcutString } from "../../utils/keyboardShortcuts";
 import StepsIcon from "../icons/StepsIcon";
@@ -143,6 +143,127 @@ export const getCellDataFromCellIndexes = (sheetData: SheetData | undefined, row
     }
 }
 
+// The number of rows we fetch at once as the user scrolls past the rows in the sheet data
+export const ROWS_WINDOW_SIZE = 500;
+
+/**
+ * Returns the rows to fetch so that all the rows in the current sheet view are in 
+ * the sheet data, or undefined if they are all there already. We fetch the rows
+ * around the first missing row, so that we don't fetch again on every scroll.
+ */
+export const getRowsWindowToFetch = (sheetData: SheetData, currentSheetView: SheetView): {startRow: number, endRow: number} | undefined => {
+    const endingRowIndex = Math.min(currentSheetView.startingRowIndex + currentSheetView.numRowsRendered, sheetData.numRows);
+
+    for (let rowIndex = Math.max(currentSheetView.startingRowIndex, 0); rowIndex < endingRowIndex; rowIndex++) {
+        if (sheetData.index[rowIndex] === undefined) {
+            const startRow = Math.max(rowIndex - ROWS_WINDOW_SIZE / 2, 0);
+            return {
+                startRow: startRow,
+                endRow: Math.min(startRow + ROWS_WINDOW_SIZE, sheetData.numRows)
+            }
+        }
+    }
+
+    return undefined;
+}
+
+// The number of columns we fetch at once when scrolling to columns that are not in the sheet data
+export const COLUMNS_WINDOW_SIZE = 100;
+
+/**
+ * Returns the columns to fetch so that all the columns in the current sheet view have
+ * data in the rows of the current sheet view, or undefined if they do already. The 
+ * columns past the first MAX_COLUMNS columns have no data in the sheet data. We fetch
+ * the columns around the first missing column, and the rows around the sheet view.
+ */
+export const getColumnsWindowToFetch = (sheetData: SheetData, currentSheetView: SheetView): {startColumn: number, endColumn: number, startRow: number, endRow: number} | undefined => {
+    const rowIndex = Math.max(currentSheetView.startingRowIndex, 0);
+    // If the row is not in the sheet data, we fetch the rows first
+    if (rowIndex >= sheetData.numRows || sheetData.index[rowIndex] === undefined) {
+        return undefined;
+    }
+
+    const endingColumnIndex = Math.min(currentSheetView.startingColumnIndex + currentSheetView.numColumnsRendered, sheetData.data.length);
+
+    for (let columnIndex = Math.max(currentSheetView.startingColumnIndex, 0); columnIndex < endingColumnIndex; columnIndex++) {
+        if (sheetData.data[columnIndex].columnData[rowIndex] === undefined) {
+            const startColumn = Math.max(columnIndex - COLUMNS_WINDOW_SIZE / 2, 0);
+            const startRow = Math.max(rowIndex - ROWS_WINDOW_SIZE / 2, 0);
+            return {
+                startColumn: startColumn,
+                endColumn: Math.min(startColumn + COLUMNS_WINDOW_SIZE, sheetData.data.length),
+                startRow: startRow,
+                endRow: Math.min(startRow + ROWS_WINDOW_SIZE, sheetData.numRows)
+            }
+        }
+    }
+
+    return undefined;
+}
+
+// The most windows that are kept in the sheet data. Once there are more, the windows that
+// were fetched first are evicted, and are fetched again if they are scrolled back into view
+export const MAX_ROWS_WINDOWS = 10;
+
+/**
+ * Returns the sheet data with the rows in the rows window placed at their row 
+ * indexes, so that everything that reads rows from the sheet data can read them.
+ * 
+ * The sheet data is rebuilt from the sheet data that was sent and the last MAX_ROWS_WINDOWS 
+ * windows, so scrolling through a large sheet does not keep every row it scrolls past. 
+ * NOTE: we never spread the arrays with windows in them, as that would turn them into dense 
+ * arrays as long as the last row in any window.
+ */
+export const getSheetDataWithRowsWindow = (sheetData: SheetData, rowsWindow: RowsWindow): SheetData => {
+    const sentSheetData = sheetData.sentSheetData || sheetData;
+    const rowsWindows = [...(sheetData.rowsWindows || []), rowsWindow].slice(-MAX_ROWS_WINDOWS);
+
+    const index = sentSheetData.index.slice();
+    const columnDataMap: Record<ColumnID, (string | number | boolean)[]> = {};
+    const conditionalFormattingResults = {...sentSheetData.conditionalFormattingResult.results};
+
+    rowsWindows.forEach(rowsWindow => {
+        rowsWindow.index.forEach((indexLabel, i) => {
+            index[rowsWindow.startRow + i] = indexLabel;
+        })
+
+        rowsWindow.data.forEach(windowColumn => {
+            if (columnDataMap[windowColumn.columnID] === undefined) {
+                const column = sentSheetData.data.find(column => column.columnID === windowColumn.columnID);
+                columnDataMap[windowColumn.columnID] = column !== undefined ? column.columnData.slice() : [];
+            }
+            const columnData = columnDataMap[windowColumn.columnID];
+            windowColumn.columnData.forEach((cellData, i) => {
+                columnData[rowsWindow.startRow + i] = cellData;
+            })
+        })
+
+        Object.entries(rowsWindow.conditionalFormattingResult.results).forEach(([columnID, cellResults]) => {
+            conditionalFormattingResults[columnID] = {...conditionalFormattingResults[columnID], ...cellResults};
+        })
+    })
+
+    const data = sentSheetData.data.map(column => {
+        const columnData = columnDataMap[column.columnID];
+        if (columnData === undefined) {
+            return column;
+        }
+        return {...column, columnData: columnData};
+    })
+
+    return {
+        ...sentSheetData,
+        index: index,
+        data: data,
+        conditionalFormattingResult: {
+            ...sentSheetData.conditionalFormattingResult,
+            results: conditionalFormattingResults
+        },
+        sentSheetData: sentSheetData,
+        rowsWindows: rowsWindows
+    }
+}
+
 /*
     Helper function for creating the ColumnIDsMapping: sheetIndex -> columnIndex -> columnID
     from the Sheet Data Array
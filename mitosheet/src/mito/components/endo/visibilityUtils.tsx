@@ -1,11 +1,11 @@
 import { GridState, SheetView, UIState } from "../../types";
 import { DEFAULT_HEIGHT } from "./EndoGrid";
-import { columnIsVisible, rowIsVisible } from "./sheetViewUtils";
+import { columnIsVisible, getElementScrollTop, rowIsVisible } from "./sheetViewUtils";
 import { isNumberInRangeInclusive } from "./utils";
 
 
-// A helper to scroll a given row into view
-const scrollRowIntoView = (containerDiv: HTMLDivElement | null, scrollAndRenderedContainerDiv: HTMLDivElement | null, currentSheetView: SheetView, rowIndex: number) => {
+// A helper to scroll a given row into view. The totalHeight is the height of all the rows in the sheet
+const scrollRowIntoView = (containerDiv: HTMLDivElement | null, scrollAndRenderedContainerDiv: HTMLDivElement | null, currentSheetView: SheetView, totalHeight: number, rowIndex: number) => {
 
     // The column headers are always visible, so we don't have to do anything
     if (rowIndex === -1) {
@@ -17,11 +17,14 @@ const scrollRowIntoView = (containerDiv: HTMLDivElement | null, scrollAndRendere
 
     const rowVisible = rowIsVisible(containerDiv, rowIndex);
     if (!rowVisible) {
+        // The element may scroll less than the sheet does, see getScrollHeight. We round so that
+        // the row is still entirely visible after the element scrolls to a whole pixel
+        const viewportHeight = scrollAndRenderedContainerDiv.clientHeight;
         const newCellIsAbove = rowIndex <= currentSheetView.startingRowIndex;
         if (newCellIsAbove) {
-            scrollTop = (rowIndex) * DEFAULT_HEIGHT;
+            scrollTop = Math.floor(getElementScrollTop((rowIndex) * DEFAULT_HEIGHT, totalHeight, viewportHeight));
         } else {
-            scrollTop = (rowIndex + 1) * DEFAULT_HEIGHT - (scrollAndRenderedContainerDiv.clientHeight);
+            scrollTop = Math.ceil(getElementScrollTop((rowIndex + 1) * DEFAULT_HEIGHT - viewportHeight, totalHeight, viewportHeight));
         }
     }
 
@@ -59,7 +62,7 @@ export const scrollColumnIntoView = (containerDiv: HTMLDivElement | null, scroll
     Makes sure the given rowIndex and columnIndex are visible, by scrolling
     the screen the minimal amount to make them visible
 */
-export const ensureCellVisible = (containerDiv: HTMLDivElement | null, scrollAndRenderedContainerDiv: HTMLDivElement | null, currentSheetView: SheetView, gridState: GridState, rowIndex: number, columnIndex: number): void => {
+export const ensureCellVisible = (containerDiv: HTMLDivElement | null, scrollAndRenderedContainerDiv: HTMLDivElement | null, currentSheetView: SheetView, gridState: GridState, totalHeight: number, rowIndex: number, columnIndex: number): void => {
     /* 
         For some reason, there is an incredibly hard to find / track down bug where
         if you use the metaKey to scroll a huge number of cells at once, then the
@@ -82,9 +85,9 @@ export const ensureCellVisible = (containerDiv: HTMLDivElement | null, scrollAnd
     // Make the row visible
     if (!rowVisible) {
         if (!largeJump) {
-            scrollRowIntoView(containerDiv, scrollAndRenderedContainerDiv, currentSheetView, rowIndex);
+            scrollRowIntoView(containerDiv, scrollAndRenderedContainerDiv, currentSheetView, totalHeight, rowIndex);
         } else {
-            setTimeout(() => scrollRowIntoView(containerDiv, scrollAndRenderedContainerDiv, currentSheetView, rowIndex), 25)
+            setTimeout(() => scrollRowIntoView(containerDiv, scrollAndRenderedContainerDiv, currentSheetView, totalHeight, rowIndex), 25)
         }
     } 
 
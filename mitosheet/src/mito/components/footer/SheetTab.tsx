@@ -152,6 +152,14 @@ export default function SheetTab(props: SheetTabProps): JSX.Element {
                         {props.tabName} 
                     </p>
                 }
+                {props.tabIDObj.tabType === 'data' && props.sheetDataArray[props.tabIDObj.sheetIndex]?.isPreview &&
+                    <p 
+                        className='ml-5px text-color-medium-important' 
+                        title='This sheet is a sample of the full data. The generated code and downloads use the full data.'
+                    >
+                        preview
+                    </p>
+                }
                 {/* Display the dropdown that allows a user to perform some action */}
                 <div 
                     onClick={(e) => {
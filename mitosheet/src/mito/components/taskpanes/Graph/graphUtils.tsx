@@ -79,9 +79,7 @@ const getAxisColumnIDs = (sheetData: SheetData, graphType?: GraphType, selectedC
 
 export const deleteGraphs = async (graphIDs: GraphID[], mitoAPI: MitoAPI, setUIState: React.Dispatch<React.SetStateAction<UIState>>, graphDataArray: GraphData[]) => {
     const remainingGraphIDs = graphDataArray.filter(graphData => !graphIDs.includes(graphData.graph_id)).map(graphData => graphData.graph_id);
-    for (const graphID of graphIDs) {
-        await mitoAPI.editGraphDelete(graphID)
-    }
+    await mitoAPI.editGraphsDelete(graphIDs)
     if (remainingGraphIDs.length === 0) {
         return setUIState(prevUIState => {
             return {
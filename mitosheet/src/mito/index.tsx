@@ -4,8 +4,8 @@ export {
     MitoTheme
 } from "./types"
 
-export { MitoAPI, MitoResponse } from './api/api';
-export { MAX_WAIT_FOR_SEND_CREATION, SendFunction, SendFunctionError, SendFunctionReturnType } from "../mito/api/send";
+export { MitoAPI, MitoResponse, MitoProgressResponse } from './api/api';
+export { EditProgress, MAX_WAIT_FOR_SEND_CREATION, SendFunction, SendFunctionError, SendFunctionReturnType } from "../mito/api/send";
 
 export { waitUntilConditionReturnsTrueOrTimeout } from "../mito/utils/time";
 
@@ -93,6 +93,8 @@ export type CodeOptions = {
     function_name: string
     function_params: Record<ParamName, ParamValue> | ParamSubType | ParamSubType[],
     import_custom_python_code: boolean
+    // The engine steps execute with. Defaults to pandas
+    engine?: 'pandas' | 'polars'
 }
 
 /**
@@ -287,10 +289,16 @@ export type IndexLabel = string | number;
 
 export type FormulaLocation = {'type': 'entire_column'} | {'type': 'specific_index_labels', 'index_labels': IndexLabel[]}
 
+/* 
+    The index the formula was applied to. If the index is a range of evenly spaced 
+    integers, it is sent as just the bounds of the range, rather than as a list of labels.
+*/
+export type FormulaIndex = IndexLabel[] | {'type': 'range', 'start': number, 'stop': number, 'step': number}
+
 export type FrontendFormulaAndLocation = {
     'frontend_formula': Formula,
     'location': FormulaLocation,
-    'index': IndexLabel[]
+    'index': FormulaIndex
 }
 
 
@@ -307,6 +315,7 @@ export type FrontendFormulaAndLocation = {
  * @param columnFiltersMap - for this dataframe, a map from column id -> filter objects
  * @param columnDtypeMap - for this dataframe, a map from column id -> column dtype
  * @param index - the indexes in this dataframe
+ * @param isPreview - if the data is a sample of the full dataframe, as it is larger than the preview_row_threshold in the mito_config
  */
 export type SheetData = {
     dfName: string;
@@ -326,6 +335,36 @@ export type SheetData = {
     index: IndexLabel[];
     dfFormat: DataframeFormat;
     conditionalFormattingResult: ConditionalFormattingResult;
+    isPreview?: boolean;
+    // If windows of rows have been placed in this sheet data, the sheet data as it was
+    // sent, and the windows placed in it. See getSheetDataWithRowsWindow
+    sentSheetData?: SheetData;
+    rowsWindows?: RowsWindow[];
+};
+
+
+/**
+ * The data of the rows from startRow up to endRow, and the columns from startColumn
+ * up to endColumn, of a sheet, which are fetched as the user scrolls past the rows
+ * that are in the sheet data.
+ * 
+ * @param data - the columns in the window, and the data of the rows in the window in each of them
+ * @param index - the indexes of the rows in the window
+ * @param conditionalFormattingResult - the conditional formatting of the cells in the window
+ */
+export type RowsWindow = {
+    sheetIndex: number;
+    startRow: number;
+    endRow: number;
+    startColumn: number;
+    endColumn: number;
+    numRows: number;
+    data: {
+        columnID: ColumnID;
+        columnData: (string | number | boolean)[];
+    }[];
+    index: IndexLabel[];
+    conditionalFormattingResult: ConditionalFormattingResult;
 };
 
 
@@ -688,7 +727,7 @@ export interface WidthData {
  * 
  * @param sheetIndex - The sheet that this grid state represents
  * @param viewport - The size of the viewport
- * @param scrollPosition - Scroll position in the grid
+ * @param scrollPosition - Scroll position in the sheet, which the element we scroll in may not be as tall as. See getScrollHeight
  * @param selections - Selected ranges
  * @param copiedSelections - The ranges that currently have been copied
  * @param columnIDsArray - A mapping from sheetIndex -> columnIndex -> columnID
@@ -735,6 +774,14 @@ export enum MitoEnterpriseConfigKey {
     ENTERPRISE = 'MITO_CONFIG_ENTERPRISE',
     CUSTOM_SHEET_FUNCTIONS_PATH = 'MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH',
     CUSTOM_IMPORTERS_PATH = 'MITO_CONFIG_CUSTOM_IMPORTERS_PATH',
+    STEP_HISTORY_MEMORY_BUDGET = 'MITO_CONFIG_STEP_HISTORY_MEMORY_BUDGET',
+    STEP_HISTORY_CHECKPOINT_INTERVAL = 'MITO_CONFIG_STEP_HISTORY_CHECKPOINT_INTERVAL',
+    STEP_HISTORY_SPILL_TO_DISK = 'MITO_CONFIG_STEP_HISTORY_SPILL_TO_DISK',
+    STEP_RESULT_CACHE_SIZE = 'MITO_CONFIG_STEP_RESULT_CACHE_SIZE',
+    PREVIEW_ROW_THRESHOLD = 'MITO_CONFIG_PREVIEW_ROW_THRESHOLD',
+    PANDAS_COPY_ON_WRITE = 'MITO_CONFIG_PANDAS_COPY_ON_WRITE',
+    ARROW_SHEET_DATA = 'MITO_CONFIG_ARROW_SHEET_DATA',
+    COMM_COMPRESSION_THRESHOLD = 'MITO_CONFIG_COMM_COMPRESSION_THRESHOLD',
 }
 
 export type PublicInterfaceVersion = 1 | 2 | 3;
@@ -824,7 +871,15 @@ export interface MitoConfig {
     [MitoEnterpriseConfigKey.CUSTOM_IMPORTERS_PATH]: string,
     [MitoEnterpriseConfigKey.LOG_SERVER_URL]: string,
     [MitoEnterpriseConfigKey.LOG_SERVER_BATCH_INTERVAL]: string,
-    [MitoEnterpriseConfigKey.ANALYTICS_URL]: string
+    [MitoEnterpriseConfigKey.ANALYTICS_URL]: string,
+    [MitoEnterpriseConfigKey.STEP_HISTORY_MEMORY_BUDGET]: number | null,
+    [MitoEnterpriseConfigKey.STEP_HISTORY_CHECKPOINT_INTERVAL]: number,
+    [MitoEnterpriseConfigKey.STEP_HISTORY_SPILL_TO_DISK]: boolean,
+    [MitoEnterpriseConfigKey.STEP_RESULT_CACHE_SIZE]: number | null,
+    [MitoEnterpriseConfigKey.PREVIEW_ROW_THRESHOLD]: number | null,
+    [MitoEnterpriseConfigKey.PANDAS_COPY_ON_WRITE]: boolean,
+    [MitoEnterpriseConfigKey.ARROW_SHEET_DATA]: boolean,
+    [MitoEnterpriseConfigKey.COMM_COMPRESSION_THRESHOLD]: number | null,
 }
 
 
@@ -1200,6 +1255,34 @@ export interface CodeSnippet {
     'Code': string[]
 }
 
+export interface StepPerformanceReport {
+    step_id: string,
+    step_idx: number,
+    step_type: string,
+    skipped: boolean,
+    states_evicted: boolean,
+    bytes_retained: number,
+    execution_time: number | null,
+    pandas_processing_time: number | null,
+    recon_time: number | null,
+    serialization_time: number | null,
+    transpile_time: number | null,
+}
+
+export interface PerformanceReport {
+    steps: StepPerformanceReport[],
+    total_bytes_retained: number,
+    step_state_eviction_count: number,
+    step_state_recompute_count: number,
+    step_state_spill_count: number,
+    step_state_load_count: number,
+    compiled_code_cache_hits: number,
+    compiled_code_cache_misses: number,
+    step_result_cache_hits: number | null,
+    step_result_cache_misses: number | null,
+    step_result_cache_hit_rate: number | null,
+}
+
 export type CodeSnippetAPIResult = 
     | {
         'status': 'success',
@@ -169,7 +169,9 @@ class MitoStreamlitWrapper extends StreamlitComponentBase<State> {
 
         const returnType = this.props.args['return_type'] as string;
         const height = this.props.args['height'] as string | undefined;
-        const sheetDataArray = getSheetDataArrayFromString(this.props.args['sheet_data_json']);
+        // If the sheet data is sent as Arrow, its data is in the sheet_data_arrow bytes
+        const sheetDataArrow = this.props.args['sheet_data_arrow'] as Uint8Array | null | undefined;
+        const sheetDataArray = getSheetDataArrayFromString(this.props.args['sheet_data_json'], sheetDataArrow ?? undefined);
         const analysisData = getAnalysisDataFromString(this.props.args['analysis_data_json']);
         const userProfile = getUserProfileFromString(this.props.args['user_profile_json']);
         const responses = JSON.parse(this.props.args['responses_json']);